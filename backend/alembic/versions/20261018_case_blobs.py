@@ -0,0 +1,56 @@
+"""content-addressed case payload blobs
+
+Revision ID: 20261018_case_blobs
+Revises: 20261018_case_snapshot_deltas
+Create Date: 2026-10-18
+
+Existing rows keep their inline JSON and stay readable; move them into
+case_blobs with `python -m src.app.cases.blob_store`.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_case_blobs"
+down_revision = "20261018_case_snapshot_deltas"
+branch_labels = None
+depends_on = None
+
+PAYLOAD_FIELDS = (
+    "profile",
+    "program_eligibility",
+    "crs_breakdown",
+    "required_artifacts",
+    "config_fingerprint",
+)
+
+
+def upgrade():
+    op.create_table(
+        "case_blobs",
+        sa.Column("hash", sa.String(length=64), nullable=False),
+        sa.Column("codec", sa.String(length=10), nullable=False, server_default="zlib"),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("refcount", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.PrimaryKeyConstraint("hash"),
+    )
+    for table in ("case_records", "case_snapshots"):
+        with op.batch_alter_table(table) as batch_op:
+            for name in PAYLOAD_FIELDS:
+                batch_op.add_column(sa.Column(f"{name}_hash", sa.String(length=64), nullable=True))
+            if table == "case_records":
+                batch_op.alter_column("profile", existing_type=sa.JSON(), nullable=True)
+                batch_op.alter_column("program_eligibility", existing_type=sa.JSON(), nullable=True)
+
+
+def downgrade():
+    # Blob-backed rows must be inlined again before downgrading.
+    for table in ("case_snapshots", "case_records"):
+        with op.batch_alter_table(table) as batch_op:
+            for name in reversed(PAYLOAD_FIELDS):
+                batch_op.drop_column(f"{name}_hash")
+    op.drop_table("case_blobs")
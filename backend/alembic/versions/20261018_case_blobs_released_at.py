@@ -0,0 +1,41 @@
+"""case_blobs.released_at, when a blob's reference count reached zero
+
+Revision ID: 20261018_case_blobs_released_at
+Revises: 20261018_storage_blobs
+Create Date: 2026-10-18
+
+BlobStore.collect_garbage only deletes blobs released longer ago than
+BLOB_GC_GRACE_SECONDS. Blobs already at zero are stamped now, so they are
+collected once the grace period has passed.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_case_blobs_released_at"
+down_revision = "20261018_storage_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = inspect(op.get_bind())
+    if "released_at" not in {col["name"] for col in inspector.get_columns("case_blobs")}:
+        op.add_column(
+            "case_blobs", sa.Column("released_at", sa.DateTime(timezone=True), nullable=True)
+        )
+    if "ix_case_blobs_released_at" not in {i["name"] for i in inspector.get_indexes("case_blobs")}:
+        op.create_index("ix_case_blobs_released_at", "case_blobs", ["released_at"])
+    op.execute(
+        "UPDATE case_blobs SET released_at = CURRENT_TIMESTAMP "
+        "WHERE refcount <= 0 AND released_at IS NULL"
+    )
+
+
+def downgrade():
+    op.drop_index("ix_case_blobs_released_at", table_name="case_blobs")
+    with op.batch_alter_table("case_blobs") as batch_op:
+        batch_op.drop_column("released_at")
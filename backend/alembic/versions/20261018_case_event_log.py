@@ -0,0 +1,76 @@
+"""case event log sequences and month column
+
+Revision ID: 20261018_case_event_log
+Revises: 20261018_case_summaries
+Create Date: 2026-10-18
+
+Existing events are numbered per case in created_at order and get their month
+key; case_records.event_sequence starts from each case's highest sequence.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_case_event_log"
+down_revision = "20261018_case_summaries"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("case_events") as batch_op:
+        batch_op.add_column(sa.Column("sequence", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("month", sa.String(length=7), nullable=True))
+    with op.batch_alter_table("case_records") as batch_op:
+        batch_op.add_column(
+            sa.Column("event_sequence", sa.Integer(), nullable=False, server_default="0")
+        )
+
+    month = (
+        "strftime('%Y-%m', created_at)"
+        if op.get_bind().dialect.name == "sqlite"
+        else "to_char(created_at, 'YYYY-MM')"
+    )
+    op.execute(f"UPDATE case_events SET month = {month}")
+    op.execute(
+        """
+        UPDATE case_events
+        SET sequence = (
+            SELECT COUNT(*) FROM case_events AS earlier
+            WHERE earlier.case_id = case_events.case_id
+              AND (earlier.created_at < case_events.created_at
+                   OR (earlier.created_at = case_events.created_at AND earlier.id <= case_events.id))
+        )
+        WHERE case_id IS NOT NULL
+        """
+    )
+    op.execute(
+        """
+        UPDATE case_records
+        SET event_sequence = (
+            SELECT COALESCE(MAX(case_events.sequence), 0)
+            FROM case_events
+            WHERE case_events.case_id = case_records.id
+        )
+        """
+    )
+
+    with op.batch_alter_table("case_events") as batch_op:
+        batch_op.create_unique_constraint("uq_case_events_case_sequence", ["case_id", "sequence"])
+    op.create_index("ix_case_events_case_created", "case_events", ["case_id", "created_at"])
+    op.create_index(
+        "ix_case_events_tenant_month", "case_events", ["tenant_id", "month", "created_at"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_case_events_tenant_month", table_name="case_events")
+    op.drop_index("ix_case_events_case_created", table_name="case_events")
+    with op.batch_alter_table("case_events") as batch_op:
+        batch_op.drop_constraint("uq_case_events_case_sequence", type_="unique")
+        batch_op.drop_column("month")
+        batch_op.drop_column("sequence")
+    with op.batch_alter_table("case_records") as batch_op:
+        batch_op.drop_column("event_sequence")
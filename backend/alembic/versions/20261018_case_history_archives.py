@@ -0,0 +1,47 @@
+"""case_history_archives cold tier for compacted case history
+
+Revision ID: 20261018_case_history_archives
+Revises: 20261018_case_snapshot_as_of
+Create Date: 2026-10-18
+
+Settled cases are compacted into this table by `python -m src.app.cases.archive`.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_case_history_archives"
+down_revision = "20261018_case_snapshot_as_of"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "case_history_archives",
+        sa.Column("case_id", sa.String(length=36), nullable=False),
+        sa.Column("tenant_id", sa.String(length=36), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("first_snapshot_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_version", sa.Integer(), nullable=True),
+        sa.Column("snapshot_count", sa.Integer(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("timeline", sa.JSON(), nullable=False),
+        sa.Column("codec", sa.String(length=10), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["case_id"], ["case_records.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("case_id"),
+    )
+    op.create_index(
+        "ix_case_history_archives_tenant",
+        "case_history_archives",
+        ["tenant_id", "case_id", "first_snapshot_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_case_history_archives_tenant", table_name="case_history_archives")
+    op.drop_table("case_history_archives")
@@ -0,0 +1,69 @@
+"""case re-evaluation runs and change report
+
+Revision ID: 20261018_case_reevaluation
+Revises: 20251209_m41_case_lifecycle
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_case_reevaluation"
+down_revision = "20251209_m41_case_lifecycle"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "case_reevaluation_runs",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="running"),
+        sa.Column("config_digest", sa.String(length=64), nullable=False),
+        sa.Column("config_fingerprint", sa.JSON(), nullable=True),
+        sa.Column("tenant_id", sa.String(length=36), nullable=True),
+        sa.Column("cursor", sa.String(length=36), nullable=True),
+        sa.Column("processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("skipped", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("changed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("elapsed_seconds", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_case_reevaluation_runs_status", "case_reevaluation_runs", ["status"])
+    op.create_index(
+        "ix_case_reevaluation_runs_config_digest", "case_reevaluation_runs", ["config_digest"]
+    )
+
+    op.create_table(
+        "case_reevaluation_changes",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("run_id", sa.String(length=36), nullable=False),
+        sa.Column("case_id", sa.String(length=36), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("eligible_before", sa.JSON(), nullable=False),
+        sa.Column("eligible_after", sa.JSON(), nullable=False),
+        sa.Column("crs_before", sa.Integer(), nullable=True),
+        sa.Column("crs_after", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["run_id"], ["case_reevaluation_runs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["case_id"], ["case_records.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_case_reevaluation_changes_run_id", "case_reevaluation_changes", ["run_id"])
+    op.create_index("ix_case_reevaluation_changes_case_id", "case_reevaluation_changes", ["case_id"])
+
+
+def downgrade():
+    op.drop_index("ix_case_reevaluation_changes_case_id", table_name="case_reevaluation_changes")
+    op.drop_index("ix_case_reevaluation_changes_run_id", table_name="case_reevaluation_changes")
+    op.drop_table("case_reevaluation_changes")
+    op.drop_index("ix_case_reevaluation_runs_config_digest", table_name="case_reevaluation_runs")
+    op.drop_index("ix_case_reevaluation_runs_status", table_name="case_reevaluation_runs")
+    op.drop_table("case_reevaluation_runs")
@@ -0,0 +1,41 @@
+"""as-of indexes and result columns on case snapshots
+
+Revision ID: 20261018_case_snapshot_as_of
+Revises: 20261018_case_event_log
+Create Date: 2026-10-18
+
+Existing snapshots get eligible_programs / crs_total with
+`python -m src.app.cases.time_travel` (until then they are rebuilt on read).
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_case_snapshot_as_of"
+down_revision = "20261018_case_event_log"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("case_snapshots") as batch_op:
+        batch_op.add_column(sa.Column("eligible_programs", sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column("crs_total", sa.Integer(), nullable=True))
+    op.create_index(
+        "ix_case_snapshots_case_at", "case_snapshots", ["case_id", "snapshot_at", "version"]
+    )
+    op.create_index(
+        "ix_case_snapshots_tenant_case_at",
+        "case_snapshots",
+        ["tenant_id", "case_id", "snapshot_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_case_snapshots_tenant_case_at", table_name="case_snapshots")
+    op.drop_index("ix_case_snapshots_case_at", table_name="case_snapshots")
+    with op.batch_alter_table("case_snapshots") as batch_op:
+        batch_op.drop_column("crs_total")
+        batch_op.drop_column("eligible_programs")
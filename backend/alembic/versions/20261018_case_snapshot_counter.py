@@ -0,0 +1,42 @@
+"""per-case snapshot version counter
+
+Revision ID: 20261018_case_snapshot_counter
+Revises: 20261018_case_blobs
+Create Date: 2026-10-18
+
+Snapshot versions are now allocated by bumping case_records.snapshot_version
+(UPDATE ... RETURNING) instead of reading max(version); existing cases start
+from their highest stored version.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_case_snapshot_counter"
+down_revision = "20261018_case_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("case_records") as batch_op:
+        batch_op.add_column(
+            sa.Column("snapshot_version", sa.Integer(), nullable=False, server_default="0")
+        )
+    op.execute(
+        """
+        UPDATE case_records
+        SET snapshot_version = (
+            SELECT COALESCE(MAX(case_snapshots.version), 0)
+            FROM case_snapshots
+            WHERE case_snapshots.case_id = case_records.id
+        )
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("case_records") as batch_op:
+        batch_op.drop_column("snapshot_version")
@@ -0,0 +1,39 @@
+"""delta-encoded case snapshots
+
+Revision ID: 20261018_case_snapshot_deltas
+Revises: 20261018_case_reevaluation
+Create Date: 2026-10-18
+
+Existing rows become full snapshots (encoding='full'); convert them to deltas
+afterwards with `python -m src.app.cases.snapshot_store`.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_case_snapshot_deltas"
+down_revision = "20261018_case_reevaluation"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("case_snapshots") as batch_op:
+        batch_op.add_column(
+            sa.Column("encoding", sa.String(length=10), nullable=False, server_default="full")
+        )
+        batch_op.add_column(sa.Column("delta", sa.JSON(), nullable=True))
+        batch_op.alter_column("profile", existing_type=sa.JSON(), nullable=True)
+        batch_op.alter_column("program_eligibility", existing_type=sa.JSON(), nullable=True)
+
+
+def downgrade():
+    # Delta rows cannot be represented without the new columns; re-expand them first
+    # (SnapshotStore.reencode_case with a full_interval of 1).
+    with op.batch_alter_table("case_snapshots") as batch_op:
+        batch_op.alter_column("program_eligibility", existing_type=sa.JSON(), nullable=False)
+        batch_op.alter_column("profile", existing_type=sa.JSON(), nullable=False)
+        batch_op.drop_column("delta")
+        batch_op.drop_column("encoding")
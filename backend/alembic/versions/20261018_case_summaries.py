@@ -0,0 +1,67 @@
+"""case_summaries listing projection
+
+Revision ID: 20261018_case_summaries
+Revises: 20261018_case_snapshot_counter
+Create Date: 2026-10-18
+
+Summaries are written with each case from now on; existing cases are added with
+`python -m src.app.cases.summaries` (payloads live in case_blobs, so the
+projection is computed in Python).
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_case_summaries"
+down_revision = "20261018_case_snapshot_counter"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "case_summaries",
+        sa.Column("case_id", sa.String(length=36), nullable=False),
+        sa.Column("tenant_id", sa.String(length=36), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("source", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("programs", sa.JSON(), nullable=False),
+        sa.Column("eligible_programs", sa.JSON(), nullable=False),
+        sa.Column("crs_total", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["case_id"], ["case_records.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("case_id"),
+    )
+    op.create_index("ix_case_summaries_created", "case_summaries", ["created_at", "case_id"])
+    op.create_index(
+        "ix_case_summaries_tenant_created", "case_summaries", ["tenant_id", "created_at", "case_id"]
+    )
+    op.create_index("ix_case_summaries_status", "case_summaries", ["status"])
+    op.create_index("ix_case_summaries_crs_total", "case_summaries", ["crs_total"])
+
+    op.create_table(
+        "case_summary_programs",
+        sa.Column("case_id", sa.String(length=36), nullable=False),
+        sa.Column("program_code", sa.String(length=50), nullable=False),
+        sa.Column("eligible", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["case_id"], ["case_summaries.case_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("case_id", "program_code"),
+    )
+    op.create_index(
+        "ix_case_summary_programs_code",
+        "case_summary_programs",
+        ["program_code", "eligible", "case_id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_case_summary_programs_code", table_name="case_summary_programs")
+    op.drop_table("case_summary_programs")
+    op.drop_index("ix_case_summaries_crs_total", table_name="case_summaries")
+    op.drop_index("ix_case_summaries_status", table_name="case_summaries")
+    op.drop_index("ix_case_summaries_tenant_created", table_name="case_summaries")
+    op.drop_index("ix_case_summaries_created", table_name="case_summaries")
+    op.drop_table("case_summaries")
@@ -0,0 +1,41 @@
+"""documents.content_sha256, hashed while the upload streams to storage
+
+Revision ID: 20261018_document_content_sha256
+Revises: 20261018_ocr_results
+Create Date: 2026-10-18
+
+documents is created by Base.metadata.create_all, which never adds columns to an
+existing table. Existing rows keep a NULL hash; the OCR cache hashes their files
+on demand.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_document_content_sha256"
+down_revision = "20261018_ocr_results"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = inspect(op.get_bind())
+    # On a fresh database create_all adds documents (with the column) when the app starts.
+    if not inspector.has_table("documents"):
+        return
+    if "content_sha256" not in {col["name"] for col in inspector.get_columns("documents")}:
+        op.add_column("documents", sa.Column("content_sha256", sa.String(length=64), nullable=True))
+    if "ix_documents_content_sha256" not in {i["name"] for i in inspector.get_indexes("documents")}:
+        op.create_index("ix_documents_content_sha256", "documents", ["content_sha256"])
+
+
+def downgrade():
+    inspector = inspect(op.get_bind())
+    if not inspector.has_table("documents"):
+        return
+    op.drop_index("ix_documents_content_sha256", table_name="documents")
+    with op.batch_alter_table("documents") as batch_op:
+        batch_op.drop_column("content_sha256")
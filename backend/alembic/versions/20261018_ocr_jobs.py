@@ -0,0 +1,62 @@
+"""ocr_jobs durable queue for background document OCR
+
+Revision ID: 20261018_ocr_jobs
+Revises: 20261018_case_history_archives
+Create Date: 2026-10-18
+
+Workers are run with `python -m src.app.services.ocr_queue`. Deployments that
+started the API after the queue shipped already have the table (created by
+Base.metadata.create_all in main.py); it is then left as is.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_ocr_jobs"
+down_revision = "20261018_case_history_archives"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = inspect(op.get_bind())
+    if inspector.has_table("ocr_jobs"):
+        return
+    # documents itself is created by create_all; on a fresh database the app adds it later.
+    document_fk = (
+        [sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE")]
+        if inspector.has_table("documents")
+        else []
+    )
+
+    op.create_table(
+        "ocr_jobs",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("document_id", sa.String(length=36), nullable=False),
+        sa.Column("org_id", sa.String(length=36), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="queued"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="3"),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        *document_fk,
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_ocr_jobs_document_id", "ocr_jobs", ["document_id"])
+    op.create_index("ix_ocr_jobs_org_id", "ocr_jobs", ["org_id"])
+    op.create_index("idx_ocr_jobs_status_available", "ocr_jobs", ["status", "available_at"])
+
+
+def downgrade():
+    op.drop_index("idx_ocr_jobs_status_available", table_name="ocr_jobs")
+    op.drop_index("ix_ocr_jobs_org_id", table_name="ocr_jobs")
+    op.drop_index("ix_ocr_jobs_document_id", table_name="ocr_jobs")
+    op.drop_table("ocr_jobs")
@@ -0,0 +1,44 @@
+"""ocr_results cache of OCR text keyed by file content
+
+Revision ID: 20261018_ocr_results
+Revises: 20261018_ocr_jobs
+Create Date: 2026-10-18
+
+Skipped when the table was already created by Base.metadata.create_all.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_ocr_results"
+down_revision = "20261018_ocr_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if inspect(op.get_bind()).has_table("ocr_results"):
+        return
+
+    op.create_table(
+        "ocr_results",
+        sa.Column("content_sha256", sa.String(length=64), nullable=False),
+        sa.Column("language", sa.String(length=50), nullable=False),
+        sa.Column("engine", sa.String(length=100), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("ocr_metadata", sa.JSON(), nullable=True),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("content_sha256", "language", "engine"),
+    )
+    op.create_index("ix_ocr_results_last_used_at", "ocr_results", ["last_used_at"])
+
+
+def downgrade():
+    op.drop_index("ix_ocr_results_last_used_at", table_name="ocr_results")
+    op.drop_table("ocr_results")
@@ -0,0 +1,41 @@
+"""storage_blobs reference counts for content-addressed document storage
+
+Revision ID: 20261018_storage_blobs
+Revises: 20261018_document_content_sha256
+Create Date: 2026-10-18
+
+Blobs are garbage-collected by `python -m src.app.services.storage gc`. Skipped
+when the table was already created by Base.metadata.create_all.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_storage_blobs"
+down_revision = "20261018_document_content_sha256"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if inspect(op.get_bind()).has_table("storage_blobs"):
+        return
+
+    op.create_table(
+        "storage_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.Column("released_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    op.create_index("ix_storage_blobs_released_at", "storage_blobs", ["released_at"])
+
+
+def downgrade():
+    op.drop_index("ix_storage_blobs_released_at", table_name="storage_blobs")
+    op.drop_table("storage_blobs")
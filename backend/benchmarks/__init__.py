@@ -0,0 +1,7 @@
+"""
+Benchmarks for the case history write and read paths.
+
+    python -m benchmarks.case_history --help
+
+See docs/CASE_HISTORY_BENCHMARKS.md.
+"""
@@ -0,0 +1,235 @@
+"""
+Synthetic case history at scale.
+
+Rows are bulk-inserted with Core statements (the services would need hours for
+millions of snapshots) but have the shape the write path produces: payloads in
+content-addressed case_blobs shared across cases, a full snapshot every
+`full_interval` versions with JSON-patch deltas in between, per-case version
+and event counters, summary rows and sequenced, month-partitioned events.
+Everything derives from `Scale.seed`, so two runs at the same scale seed the
+same data.
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from src.app.cases.blob_store import PAYLOAD_FIELDS, BlobStore
+from src.app.cases.event_log import month_key
+from src.app.cases.models_db import (
+    CaseEvent,
+    CaseRecord,
+    CaseSnapshot,
+    CaseSummary,
+    CaseSummaryProgram,
+)
+from src.app.cases.snapshot_store import SNAPSHOT_DELTA, SNAPSHOT_FULL
+from src.app.cases.summaries import program_results, result_columns
+from src.app.models.tenant import Tenant
+from src.app.models.user import User
+
+PROGRAMS = ("FSW", "CEC", "FST", "PNP")
+STATUSES = ("draft", "submitted", "in_review", "complete", "archived", "evaluated")
+SOURCE = "benchmark"
+
+
+@dataclass
+class Scale:
+    tenants: int = 10
+    cases: int = 10_000
+    snapshots_per_case: int = 20
+    events_per_case: int = 5
+    full_interval: int = 10
+    payload_pool: int = 50
+    chunk_size: int = 1_000
+    seed: int = 42
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def synthetic_document(rng: random.Random) -> dict[str, Any]:
+    """One evaluation payload of realistic size (a few KB of JSON)."""
+    crs = rng.randint(300, 520)
+    return {
+        "profile": {
+            "age": rng.randint(20, 50),
+            "marital_status": rng.choice(["single", "married"]),
+            "education": [
+                {"level": rng.choice(["bachelor", "master", "phd"]), "years": rng.randint(2, 6)}
+            ],
+            "language_tests": [
+                {
+                    "test_type": "IELTS",
+                    **{f"{skill}_clb": rng.randint(5, 10) for skill in ("listening", "reading")},
+                    **{f"{skill}_clb": rng.randint(5, 10) for skill in ("writing", "speaking")},
+                }
+            ],
+            "work_experience": [
+                {"noc_code": f"{rng.randint(10000, 99999)}", "years": rng.randint(1, 10)}
+                for _ in range(rng.randint(1, 4))
+            ],
+        },
+        "program_eligibility": {
+            "results": [
+                {
+                    "program_code": code,
+                    "eligible": rng.random() < 0.5,
+                    "reasons": [f"rule-{rng.randint(1, 60)}" for _ in range(3)],
+                }
+                for code in PROGRAMS
+            ]
+        },
+        "crs_breakdown": {
+            "total": crs,
+            "breakdown": {"core": crs // 2, "spouse": 0, "skills": crs // 4, "additional": 0},
+        },
+        "required_artifacts": {
+            "forms": [f"IMM{rng.randint(1000, 9999)}" for _ in range(4)],
+            "documents": [f"doc-{rng.randint(1, 200)}" for _ in range(8)],
+        },
+        "config_fingerprint": {"rules": uuid.UUID(int=rng.getrandbits(128)).hex},
+    }
+
+
+def seed_case_history(db: Session, scale: Scale) -> dict[str, int]:
+    """Insert `scale` worth of tenants, users, cases, snapshots and events; returns row counts."""
+    rng = random.Random(scale.seed)
+    tenants = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(scale.tenants)]
+    users = {tenant_id: str(uuid.UUID(int=rng.getrandbits(128))) for tenant_id in tenants}
+    db.execute(
+        insert(Tenant),
+        [{"id": tenant_id, "name": f"Benchmark tenant {n}"} for n, tenant_id in enumerate(tenants)],
+    )
+    db.execute(
+        insert(User),
+        [
+            {
+                "id": user_id,
+                "tenant_id": tenant_id,
+                "email": f"bench-{n}@example.com",
+                "role": "agent",
+            }
+            for n, (tenant_id, user_id) in enumerate(users.items())
+        ],
+    )
+
+    pool = [synthetic_document(rng) for _ in range(scale.payload_pool)]
+    blobs = BlobStore(db)
+    keys = iter(blobs.put_many(document[name] for document in pool for name in PAYLOAD_FIELDS))
+    hashes = [{f"{name}_hash": next(keys) for name in PAYLOAD_FIELDS} for _ in pool]
+    outcomes = [result_columns(d["program_eligibility"], d["crs_breakdown"]) for d in pool]
+    programs = [program_results(d["program_eligibility"]) for d in pool]
+
+    counts = {"cases": 0, "snapshots": 0, "events": 0}
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for chunk in _chunks(range(scale.cases), scale.chunk_size):
+        records, summaries, summary_programs, snapshots, events = [], [], [], [], []
+        for n in chunk:
+            case_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            tenant_id = tenants[n % len(tenants)]
+            doc = rng.randrange(len(pool))
+            status = rng.choice(STATUSES)
+            created_at = start + timedelta(minutes=n)
+            records.append(
+                {
+                    "id": case_id,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "source": SOURCE,
+                    "status": status,
+                    "tenant_id": tenant_id,
+                    "created_by_user_id": users[tenant_id],
+                    "created_by": "benchmark",
+                    "snapshot_version": scale.snapshots_per_case,
+                    "event_sequence": scale.events_per_case,
+                    **hashes[doc],
+                }
+            )
+            summaries.append(
+                {
+                    "case_id": case_id,
+                    "tenant_id": tenant_id,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "source": SOURCE,
+                    "status": status,
+                    **outcomes[doc],
+                }
+            )
+            summary_programs.extend(
+                {"case_id": case_id, "program_code": code, "eligible": eligible}
+                for code, eligible in programs[doc]
+            )
+            for version in range(1, scale.snapshots_per_case + 1):
+                full = (version - 1) % scale.full_interval == 0
+                snapshots.append(
+                    {
+                        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                        "case_id": case_id,
+                        "version": version,
+                        "snapshot_at": created_at + timedelta(hours=version),
+                        "source": SOURCE,
+                        "tenant_id": tenant_id,
+                        "encoding": SNAPSHOT_FULL if full else SNAPSHOT_DELTA,
+                        "delta": (
+                            None
+                            if full
+                            else [{"op": "replace", "path": "/profile/age", "value": 20 + version}]
+                        ),
+                        "eligible_programs": outcomes[doc]["eligible_programs"],
+                        "crs_total": outcomes[doc]["crs_total"],
+                        **(hashes[doc] if full else {}),
+                    }
+                )
+            for sequence in range(1, scale.events_per_case + 1):
+                event_at = created_at + timedelta(hours=sequence)
+                events.append(
+                    {
+                        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                        "case_id": case_id,
+                        "event_type": "EVALUATION_CREATED" if sequence == 1 else "CASE_NOTE",
+                        "tenant_id": tenant_id,
+                        "created_at": event_at,
+                        "actor": "benchmark",
+                        "event_metadata": {"sequence": sequence},
+                        "sequence": sequence,
+                        "month": month_key(event_at),
+                    }
+                )
+        for model, rows in (
+            (CaseRecord, records),
+            (CaseSummary, summaries),
+            (CaseSummaryProgram, summary_programs),
+            (CaseSnapshot, snapshots),
+            (CaseEvent, events),
+        ):
+            if rows:
+                db.execute(insert(model), rows)
+        # Keep the blob refcounts true to the rows that reference them.
+        blobs.retain(key for row in records + snapshots for key in _hash_values(row))
+        db.commit()
+        counts["cases"] += len(records)
+        counts["snapshots"] += len(snapshots)
+        counts["events"] += len(events)
+    return counts
+
+
+def _hash_values(row: dict[str, Any]) -> Iterator[str]:
+    for name in PAYLOAD_FIELDS:
+        key = row.get(f"{name}_hash")
+        if key:
+            yield key
+
+
+def _chunks(items: range, size: int) -> Iterator[range]:
+    for offset in range(0, len(items), size):
+        yield items[offset : offset + size]
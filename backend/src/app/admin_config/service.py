@@ -15,7 +15,9 @@ from src.app.rules.config_models import (
     ArrangedEmploymentConfig,
     BiometricsMedicalsConfig,
     ClbTablesConfig,
+    CrsAdditionalConfig,
     CrsCoreConfig,
+    CrsSpouseConfig,
     CrsTransferabilityConfig,
     LanguageConfig,
     ProgramRulesConfig,
@@ -29,6 +31,8 @@ class DomainConfigSnapshot(BaseModel):
 
     crs_core: CrsCoreConfig
     crs_transferability: CrsTransferabilityConfig
+    crs_spouse: CrsSpouseConfig
+    crs_additional: CrsAdditionalConfig
     language: LanguageConfig
     clb_tables: ClbTablesConfig
     work_experience: WorkExperienceConfig
@@ -68,6 +72,8 @@ class AdminConfigService:
         return DomainConfigSnapshot(
             crs_core=domain_bundle.crs_core,
             crs_transferability=domain_bundle.crs_transferability,
+            crs_spouse=domain_bundle.crs_spouse,
+            crs_additional=domain_bundle.crs_additional,
             language=domain_bundle.language,
             clb_tables=domain_bundle.clb_tables,
             work_experience=domain_bundle.work_experience,
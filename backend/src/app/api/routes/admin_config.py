@@ -3,6 +3,7 @@ from typing import Any, Dict, List
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from src.app.admin_config.service import AdminConfigService, DomainConfigSnapshot
+from src.app.domain_config.registry import get_config_snapshot
 from src.app.domain_config.service import ConfigService
 from src.app.documents.service import DocumentMatrixService
 
@@ -10,13 +11,13 @@ router = APIRouter()
 
 
 def get_config_service() -> ConfigService:
-    return ConfigService()
+    return get_config_snapshot().config_service
 
 
 def get_document_service(
     config_service: ConfigService = Depends(get_config_service),
 ) -> DocumentMatrixService:
-    return DocumentMatrixService(config_service)
+    return DocumentMatrixService(config_service, bundle=get_config_snapshot().documents)
 
 
 def get_admin_config_service(
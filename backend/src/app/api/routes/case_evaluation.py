@@ -1,53 +1,41 @@
 from __future__ import annotations
 
-import hashlib
+import asyncio
+import queue
+from collections.abc import Iterator
+from dataclasses import asdict
 from datetime import datetime
-from pathlib import Path
-from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
-from src.app.cases.history_service import CaseHistoryResult, CaseHistoryService
-from src.app.cases.model import CaseService
+from src.app.cases.evaluation import (
+    CrsBreakdownResponse,
+    ProgramEligibilityResponse,
+    crs_response,
+    evaluate_profile,
+    history_payload,
+    program_response,
+    select_crs,
+)
+from src.app.cases.evaluation_cache import get_evaluation_cache
+from src.app.cases.evaluation_executor import run_evaluation
+from src.app.cases.history_service import CaseHistoryResult
+from src.app.cases.write_behind import get_history_write_queue, write_status
 from src.app.db.database import get_db
-from src.app.documents.service import DocumentMatrixService
-from src.app.domain_config.service import ConfigService
-from src.app.rules.models import CandidateProfile, ProgramEligibilityResult
+from src.app.domain_config.registry import get_config_snapshot
+from src.app.rules.models import CandidateProfile
+from src.app.rules.what_if import WhatIfAnalysis, WhatIfDelta
 from src.app.services.rule_engine_service import RuleEngineService
 
-
 router = APIRouter()
 
-
-class FactorDetail(BaseModel):
-    name: str
-    points: int
-    rule_id: str
-    config_ref: str | None = None
-
-
-class CrsBreakdownResponse(BaseModel):
-    total: int
-    breakdown: dict[str, int] = Field(default_factory=dict)
-    factor_details: list[FactorDetail] = Field(default_factory=list)
-
-
-class ProgramEligibilityResponse(BaseModel):
-    program_code: str
-    eligible: bool
-    reasons: list[str] = Field(default_factory=list)
-    rule_ids: list[str] = Field(default_factory=list)
-
-
-class DocumentRequirement(BaseModel):
-    id: str
-    label: str | None = None
-    category: str | None = None
-    mandatory: bool = True
-    programs_applicable: list[str] = Field(default_factory=list)
-    rule_ids: list[str] = Field(default_factory=list)
+# Profiles evaluated per batch pass when streaming batch results.
+BATCH_CHUNK_SIZE = 500
+# Upper bound on candidate deltas per what-if request (combinations grow as n^max_changes).
+MAX_WHAT_IF_DELTAS = 25
 
 
 class AuditInfo(BaseModel):
@@ -57,7 +45,7 @@ class AuditInfo(BaseModel):
 
 class CaseEvaluationResponse(BaseModel):
     case_id: str
-    version: int
+    version: int | None = None  # None while write_status is pending
     profile: CandidateProfile
     program_eligibility: list[ProgramEligibilityResponse]
     crs: CrsBreakdownResponse
@@ -67,181 +55,170 @@ class CaseEvaluationResponse(BaseModel):
     config: dict[str, str] | None = None
     warnings: list[str] = Field(default_factory=list)
     audit: AuditInfo
+    write_id: str | None = None
+    write_status: str | None = None  # pending | committed | failed
+
+
+class HistoryWriteStatus(BaseModel):
+    write_id: str
+    case_id: str
+    status: str
+    version: int | None = None
+    enqueued_at: datetime
+    completed_at: datetime | None = None
+    error: str | None = None
+
+
+class EvaluationCacheStats(BaseModel):
+    enabled: bool
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+    hit_ratio: float = 0.0
 
 
 class CaseEvaluationRequest(BaseModel):
     profile: CandidateProfile
 
 
-def _config_hashes() -> dict[str, str]:
-    files = [
-        "config/domain/crs.yaml",
-        "config/domain/programs.yaml",
-        "config/domain/language.yaml",
-        "config/domain/work_experience.yaml",
-        "config/domain/proof_of_funds.yaml",
-        "config/domain/arranged_employment.yaml",
-        "config/domain/biometrics_medicals.yaml",
-        "config/domain/forms.yaml",
-        "config/domain/documents.yaml",
-    ]
-    hashes: dict[str, str] = {}
-    for rel in files:
-        path = Path(__file__).resolve().parents[4] / rel
-        try:
-            data = path.read_bytes()
-            hashes[rel] = hashlib.sha256(data).hexdigest()
-        except FileNotFoundError:
-            hashes[rel] = "missing"
-    return hashes
-
-
-def _program_response(result: ProgramEligibilityResult) -> ProgramEligibilityResponse:
-    return ProgramEligibilityResponse(
-        program_code=result.program_code,
-        eligible=result.eligible,
-        reasons=result.reasons,
-        rule_ids=[],
-    )
+class CaseBatchEvaluationRequest(BaseModel):
+    profiles: list[CandidateProfile] = Field(default_factory=list)
 
 
-def _persist_history(
-    *,
-    history_service: CaseHistoryService,
-    profile: CandidateProfile,
-    program_results: list[ProgramEligibilityResponse],
-    crs_payload: dict[str, Any],
-    required_artifacts: dict[str, list],
-    config_fingerprint: dict[str, str],
-    source: str,
-) -> CaseHistoryResult:
-    program_payload = [res.model_dump(mode="json") for res in program_results]
-    return history_service.persist_evaluation(
-        profile=profile.model_dump(mode="json"),
-        program_eligibility={"results": program_payload},
-        crs_breakdown=crs_payload,
-        required_artifacts=required_artifacts,
-        config_fingerprint=config_fingerprint,
-        source=source,
-        actor="system",
-    )
+class CaseBatchEvaluationItem(BaseModel):
+    index: int
+    selected_program: str | None = None
+    program_eligibility: list[ProgramEligibilityResponse]
+    crs: CrsBreakdownResponse
+    warnings: list[str] = Field(default_factory=list)
+
+
+class WhatIfRequest(BaseModel):
+    profile: CandidateProfile
+    deltas: list[WhatIfDelta] = Field(default_factory=list, max_length=MAX_WHAT_IF_DELTAS)
+    target_score: int | None = None
+    max_changes: int = Field(default=2, ge=1, le=3)
+    limit: int = Field(default=10, ge=1, le=50)
 
 
 @router.post("/evaluate", response_model=CaseEvaluationResponse)
 async def evaluate_case(
-    request: CaseEvaluationRequest, db: Session = Depends(get_db)
+    request: CaseEvaluationRequest,
+    wait_for_write: bool = Query(
+        True,
+        description="Wait until the case history row is committed. When false the response "
+        "returns immediately with write_status=pending; poll /evaluate/writes/{write_id}.",
+    ),
+    db: Session = Depends(get_db),
 ) -> CaseEvaluationResponse:
-    config_service = ConfigService()
-    rule_engine = RuleEngineService(config_service=config_service)
-    document_service = DocumentMatrixService(config_service=config_service)
-    case_service = CaseService(rule_engine=rule_engine, document_service=document_service)
-    history_service = CaseHistoryService(db)
-
-    case = case_service.build_case(request.profile)
-    crs_results = rule_engine.evaluate(request.profile)
-    crs_for_program = None
-    if case.selected_program and case.selected_program in crs_results:
-        crs_for_program = crs_results[case.selected_program].crs
-    else:
-        crs_for_program = next(iter(crs_results.values())).crs if crs_results else None
-
-    crs_breakdown: dict[str, int] = {}
-    factor_details: list[FactorDetail] = []
-    total = 0
-    if crs_for_program:
-        crs_breakdown = {
-            "core_points": crs_for_program.core_points,
-            "spouse_points": crs_for_program.spouse_points,
-            "transferability_points": crs_for_program.transferability_points,
-            "additional_points": crs_for_program.additional_points,
-        }
-        total = crs_for_program.total_points
-        factor_details = [
-            FactorDetail(
-                name="core_points",
-                points=crs_for_program.core_points,
-                rule_id="crs.core",
-                config_ref="config/domain/crs.yaml",
-            ),
-            FactorDetail(
-                name="spouse_points",
-                points=crs_for_program.spouse_points,
-                rule_id="crs.spouse",
-                config_ref="config/domain/crs.yaml",
-            ),
-            FactorDetail(
-                name="transferability_points",
-                points=crs_for_program.transferability_points,
-                rule_id="crs.transferability",
-                config_ref="config/domain/crs.yaml",
-            ),
-            FactorDetail(
-                name="additional_points",
-                points=crs_for_program.additional_points,
-                rule_id="crs.additional",
-                config_ref="config/domain/crs.yaml",
-            ),
-        ]
-
-    documents = [
-        DocumentRequirement(
-            id=d.id,
-            label=getattr(d, "label", None),
-            category=getattr(d, "category", None),
-            mandatory=d.mandatory,
-            programs_applicable=[case.selected_program] if case.selected_program else [],
-            rule_ids=[],
-        )
-        for d in case.required_documents
-    ]
-    docs_payload = {
-        "forms": list(case.required_forms),
-        "documents": [doc.model_dump() for doc in documents],
-    }
-
-    warnings: list[str] = []
-    if case.program_eligibility:
-        for res in case.program_eligibility.results:
-            warnings.extend(res.warnings)
-
-    program_responses = (
-        [_program_response(res) for res in case.program_eligibility.results]
-        if case.program_eligibility
-        else []
-    )
-    crs_payload = {
-        "total": total,
-        "breakdown": crs_breakdown,
-        "factor_details": [fd.model_dump() for fd in factor_details],
-    }
-    config_version = _config_hashes()
+    evaluation = await run_evaluation(evaluate_profile, request.profile)
     source = "express_entry_intake"
 
-    history = _persist_history(
-        history_service=history_service,
-        profile=request.profile,
-        program_results=program_responses,
-        crs_payload=crs_payload,
-        required_artifacts=docs_payload,
-        config_fingerprint=config_version,
-        source=source,
-    )
+    # Record + snapshot + event are written by the write-behind queue, off the event loop.
+    try:
+        write, future = get_history_write_queue().submit(
+            db.get_bind(),
+            **history_payload(profile=request.profile, evaluation=evaluation, source=source),
+        )
+    except queue.Full as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Case history write queue is full; retry later",
+        ) from exc
+
+    if wait_for_write:
+        history: CaseHistoryResult = await asyncio.wrap_future(future)
+        case_id, version, created_at = history.case_id, history.version, history.created_at
+    elif future.done() and future.exception() is None:
+        history = future.result()
+        case_id, version, created_at = history.case_id, history.version, history.created_at
+    else:
+        # The version is allocated by the write; poll /evaluate/writes/{write_id} for it.
+        case_id, version, created_at = write.case_id, None, write.enqueued_at
 
     return CaseEvaluationResponse(
-        case_id=history.case_id,
-        version=history.version,
+        case_id=case_id,
+        version=version,
         profile=request.profile,
-        program_eligibility=program_responses,
-        crs=CrsBreakdownResponse(
-            total=total,
-            breakdown=crs_breakdown,
-            factor_details=factor_details,
-        ),
-        documents_and_forms=docs_payload,
-        required_artifacts=docs_payload,
-        config_version=config_version,
-        config=config_version,
-        warnings=warnings,
-        audit=AuditInfo(created_at=history.created_at, source=history.source),
+        program_eligibility=evaluation.program_responses,
+        crs=evaluation.crs_response,
+        documents_and_forms=evaluation.docs_payload,
+        required_artifacts=evaluation.docs_payload,
+        config_version=evaluation.config_version,
+        config=evaluation.config_version,
+        warnings=evaluation.warnings,
+        audit=AuditInfo(created_at=created_at, source=source),
+        write_id=write.write_id,
+        write_status=write.status,
     )
 
+
+@router.get("/evaluate/writes/{write_id}", response_model=HistoryWriteStatus)
+def get_evaluation_write_status(write_id: str, db: Session = Depends(get_db)) -> HistoryWriteStatus:
+    """Durability of a case history write queued by /evaluate."""
+    write = write_status(db, write_id)
+    if write is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown write id")
+    return HistoryWriteStatus(**asdict(write))
+
+
+@router.get("/evaluate/cache", response_model=EvaluationCacheStats)
+async def get_evaluation_cache_stats() -> EvaluationCacheStats:
+    """Hit/miss counters of the evaluation result cache."""
+    cache = get_evaluation_cache()
+    if cache is None:
+        return EvaluationCacheStats(enabled=False)
+    stats = cache.stats()
+    return EvaluationCacheStats(enabled=True, hit_ratio=stats.hit_ratio, **asdict(stats))
+
+
+@router.post("/evaluate/batch")
+async def evaluate_case_batch(request: CaseBatchEvaluationRequest) -> StreamingResponse:
+    """
+    Re-score many profiles without persisting cases.
+    Results are streamed as NDJSON, one CaseBatchEvaluationItem per line, in input order.
+    """
+    rule_engine = RuleEngineService(config_service=get_config_snapshot().config_service)
+    profiles = request.profiles
+
+    def _stream() -> Iterator[str]:
+        for start in range(0, len(profiles), BATCH_CHUNK_SIZE):
+            chunk = profiles[start : start + BATCH_CHUNK_SIZE]
+            # One fact derivation per profile yields both eligibility and CRS.
+            evaluations = rule_engine.evaluate_profiles(chunk)
+            for offset, evaluation in enumerate(evaluations):
+                eligibility = evaluation.programs
+                selected = eligibility.primary_recommendation()
+                item = CaseBatchEvaluationItem(
+                    index=start + offset,
+                    selected_program=selected,
+                    program_eligibility=[program_response(r) for r in eligibility.results],
+                    crs=crs_response(select_crs(evaluation.crs, selected)),
+                    warnings=[w for r in eligibility.results for w in r.warnings],
+                )
+                yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+
+@router.post("/what-if", response_model=WhatIfAnalysis)
+async def evaluate_what_if(request: WhatIfRequest) -> WhatIfAnalysis:
+    """
+    CRS sensitivity for hypothetical profile changes. Only the CRS factors and
+    program rules a delta touches are re-evaluated; no case history is written.
+    """
+    rule_engine = RuleEngineService(config_service=get_config_snapshot().config_service)
+    try:
+        return rule_engine.what_if(
+            request.profile,
+            request.deltas,
+            target_score=request.target_score,
+            max_changes=request.max_changes,
+            limit=request.limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
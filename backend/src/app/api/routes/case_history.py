@@ -3,11 +3,17 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
 
-from src.app.cases.repository import CaseEventRepository, CaseRepository, CaseSnapshotRepository
+from src.app.cases.blob_store import PAYLOAD_FIELDS
+from src.app.cases.case_detail import DETAIL_SECTIONS, iter_case_detail_json, load_case_detail
+from src.app.cases.reevaluation import ReevaluationJob, ReevaluationProgress, build_report
+from src.app.cases.summaries import CaseSummaryStore
+from src.app.cases.time_travel import eligibility_as_of, snapshot_as_of
 from src.app.db.database import get_db
 
 router = APIRouter()
@@ -18,7 +24,9 @@ class CaseSummary(BaseModel):
     created_at: datetime
     source: str
     status: str
+    tenant_id: str | None = None
     programs: list[str] = Field(default_factory=list)
+    eligible_programs: list[str] = Field(default_factory=list)
     crs_total: int | None = None
 
 
@@ -28,8 +36,8 @@ class CaseRecordResponse(BaseModel):
     updated_at: datetime
     source: str
     status: str
-    profile: dict[str, Any]
-    program_eligibility: dict[str, Any]
+    profile: dict[str, Any] | None = None
+    program_eligibility: dict[str, Any] | None = None
     crs_breakdown: dict[str, Any] | None = None
     required_artifacts: dict[str, Any] | None = None
     config_fingerprint: dict[str, Any] | None = None
@@ -43,13 +51,25 @@ class CaseSnapshotResponse(BaseModel):
     snapshot_at: datetime
     source: str
     version: int
-    profile: dict[str, Any]
-    program_eligibility: dict[str, Any]
+    profile: dict[str, Any] | None = None
+    program_eligibility: dict[str, Any] | None = None
     crs_breakdown: dict[str, Any] | None = None
     required_artifacts: dict[str, Any] | None = None
     config_fingerprint: dict[str, Any] | None = None
 
 
+class CaseAsOfResponse(CaseSnapshotResponse):
+    as_of: datetime
+
+
+class CaseEligibilityAsOfResponse(BaseModel):
+    case_id: str
+    version: int
+    snapshot_at: datetime
+    eligible_programs: list[str] = Field(default_factory=list)
+    crs_total: int | None = None
+
+
 class CaseEventResponse(BaseModel):
     id: str
     event_type: str
@@ -61,109 +81,272 @@ class CaseEventResponse(BaseModel):
 
 class CaseDetailResponse(BaseModel):
     record: CaseRecordResponse
-    snapshots: list[CaseSnapshotResponse]
-    events: list[CaseEventResponse]
-
-
-def _extract_programs(program_eligibility: Any) -> list[str]:
-    if not isinstance(program_eligibility, dict):
-        return []
-    results = program_eligibility.get("results", [])
-    if not isinstance(results, list):
-        return []
-    codes: list[str] = []
-    for res in results:
-        if isinstance(res, dict) and res.get("program_code"):
-            codes.append(str(res["program_code"]))
-    return codes
-
-
-def _crs_total(crs_breakdown: Any) -> int | None:
-    if not isinstance(crs_breakdown, dict):
-        return None
-    if isinstance(crs_breakdown.get("total"), (int, float)):
-        return int(crs_breakdown["total"])
-    if isinstance(crs_breakdown.get("total_points"), (int, float)):
-        return int(crs_breakdown["total_points"])
-    breakdown = crs_breakdown.get("breakdown")
-    if isinstance(breakdown, dict):
-        total = sum(v for v in breakdown.values() if isinstance(v, (int, float)))
-        return int(total)
-    return None
+    snapshots: list[CaseSnapshotResponse] | None = None
+    events: list[CaseEventResponse] | None = None
+
+
+class ReevaluationRequest(BaseModel):
+    chunk_size: int | None = Field(default=None, ge=1, le=10_000)
+    processes: int | None = Field(default=None, ge=0, le=64)
+    tenant_id: str | None = None
+
+
+class ReevaluationProgressResponse(BaseModel):
+    run_id: str
+    status: str
+    processed: int
+    updated: int
+    skipped: int
+    failed: int
+    changed: int
+    elapsed_seconds: float
+    throughput: float
+    cursor: str | None = None
+
+
+class ReevaluationChangeResponse(BaseModel):
+    case_id: str
+    version: int
+    eligible_before: list[str]
+    eligible_after: list[str]
+    crs_before: int | None = None
+    crs_after: int | None = None
+
+
+class ProgramShiftResponse(BaseModel):
+    gained: int
+    lost: int
+
+
+class ReevaluationReportResponse(BaseModel):
+    progress: ReevaluationProgressResponse
+    programs: dict[str, ProgramShiftResponse] = Field(default_factory=dict)
+    crs_increased: int = 0
+    crs_decreased: int = 0
+    changes: list[ReevaluationChangeResponse] = Field(default_factory=list)
+
+
+def _progress_response(progress: ReevaluationProgress) -> ReevaluationProgressResponse:
+    return ReevaluationProgressResponse(
+        run_id=progress.run_id,
+        status=progress.status,
+        processed=progress.processed,
+        updated=progress.updated,
+        skipped=progress.skipped,
+        failed=progress.failed,
+        changed=progress.changed,
+        elapsed_seconds=progress.elapsed_seconds,
+        throughput=progress.throughput,
+        cursor=progress.cursor,
+    )
+
+
+def _run_reevaluation(
+    bind: Engine | Connection, run_id: str, request: ReevaluationRequest
+) -> None:
+    db = Session(bind=bind)
+    try:
+        ReevaluationJob(
+            db,
+            chunk_size=request.chunk_size,
+            processes=request.processes,
+            tenant_id=request.tenant_id,
+        ).run(run_id)
+    except Exception:
+        pass  # recorded on the run row (status=failed, error) and logged by the job
+    finally:
+        db.close()
 
 
 @router.get("", response_model=list[CaseSummary])
-async def list_cases(limit: int = Query(50, ge=1, le=200), db: Session = Depends(get_db)):
-    repo = CaseRepository(db)
-    records = repo.list_recent(limit=limit)
-    summaries: list[CaseSummary] = []
-    for record in records:
-        summaries.append(
-            CaseSummary(
-                id=record.id,
-                created_at=record.created_at,
-                source=record.source,
-                status=record.status,
-                programs=_extract_programs(record.program_eligibility),
-                crs_total=_crs_total(record.crs_breakdown),
-            )
+async def list_cases(
+    response: Response,
+    limit: int = Query(50, ge=1, le=1000),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
+    tenant_id: str | None = None,
+    status: str | None = None,
+    program: str | None = Query(None, description="Only cases with a result for this program"),
+    eligible: bool | None = Query(None, description="With `program`: require this eligibility"),
+    crs_min: int | None = None,
+    crs_max: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Newest cases first, read from the case_summaries projection. Pages are chained
+    with the opaque cursor returned in the X-Next-Cursor header (absent on the last page).
+    """
+    try:
+        page = CaseSummaryStore(db).list_summaries(
+            limit=limit,
+            cursor=cursor,
+            tenant_id=tenant_id,
+            status=status,
+            program=program,
+            eligible=eligible,
+            crs_min=crs_min,
+            crs_max=crs_max,
         )
-    return summaries
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return [
+        CaseSummary(
+            id=summary.case_id,
+            created_at=summary.created_at,
+            source=summary.source,
+            status=summary.status,
+            tenant_id=summary.tenant_id,
+            programs=summary.programs or [],
+            eligible_programs=summary.eligible_programs or [],
+            crs_total=summary.crs_total,
+        )
+        for summary in page.items
+    ]
 
 
-@router.get("/{case_id}", response_model=CaseDetailResponse)
-async def get_case(case_id: str, db: Session = Depends(get_db)):
-    repo = CaseRepository(db)
-    snapshot_repo = CaseSnapshotRepository(db)
-    event_repo = CaseEventRepository(db)
+@router.post("/reevaluations", response_model=ReevaluationProgressResponse, status_code=202)
+async def start_reevaluation(
+    request: ReevaluationRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    """
+    Re-score stored cases against the active domain config in the background.
+    An unfinished run for the same config digest is resumed from its checkpoint.
+    """
+    job = ReevaluationJob(
+        db, chunk_size=request.chunk_size, processes=request.processes, tenant_id=request.tenant_id
+    )
+    run = job.start()
+    background_tasks.add_task(_run_reevaluation, db.get_bind(), run.id, request)
+    return _progress_response(ReevaluationProgress.from_run(run))
 
-    record = repo.get_case(case_id)
-    if not record:
-        raise HTTPException(status_code=404, detail="Case not found")
 
-    snapshots = snapshot_repo.list_snapshots(case_id)
-    events = event_repo.list_events(case_id)
-
-    return CaseDetailResponse(
-        record=CaseRecordResponse(
-            id=record.id,
-            created_at=record.created_at,
-            updated_at=record.updated_at,
-            source=record.source,
-            status=record.status,
-            profile=record.profile,
-            program_eligibility=record.program_eligibility,
-            crs_breakdown=record.crs_breakdown,
-            required_artifacts=record.required_artifacts,
-            config_fingerprint=record.config_fingerprint,
-            tenant_id=record.tenant_id,
-            created_by=record.created_by,
-        ),
-        snapshots=[
-            CaseSnapshotResponse(
-                id=snapshot.id,
-                case_id=snapshot.case_id,
-                snapshot_at=snapshot.snapshot_at,
-                source=snapshot.source,
-                version=snapshot.version,
-                profile=snapshot.profile,
-                program_eligibility=snapshot.program_eligibility,
-                crs_breakdown=snapshot.crs_breakdown,
-                required_artifacts=snapshot.required_artifacts,
-                config_fingerprint=snapshot.config_fingerprint,
-            )
-            for snapshot in snapshots
-        ],
-        events=[
-            CaseEventResponse(
-                id=event.id,
-                event_type=event.event_type,
-                created_at=event.created_at,
-                actor=event.actor,
-                metadata=event.event_metadata or {},
-                case_id=event.case_id,
+@router.get("/reevaluations/{run_id}", response_model=ReevaluationReportResponse)
+async def get_reevaluation(
+    run_id: str,
+    limit: int = Query(100, ge=0, le=10_000),
+    db: Session = Depends(get_db),
+):
+    """Progress of a re-evaluation run plus its diff report (first `limit` changed cases)."""
+    report = build_report(db, run_id, limit=limit)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Re-evaluation run not found")
+    return ReevaluationReportResponse(
+        progress=_progress_response(report.progress),
+        programs={
+            code: ProgramShiftResponse(gained=shift.gained, lost=shift.lost)
+            for code, shift in report.programs.items()
+        },
+        crs_increased=report.crs_increased,
+        crs_decreased=report.crs_decreased,
+        changes=[
+            ReevaluationChangeResponse(
+                case_id=change.case_id,
+                version=change.version,
+                eligible_before=change.eligible_before,
+                eligible_after=change.eligible_after,
+                crs_before=change.crs_before,
+                crs_after=change.crs_after,
             )
-            for event in events
+            for change in report.changes
         ],
     )
 
+
+@router.get("/as-of", response_model=list[CaseEligibilityAsOfResponse])
+async def list_eligibility_as_of(
+    response: Response,
+    tenant_id: str,
+    ts: datetime = Query(..., description="Point in time (ISO 8601; naive values are UTC)"),
+    limit: int = Query(500, ge=1, le=5000),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
+    db: Session = Depends(get_db),
+):
+    """
+    Eligible programs and CRS total of every case in a tenant as of `ts`, ordered
+    by case id and paged with the X-Next-Cursor header.
+    """
+    items, next_case_id = eligibility_as_of(
+        db, tenant_id, ts, limit=limit, after_case_id=cursor
+    )
+    if next_case_id:
+        response.headers["X-Next-Cursor"] = next_case_id
+    return [
+        CaseEligibilityAsOfResponse(
+            case_id=item.case_id,
+            version=item.version,
+            snapshot_at=item.snapshot_at,
+            eligible_programs=item.eligible_programs,
+            crs_total=item.crs_total,
+        )
+        for item in items
+    ]
+
+
+@router.get("/{case_id}/as-of", response_model=CaseAsOfResponse)
+async def get_case_as_of(
+    case_id: str,
+    ts: datetime = Query(..., description="Point in time (ISO 8601; naive values are UTC)"),
+    db: Session = Depends(get_db),
+):
+    """The snapshot in effect at `ts` (latest version written at or before it)."""
+    snapshot = snapshot_as_of(db, case_id, ts)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="No snapshot of this case at that time")
+    return CaseAsOfResponse(
+        id=snapshot.id,
+        case_id=snapshot.case_id,
+        snapshot_at=snapshot.snapshot_at,
+        source=snapshot.source,
+        version=snapshot.version,
+        as_of=ts,
+        **snapshot.document,
+    )
+
+
+def _csv_param(value: str | None, allowed: tuple[str, ...], name: str) -> tuple[str, ...]:
+    items = tuple(item.strip() for item in (value or "").split(",") if item.strip())
+    unknown = [item for item in items if item not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown {name}: {', '.join(unknown)} (allowed: {', '.join(allowed)})",
+        )
+    return items
+
+
+@router.get("/{case_id}", response_model=CaseDetailResponse)
+async def get_case(
+    case_id: str,
+    include: str = Query(
+        "snapshots,events", description="Comma-separated sections to return: snapshots, events"
+    ),
+    from_version: int | None = Query(None, ge=1, description="First snapshot version"),
+    to_version: int | None = Query(None, ge=1, description="Last snapshot version"),
+    fields: str | None = Query(
+        None, description="Comma-separated payload fields to return (default: all)"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Case record with its snapshots and audit events, loaded in one eager query and
+    streamed as incremental JSON. Sections left out of `include` are omitted.
+    """
+    sections = _csv_param(include, DETAIL_SECTIONS, "include")
+    projection = _csv_param(fields, PAYLOAD_FIELDS, "fields") if fields else PAYLOAD_FIELDS
+    if from_version is not None and to_version is not None and from_version > to_version:
+        raise HTTPException(status_code=422, detail="from_version must not exceed to_version")
+
+    detail = load_case_detail(
+        db,
+        case_id,
+        include=sections,
+        from_version=from_version,
+        to_version=to_version,
+        fields=projection,
+    )
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Case not found")
+    return StreamingResponse(iter_case_detail_json(detail), media_type="application/json")
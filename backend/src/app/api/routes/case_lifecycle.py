@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from src.app.cases.lifecycle_service import CaseLifecycleError, CaseLifecycleService
@@ -12,6 +12,9 @@ from src.app.db.database import get_db
 
 router = APIRouter()
 
+# Upper bound on case_ids per bulk transition request.
+MAX_BULK_CASES = 1000
+
 
 class LifecycleRequest(BaseModel):
     user_id: str
@@ -33,6 +36,26 @@ class CaseLifecycleResponse(BaseModel):
     events: list[dict[str, Any]]
 
 
+class BulkTransitionRequest(LifecycleRequest):
+    case_ids: list[str] = Field(min_length=1, max_length=MAX_BULK_CASES)
+    target_status: str
+
+
+class BulkTransitionItem(BaseModel):
+    case_id: str
+    ok: bool
+    from_status: str | None = None
+    status: str | None = None
+    version: int | None = None
+    error: str | None = None
+
+
+class BulkTransitionResponse(BaseModel):
+    results: list[BulkTransitionItem]
+    succeeded: int
+    failed: int
+
+
 def _fetch_events(repo: CaseEventRepository, case_id: str) -> list[dict[str, Any]]:
     return [
         {
@@ -48,8 +71,7 @@ def _fetch_events(repo: CaseEventRepository, case_id: str) -> list[dict[str, Any
 
 
 def _current_snapshot_version(snapshot_repo: CaseSnapshotRepository, case_id: str) -> int:
-    snapshots = snapshot_repo.list_snapshots(case_id)
-    return snapshots[-1].version if snapshots else 0
+    return snapshot_repo.latest_version(case_id)
 
 
 def _build_response(
@@ -118,3 +140,22 @@ async def archive_case(case_id: str, request: LifecycleRequest, db: Session = De
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     return _build_response(record, snapshot_repo, event_repo)
 
+
+@router.post("/case-lifecycle/bulk-transition", response_model=BulkTransitionResponse)
+async def bulk_transition(request: BulkTransitionRequest, db: Session = Depends(get_db)):
+    service = CaseLifecycleService(db)
+    try:
+        results = service.bulk_transition(
+            case_ids=request.case_ids,
+            tenant_id=request.tenant_id,
+            user_id=request.user_id,
+            new_status=request.target_status,
+        )
+    except CaseLifecycleError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    succeeded = sum(1 for result in results if result.ok)
+    return BulkTransitionResponse(
+        results=[BulkTransitionItem(**vars(result)) for result in results],
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+    )
@@ -12,6 +12,7 @@ from ...models.organization import Organization
 from ...models.user import User
 from ...schemas.document import Document, DocumentCreate, DocumentUpdate, DocumentUploadResponse
 from ...services.document import DocumentService
+from ...services.ocr_queue import OCRJobQueue
 from ..dependencies import get_current_user, get_current_user_org
 
 router = APIRouter()
@@ -44,8 +45,8 @@ async def upload_document(
             person_id=uuid.UUID(person_id) if person_id else None,
         )
 
-        # Create and save document
-        document = DocumentService.create_document(
+        # Create and stream the file to storage
+        document = await DocumentService.create_document_async(
             db=db,
             file=file,
             document_data=document_data,
@@ -53,21 +54,10 @@ async def upload_document(
             uploaded_by=str(current_user.id),
             case_id=str(case_id) if case_id else None,
             person_id=str(person_id) if person_id else None,
+            # OCR runs in the background workers (services/ocr_queue.py), not in this request
+            queue_ocr=True,
         )
 
-        # Trigger OCR processing asynchronously (in production, use background tasks)
-        try:
-            # Process with OCR in background (non-blocking)
-            DocumentService.process_document_with_ocr(
-                db=db, document_id=document.id, org_id=str(current_org.id)
-            )
-        except Exception as e:
-            # Log error but don't fail the upload
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.error(f"OCR processing failed for document {document.id}: {str(e)}")
-
         return DocumentUploadResponse(document=document, message="Document uploaded successfully")
     except HTTPException:
         raise
@@ -181,18 +171,21 @@ async def get_person_documents(
     return documents
 
 
-@router.post("/{document_id}/process-ocr")
+@router.post("/{document_id}/process-ocr", status_code=status.HTTP_202_ACCEPTED)
 async def process_document_ocr(
     document_id: uuid.UUID,
     current_org: Organization = Depends(get_current_user_org),
     db: Session = Depends(get_db),
 ):
-    """Trigger OCR processing for a document"""
-    document = DocumentService.process_document_with_ocr(db, str(document_id), str(current_org.id))
+    """Queue (or re-queue) OCR processing for a document"""
+    document = DocumentService.get_document_by_id(db, str(document_id), str(current_org.id))
     if not document:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+    job = OCRJobQueue(db).enqueue(document)
+    db.refresh(document)
     return {
-        "message": "OCR processing completed",
+        "message": "OCR processing queued",
+        "job_id": job.id,
         "document": document,
         "ocr_status": document.ocr_status,
         "processing_status": document.processing_status,
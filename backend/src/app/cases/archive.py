@@ -0,0 +1,306 @@
+"""
+Compaction and cold storage of settled case history.
+
+case_snapshots and case_events only grow. Once a case is complete or archived
+(and has not changed for `settings.case_archive_after_days`), compact_case()
+moves its history out of the hot tables:
+
+- every snapshot except the newest goes into one case_history_archives row, as
+  zlib-compressed JSON. Versions whose payload equals the previous version's
+  (lifecycle transitions only change the status) are collapsed into a
+  reference to that version, so status-only versions cost a few bytes each;
+- all of its events move into the same document;
+- the newest snapshot stays in case_snapshots as a full row, so the current
+  state and later writes (new versions, deltas) work as before.
+
+The archive row also keeps a small uncompressed timeline of (version,
+snapshot_at, eligible_programs, crs_total), the hot index that as-of queries
+read without decompressing anything. Readers (case detail, get_snapshot,
+list_events, the as-of queries) fall back to load_archive() for versions and
+events that are no longer in the hot tables. A case that gains history after
+compaction is merged into its existing archive on the next run.
+
+Run with `python -m src.app.cases.archive [--older-than-days N]`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.orm import Session
+
+from src.app.cases.blob_store import PAYLOAD_FIELDS, BlobStore
+from src.app.cases.event_log import CaseEventLog, month_key
+from src.app.cases.models_db import CaseEvent, CaseHistoryArchive, CaseRecord, CaseSnapshot
+from src.app.cases.snapshot_store import (
+    SNAPSHOT_DELTA,
+    SNAPSHOT_FULL,
+    SnapshotStore,
+    snapshot_document,
+)
+from src.app.cases.summaries import result_columns
+from src.app.config import settings
+
+logger = logging.getLogger(__name__)
+
+COMPACTABLE_STATUSES = ("complete", "archived")
+
+
+def _timestamp(moment: datetime) -> str:
+    # Stored as ISO-8601 UTC; naive values are UTC already (SQLite drops the offset).
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat()
+
+
+def _parse(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def _aware(moment: datetime) -> datetime:
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class ArchivedHistory:
+    """Decoded archive document of one case."""
+
+    case_id: str
+    snapshots: list[dict[str, Any]] = field(default_factory=list)
+    events: list[dict[str, Any]] = field(default_factory=list)
+
+    def documents(self) -> Iterator[tuple[dict[str, Any], dict[str, Any]]]:
+        """(entry, payload document) per archived version, oldest first."""
+        kept: dict[int, dict[str, Any]] = {}
+        for entry in self.snapshots:
+            if "document" in entry:
+                kept[entry["version"]] = entry["document"]
+            yield entry, kept[entry.get("same_as", entry["version"])]
+
+    def document(self, version: int) -> Optional[dict[str, Any]]:
+        for entry, document in self.documents():
+            if entry["version"] == version:
+                return document
+        return None
+
+    def as_of(self, moment: datetime) -> Optional[tuple[dict[str, Any], dict[str, Any]]]:
+        """Newest archived (entry, document) written at or before `moment`."""
+        found = None
+        for entry, document in self.documents():
+            if _parse(entry["snapshot_at"]) <= _aware(moment):
+                found = (entry, document)
+        return found
+
+    def case_events(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> list[CaseEvent]:
+        """Archived events as detached CaseEvent objects; `since` inclusive, `until` exclusive."""
+        events = []
+        for entry in self.events:
+            created_at = _parse(entry["created_at"])
+            if since is not None and created_at < _aware(since):
+                continue
+            if until is not None and created_at >= _aware(until):
+                continue
+            events.append(
+                CaseEvent(
+                    id=entry["id"],
+                    case_id=self.case_id,
+                    event_type=entry["event_type"],
+                    tenant_id=entry.get("tenant_id"),
+                    created_at=created_at,
+                    actor=entry["actor"],
+                    event_metadata=entry.get("metadata") or {},
+                    sequence=entry.get("sequence"),
+                    month=month_key(created_at),
+                )
+            )
+        return events
+
+
+def _decode(row: CaseHistoryArchive) -> dict[str, Any]:
+    text = zlib.decompress(row.data) if row.codec == "zlib" else row.data
+    return json.loads(text)
+
+
+def load_archive(db: Session, case_id: str) -> Optional[ArchivedHistory]:
+    """The case's archived history, or None if it was never compacted."""
+    row = db.get(CaseHistoryArchive, case_id)
+    if row is None:
+        return None
+    content = _decode(row)
+    return ArchivedHistory(
+        case_id=case_id, snapshots=content["snapshots"], events=content["events"]
+    )
+
+
+def compact_case(db: Session, case_id: str) -> Optional[ArchivedHistory]:
+    """
+    Move the case's older snapshots and its events into its archive row (flushed,
+    not committed). Returns the archived history, or None if nothing was moved.
+    """
+    snapshots = (
+        db.query(CaseSnapshot)
+        .filter(CaseSnapshot.case_id == case_id)
+        .order_by(CaseSnapshot.version.asc())
+        .all()
+    )
+    events = CaseEventLog(db).scan(case_id)
+    if len(snapshots) <= 1 and not events:
+        return None
+    SnapshotStore(db).hydrate(snapshots)
+    current, moved = (snapshots[-1], snapshots[:-1]) if snapshots else (None, [])
+
+    row = db.get(CaseHistoryArchive, case_id)
+    history = load_archive(db, case_id) or ArchivedHistory(case_id=case_id)
+    previous = None
+    base_version = None
+    for entry, document in history.documents():
+        previous, base_version = document, entry.get("same_as", entry["version"])
+    timeline = list(row.timeline) if row is not None else []
+
+    for snapshot in moved:
+        document = snapshot_document(snapshot)
+        if snapshot.eligible_programs is not None:
+            eligible, crs = snapshot.eligible_programs, snapshot.crs_total
+        else:
+            outcome = result_columns(document["program_eligibility"], document["crs_breakdown"])
+            eligible, crs = outcome["eligible_programs"], outcome["crs_total"]
+        entry = {
+            "id": snapshot.id,
+            "version": snapshot.version,
+            "snapshot_at": _timestamp(snapshot.snapshot_at),
+            "source": snapshot.source,
+            "tenant_id": snapshot.tenant_id,
+        }
+        if document == previous:
+            entry["same_as"] = base_version
+        else:
+            entry["document"] = document
+            previous, base_version = document, snapshot.version
+        history.snapshots.append(entry)
+        timeline.append([snapshot.version, entry["snapshot_at"], eligible, crs])
+    history.events.extend(
+        {
+            "id": event.id,
+            "sequence": event.sequence,
+            "event_type": event.event_type,
+            "created_at": _timestamp(event.created_at),
+            "actor": event.actor,
+            "tenant_id": event.tenant_id,
+            "metadata": event.event_metadata or {},
+        }
+        for event in events
+    )
+
+    # The newest version stays hot; as a full row it no longer needs the archived chain.
+    blobs = BlobStore(db)
+    if current is not None and current.encoding == SNAPSHOT_DELTA:
+        document = snapshot_document(current)
+        current.encoding, current.delta = SNAPSHOT_FULL, None
+        blobs.assign(current, document)
+    blobs.release(
+        getattr(snapshot, f"{name}_hash") for snapshot in moved for name in PAYLOAD_FIELDS
+    )
+    if moved:
+        db.execute(
+            delete(CaseSnapshot).where(
+                CaseSnapshot.case_id == case_id, CaseSnapshot.version <= moved[-1].version
+            )
+        )
+    if events:
+        db.execute(delete(CaseEvent).where(CaseEvent.id.in_([event.id for event in events])))
+
+    text = json.dumps({"snapshots": history.snapshots, "events": history.events})
+    if row is None:
+        row = CaseHistoryArchive(case_id=case_id)
+        db.add(row)
+    row.tenant_id = current.tenant_id if current is not None else events[0].tenant_id
+    row.archived_at = datetime.now(timezone.utc)
+    row.first_snapshot_at = _parse(timeline[0][1]) if timeline else None
+    row.last_version = timeline[-1][0] if timeline else None
+    row.snapshot_count = len(history.snapshots)
+    row.event_count = len(history.events)
+    row.timeline = timeline
+    row.codec = "zlib"
+    row.data = zlib.compress(text.encode("utf-8"))
+    row.size = len(text)
+    db.flush()
+    return history
+
+
+def compact_history(
+    db: Session,
+    *,
+    older_than_days: Optional[int] = None,
+    chunk_size: int = 200,
+    statuses: Iterable[str] = COMPACTABLE_STATUSES,
+) -> int:
+    """
+    Compact every settled case untouched for `older_than_days`, one committed chunk
+    of cases at a time (safe to re-run). Returns the number of cases compacted.
+    """
+    days = settings.case_archive_after_days if older_than_days is None else older_than_days
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    snapshot_count = (
+        select(func.count())
+        .where(CaseSnapshot.case_id == CaseRecord.id)
+        .correlate(CaseRecord)
+        .scalar_subquery()
+    )
+    has_events = select(CaseEvent.id).where(CaseEvent.case_id == CaseRecord.id).exists()
+    compacted = 0
+    cursor: Optional[str] = None
+    while True:
+        stmt = select(CaseRecord.id).where(
+            CaseRecord.status.in_(list(statuses)),
+            CaseRecord.updated_at <= cutoff,
+            or_(snapshot_count > 1, has_events),
+        )
+        if cursor is not None:
+            stmt = stmt.where(CaseRecord.id > cursor)
+        case_ids = list(db.execute(stmt.order_by(CaseRecord.id).limit(chunk_size)).scalars())
+        if not case_ids:
+            break
+        for case_id in case_ids:
+            if compact_case(db, case_id) is not None:
+                compacted += 1
+        db.commit()
+        cursor = case_ids[-1]
+        logger.info("Compacted case history up to case %s (%d cases)", cursor, compacted)
+    removed = BlobStore(db).collect_garbage()
+    db.commit()
+    logger.info("Removed %d unreferenced blobs", removed)
+    return compacted
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """CLI: python -m src.app.cases.archive [--older-than-days N] [--chunk-size N]"""
+    from src.app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Compact settled case history.")
+    parser.add_argument("--older-than-days", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    logging.basicConfig(level=settings.log_level)
+    db = SessionLocal()
+    try:
+        compacted = compact_history(
+            db, older_than_days=args.older_than_days, chunk_size=args.chunk_size
+        )
+        print(f"{compacted} cases compacted")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
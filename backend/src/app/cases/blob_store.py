@@ -0,0 +1,409 @@
+"""
+Content-addressed, deduplicated storage for case JSON payloads.
+
+The same required_artifacts list and config_fingerprint dict are written for
+thousands of cases. Instead of a JSON copy per row, case_records and full
+case_snapshots store a sha256 of each payload's canonical JSON in
+`<field>_hash`, and the payload itself lives once in case_blobs (zlib
+compressed when that helps), with a reference count per referencing column.
+
+Reads stay transparent: ORM load/refresh hooks resolve the hashes and fill in
+the usual `profile`, `program_eligibility`, ... attributes (without marking
+them dirty), served from a process-wide LRU of decoded blobs. Rows written
+before the blob store keep their inline JSON and are read as-is;
+migrate_inline_payloads() (python -m src.app.cases.blob_store) moves them over.
+
+Released blobs are not deleted immediately; collect_garbage() drops blobs whose
+reference count reached zero more than BLOB_GC_GRACE_SECONDS ago. recount()
+rebuilds every count from the hash columns (python -m src.app.cases.blob_store
+--recount --gc) when counts have drifted from the rows, e.g. rows deleted
+without releasing their blobs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import case, delete, event, func, null, select, union_all, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.app.cases.models_db import CaseBlob, CaseRecord, CaseSnapshot
+from src.app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PAYLOAD_FIELDS = (
+    "profile",
+    "program_eligibility",
+    "crs_breakdown",
+    "required_artifacts",
+    "config_fingerprint",
+)
+
+CODEC_RAW = "raw"
+CODEC_ZLIB = "zlib"
+# Payloads shorter than this are stored uncompressed (zlib framing outweighs the gain).
+COMPRESS_MIN_BYTES = 128
+
+# Execution option: skip per-row hydration on load (the caller resolves blobs in bulk).
+DEFER_HYDRATION = "case_blobs_defer_hydration"
+
+_blobs = CaseBlob.__table__
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def blob_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _encode(text: str) -> tuple[str, bytes]:
+    raw = text.encode("utf-8")
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            return CODEC_ZLIB, packed
+    return CODEC_RAW, raw
+
+
+def _decode(codec: str, data: bytes) -> str:
+    raw = zlib.decompress(data) if codec == CODEC_ZLIB else data
+    return raw.decode("utf-8")
+
+
+class BlobCache:
+    """LRU of decoded blob JSON text keyed by hash; every get parses a fresh copy."""
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return text
+
+    def put(self, key: str, text: str) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache: Optional[BlobCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_blob_cache() -> BlobCache:
+    """Process-wide decoded-blob cache (sized by settings.blob_cache_size)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = BlobCache(max_entries=settings.blob_cache_size)
+    return _cache
+
+
+class BlobStore:
+    """Reference-counted put/get of JSON payloads in case_blobs."""
+
+    def __init__(self, db: Session, cache: Optional[BlobCache] = None) -> None:
+        self.db = db
+        self.cache = cache if cache is not None else get_blob_cache()
+
+    def put_many(self, values: Iterable[Any]) -> list[Optional[str]]:
+        """Store payloads (one reference each); None values get no blob and a None hash."""
+        hashes: list[Optional[str]] = []
+        rows: dict[str, dict[str, Any]] = {}
+        for value in values:
+            if value is None:
+                hashes.append(None)
+                continue
+            text = canonical_json(value)
+            key = blob_hash(text)
+            hashes.append(key)
+            if key in rows:
+                rows[key]["refcount"] += 1
+                continue
+            codec, data = _encode(text)
+            rows[key] = {
+                "hash": key,
+                "codec": codec,
+                "data": data,
+                "size": len(text),
+                "refcount": 1,
+            }
+            self.cache.put(key, text)
+        self._upsert(list(rows.values()))
+        return hashes
+
+    def put(self, value: Any) -> Optional[str]:
+        return self.put_many([value])[0]
+
+    def retain(self, hashes: Iterable[Optional[str]]) -> None:
+        """Add a reference to blobs that already exist."""
+        self._adjust(Counter(h for h in hashes if h))
+
+    def release(self, hashes: Iterable[Optional[str]]) -> None:
+        """Drop a reference; blobs at zero are removed by collect_garbage()."""
+        self._adjust(Counter({h: -n for h, n in Counter(h for h in hashes if h).items()}))
+
+    def get_many(self, hashes: Iterable[Optional[str]]) -> dict[str, Any]:
+        wanted = {h for h in hashes if h}
+        texts: dict[str, str] = {}
+        for key in wanted:
+            text = self.cache.get(key)
+            if text is not None:
+                texts[key] = text
+        missing = wanted - texts.keys()
+        if missing:
+            # Core select on the session's connection: no autoflush (this runs inside ORM loads).
+            rows = self.db.connection().execute(
+                select(_blobs.c.hash, _blobs.c.codec, _blobs.c.data).where(
+                    _blobs.c.hash.in_(missing)
+                )
+            )
+            for key, codec, data in rows:
+                texts[key] = _decode(codec, data)
+                self.cache.put(key, texts[key])
+        for key in missing - texts.keys():
+            logger.error("Case blob %s is missing", key)
+        return {key: json.loads(text) for key, text in texts.items()}
+
+    def get(self, key: Optional[str]) -> Any:
+        return self.get_many([key]).get(key) if key else None
+
+    def assign(self, target: CaseRecord | CaseSnapshot, document: dict[str, Any]) -> None:
+        """Point a new or full row at blobs for `document` (payload columns are left NULL)."""
+        hashes = self.put_many(document.get(name) for name in PAYLOAD_FIELDS)
+        for name, key in zip(PAYLOAD_FIELDS, hashes, strict=True):
+            setattr(target, f"{name}_hash", key)
+            setattr(target, name, null())  # SQL NULL, not JSON 'null'
+
+    def recount(self) -> None:
+        """Set every blob's reference count to the number of hash columns pointing at it."""
+        columns = [
+            select(getattr(model, f"{name}_hash").label("hash"))
+            for model in (CaseRecord, CaseSnapshot)
+            for name in PAYLOAD_FIELDS
+        ]
+        references = union_all(*columns).subquery()
+        count = (
+            select(func.count())
+            .select_from(references)
+            .where(references.c.hash == _blobs.c.hash)
+            .scalar_subquery()
+        )
+        self.db.execute(
+            update(_blobs).values(
+                refcount=count,
+                released_at=case(
+                    (count > 0, None),
+                    (_blobs.c.released_at.is_(None), datetime.now(timezone.utc)),
+                    else_=_blobs.c.released_at,
+                ),
+            )
+        )
+
+    def collect_garbage(self, grace_seconds: Optional[int] = None) -> int:
+        """
+        Delete blobs whose count has been zero for longer than the grace period. A
+        blob released by a transaction that is still open may be retained again
+        before it commits, so recently released blobs are kept.
+        """
+        grace = settings.blob_gc_grace_seconds if grace_seconds is None else grace_seconds
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace)
+        # One statement: a blob retained between a SELECT and the DELETE would be lost.
+        removed = list(
+            self.db.execute(
+                delete(_blobs)
+                .where(_blobs.c.refcount <= 0, _blobs.c.released_at <= cutoff)
+                .returning(_blobs.c.hash)
+            ).scalars()
+        )
+        self.cache.discard(removed)
+        return len(removed)
+
+    def _adjust(self, deltas: Counter) -> None:
+        by_delta: dict[int, list[str]] = {}
+        for key, delta in deltas.items():
+            if delta:
+                by_delta.setdefault(delta, []).append(key)
+        now = datetime.now(timezone.utc)
+        for delta, keys in by_delta.items():
+            refcount = _blobs.c.refcount + delta
+            self.db.execute(
+                update(_blobs)
+                .where(_blobs.c.hash.in_(keys))
+                .values(
+                    refcount=refcount,
+                    released_at=case((refcount > 0, None), else_=now),
+                )
+            )
+
+    def _upsert(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        dialect = self.db.get_bind().dialect.name
+        insert_fn = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}.get(dialect)
+        if insert_fn is not None:
+            stmt = insert_fn(_blobs).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[_blobs.c.hash],
+                set_={"refcount": _blobs.c.refcount + stmt.excluded.refcount, "released_at": None},
+            )
+            self.db.execute(stmt)
+            return
+        existing = set(
+            self.db.execute(
+                select(_blobs.c.hash).where(_blobs.c.hash.in_([r["hash"] for r in rows]))
+            ).scalars()
+        )
+        self.retain(h for r in rows if r["hash"] in existing for h in [r["hash"]] * r["refcount"])
+        new_rows = [r for r in rows if r["hash"] not in existing]
+        if new_rows:
+            self.db.execute(_blobs.insert(), new_rows)
+
+
+def hydrate(target: CaseRecord | CaseSnapshot, values: Optional[dict[str, Any]] = None) -> None:
+    """
+    Fill payload attributes from their blobs without marking them modified. With
+    `values` (the document just written) no lookup is needed.
+    """
+    state = target.__dict__
+    hashes = {name: state.get(f"{name}_hash") for name in PAYLOAD_FIELDS}
+    if not any(hashes.values()):
+        return
+    if values is not None:
+        resolved = {name: copy.deepcopy(values.get(name)) for name in PAYLOAD_FIELDS}
+    else:
+        from sqlalchemy.orm import object_session
+
+        session = object_session(target)
+        if session is None:
+            return
+        blobs = BlobStore(session).get_many(hashes.values())
+        resolved = {name: blobs.get(key) for name, key in hashes.items() if key}
+    for name, key in hashes.items():
+        if key:
+            set_committed_value(target, name, resolved.get(name))
+
+
+@event.listens_for(CaseRecord, "load")
+@event.listens_for(CaseSnapshot, "load")
+def _hydrate_on_load(target, context) -> None:
+    if not context.execution_options.get(DEFER_HYDRATION):
+        hydrate(target)
+
+
+@event.listens_for(CaseRecord, "refresh")
+@event.listens_for(CaseSnapshot, "refresh")
+def _hydrate_on_refresh(target, context, attrs) -> None:
+    # context is None when a bulk UPDATE synchronizes objects already in the session.
+    if context is not None and context.execution_options.get(DEFER_HYDRATION):
+        return
+    if attrs is None or any(f"{name}_hash" in attrs or name in attrs for name in PAYLOAD_FIELDS):
+        hydrate(target)
+
+
+def migrate_inline_payloads(db: Session, chunk_size: int = 500) -> int:
+    """
+    Move payloads still stored inline (rows written before the blob store) into
+    case_blobs, one committed chunk at a time. Safe to re-run; returns rows moved.
+    """
+    store = BlobStore(db)
+    moved = 0
+    for model in (CaseRecord, CaseSnapshot):
+        cursor: Optional[str] = None
+        inline = model.profile_hash.is_(None) & model.profile.isnot(None)
+        if model is CaseSnapshot:
+            inline &= CaseSnapshot.encoding == "full"
+        while True:
+            query = db.query(model).filter(inline)
+            if cursor is not None:
+                query = query.filter(model.id > cursor)
+            rows = query.order_by(model.id).limit(chunk_size).all()
+            if not rows:
+                break
+            documents = [{name: getattr(row, name) for name in PAYLOAD_FIELDS} for row in rows]
+            for row, document in zip(rows, documents, strict=True):
+                store.assign(row, document)
+            db.commit()
+            moved += len(rows)
+            cursor = rows[-1].id
+            logger.info("Moved %d %s payloads to case_blobs", moved, model.__tablename__)
+    return moved
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """
+    CLI: python -m src.app.cases.blob_store [--chunk-size N] [--recount] [--gc]
+    [--grace-seconds N]
+    """
+    from src.app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Move inline case payloads to case_blobs.")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument(
+        "--recount", action="store_true", help="Rebuild reference counts from the hash columns"
+    )
+    parser.add_argument("--gc", action="store_true", help="Also delete unreferenced blobs")
+    parser.add_argument("--grace-seconds", type=int, default=None)
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    logging.basicConfig(level=settings.log_level)
+    db = SessionLocal()
+    try:
+        print(f"{migrate_inline_payloads(db, chunk_size=args.chunk_size)} rows moved to blobs")
+        if args.recount:
+            BlobStore(db).recount()
+            db.commit()
+            print("Blob reference counts rebuilt")
+        if args.gc:
+            removed = BlobStore(db).collect_garbage(args.grace_seconds)
+            db.commit()
+            print(f"{removed} unreferenced blobs deleted")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Case detail reads for GET /case-history/{case_id}.
+
+load_case_detail() fetches the record together with its snapshots and events in
+one eager-loaded query (selectinload, optionally restricted to a version range)
+and resolves every payload blob they reference in one batched lookup, instead of
+a query per section plus a blob lookup per row.
+
+iter_case_detail_json() serializes the result incrementally: the record, each
+snapshot and each event become separate JSON fragments, and delta snapshots are
+rebuilt one version at a time. A long history is therefore never assembled as a
+single document or as one Pydantic model per snapshot.
+
+History moved out by compaction (src/app/cases/archive.py) is read from the
+case's archive row and served ahead of the hot snapshots and events.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from pydantic_core import to_json
+from sqlalchemy import func, select, true
+from sqlalchemy.orm import Session, selectinload
+
+from src.app.cases.archive import ArchivedHistory, load_archive
+from src.app.cases.blob_store import DEFER_HYDRATION, PAYLOAD_FIELDS, BlobStore
+from src.app.cases.event_log import CaseEventLog
+from src.app.cases.json_patch import apply_patch
+from src.app.cases.models_db import CaseEvent, CaseRecord, CaseSnapshot
+from src.app.cases.snapshot_store import SNAPSHOT_DELTA, SNAPSHOT_FULL, get_snapshot_cache
+
+DETAIL_SECTIONS = ("snapshots", "events")
+
+
+@dataclass
+class CaseDetail:
+    record: CaseRecord
+    snapshots: Optional[list[CaseSnapshot]] = None
+    events: Optional[list[CaseEvent]] = None
+    fields: tuple[str, ...] = PAYLOAD_FIELDS
+    from_version: Optional[int] = None
+    to_version: Optional[int] = None
+    blobs: dict[str, Any] = field(default_factory=dict)
+    archive: Optional[ArchivedHistory] = None  # compacted history, served before the hot rows
+
+
+def load_case_detail(
+    db: Session,
+    case_id: str,
+    *,
+    include: Iterable[str] = DETAIL_SECTIONS,
+    from_version: Optional[int] = None,
+    to_version: Optional[int] = None,
+    fields: Iterable[str] = PAYLOAD_FIELDS,
+) -> Optional[CaseDetail]:
+    """Record plus the requested sections, or None if the case does not exist."""
+    include = set(include)
+    CaseEventLog(db).flush()
+    fields = tuple(name for name in PAYLOAD_FIELDS if name in set(fields))
+    options = []
+    if "snapshots" in include:
+        criteria = true()
+        if from_version is not None:
+            # A delta is rebuilt from the nearest full row at or before it, so the
+            # chain is loaded from there and trimmed when serializing.
+            base = (
+                select(func.max(CaseSnapshot.version))
+                .where(
+                    CaseSnapshot.case_id == case_id,
+                    CaseSnapshot.encoding == SNAPSHOT_FULL,
+                    CaseSnapshot.version <= from_version,
+                )
+                .scalar_subquery()
+            )
+            criteria = CaseSnapshot.version >= func.coalesce(base, from_version)
+        if to_version is not None:
+            criteria = criteria & (CaseSnapshot.version <= to_version)
+        options.append(selectinload(CaseRecord.snapshots.and_(criteria)))
+    if "events" in include:
+        options.append(selectinload(CaseRecord.events))
+
+    # A private session on the same connection keeps these partially hydrated rows
+    # out of the caller's identity map.
+    with Session(bind=db.connection(), autoflush=False) as reader:
+        record = reader.execute(
+            select(CaseRecord)
+            .where(CaseRecord.id == case_id)
+            .options(*options)
+            .execution_options(**{DEFER_HYDRATION: True})
+        ).scalar_one_or_none()
+        if record is None:
+            return None
+        snapshots = list(record.snapshots) if "snapshots" in include else None
+        events = list(record.events) if "events" in include else None
+
+    full_rows = [record] + [s for s in snapshots or [] if s.encoding != SNAPSHOT_DELTA]
+    hashes = [getattr(row, f"{name}_hash") for row in full_rows for name in fields]
+    return CaseDetail(
+        record=record,
+        snapshots=snapshots,
+        events=events,
+        fields=fields,
+        from_version=from_version,
+        to_version=to_version,
+        blobs=BlobStore(db).get_many(hashes),
+        archive=load_archive(db, case_id) if include else None,
+    )
+
+
+def _payload(row: CaseRecord | CaseSnapshot, detail: CaseDetail) -> dict[str, Any]:
+    payload = {}
+    for name in detail.fields:
+        key = getattr(row, f"{name}_hash")
+        payload[name] = detail.blobs.get(key) if key else getattr(row, name)
+    return payload
+
+
+def _archived_snapshots(detail: CaseDetail) -> Iterator[dict[str, Any]]:
+    if detail.archive is None:
+        return
+    for entry, document in detail.archive.documents():
+        version = entry["version"]
+        if detail.from_version is not None and version < detail.from_version:
+            continue
+        if detail.to_version is not None and version > detail.to_version:
+            break
+        yield {
+            "id": entry["id"],
+            "case_id": detail.archive.case_id,
+            "snapshot_at": entry["snapshot_at"],
+            "source": entry["source"],
+            "version": version,
+            **{name: document.get(name) for name in detail.fields},
+        }
+
+
+def _snapshot_documents(detail: CaseDetail) -> Iterator[tuple[CaseSnapshot, dict[str, Any]]]:
+    cache = get_snapshot_cache()
+    complete = detail.fields == PAYLOAD_FIELDS
+    document: Optional[dict[str, Any]] = None
+    for snapshot in detail.snapshots or []:
+        if snapshot.encoding != SNAPSHOT_DELTA:
+            document = _payload(snapshot, detail)
+        else:
+            cached = cache.get(snapshot.id)
+            if cached is not None:
+                document = {name: cached.get(name) for name in detail.fields}
+            elif document is None:
+                raise ValueError(
+                    f"Snapshot {snapshot.case_id} v{snapshot.version} has no base version"
+                )
+            else:
+                # Every operation targets one top-level payload field; skip projected-out ones.
+                ops = [
+                    op
+                    for op in snapshot.delta or []
+                    if op["path"].split("/", 2)[1] in detail.fields
+                ]
+                document = apply_patch(document, ops)
+                if complete:
+                    cache.put(snapshot.id, document)
+        if detail.from_version is None or snapshot.version >= detail.from_version:
+            yield snapshot, document
+
+
+def _snapshot_items(detail: CaseDetail) -> Iterator[dict[str, Any]]:
+    yield from _archived_snapshots(detail)
+    for snapshot, document in _snapshot_documents(detail):
+        yield {
+            "id": snapshot.id,
+            "case_id": snapshot.case_id,
+            "snapshot_at": snapshot.snapshot_at,
+            "source": snapshot.source,
+            "version": snapshot.version,
+            **document,
+        }
+
+
+def iter_case_detail_json(detail: CaseDetail) -> Iterator[bytes]:
+    """The CaseDetailResponse JSON document, one fragment at a time."""
+    record = detail.record
+    yield b'{"record":'
+    yield to_json(
+        {
+            "id": record.id,
+            "created_at": record.created_at,
+            "updated_at": record.updated_at,
+            "source": record.source,
+            "status": record.status,
+            **_payload(record, detail),
+            "tenant_id": record.tenant_id,
+            "created_by": record.created_by,
+        }
+    )
+    if detail.snapshots is not None:
+        yield b',"snapshots":['
+        for index, item in enumerate(_snapshot_items(detail)):
+            yield (b"," if index else b"") + to_json(item)
+        yield b"]"
+    if detail.events is not None:
+        yield b',"events":['
+        archived = detail.archive.case_events() if detail.archive is not None else []
+        for index, event in enumerate(archived + detail.events):
+            yield (b"," if index else b"") + to_json(
+                {
+                    "id": event.id,
+                    "event_type": event.event_type,
+                    "created_at": event.created_at,
+                    "actor": event.actor,
+                    "metadata": event.event_metadata or {},
+                    "case_id": event.case_id,
+                }
+            )
+        yield b"]"
+    yield b"}"
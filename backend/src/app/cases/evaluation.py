@@ -0,0 +1,205 @@
+"""
+Case evaluation pipeline shared by the /cases/evaluate route and the config
+re-evaluation job: one profile in, the response payloads and the keyword
+arguments for CaseHistoryService.persist_evaluation out.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from src.app.cases.evaluation_cache import get_evaluation_cache
+from src.app.cases.model import CaseService
+from src.app.documents.service import DocumentMatrixService
+from src.app.domain_config.registry import get_config_snapshot
+from src.app.rules.crs import CRS_FACTOR_SECTIONS
+from src.app.rules.models import (
+    CandidateProfile,
+    CRSBreakdown,
+    ProgramEligibilityResult,
+    ProgramEvaluationResult,
+)
+from src.app.services.rule_engine_service import RuleEngineService
+
+
+class FactorDetail(BaseModel):
+    name: str
+    points: int
+    rule_id: str
+    config_ref: str | None = None
+
+
+class CrsBreakdownResponse(BaseModel):
+    total: int
+    breakdown: dict[str, int] = Field(default_factory=dict)
+    factor_details: list[FactorDetail] = Field(default_factory=list)
+
+
+class ProgramEligibilityResponse(BaseModel):
+    program_code: str
+    eligible: bool
+    reasons: list[str] = Field(default_factory=list)
+    rule_ids: list[str] = Field(default_factory=list)
+
+
+class DocumentRequirement(BaseModel):
+    id: str
+    label: str | None = None
+    category: str | None = None
+    mandatory: bool = True
+    programs_applicable: list[str] = Field(default_factory=list)
+    rule_ids: list[str] = Field(default_factory=list)
+
+
+def program_response(result: ProgramEligibilityResult) -> ProgramEligibilityResponse:
+    return ProgramEligibilityResponse(
+        program_code=result.program_code,
+        eligible=result.eligible,
+        reasons=result.reasons,
+        rule_ids=[],
+    )
+
+
+def select_crs(
+    crs_results: dict[str, ProgramEvaluationResult], selected_program: str | None
+) -> CRSBreakdown | None:
+    if selected_program and selected_program in crs_results:
+        return crs_results[selected_program].crs
+    return next(iter(crs_results.values())).crs if crs_results else None
+
+
+def crs_response(crs: CRSBreakdown | None) -> CrsBreakdownResponse:
+    if not crs:
+        return CrsBreakdownResponse(total=0)
+    return CrsBreakdownResponse(
+        total=crs.total_points,
+        breakdown={
+            "core_points": crs.core_points,
+            "spouse_points": crs.spouse_points,
+            "transferability_points": crs.transferability_points,
+            "additional_points": crs.additional_points,
+        },
+        factor_details=[
+            FactorDetail(
+                name="core_points",
+                points=crs.core_points,
+                rule_id="crs.core",
+                config_ref="config/domain/crs.yaml",
+            ),
+            FactorDetail(
+                name="spouse_points",
+                points=crs.spouse_points,
+                rule_id="crs.spouse",
+                config_ref="config/domain/crs.yaml",
+            ),
+            FactorDetail(
+                name="transferability_points",
+                points=crs.transferability_points,
+                rule_id="crs.transferability",
+                config_ref="config/domain/crs.yaml",
+            ),
+            FactorDetail(
+                name="additional_points",
+                points=crs.additional_points,
+                rule_id="crs.additional",
+                config_ref="config/domain/crs.yaml",
+            ),
+            *(
+                FactorDetail(
+                    name=name,
+                    points=crs.factors[name],
+                    rule_id=f"crs.{section}.{name}",
+                    config_ref="config/domain/crs.yaml",
+                )
+                for section, names in CRS_FACTOR_SECTIONS
+                for name in names
+                if name in crs.factors
+            ),
+        ],
+    )
+
+
+@dataclass
+class CaseEvaluation:
+    program_responses: list[ProgramEligibilityResponse]
+    crs_response: CrsBreakdownResponse
+    docs_payload: dict[str, list]
+    warnings: list[str]
+    config_version: dict[str, str]
+
+
+def evaluate_profile(profile: CandidateProfile) -> CaseEvaluation:
+    """Synchronous evaluation (config refresh, rule engines, document matrix); runs off-loop."""
+    snapshot = get_config_snapshot()
+    rule_engine = RuleEngineService(config_service=snapshot.config_service)
+    document_service = DocumentMatrixService(
+        config_service=snapshot.config_service, bundle=snapshot.documents
+    )
+    case_service = CaseService(
+        rule_engine=rule_engine,
+        document_service=document_service,
+        cache=get_evaluation_cache(),
+        config_fingerprint=snapshot.digest,
+    )
+
+    # One pass over the profile yields both program eligibility and CRS results.
+    case = case_service.build_case(profile)
+    crs = crs_response(select_crs(case.program_results, case.selected_program))
+
+    documents = [
+        DocumentRequirement(
+            id=d.id,
+            label=getattr(d, "label", None),
+            category=getattr(d, "category", None),
+            mandatory=d.mandatory,
+            programs_applicable=[case.selected_program] if case.selected_program else [],
+            rule_ids=[],
+        )
+        for d in case.required_documents
+    ]
+    docs_payload = {
+        "forms": list(case.required_forms),
+        "documents": [doc.model_dump() for doc in documents],
+    }
+
+    warnings: list[str] = []
+    if case.program_eligibility:
+        for res in case.program_eligibility.results:
+            warnings.extend(res.warnings)
+
+    program_responses = (
+        [program_response(res) for res in case.program_eligibility.results]
+        if case.program_eligibility
+        else []
+    )
+    return CaseEvaluation(
+        program_responses=program_responses,
+        crs_response=crs,
+        docs_payload=docs_payload,
+        warnings=warnings,
+        # Hashes are computed once per config generation by the registry, not per request.
+        config_version=dict(snapshot.fingerprint),
+    )
+
+
+def history_payload(
+    *,
+    profile: CandidateProfile,
+    evaluation: CaseEvaluation,
+    source: str,
+) -> dict[str, Any]:
+    """Keyword arguments for CaseHistoryService.persist_evaluation."""
+    return {
+        "profile": profile.model_dump(mode="json"),
+        "program_eligibility": {
+            "results": [res.model_dump(mode="json") for res in evaluation.program_responses]
+        },
+        "crs_breakdown": evaluation.crs_response.model_dump(),
+        "required_artifacts": evaluation.docs_payload,
+        "config_fingerprint": evaluation.config_version,
+        "source": source,
+        "actor": "system",
+    }
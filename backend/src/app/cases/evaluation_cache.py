@@ -0,0 +1,242 @@
+"""
+Evaluation result cache.
+
+Identical CandidateProfile re-submissions skip the rule engines and the
+document matrix. Keys combine a namespace (rules / documents:<program>), the
+config digest of the active ConfigSnapshot, the evaluation date (ages and
+expiry flags depend on it) and a canonical hash of the profile JSON, so a
+config change or a new day never serves stale results: old keys simply stop
+being requested and age out.
+
+Backends:
+- MemoryCacheBackend: in-process LRU with per-entry TTL; stores the result
+  objects themselves (treated as read-only by callers).
+- SQLiteCacheBackend: local file shared across workers/restarts; stores JSON
+  and evicts least recently used rows beyond max_entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any, Optional, Protocol, TypeVar
+
+from pydantic import BaseModel
+
+from src.app.config import settings
+
+_M = TypeVar("_M", bound=BaseModel)
+
+
+def canonical_profile_hash(profile: BaseModel) -> str:
+    """sha256 of the profile JSON with sorted keys and no whitespace."""
+    payload = json.dumps(profile.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheBackend(Protocol):
+    serializes: bool  # True when values must be JSON strings
+
+    def get(self, key: str, now: float) -> tuple[Optional[Any], bool]:
+        """(value, expired); value is None on a miss."""
+
+    def set(self, key: str, value: Any, expires_at: Optional[float]) -> int:
+        """Store a value; returns the number of entries evicted to make room."""
+
+    def clear(self) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryCacheBackend:
+    serializes = False
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[Any, Optional[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, now: float) -> tuple[Optional[Any], bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+                return None, True
+            self._entries.move_to_end(key)
+            return value, False
+
+    def set(self, key: str, value: Any, expires_at: Optional[float]) -> int:
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    serializes = True
+
+    def __init__(self, path: str, max_entries: int = 100_000) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS evaluation_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " expires_at REAL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_evaluation_cache_last_access"
+            " ON evaluation_cache (last_access)"
+        )
+
+    def get(self, key: str, now: float) -> tuple[Optional[Any], bool]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM evaluation_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, False
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM evaluation_cache WHERE key = ?", (key,))
+                return None, True
+            self._conn.execute(
+                "UPDATE evaluation_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            return value, False
+
+    def set(self, key: str, value: Any, expires_at: Optional[float]) -> int:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO evaluation_cache (key, value, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, time.time()),
+            )
+            excess = self._count() - self.max_entries
+            if excess <= 0:
+                return 0
+            self._conn.execute(
+                "DELETE FROM evaluation_cache WHERE key IN ("
+                " SELECT key FROM evaluation_cache ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            return excess
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM evaluation_cache")
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM evaluation_cache").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+
+class EvaluationCache:
+    """Get-or-compute front for evaluation results with LRU/TTL eviction and hit/miss stats."""
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: Optional[float] = 3600) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(namespace: str, config_fingerprint: str, profile_hash: str, on_date: str) -> str:
+        return f"{namespace}:{config_fingerprint}:{on_date}:{profile_hash}"
+
+    def get_or_compute(self, key: str, model: type[_M], compute: Callable[[], _M]) -> _M:
+        now = time.time()
+        cached, expired = self.backend.get(key, now)
+        if cached is not None:
+            self._count(hits=1)
+            return model.model_validate_json(cached) if self.backend.serializes else cached
+
+        value = compute()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else None
+        stored = value.model_dump_json() if self.backend.serializes else value
+        evicted = self.backend.set(key, stored, expires_at)
+        self._count(misses=1, evictions=evicted, expirations=int(expired))
+        return value
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**{**asdict(self._stats), "size": len(self.backend)})
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self._stats, name, getattr(self._stats, name) + delta)
+
+
+_cache: Optional[EvaluationCache] = None
+_cache_built = False
+_cache_lock = threading.Lock()
+
+
+def build_evaluation_cache() -> Optional[EvaluationCache]:
+    """Cache configured by settings.evaluation_cache_backend ("memory", "sqlite" or "none")."""
+    kind = settings.evaluation_cache_backend.lower()
+    if kind == "none":
+        return None
+    if kind == "sqlite":
+        backend: CacheBackend = SQLiteCacheBackend(
+            settings.evaluation_cache_path, max_entries=settings.evaluation_cache_max_entries
+        )
+    elif kind == "memory":
+        backend = MemoryCacheBackend(max_entries=settings.evaluation_cache_max_entries)
+    else:
+        raise ValueError(f"Unknown evaluation cache backend: {settings.evaluation_cache_backend}")
+    return EvaluationCache(backend, ttl_seconds=settings.evaluation_cache_ttl_seconds)
+
+
+def get_evaluation_cache() -> Optional[EvaluationCache]:
+    global _cache, _cache_built
+    if not _cache_built:
+        with _cache_lock:
+            if not _cache_built:
+                _cache = build_evaluation_cache()
+                _cache_built = True
+    return _cache
@@ -0,0 +1,49 @@
+"""
+Bounded executor for case evaluation work.
+
+Config snapshot refreshes (YAML I/O), rule evaluation and the document matrix
+are synchronous; async routes run them here so they never block the event loop.
+The pool size (settings.evaluation_workers) bounds how many evaluations run at
+once; further requests wait for a free worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Optional, TypeVar
+
+from src.app.config import settings
+
+_T = TypeVar("_T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_evaluation_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(settings.evaluation_workers, 1),
+                    thread_name_prefix="case-eval",
+                )
+    return _executor
+
+
+async def run_evaluation(func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_evaluation_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_evaluation_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -0,0 +1,226 @@
+"""
+Append-only, batched case event log.
+
+CaseEventRepository.log_event used to add and flush one CaseEvent per call inside
+the request transaction. Appended events are now buffered on the session and
+written with one executemany INSERT when the transaction commits, when the
+buffer reaches `settings.case_event_batch_size`, or before events are read back.
+A rollback discards the buffer together with the rest of the transaction.
+
+The commit and rollback hooks are registered on each session that buffers
+events, not on the Session class, so sessions that never log an event pay
+nothing. Because of the buffering, append() returns the event before it is
+written: its sequence is None until the buffer is flushed.
+
+Every event of a case gets a monotonic `sequence` (1, 2, ...) reserved from
+case_records.event_sequence with one UPDATE ... RETURNING per batch, the same
+scheme as snapshot versions. Rows also carry a `month` column ("YYYY-MM" of
+created_at). The table itself is not partitioned: `month` leads the
+(tenant_id, month, created_at) index, so a tenant scan over a time range seeks
+straight to the months it covers. Together with the (case_id, sequence) and
+(case_id, created_at) indexes, scans by case, tenant and time range touch only
+their slice of the log.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import case, event, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from src.app.cases.models_db import CaseEvent, CaseRecord
+from src.app.config import settings
+
+# Session.info key holding the not-yet-written CaseEvent objects.
+EVENT_BUFFER_KEY = "case_event_buffer"
+
+_records = CaseRecord.__table__
+_events = CaseEvent.__table__
+
+
+def month_key(moment: datetime) -> str:
+    return moment.strftime("%Y-%m")
+
+
+class CaseEventLog:
+    """Buffered appends and range scans over case_events."""
+
+    def __init__(self, db: Session, batch_size: Optional[int] = None) -> None:
+        self.db = db
+        self.batch_size = max(batch_size or settings.case_event_batch_size, 1)
+
+    def append(
+        self,
+        *,
+        event_type: str,
+        case_id: Optional[str],
+        actor: str,
+        tenant_id: Optional[str] = None,
+        metadata: Optional[dict[str, Any]] = None,
+        created_at: Optional[datetime] = None,
+    ) -> CaseEvent:
+        """
+        Buffer one event. The returned object has its id and created_at set; its
+        sequence is filled in when the buffer is written.
+        """
+        created_at = created_at or datetime.now(timezone.utc)
+        entry = CaseEvent(
+            id=str(uuid.uuid4()),
+            event_type=event_type,
+            case_id=case_id,
+            actor=actor,
+            tenant_id=tenant_id,
+            event_metadata=metadata or {},
+            created_at=created_at,
+            month=month_key(created_at),
+        )
+        if not self.db.in_transaction():
+            self.db.begin()  # the buffer lives and dies with the session transaction
+        _watch(self.db)
+        buffer = self.db.info.setdefault(EVENT_BUFFER_KEY, [])
+        buffer.append(entry)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+        return entry
+
+    def flush(self) -> int:
+        """Write the session's buffered events; returns how many were written."""
+        buffer: list[CaseEvent] = self.db.info.pop(EVENT_BUFFER_KEY, None) or []
+        if not buffer:
+            return 0
+        self.db.flush()  # the cases (and counters) the events refer to must be written first
+        rows = self.write(
+            {
+                "id": entry.id,
+                "event_type": entry.event_type,
+                "case_id": entry.case_id,
+                "actor": entry.actor,
+                "tenant_id": entry.tenant_id,
+                "event_metadata": entry.event_metadata,
+                "created_at": entry.created_at,
+            }
+            for entry in buffer
+        )
+        for entry, row in zip(buffer, rows, strict=True):
+            entry.sequence = row["sequence"]
+        return len(rows)
+
+    def write(self, events: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Insert CaseEvent column dicts in one statement, filling in id, created_at,
+        month and sequence. Returns the rows as written, in input order.
+        """
+        now = datetime.now(timezone.utc)
+        rows = []
+        for source in events:
+            row = dict(source)
+            row.setdefault("id", str(uuid.uuid4()))
+            row.setdefault("actor", "system")
+            row["created_at"] = row.get("created_at") or now
+            row["month"] = month_key(row["created_at"])
+            row["sequence"] = None
+            rows.append(row)
+        if not rows:
+            return rows
+        last = self.allocate_sequences(Counter(r["case_id"] for r in rows if r["case_id"]))
+        # Number each case's events in input order, ending at its reserved maximum.
+        remaining = Counter(r["case_id"] for r in rows if r["case_id"])
+        for row in rows:
+            case_id = row["case_id"]
+            if case_id in last:
+                row["sequence"] = last[case_id] - remaining[case_id] + 1
+                remaining[case_id] -= 1
+        self.db.execute(insert(CaseEvent), rows)
+        return rows
+
+    def allocate_sequences(self, counts: dict[str, int]) -> dict[str, int]:
+        """
+        Reserve `counts[case_id]` sequence numbers per case in one UPDATE ... RETURNING;
+        returns the highest reserved number per case. A counter that lags the stored
+        events (rows written before it existed) catches up with max(sequence) here.
+        """
+        counts = {case_id: n for case_id, n in counts.items() if n > 0}
+        if not counts:
+            return {}
+        counter = func.coalesce(_records.c.event_sequence, 0)
+        stored = (
+            select(func.coalesce(func.max(_events.c.sequence), 0))
+            .where(_events.c.case_id == _records.c.id)
+            .scalar_subquery()
+        )
+        start = case((counter >= stored, counter), else_=stored)
+        stmt = (
+            update(_records)
+            .where(_records.c.id.in_(list(counts)))
+            .values(event_sequence=start + case(counts, value=_records.c.id, else_=0))
+        )
+        if self.db.get_bind().dialect.update_returning:
+            rows = self.db.execute(stmt.returning(_records.c.id, _records.c.event_sequence))
+            return dict(rows.all())
+        self.db.execute(stmt)
+        rows = self.db.execute(
+            select(_records.c.id, _records.c.event_sequence).where(_records.c.id.in_(list(counts)))
+        )
+        return dict(rows.all())
+
+    def scan(
+        self,
+        case_id: Optional[str] = None,
+        *,
+        tenant_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_sequence: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[CaseEvent]:
+        """
+        Events in log order: by sequence for one case, otherwise by time. `since` is
+        inclusive and `until` exclusive; `after_sequence` resumes a per-case scan.
+        """
+        self.flush()
+        query = self.db.query(CaseEvent)
+        if case_id is not None:
+            query = query.filter(CaseEvent.case_id == case_id)
+        if tenant_id is not None:
+            query = query.filter(CaseEvent.tenant_id == tenant_id)
+            # Seek to the months the time range covers (leading index columns).
+            if since is not None:
+                query = query.filter(CaseEvent.month >= month_key(since))
+            if until is not None:
+                query = query.filter(CaseEvent.month <= month_key(until))
+        if since is not None:
+            query = query.filter(CaseEvent.created_at >= since)
+        if until is not None:
+            query = query.filter(CaseEvent.created_at < until)
+        if after_sequence is not None:
+            query = query.filter(CaseEvent.sequence > after_sequence)
+        if case_id is not None:
+            query = query.order_by(CaseEvent.sequence.asc(), CaseEvent.created_at.asc())
+        else:
+            query = query.order_by(CaseEvent.created_at.asc(), CaseEvent.id.asc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+
+def _watch(session: Session) -> None:
+    # Hooks on this session only; they stay registered for the session's lifetime.
+    if not event.contains(session, "before_commit", _write_buffered_events):
+        event.listen(session, "before_commit", _write_buffered_events)
+        event.listen(session, "after_transaction_end", _discard_buffered_events)
+
+
+def _write_buffered_events(session: Session) -> None:
+    if session.info.get(EVENT_BUFFER_KEY):
+        CaseEventLog(session).flush()
+
+
+def _discard_buffered_events(session: Session, transaction) -> None:
+    # Commits write the buffer first (above); a rollback or close drops what is left.
+    if transaction.parent is None:
+        session.info.pop(EVENT_BUFFER_KEY, None)
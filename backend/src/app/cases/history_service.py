@@ -42,6 +42,7 @@ class CaseHistoryService:
         status: str = "evaluated",
         actor: str = "system",
         tenant_id: Optional[str] = None,
+        case_id: Optional[str] = None,
     ) -> CaseHistoryResult:
         # Single transaction to ensure record + snapshot + event stay consistent.
         record = self.case_repo.create_case(
@@ -55,12 +56,11 @@ class CaseHistoryService:
             tenant_id=tenant_id,
             created_by=actor,
             created_by_user_id=None,
+            case_id=case_id,
         )
 
-        snapshot_version = self.snapshot_repo.next_version(record.id)
-        snapshot = self.snapshot_repo.create_snapshot(
+        snapshot = self.snapshot_repo.append_snapshot(
             case_id=record.id,
-            version=snapshot_version,
             profile=profile,
             program_eligibility=program_eligibility,
             crs_breakdown=crs_breakdown,
@@ -75,7 +75,7 @@ class CaseHistoryService:
             case_id=record.id,
             actor=actor,
             tenant_id=tenant_id,
-            metadata={"source": source, "version": snapshot_version},
+            metadata={"source": source, "version": snapshot.version},
         )
 
         self.db.commit()
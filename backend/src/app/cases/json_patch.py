@@ -0,0 +1,90 @@
+"""
+Minimal RFC 6902 JSON Patch support for snapshot deltas.
+
+make_patch() emits only "add", "remove" and "replace" operations: objects are
+diffed key by key, equal-length arrays element by element, and any other change
+replaces the value at that path. apply_patch() accepts the same subset and
+never mutates its input. Paths are RFC 6901 JSON pointers.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+JsonPatch = list[dict[str, Any]]
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(source: Any, target: Any) -> JsonPatch:
+    """Operations that turn `source` into `target`."""
+    ops: JsonPatch = []
+    _diff(source, target, "", ops)
+    return ops
+
+
+def _diff(source: Any, target: Any, path: str, ops: JsonPatch) -> None:
+    if type(source) is not type(target):
+        ops.append({"op": "replace", "path": path, "value": target})
+        return
+    if isinstance(source, dict) and isinstance(target, dict):
+        for key in source:
+            if key not in target:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(str(key))}"})
+        for key, value in target.items():
+            child = f"{path}/{_escape(str(key))}"
+            if key in source:
+                _diff(source[key], value, child, ops)
+            else:
+                ops.append({"op": "add", "path": child, "value": value})
+        return
+    if isinstance(source, list) and isinstance(target, list) and len(source) == len(target):
+        for index, (old, new) in enumerate(zip(source, target, strict=True)):
+            _diff(old, new, f"{path}/{index}", ops)
+        return
+    # 1 == True and 1 == 1.0 in Python, so scalars only match with equal types (checked above).
+    if source == target:
+        return
+    ops.append({"op": "replace", "path": path, "value": target})
+
+
+def apply_patch(document: Any, patch: JsonPatch) -> Any:
+    """Return a copy of `document` with `patch` applied."""
+    result = copy.deepcopy(document)
+    for op in patch:
+        kind, path = op["op"], op["path"]
+        if path == "":
+            if kind == "remove":
+                raise ValueError("Cannot remove the document root")
+            result = copy.deepcopy(op["value"])
+            continue
+        parent_path, _, last = path.rpartition("/")
+        parent = _resolve(result, parent_path)
+        key: Any = _unescape(last)
+        if isinstance(parent, list):
+            key = len(parent) if key == "-" else int(key)
+        if kind == "remove":
+            del parent[key]
+        elif kind == "add" and isinstance(parent, list):
+            parent.insert(key, copy.deepcopy(op["value"]))
+        elif kind in ("add", "replace"):
+            parent[key] = copy.deepcopy(op["value"])
+        else:
+            raise ValueError(f"Unsupported JSON patch operation: {kind}")
+    return result
+
+
+def _resolve(document: Any, pointer: str) -> Any:
+    node = document
+    if not pointer:
+        return node
+    for token in pointer.lstrip("/").split("/"):
+        node = node[int(token)] if isinstance(node, list) else node[_unescape(token)]
+    return node
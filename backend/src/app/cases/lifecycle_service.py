@@ -1,22 +1,39 @@
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Any, Optional, Tuple
 
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
-from src.app.cases.models_db import CaseRecord
+from src.app.cases.blob_store import PAYLOAD_FIELDS, BlobStore
+from src.app.cases.event_log import CaseEventLog
+from src.app.cases.models_db import CaseRecord, CaseSnapshot
 from src.app.cases.repository import (
     CaseEventRepository,
     CaseRepository,
     CaseSnapshotRepository,
 )
+from src.app.cases.snapshot_store import SNAPSHOT_FULL
+from src.app.cases.summaries import CaseSummaryStore, result_columns
 
 
 class CaseLifecycleError(Exception):
     """Domain error for invalid lifecycle operations."""
 
 
+@dataclass
+class BulkTransitionResult:
+    case_id: str
+    ok: bool
+    from_status: Optional[str] = None
+    status: Optional[str] = None
+    version: Optional[int] = None
+    error: Optional[str] = None
+
+
 class CaseLifecycleService:
     """Tenant-aware case lifecycle with audit + snapshots."""
 
@@ -28,11 +45,19 @@ class CaseLifecycleService:
         "archived": set(),
     }
 
+    TRANSITION_EVENTS = {
+        "submitted": "CASE_SUBMITTED",
+        "in_review": "CASE_IN_REVIEW",
+        "complete": "CASE_COMPLETE",
+        "archived": "CASE_ARCHIVED",
+    }
+
     def __init__(self, db: Session) -> None:
         self.db = db
         self.case_repo = CaseRepository(db)
         self.snapshot_repo = CaseSnapshotRepository(db)
         self.event_repo = CaseEventRepository(db)
+        self.summary_store = CaseSummaryStore(db)
 
     def _transition(
         self,
@@ -54,12 +79,11 @@ class CaseLifecycleService:
 
         record.status = new_status
         record.updated_at = datetime.utcnow()
+        self.summary_store.update_status(record.id, new_status)
         record.created_by_user_id = record.created_by_user_id or user_id
 
-        next_version = self.snapshot_repo.next_version(record.id)
-        self.snapshot_repo.create_snapshot(
+        snapshot = self.snapshot_repo.append_snapshot(
             case_id=record.id,
-            version=next_version,
             profile=record.profile or {},
             program_eligibility=record.program_eligibility or {},
             crs_breakdown=record.crs_breakdown,
@@ -79,7 +103,149 @@ class CaseLifecycleService:
 
         self.db.commit()
         self.db.refresh(record)
-        return record, next_version
+        return record, snapshot.version
+
+    def bulk_transition(
+        self,
+        *,
+        case_ids: Iterable[str],
+        tenant_id: str,
+        user_id: str,
+        new_status: str,
+    ) -> list[BulkTransitionResult]:
+        """
+        Move many cases to `new_status` in one transaction. The cases are loaded and
+        validated together; those that are missing or cannot make the transition are
+        reported and left alone, the others get their snapshot, event and status update
+        in a few set-based statements and a single commit. Results follow `case_ids`.
+        """
+        event_type = self.TRANSITION_EVENTS.get(new_status)
+        if event_type is None:
+            raise CaseLifecycleError(f"Unknown target status {new_status}")
+        ids = list(dict.fromkeys(case_ids))
+        allowed_from = {
+            status for status, targets in self.ALLOWED_TRANSITIONS.items() if new_status in targets
+        }
+
+        rows = {
+            row.id: row
+            for row in self.db.execute(
+                select(
+                    CaseRecord.id,
+                    CaseRecord.status,
+                    CaseRecord.source,
+                    CaseRecord.tenant_id,
+                    CaseRecord.created_by_user_id,
+                    *(getattr(CaseRecord, name) for name in PAYLOAD_FIELDS),
+                    *(getattr(CaseRecord, f"{name}_hash") for name in PAYLOAD_FIELDS),
+                )
+                .where(CaseRecord.id.in_(ids), CaseRecord.tenant_id == tenant_id)
+                .with_for_update()
+            )
+        }
+        results: dict[str, BulkTransitionResult] = {}
+        movable = []
+        for case_id in ids:
+            row = rows.get(case_id)
+            if row is None:
+                results[case_id] = BulkTransitionResult(
+                    case_id=case_id, ok=False, error="Case not found for tenant"
+                )
+            elif row.status not in allowed_from:
+                results[case_id] = BulkTransitionResult(
+                    case_id=case_id,
+                    ok=False,
+                    from_status=row.status,
+                    status=row.status,
+                    error=f"Cannot transition from {row.status} to {new_status}",
+                )
+            else:
+                movable.append(row)
+
+        if movable:
+            versions = self._write_transitions(movable, user_id, new_status, event_type)
+            for row in movable:
+                results[row.id] = BulkTransitionResult(
+                    case_id=row.id,
+                    ok=True,
+                    from_status=row.status,
+                    status=new_status,
+                    version=versions[row.id],
+                )
+        self.db.commit()
+        return [results[case_id] for case_id in ids]
+
+    def _write_transitions(
+        self, rows: list[Any], user_id: str, new_status: str, event_type: str
+    ) -> dict[str, int]:
+        # A transition leaves the payload unchanged, so each snapshot is a full row
+        # pointing at the record's blobs (one more reference each) instead of a delta
+        # that would need the previous version rebuilt. Legacy inline payloads are
+        # moved into the blob store on the way.
+        blobs = BlobStore(self.db)
+        hashes = {
+            row.id: {name: getattr(row, f"{name}_hash") for name in PAYLOAD_FIELDS} for row in rows
+        }
+        inline = [
+            (row.id, name, getattr(row, name))
+            for row in rows
+            for name in PAYLOAD_FIELDS
+            if not hashes[row.id][name] and getattr(row, name) is not None
+        ]
+        blobs.retain(key for columns in hashes.values() for key in columns.values())
+        stored = blobs.put_many(v for _, _, v in inline)
+        for (case_id, name, _), key in zip(inline, stored, strict=True):
+            hashes[case_id][name] = key
+        values = blobs.get_many(
+            hashes[row.id][name]
+            for row in rows
+            for name in ("program_eligibility", "crs_breakdown")
+        )
+
+        versions = self.snapshot_repo.allocate_versions(row.id for row in rows)
+        now = datetime.now(timezone.utc)
+        snapshots, records, events = [], [], []
+        for row in rows:
+            columns = hashes[row.id]
+            outcome = result_columns(
+                values.get(columns["program_eligibility"]), values.get(columns["crs_breakdown"])
+            )
+            snapshots.append(
+                {
+                    "case_id": row.id,
+                    "version": versions[row.id],
+                    "source": row.source,
+                    "tenant_id": row.tenant_id,
+                    "encoding": SNAPSHOT_FULL,
+                    "snapshot_at": now,
+                    "eligible_programs": outcome["eligible_programs"],
+                    "crs_total": outcome["crs_total"],
+                    **{f"{name}_hash": key for name, key in columns.items()},
+                }
+            )
+            records.append(
+                {
+                    "id": row.id,
+                    "status": new_status,
+                    "updated_at": now,
+                    "created_by_user_id": row.created_by_user_id or user_id,
+                }
+            )
+            events.append(
+                {
+                    "event_type": event_type,
+                    "case_id": row.id,
+                    "tenant_id": row.tenant_id,
+                    "actor": user_id,
+                    "event_metadata": {"from": row.status, "to": new_status},
+                    "created_at": now,
+                }
+            )
+        self.db.execute(insert(CaseSnapshot), snapshots)
+        self.db.execute(update(CaseRecord), records)
+        CaseEventLog(self.db).write(events)
+        self.summary_store.update_statuses(list(versions), new_status)
+        return versions
 
     def create_case(
         self,
@@ -106,10 +272,8 @@ class CaseLifecycleService:
             created_by_user_id=user_id,
         )
 
-        version = self.snapshot_repo.next_version(record.id)
-        self.snapshot_repo.create_snapshot(
+        self.snapshot_repo.append_snapshot(
             case_id=record.id,
-            version=version,
             profile=record.profile,
             program_eligibility=record.program_eligibility,
             crs_breakdown=record.crs_breakdown,
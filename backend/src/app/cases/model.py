@@ -1,40 +1,84 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from collections.abc import Callable
+from datetime import date
+from typing import List, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 
+from src.app.cases.evaluation_cache import EvaluationCache, canonical_profile_hash
 from src.app.documents.service import DocumentMatrixResult, DocumentMatrixService
-from src.app.rules.models import CandidateProfile, ProgramEligibilitySummary
+from src.app.rules.models import (
+    CandidateProfile,
+    ProfileEvaluation,
+    ProgramEligibilitySummary,
+    ProgramEvaluationResult,
+)
 from src.app.services.rule_engine_service import RuleEngineService
 
 
 class Case(BaseModel):
     profile: CandidateProfile
     program_eligibility: Optional[ProgramEligibilitySummary] = None
+    program_results: dict[str, ProgramEvaluationResult] = Field(default_factory=dict)
     selected_program: Optional[str] = None
     required_forms: List[str] = Field(default_factory=list)
     required_documents: List = Field(default_factory=list)
 
 
+_M = TypeVar("_M", bound=BaseModel)
+
+
 class CaseService:
-    def __init__(self, rule_engine: RuleEngineService, document_service: DocumentMatrixService) -> None:
+    def __init__(
+        self,
+        rule_engine: RuleEngineService,
+        document_service: DocumentMatrixService,
+        cache: Optional[EvaluationCache] = None,
+        config_fingerprint: Optional[str] = None,
+    ) -> None:
         self.rule_engine = rule_engine
         self.document_service = document_service
+        # Results are only cached when tied to a config fingerprint.
+        self.cache = cache if config_fingerprint else None
+        self.config_fingerprint = config_fingerprint
 
     def build_case(self, profile: CandidateProfile) -> Case:
-        eligibility = self.rule_engine.evaluate_programs(profile)
+        cached = self._cached_call(profile)
+        evaluation = cached(
+            "rules", ProfileEvaluation, lambda: self.rule_engine.evaluate_profile(profile)
+        )
+        eligibility = evaluation.programs
         program = eligibility.primary_recommendation()
 
         docs = DocumentMatrixResult()
         if program:
-            docs = self.document_service.get_required_documents(profile, program)
+            docs = cached(
+                f"documents:{program}",
+                DocumentMatrixResult,
+                lambda: self.document_service.get_required_documents(profile, program),
+            )
 
         return Case(
             profile=profile,
             program_eligibility=eligibility,
+            program_results=evaluation.crs,
             selected_program=program,
             required_forms=docs.required_forms,
             required_documents=docs.required_documents,
         )
 
+    def _cached_call(
+        self, profile: CandidateProfile
+    ) -> Callable[[str, type[_M], Callable[[], _M]], _M]:
+        cache = self.cache
+        if cache is None:
+            return lambda _namespace, _model, compute: compute()
+        profile_hash = canonical_profile_hash(profile)
+        today = date.today().isoformat()
+
+        def cached(namespace: str, model: type[_M], compute: Callable[[], _M]) -> _M:
+            key = cache.key(namespace, self.config_fingerprint or "", profile_hash, today)
+            return cache.get_or_compute(key, model, compute)
+
+        return cached
@@ -1,6 +1,17 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -24,16 +35,27 @@ class CaseRecord(Base):
         nullable=False,
         default="draft",
     )
-    profile = Column(JSON, nullable=False)
-    program_eligibility = Column(JSON, nullable=False)
+    # Payloads live in case_blobs (see src/app/cases/blob_store.py); the JSON columns
+    # only hold rows written before the blob store and are filled in on load otherwise.
+    profile = Column(JSON, nullable=True)
+    program_eligibility = Column(JSON, nullable=True)
     crs_breakdown = Column(JSON, nullable=True)
     required_artifacts = Column(JSON, nullable=True)
     config_fingerprint = Column(JSON, nullable=True)
+    profile_hash = Column(String(64), nullable=True)
+    program_eligibility_hash = Column(String(64), nullable=True)
+    crs_breakdown_hash = Column(String(64), nullable=True)
+    required_artifacts_hash = Column(String(64), nullable=True)
+    config_fingerprint_hash = Column(String(64), nullable=True)
     tenant_id = Column(String(36), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=True, index=True)
     created_by_user_id = Column(
         String(36), ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
     )
     created_by = Column(String(64), nullable=True)
+    # Last snapshot version handed out; bumped atomically by CaseSnapshotRepository.allocate_version.
+    snapshot_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Last event sequence number handed out (see src/app/cases/event_log.py).
+    event_sequence = Column(Integer, nullable=False, default=0, server_default="0")
 
     tenant = relationship("Tenant", back_populates="cases")
     creator_user = relationship("User", back_populates="created_cases")
@@ -48,7 +70,7 @@ class CaseRecord(Base):
         "CaseEvent",
         back_populates="case",
         cascade="all, delete-orphan",
-        order_by="CaseEvent.created_at",
+        order_by="CaseEvent.sequence",
     )
 
     def __repr__(self) -> str:
@@ -61,6 +83,9 @@ class CaseSnapshot(Base):
     __tablename__ = "case_snapshots"
     __table_args__ = (
         UniqueConstraint("case_id", "version", name="uq_case_snapshots_case_version"),
+        # As-of lookups (src/app/cases/time_travel.py): per case, and per tenant.
+        Index("ix_case_snapshots_case_at", "case_id", "snapshot_at", "version"),
+        Index("ix_case_snapshots_tenant_case_at", "tenant_id", "case_id", "snapshot_at"),
     )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -70,12 +95,24 @@ class CaseSnapshot(Base):
     snapshot_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     source = Column(String(100), nullable=False, index=True)
     tenant_id = Column(String(36), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=True, index=True)
-    profile = Column(JSON, nullable=False)
-    program_eligibility = Column(JSON, nullable=False)
+    # Payloads are NULL on delta rows (src/app/cases/snapshot_store.py); full rows
+    # reference case_blobs by hash like CaseRecord.
+    profile = Column(JSON, nullable=True)
+    program_eligibility = Column(JSON, nullable=True)
     crs_breakdown = Column(JSON, nullable=True)
     required_artifacts = Column(JSON, nullable=True)
     config_fingerprint = Column(JSON, nullable=True)
+    profile_hash = Column(String(64), nullable=True)
+    program_eligibility_hash = Column(String(64), nullable=True)
+    crs_breakdown_hash = Column(String(64), nullable=True)
+    required_artifacts_hash = Column(String(64), nullable=True)
+    config_fingerprint_hash = Column(String(64), nullable=True)
     version = Column(Integer, nullable=False)
+    encoding = Column(String(10), nullable=False, default="full")  # full | delta
+    delta = Column(JSON, nullable=True)  # RFC 6902 patch from the previous version
+    # Denormalized results for bulk as-of queries (no payload rebuild needed).
+    eligible_programs = Column(JSON, nullable=True)
+    crs_total = Column(Integer, nullable=True)
 
     case = relationship("CaseRecord", back_populates="snapshots")
 
@@ -87,6 +124,11 @@ class CaseEvent(Base):
     """Audit events for case evaluations."""
 
     __tablename__ = "case_events"
+    __table_args__ = (
+        UniqueConstraint("case_id", "sequence", name="uq_case_events_case_sequence"),
+        Index("ix_case_events_case_created", "case_id", "created_at"),
+        Index("ix_case_events_tenant_month", "tenant_id", "month", "created_at"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     case_id = Column(
@@ -97,9 +139,159 @@ class CaseEvent(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     actor = Column(String(100), nullable=False, default="system")
     event_metadata = Column("metadata", JSON, nullable=True)
+    sequence = Column(Integer, nullable=True)  # monotonic per case, from 1
+    month = Column(String(7), nullable=True)  # "YYYY-MM" of created_at; not a partition
 
     case = relationship("CaseRecord", back_populates="events")
 
     def __repr__(self) -> str:
         return f"<CaseEvent id={self.id} event_type={self.event_type} case_id={self.case_id}>"
 
+
+
+class CaseReevaluationRun(Base):
+    """Bulk re-evaluation of stored cases against a config generation; doubles as checkpoint."""
+
+    __tablename__ = "case_reevaluation_runs"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    status = Column(String(20), nullable=False, default="running", index=True)
+    config_digest = Column(String(64), nullable=False, index=True)
+    config_fingerprint = Column(JSON, nullable=True)
+    tenant_id = Column(String(36), nullable=True)
+    # Keyset cursor: id of the last case_records row whose chunk was committed.
+    cursor = Column(String(36), nullable=True)
+    processed = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    changed = Column(Integer, nullable=False, default=0)
+    elapsed_seconds = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+
+    changes = relationship(
+        "CaseReevaluationChange",
+        back_populates="run",
+        cascade="all, delete-orphan",
+        order_by="CaseReevaluationChange.case_id",
+    )
+
+    def __repr__(self) -> str:
+        return f"<CaseReevaluationRun id={self.id} status={self.status} processed={self.processed}>"
+
+
+class CaseReevaluationChange(Base):
+    """A case whose eligibility or CRS total moved during a re-evaluation run."""
+
+    __tablename__ = "case_reevaluation_changes"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    run_id = Column(
+        String(36),
+        ForeignKey("case_reevaluation_runs.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    case_id = Column(
+        String(36), ForeignKey("case_records.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    version = Column(Integer, nullable=False)
+    eligible_before = Column(JSON, nullable=False)
+    eligible_after = Column(JSON, nullable=False)
+    crs_before = Column(Integer, nullable=True)
+    crs_after = Column(Integer, nullable=True)
+
+    run = relationship("CaseReevaluationRun", back_populates="changes")
+
+    def __repr__(self) -> str:
+        return f"<CaseReevaluationChange run_id={self.run_id} case_id={self.case_id}>"
+
+
+class CaseBlob(Base):
+    """Content-addressed JSON payload shared by case records and snapshots."""
+
+    __tablename__ = "case_blobs"
+
+    hash = Column(String(64), primary_key=True)  # sha256 of the canonical JSON
+    codec = Column(String(10), nullable=False, default="zlib")  # raw | zlib
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)  # canonical JSON bytes before compression
+    refcount = Column(Integer, nullable=False, default=0)
+    released_at = Column(DateTime(timezone=True), nullable=True, index=True)  # refcount hit 0
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CaseBlob hash={self.hash[:12]} refcount={self.refcount}>"
+
+
+class CaseHistoryArchive(Base):
+    """Compacted cold history of a settled case (see src/app/cases/archive.py)."""
+
+    __tablename__ = "case_history_archives"
+    __table_args__ = (
+        Index("ix_case_history_archives_tenant", "tenant_id", "case_id", "first_snapshot_at"),
+    )
+
+    case_id = Column(
+        String(36), ForeignKey("case_records.id", ondelete="CASCADE"), primary_key=True
+    )
+    tenant_id = Column(String(36), nullable=True)
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+    first_snapshot_at = Column(DateTime(timezone=True), nullable=True)
+    last_version = Column(Integer, nullable=True)  # newest archived snapshot version
+    snapshot_count = Column(Integer, nullable=False, default=0)
+    event_count = Column(Integer, nullable=False, default=0)
+    # Hot index for as-of queries: [[version, snapshot_at, eligible_programs, crs_total], ...]
+    timeline = Column(JSON, nullable=False, default=list)
+    codec = Column(String(10), nullable=False, default="zlib")
+    data = Column(LargeBinary, nullable=False)  # compressed {"snapshots": [...], "events": [...]}
+    size = Column(Integer, nullable=False)  # JSON bytes before compression
+
+    def __repr__(self) -> str:
+        return f"<CaseHistoryArchive case_id={self.case_id} snapshots={self.snapshot_count}>"
+
+
+class CaseSummary(Base):
+    """Denormalized listing row per case, maintained on write (see src/app/cases/summaries.py)."""
+
+    __tablename__ = "case_summaries"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, case_id DESC (optionally per tenant).
+        Index("ix_case_summaries_created", "created_at", "case_id"),
+        Index("ix_case_summaries_tenant_created", "tenant_id", "created_at", "case_id"),
+    )
+
+    case_id = Column(
+        String(36), ForeignKey("case_records.id", ondelete="CASCADE"), primary_key=True
+    )
+    tenant_id = Column(String(36), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    source = Column(String(100), nullable=False)
+    status = Column(String(50), nullable=False, index=True)
+    programs = Column(JSON, nullable=False, default=list)  # program codes in result order
+    eligible_programs = Column(JSON, nullable=False, default=list)
+    crs_total = Column(Integer, nullable=True, index=True)
+
+    def __repr__(self) -> str:
+        return f"<CaseSummary case_id={self.case_id} status={self.status}>"
+
+
+class CaseSummaryProgram(Base):
+    """One program result of a case summary; backs the indexed program filter."""
+
+    __tablename__ = "case_summary_programs"
+    __table_args__ = (
+        Index("ix_case_summary_programs_code", "program_code", "eligible", "case_id"),
+    )
+
+    case_id = Column(
+        String(36), ForeignKey("case_summaries.case_id", ondelete="CASCADE"), primary_key=True
+    )
+    program_code = Column(String(50), primary_key=True)
+    eligible = Column(Boolean, nullable=False, default=False)
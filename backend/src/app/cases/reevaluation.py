@@ -0,0 +1,480 @@
+"""
+Bulk re-evaluation of stored cases after a domain config change.
+
+Editing config/domain/*.yaml changes the config digest but leaves existing
+CaseRecord rows scored against the old rules. ReevaluationJob re-scores them:
+
+- case_records are streamed in keyset-paginated chunks (ORDER BY id, WHERE
+  id > cursor), so memory stays flat and new inserts never shift pages;
+- each chunk's profiles are evaluated by a process pool using the same
+  pipeline as POST /cases/evaluate (src.app.cases.evaluation);
+- new CaseSnapshot versions, the updated CaseRecord state, the audit events and
+  the change rows for the diff report are written with bulk statements in one
+  transaction together with the run's cursor. A chunk is therefore either fully
+  applied or not at all, and an interrupted run resumes after its last
+  committed chunk. Records already carrying the target fingerprint are skipped.
+
+The run row (case_reevaluation_runs) holds the checkpoint, progress counters
+and throughput; case_reevaluation_changes lists every case whose eligible
+programs or CRS total moved.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from src.app.cases.blob_store import PAYLOAD_FIELDS, BlobStore
+from src.app.cases.evaluation import evaluate_profile, history_payload
+from src.app.cases.event_log import CaseEventLog
+from src.app.cases.models_db import (
+    CaseRecord,
+    CaseReevaluationChange,
+    CaseReevaluationRun,
+    CaseSnapshot,
+)
+from src.app.cases.repository import CaseSnapshotRepository
+from src.app.cases.summaries import CaseSummaryStore, result_columns
+from src.app.config import settings
+from src.app.domain_config.registry import get_config_snapshot
+from src.app.rules.models import CandidateProfile
+
+logger = logging.getLogger(__name__)
+
+REEVALUATION_SOURCE = "config_reevaluation"
+REEVALUATION_EVENT = "EVALUATION_REFRESHED"
+
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_FAILED = "failed"
+
+_RESULT_FIELDS = (
+    "program_eligibility",
+    "crs_breakdown",
+    "required_artifacts",
+    "config_fingerprint",
+)
+
+
+def _evaluate_profiles(profiles: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Process-pool worker: evaluate stored profile payloads. Returns, per profile,
+    the persisted result fields or {"error": ...} when the profile cannot be
+    evaluated (e.g. it no longer validates).
+    """
+    results: list[dict[str, Any]] = []
+    for raw in profiles:
+        try:
+            profile = CandidateProfile.model_validate(raw)
+            payload = history_payload(
+                profile=profile, evaluation=evaluate_profile(profile), source=REEVALUATION_SOURCE
+            )
+        except Exception as exc:  # one bad profile must not fail the chunk
+            results.append({"error": f"{type(exc).__name__}: {exc}"})
+            continue
+        results.append({name: payload[name] for name in _RESULT_FIELDS})
+    return results
+
+
+def eligible_programs(program_eligibility: Optional[dict[str, Any]]) -> list[str]:
+    results = (program_eligibility or {}).get("results") or []
+    return sorted(r["program_code"] for r in results if r.get("eligible"))
+
+
+def crs_total(crs_breakdown: Optional[dict[str, Any]]) -> Optional[int]:
+    return (crs_breakdown or {}).get("total")
+
+
+@dataclass
+class _CaseRow:
+    id: str
+    tenant_id: Optional[str]
+    hashes: dict[str, Optional[str]]
+    profile: Any = None
+    program_eligibility: Any = None
+    crs_breakdown: Any = None
+    required_artifacts: Any = None
+    config_fingerprint: Any = None
+
+
+@dataclass
+class ReevaluationProgress:
+    run_id: str
+    status: str
+    processed: int
+    updated: int
+    skipped: int
+    failed: int
+    changed: int
+    elapsed_seconds: float
+    cursor: Optional[str] = None
+
+    @property
+    def throughput(self) -> float:
+        """Cases processed per second."""
+        return self.processed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @classmethod
+    def from_run(
+        cls, run: CaseReevaluationRun, elapsed: Optional[float] = None
+    ) -> ReevaluationProgress:
+        return cls(
+            run_id=run.id,
+            status=run.status,
+            processed=run.processed,
+            updated=run.updated,
+            skipped=run.skipped,
+            failed=run.failed,
+            changed=run.changed,
+            elapsed_seconds=run.elapsed_seconds if elapsed is None else elapsed,
+            cursor=run.cursor,
+        )
+
+
+@dataclass
+class ProgramShift:
+    gained: int = 0
+    lost: int = 0
+
+
+@dataclass
+class ReevaluationReport:
+    progress: ReevaluationProgress
+    programs: dict[str, ProgramShift] = field(default_factory=dict)
+    crs_increased: int = 0
+    crs_decreased: int = 0
+    changes: list[CaseReevaluationChange] = field(default_factory=list)
+
+
+class ReevaluationJob:
+    """Re-score stored cases against the active config generation."""
+
+    def __init__(
+        self,
+        db: Session,
+        *,
+        chunk_size: Optional[int] = None,
+        processes: Optional[int] = None,
+        tenant_id: Optional[str] = None,
+        on_progress: Optional[Callable[[ReevaluationProgress], None]] = None,
+    ) -> None:
+        self.db = db
+        self.chunk_size = max(chunk_size or settings.reevaluation_chunk_size, 1)
+        # processes <= 0 evaluates in-process (tests, tiny tables).
+        self.processes = settings.reevaluation_processes if processes is None else processes
+        self.tenant_id = tenant_id
+        self.on_progress = on_progress
+
+    def start(self) -> CaseReevaluationRun:
+        """
+        Return the unfinished run for the active config digest (to resume it) or
+        create a new one.
+        """
+        snapshot = get_config_snapshot()
+        query = self.db.query(CaseReevaluationRun).filter(
+            CaseReevaluationRun.config_digest == snapshot.digest,
+            CaseReevaluationRun.status != RUN_COMPLETED,
+        )
+        query = query.filter(
+            CaseReevaluationRun.tenant_id.is_(None)
+            if self.tenant_id is None
+            else CaseReevaluationRun.tenant_id == self.tenant_id
+        )
+        run = query.order_by(CaseReevaluationRun.created_at.desc()).first()
+        if run is None:
+            run = CaseReevaluationRun(
+                config_digest=snapshot.digest,
+                config_fingerprint=dict(snapshot.fingerprint),
+                tenant_id=self.tenant_id,
+                status=RUN_RUNNING,
+                processed=0,
+                updated=0,
+                skipped=0,
+                failed=0,
+                changed=0,
+                elapsed_seconds=0,
+            )
+            self.db.add(run)
+        else:
+            run.status, run.error, run.finished_at = RUN_RUNNING, None, None
+        self.db.commit()
+        self.db.refresh(run)
+        return run
+
+    def run(self, run_id: Optional[str] = None) -> ReevaluationProgress:
+        """Process every remaining chunk of the given (or a started/resumed) run."""
+        run = self.db.get(CaseReevaluationRun, run_id) if run_id else self.start()
+        if run is None:
+            raise ValueError(f"Unknown re-evaluation run: {run_id}")
+        if run.status == RUN_COMPLETED:
+            return ReevaluationProgress.from_run(run)
+
+        prior_elapsed = run.elapsed_seconds
+        started = time.perf_counter()
+        executor = self._executor()
+        try:
+            while True:
+                rows = self._next_chunk(run.cursor)
+                if not rows:
+                    break
+                self._apply_chunk(run, rows, executor)
+                elapsed = prior_elapsed + time.perf_counter() - started
+                run.elapsed_seconds = int(elapsed)
+                # Cursor, counters and the chunk's rows commit together: the checkpoint.
+                self.db.commit()
+                self._report(ReevaluationProgress.from_run(run, elapsed))
+        except Exception as exc:
+            self.db.rollback()
+            run.status, run.error = RUN_FAILED, f"{type(exc).__name__}: {exc}"
+            self.db.commit()
+            logger.exception("Case re-evaluation run %s failed", run.id)
+            raise
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        elapsed = prior_elapsed + time.perf_counter() - started
+        run.status = RUN_COMPLETED
+        run.elapsed_seconds = int(elapsed)
+        run.finished_at = datetime.now(timezone.utc)
+        self.db.commit()
+        progress = ReevaluationProgress.from_run(run, elapsed)
+        self._report(progress)
+        return progress
+
+    def _executor(self) -> Optional[Executor]:
+        if self.processes <= 0:
+            return None
+        # spawn: forking a server process that holds threads and DB connections is unsafe.
+        return ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def _next_chunk(self, cursor: Optional[str]) -> list[_CaseRow]:
+        stmt = select(
+            CaseRecord.id,
+            CaseRecord.tenant_id,
+            *(getattr(CaseRecord, name) for name in PAYLOAD_FIELDS),
+            *(getattr(CaseRecord, f"{name}_hash") for name in PAYLOAD_FIELDS),
+        )
+        if cursor is not None:
+            stmt = stmt.where(CaseRecord.id > cursor)
+        if self.tenant_id is not None:
+            stmt = stmt.where(CaseRecord.tenant_id == self.tenant_id)
+        rows = list(self.db.execute(stmt.order_by(CaseRecord.id).limit(self.chunk_size)))
+
+        # One blob lookup per chunk; rows written before the blob store keep inline JSON.
+        blobs = BlobStore(self.db).get_many(
+            getattr(row, f"{name}_hash") for row in rows for name in PAYLOAD_FIELDS
+        )
+        chunk = []
+        for row in rows:
+            hashes = {name: getattr(row, f"{name}_hash") for name in PAYLOAD_FIELDS}
+            payload = {
+                name: blobs.get(key) if key else getattr(row, name) for name, key in hashes.items()
+            }
+            chunk.append(_CaseRow(id=row.id, tenant_id=row.tenant_id, hashes=hashes, **payload))
+        return chunk
+
+    def _evaluate(
+        self, profiles: list[dict[str, Any]], executor: Optional[Executor]
+    ) -> list[dict[str, Any]]:
+        if executor is None:
+            return _evaluate_profiles(profiles)
+        # One slice per worker keeps pickling overhead to a few messages per chunk.
+        size = -(-len(profiles) // self.processes)
+        slices = [profiles[i : i + size] for i in range(0, len(profiles), size)]
+        return [result for part in executor.map(_evaluate_profiles, slices) for result in part]
+
+    def _apply_chunk(
+        self, run: CaseReevaluationRun, rows: list[_CaseRow], executor: Optional[Executor]
+    ) -> None:
+        target = run.config_fingerprint or {}
+        pending = [row for row in rows if row.config_fingerprint != target]
+        run.cursor = rows[-1].id
+        run.processed += len(rows)
+        run.skipped += len(rows) - len(pending)
+        if not pending:
+            return
+
+        results = self._evaluate([row.profile for row in pending], executor)
+        evaluated = [
+            (row, result) for row, result in zip(pending, results, strict=True) if "error" not in result
+        ]
+        for row, result in zip(pending, results, strict=True):
+            if "error" in result:
+                run.failed += 1
+                logger.warning("Re-evaluation of case %s failed: %s", row.id, result["error"])
+        if not evaluated:
+            return
+
+        # Results (and inline legacy profiles) go to the blob store in one upsert. Each
+        # result blob is referenced twice, by the record and by the new snapshot; the
+        # snapshot shares the record's profile blob.
+        blobs = BlobStore(self.db)
+        values = [result[name] for _, result in evaluated for name in _RESULT_FIELDS]
+        legacy_profiles = [row for row, _ in evaluated if not row.hashes["profile"]]
+        stored = iter(blobs.put_many(values + [row.profile for row in legacy_profiles]))
+        result_hashes = [{name: next(stored) for name in _RESULT_FIELDS} for _ in evaluated]
+        profile_hashes = {row.id: next(stored) for row in legacy_profiles}
+        blobs.retain(key for hashes in result_hashes for key in hashes.values())
+        blobs.retain(row.hashes["profile"] for row, _ in evaluated if row.hashes["profile"])
+        blobs.release(row.hashes[name] for row, _ in evaluated for name in _RESULT_FIELDS)
+
+        # One UPDATE ... RETURNING reserves the next version of every case in the chunk.
+        versions = CaseSnapshotRepository(self.db).allocate_versions(row.id for row, _ in evaluated)
+
+        now = datetime.now(timezone.utc)
+        snapshots, records, events, changes = [], [], [], []
+        for (row, result), hashes in zip(evaluated, result_hashes, strict=True):
+            version = versions[row.id]
+            hash_columns = {f"{name}_hash": key for name, key in hashes.items()}
+            outcome = result_columns(result["program_eligibility"], result["crs_breakdown"])
+            snapshots.append(
+                {
+                    "case_id": row.id,
+                    "version": version,
+                    "source": REEVALUATION_SOURCE,
+                    "tenant_id": row.tenant_id,
+                    "encoding": "full",
+                    "profile_hash": row.hashes["profile"] or profile_hashes[row.id],
+                    "snapshot_at": now,
+                    "eligible_programs": outcome["eligible_programs"],
+                    "crs_total": outcome["crs_total"],
+                    **hash_columns,
+                }
+            )
+            records.append(
+                {"id": row.id, **hash_columns, **{name: None for name in _RESULT_FIELDS}}
+            )
+            events.append(
+                {
+                    "case_id": row.id,
+                    "event_type": REEVALUATION_EVENT,
+                    "actor": "system",
+                    "tenant_id": row.tenant_id,
+                    "event_metadata": {
+                        "source": REEVALUATION_SOURCE,
+                        "version": version,
+                        "run_id": run.id,
+                    },
+                }
+            )
+            before = (eligible_programs(row.program_eligibility), crs_total(row.crs_breakdown))
+            after = (
+                eligible_programs(result["program_eligibility"]),
+                crs_total(result["crs_breakdown"]),
+            )
+            if before != after:
+                changes.append(
+                    {
+                        "run_id": run.id,
+                        "case_id": row.id,
+                        "version": version,
+                        "eligible_before": before[0],
+                        "eligible_after": after[0],
+                        "crs_before": before[1],
+                        "crs_after": after[1],
+                    }
+                )
+
+        for model, params in ((CaseSnapshot, snapshots), (CaseReevaluationChange, changes)):
+            self.db.execute(insert(model), params)
+        CaseEventLog(self.db).write(events)
+        self.db.execute(update(CaseRecord), records)
+        CaseSummaryStore(self.db).update_results(
+            {
+                row.id: (result["program_eligibility"], result["crs_breakdown"])
+                for row, result in evaluated
+            }
+        )
+        run.updated += len(snapshots)
+        run.changed += len(changes)
+
+    def _report(self, progress: ReevaluationProgress) -> None:
+        logger.info(
+            "Re-evaluation run %s: %d processed (%d updated, %d skipped, %d failed, %d changed), "
+            "%.1f cases/s",
+            progress.run_id,
+            progress.processed,
+            progress.updated,
+            progress.skipped,
+            progress.failed,
+            progress.changed,
+            progress.throughput,
+        )
+        if self.on_progress is not None:
+            self.on_progress(progress)
+
+
+def build_report(
+    db: Session, run_id: str, limit: Optional[int] = None
+) -> Optional[ReevaluationReport]:
+    """Diff report for a run: per-program gains/losses, CRS direction counts and the changed cases."""
+    run = db.get(CaseReevaluationRun, run_id)
+    if run is None:
+        return None
+    report = ReevaluationReport(progress=ReevaluationProgress.from_run(run))
+    query = (
+        db.query(CaseReevaluationChange)
+        .filter(CaseReevaluationChange.run_id == run_id)
+        .order_by(CaseReevaluationChange.case_id)
+    )
+    for index, change in enumerate(query.yield_per(1000)):
+        before, after = set(change.eligible_before), set(change.eligible_after)
+        for program in after - before:
+            report.programs.setdefault(program, ProgramShift()).gained += 1
+        for program in before - after:
+            report.programs.setdefault(program, ProgramShift()).lost += 1
+        delta = (change.crs_after or 0) - (change.crs_before or 0)
+        report.crs_increased += delta > 0
+        report.crs_decreased += delta < 0
+        if limit is None or index < limit:
+            report.changes.append(change)
+    return report
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """CLI: python -m src.app.cases.reevaluation [--chunk-size N] [--processes N] [--tenant-id ID]"""
+    from src.app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Re-score stored cases against the active config.")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--tenant-id", default=None)
+    parser.add_argument("--run-id", default=None, help="Resume a specific run")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    logging.basicConfig(level=settings.log_level)
+    db = SessionLocal()
+    try:
+        job = ReevaluationJob(
+            db, chunk_size=args.chunk_size, processes=args.processes, tenant_id=args.tenant_id
+        )
+        progress = job.run(args.run_id)
+        report = build_report(db, progress.run_id, limit=0)
+        print(
+            f"run {progress.run_id}: {progress.processed} processed, {progress.updated} updated, "
+            f"{progress.changed} changed, {progress.failed} failed "
+            f"({progress.throughput:.1f} cases/s)"
+        )
+        if report is not None:
+            for program, shift in sorted(report.programs.items()):
+                print(f"  {program}: +{shift.gained} / -{shift.lost} eligible")
+            print(f"  CRS: {report.crs_increased} up, {report.crs_decreased} down")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
-from datetime import datetime
+import logging
+from collections.abc import Iterable
+from datetime import datetime, timezone
 from typing import Any, Optional
 
-from sqlalchemy import func
+from sqlalchemy import case, func, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from src.app.cases.archive import load_archive
+from src.app.cases.blob_store import BlobStore, hydrate
+from src.app.cases.event_log import CaseEventLog
 from src.app.cases.models_db import CaseEvent, CaseRecord, CaseSnapshot
+from src.app.cases.snapshot_store import SnapshotStore
+from src.app.cases.summaries import CaseSummaryStore
+
+logger = logging.getLogger(__name__)
+
+_records = CaseRecord.__table__
 
 
 class CaseRepository:
@@ -28,21 +40,31 @@ class CaseRepository:
         tenant_id: Optional[str] = None,
         created_by: Optional[str] = "system",
         created_by_user_id: Optional[str] = None,
+        case_id: Optional[str] = None,
     ) -> CaseRecord:
         record = CaseRecord(
-            profile=profile,
-            program_eligibility=program_eligibility,
-            crs_breakdown=crs_breakdown,
-            required_artifacts=required_artifacts,
-            config_fingerprint=config_fingerprint,
+            created_at=datetime.now(timezone.utc),
             source=source,
             status=status,
             tenant_id=tenant_id,
             created_by_user_id=created_by_user_id,
             created_by=created_by,
         )
+        if case_id:
+            record.id = case_id
+        # Payloads are stored once in case_blobs; the record keeps their hashes.
+        document = {
+            "profile": profile,
+            "program_eligibility": program_eligibility,
+            "crs_breakdown": crs_breakdown,
+            "required_artifacts": required_artifacts,
+            "config_fingerprint": config_fingerprint,
+        }
+        BlobStore(self.db).assign(record, document)
         self.db.add(record)
         self.db.flush()
+        hydrate(record, document)
+        CaseSummaryStore(self.db).upsert([record])
         return record
 
     def get_case(self, case_id: str, tenant_id: Optional[str] = None) -> Optional[CaseRecord]:
@@ -63,9 +85,94 @@ class CaseRepository:
 class CaseSnapshotRepository:
     """Immutable snapshots per evaluation."""
 
+    # Savepoint retries when an allocated version is already taken.
+    VERSION_RETRIES = 3
+
     def __init__(self, db: Session) -> None:
         self.db = db
 
+    def allocate_version(self, case_id: str) -> int:
+        """
+        Reserve the case's next snapshot version by bumping case_records.snapshot_version
+        (UPDATE ... RETURNING, one round trip). The row lock taken by the UPDATE
+        serializes concurrent writers until their transaction ends, so no two of them
+        get the same number.
+        """
+        version = self.allocate_versions([case_id]).get(case_id)
+        if version is None:
+            raise LookupError(f"Case {case_id} does not exist")
+        return version
+
+    def allocate_versions(self, case_ids: Iterable[str]) -> dict[str, int]:
+        """allocate_version() for many cases in one statement; returns {case_id: version}."""
+        ids = list(dict.fromkeys(case_ids))
+        if not ids:
+            return {}
+        # A counter that lags the stored snapshots (rows written without it) catches up
+        # here: the indexed max(version) lookup keeps the allocation self-healing.
+        counter = func.coalesce(_records.c.snapshot_version, 0)
+        stored = (
+            select(func.coalesce(func.max(CaseSnapshot.version), 0))
+            .where(CaseSnapshot.case_id == _records.c.id)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(_records)
+            .where(_records.c.id.in_(ids))
+            .values(snapshot_version=case((counter >= stored, counter), else_=stored) + 1)
+        )
+        if self.db.get_bind().dialect.update_returning:
+            rows = self.db.execute(stmt.returning(_records.c.id, _records.c.snapshot_version))
+            return dict(rows.all())
+        self.db.execute(stmt)
+        rows = self.db.execute(
+            select(_records.c.id, _records.c.snapshot_version).where(_records.c.id.in_(ids))
+        )
+        return dict(rows.all())
+
+    def append_snapshot(
+        self,
+        *,
+        case_id: str,
+        profile: dict[str, Any],
+        program_eligibility: dict[str, Any],
+        crs_breakdown: Optional[dict[str, Any]],
+        required_artifacts: Optional[dict[str, Any]],
+        config_fingerprint: Optional[dict[str, Any]],
+        source: str,
+        snapshot_at: Optional[datetime] = None,
+        tenant_id: Optional[str] = None,
+    ) -> CaseSnapshot:
+        """
+        Write the case's next snapshot under a freshly allocated version. Should the
+        insert still collide (a concurrent writer that bypasses the counter), it is
+        rolled back to a savepoint and retried with a new version.
+        """
+        attempt = 1
+        while True:
+            version = self.allocate_version(case_id)
+            try:
+                with self.db.begin_nested():
+                    return self.create_snapshot(
+                        case_id=case_id,
+                        version=version,
+                        profile=profile,
+                        program_eligibility=program_eligibility,
+                        crs_breakdown=crs_breakdown,
+                        required_artifacts=required_artifacts,
+                        config_fingerprint=config_fingerprint,
+                        source=source,
+                        snapshot_at=snapshot_at,
+                        tenant_id=tenant_id,
+                    )
+            except IntegrityError:
+                if attempt >= self.VERSION_RETRIES:
+                    raise
+                logger.warning(
+                    "Snapshot version %d of case %s already exists; retrying", version, case_id
+                )
+                attempt += 1
+
     def next_version(self, case_id: str) -> int:
         current = (
             self.db.query(func.max(CaseSnapshot.version))
@@ -88,36 +195,50 @@ class CaseSnapshotRepository:
         snapshot_at: Optional[datetime] = None,
         tenant_id: Optional[str] = None,
     ) -> CaseSnapshot:
-        snapshot = CaseSnapshot(
+        # Stored as a full base row or a JSON-patch delta from the previous version.
+        return SnapshotStore(self.db).write(
             case_id=case_id,
             version=version,
-            profile=profile,
-            program_eligibility=program_eligibility,
-            crs_breakdown=crs_breakdown,
-            required_artifacts=required_artifacts,
-            config_fingerprint=config_fingerprint,
+            document={
+                "profile": profile,
+                "program_eligibility": program_eligibility,
+                "crs_breakdown": crs_breakdown,
+                "required_artifacts": required_artifacts,
+                "config_fingerprint": config_fingerprint,
+            },
             source=source,
             snapshot_at=snapshot_at,
             tenant_id=tenant_id,
         )
-        self.db.add(snapshot)
-        self.db.flush()
-        return snapshot
+
+    def get_snapshot(self, case_id: str, version: int) -> Optional[dict[str, Any]]:
+        """Materialized payload of one version (None if it does not exist)."""
+        document = SnapshotStore(self.db).materialize(case_id, version)
+        if document is None:
+            # Older versions of compacted cases live in the archive.
+            archive = load_archive(self.db, case_id)
+            document = archive.document(version) if archive is not None else None
+        return document
+
+    def latest_version(self, case_id: str) -> int:
+        return self.next_version(case_id) - 1
 
     def list_snapshots(self, case_id: str) -> list[CaseSnapshot]:
-        return (
+        snapshots = (
             self.db.query(CaseSnapshot)
             .filter(CaseSnapshot.case_id == case_id)
             .order_by(CaseSnapshot.version.asc())
             .all()
         )
+        return SnapshotStore(self.db).hydrate(snapshots)
 
 
 class CaseEventRepository:
-    """Audit events for case evaluations."""
+    """Audit events for case evaluations (buffered through CaseEventLog)."""
 
     def __init__(self, db: Session) -> None:
         self.db = db
+        self.log = CaseEventLog(db)
 
     def log_event(
         self,
@@ -128,22 +249,28 @@ class CaseEventRepository:
         tenant_id: Optional[str] = None,
         metadata: Optional[dict[str, Any]] = None,
     ) -> CaseEvent:
-        event = CaseEvent(
+        """
+        Buffer an event; it is written with the rest of the batch when the
+        transaction commits. The returned event is not persisted yet: its id and
+        created_at are set, but sequence stays None until the buffer is written
+        (commit, list_events or CaseEventLog.flush()).
+        """
+        return self.log.append(
             event_type=event_type,
             case_id=case_id,
             actor=actor,
             tenant_id=tenant_id,
-            event_metadata=metadata or {},
-        )
-        self.db.add(event)
-        self.db.flush()
-        return event
-
-    def list_events(self, case_id: str) -> list[CaseEvent]:
-        return (
-            self.db.query(CaseEvent)
-            .filter(CaseEvent.case_id == case_id)
-            .order_by(CaseEvent.created_at.asc())
-            .all()
+            metadata=metadata,
         )
 
+    def list_events(
+        self,
+        case_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> list[CaseEvent]:
+        events = self.log.scan(case_id, since=since, until=until)
+        archive = load_archive(self.db, case_id)
+        if archive is not None:
+            events = archive.case_events(since, until) + events
+        return events
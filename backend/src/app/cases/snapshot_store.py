@@ -0,0 +1,323 @@
+"""
+Delta-encoded storage for case snapshots.
+
+Most snapshot versions repeat their predecessor: a lifecycle transition copies
+the record unchanged, a re-evaluation touches a few result fields. Instead of a
+full JSON copy per version, SnapshotStore writes
+
+- a full row ("full": payload columns set) for the first version and then at
+  most every `full_interval` versions, and
+- delta rows in between ("delta": payload columns NULL, `delta` holds the
+  RFC 6902 patch from the previous version's document).
+
+Any version is rebuilt by applying the deltas after its nearest full row, so a
+read touches at most `full_interval` rows. Materialized documents are kept in a
+process-wide LRU keyed by row id (snapshots are immutable). Full rows may appear
+anywhere (bulk writers store them directly); they simply start a new chain.
+
+Existing all-full histories are converted with reencode_snapshots()
+(python -m src.app.cases.snapshot_store).
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import func, null, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.app.cases.blob_store import PAYLOAD_FIELDS, BlobStore
+from src.app.cases.json_patch import apply_patch, make_patch
+from src.app.cases.models_db import CaseSnapshot
+from src.app.cases.summaries import result_columns
+from src.app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FULL = "full"
+SNAPSHOT_DELTA = "delta"
+
+
+def snapshot_document(snapshot: CaseSnapshot) -> dict[str, Any]:
+    """Payload of a full snapshot row."""
+    return {name: getattr(snapshot, name) for name in PAYLOAD_FIELDS}
+
+
+class SnapshotCache:
+    """
+    LRU of materialized snapshot documents keyed by snapshot row id. Row ids are
+    never reused, so an entry cached from a transaction that later rolls back
+    (freeing its version number for another writer) can never be served for the
+    row that takes the version.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, snapshot_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            document = self._entries.get(snapshot_id)
+            if document is None:
+                return None
+            self._entries.move_to_end(snapshot_id)
+        return copy.deepcopy(document)
+
+    def put(self, snapshot_id: str, document: dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        stored = copy.deepcopy(document)
+        with self._lock:
+            self._entries[snapshot_id] = stored
+            self._entries.move_to_end(snapshot_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache: Optional[SnapshotCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_snapshot_cache() -> SnapshotCache:
+    """Process-wide materialization cache (sized by settings.snapshot_cache_size)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SnapshotCache(max_entries=settings.snapshot_cache_size)
+    return _cache
+
+
+class SnapshotStore:
+    """Writes full/delta snapshot rows and rebuilds any version on demand."""
+
+    def __init__(
+        self,
+        db: Session,
+        full_interval: Optional[int] = None,
+        cache: Optional[SnapshotCache] = None,
+    ) -> None:
+        self.db = db
+        self.full_interval = max(full_interval or settings.snapshot_full_interval, 1)
+        self.cache = cache if cache is not None else get_snapshot_cache()
+
+    def write(
+        self,
+        *,
+        case_id: str,
+        version: int,
+        document: dict[str, Any],
+        source: str,
+        snapshot_at: Optional[datetime] = None,
+        tenant_id: Optional[str] = None,
+    ) -> CaseSnapshot:
+        previous, last_full = self.db.execute(
+            select(
+                func.max(CaseSnapshot.version),
+                func.max(CaseSnapshot.version).filter(CaseSnapshot.encoding == SNAPSHOT_FULL),
+            ).where(CaseSnapshot.case_id == case_id, CaseSnapshot.version < version)
+        ).one()
+
+        results = result_columns(document.get("program_eligibility"), document.get("crs_breakdown"))
+        snapshot = CaseSnapshot(
+            case_id=case_id,
+            version=version,
+            source=source,
+            snapshot_at=snapshot_at or datetime.now(timezone.utc),
+            tenant_id=tenant_id,
+            eligible_programs=results["eligible_programs"],
+            crs_total=results["crs_total"],
+        )
+        base = None
+        if (
+            previous is not None
+            and last_full is not None
+            and version - last_full < self.full_interval
+        ):
+            base = self.materialize(case_id, previous)
+        if base is None:
+            snapshot.encoding = SNAPSHOT_FULL
+            BlobStore(self.db).assign(snapshot, document)
+        else:
+            snapshot.encoding = SNAPSHOT_DELTA
+            snapshot.delta = make_patch(base, document)
+        self.db.add(snapshot)
+        self.db.flush()
+
+        full = {name: document.get(name) for name in PAYLOAD_FIELDS}
+        self._hydrate(snapshot, full)
+        self.cache.put(snapshot.id, full)
+        return snapshot
+
+    def materialize(self, case_id: str, version: int) -> Optional[dict[str, Any]]:
+        """Document of one version, or None if the version does not exist."""
+        base_version = (
+            select(func.max(CaseSnapshot.version))
+            .where(
+                CaseSnapshot.case_id == case_id,
+                CaseSnapshot.version <= version,
+                CaseSnapshot.encoding == SNAPSHOT_FULL,
+            )
+            .scalar_subquery()
+        )
+        chain = self.db.execute(
+            select(CaseSnapshot.id, CaseSnapshot.version)
+            .where(
+                CaseSnapshot.case_id == case_id,
+                CaseSnapshot.version >= base_version,
+                CaseSnapshot.version <= version,
+            )
+            .order_by(CaseSnapshot.version.asc())
+        ).all()
+        if not chain or chain[-1].version != version:
+            return None
+
+        # Start from the newest version already in the cache and load only the rows after it.
+        document: Optional[dict[str, Any]] = None
+        start = 0
+        for index in range(len(chain) - 1, -1, -1):
+            document = self.cache.get(chain[index].id)
+            if document is not None:
+                start = index + 1
+                break
+        if start == len(chain):
+            return document
+        rows = (
+            self.db.query(CaseSnapshot)
+            .filter(CaseSnapshot.id.in_([link.id for link in chain[start:]]))
+            .order_by(CaseSnapshot.version.asc())
+            .all()
+        )
+        for row in rows:
+            if row.encoding == SNAPSHOT_DELTA:
+                document = apply_patch(document, row.delta or [])
+                self._hydrate(row, document)
+            else:
+                document = snapshot_document(row)
+            self.cache.put(row.id, document)
+        return document
+
+    def hydrate(self, snapshots: list[CaseSnapshot]) -> list[CaseSnapshot]:
+        """
+        Fill the payload attributes of delta rows in place (without marking them
+        dirty). `snapshots` must be one case's consecutive versions starting at a
+        full row, as returned by list_snapshots.
+        """
+        document: Optional[dict[str, Any]] = None
+        for snapshot in snapshots:
+            if snapshot.encoding != SNAPSHOT_DELTA:
+                document = snapshot_document(snapshot)
+            else:
+                cached = self.cache.get(snapshot.id)
+                if cached is None:
+                    if document is None:
+                        raise ValueError(
+                            f"Snapshot {snapshot.case_id} v{snapshot.version} has no base version"
+                        )
+                    cached = apply_patch(document, snapshot.delta or [])
+                document = cached
+                self._hydrate(snapshot, document)
+            self.cache.put(snapshot.id, document)
+        return snapshots
+
+    def reencode_case(self, case_id: str) -> int:
+        """Rewrite a case's full rows as deltas per the interval policy; returns rows converted."""
+        snapshots = (
+            self.db.query(CaseSnapshot)
+            .filter(CaseSnapshot.case_id == case_id)
+            .order_by(CaseSnapshot.version.asc())
+            .all()
+        )
+        self.hydrate(snapshots)
+        blobs = BlobStore(self.db)
+        documents = [snapshot_document(snapshot) for snapshot in snapshots]
+        converted = 0
+        last_full: Optional[int] = None
+        for index, (snapshot, document) in enumerate(zip(snapshots, documents, strict=True)):
+            keep_full = last_full is None or snapshot.version - last_full >= self.full_interval
+            if keep_full and snapshot.encoding != SNAPSHOT_FULL:
+                snapshot.encoding, snapshot.delta = SNAPSHOT_FULL, None
+                blobs.assign(snapshot, document)
+            elif not keep_full and snapshot.encoding == SNAPSHOT_FULL:
+                snapshot.encoding = SNAPSHOT_DELTA
+                snapshot.delta = make_patch(documents[index - 1], document)
+                blobs.release(snapshot.__dict__.get(f"{name}_hash") for name in PAYLOAD_FIELDS)
+                for name in PAYLOAD_FIELDS:
+                    setattr(snapshot, f"{name}_hash", None)
+                    setattr(snapshot, name, null())
+                converted += 1
+            if keep_full:
+                last_full = snapshot.version
+        self.db.flush()
+        for snapshot, document in zip(snapshots, documents, strict=True):
+            self._hydrate(snapshot, document)
+        return converted
+
+    @staticmethod
+    def _hydrate(snapshot: CaseSnapshot, document: dict[str, Any]) -> None:
+        for name in PAYLOAD_FIELDS:
+            set_committed_value(snapshot, name, copy.deepcopy(document.get(name)))
+
+
+def reencode_snapshots(
+    db: Session, chunk_size: int = 500, full_interval: Optional[int] = None
+) -> int:
+    """
+    Migrate existing full-copy histories to delta encoding, one committed chunk
+    of cases at a time (safe to re-run). Returns the number of rows converted.
+    """
+    store = SnapshotStore(db, full_interval=full_interval)
+    converted = 0
+    cursor: Optional[str] = None
+    while True:
+        stmt = select(CaseSnapshot.case_id).distinct().order_by(CaseSnapshot.case_id)
+        if cursor is not None:
+            stmt = stmt.where(CaseSnapshot.case_id > cursor)
+        case_ids = list(db.execute(stmt.limit(chunk_size)).scalars())
+        if not case_ids:
+            return converted
+        for case_id in case_ids:
+            converted += store.reencode_case(case_id)
+        db.commit()
+        cursor = case_ids[-1]
+        logger.info("Re-encoded snapshots up to case %s (%d rows converted)", cursor, converted)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """CLI: python -m src.app.cases.snapshot_store [--chunk-size N] [--full-interval N]"""
+    from src.app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Delta-encode existing case snapshots.")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--full-interval", type=int, default=None)
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    logging.basicConfig(level=settings.log_level)
+    db = SessionLocal()
+    try:
+        converted = reencode_snapshots(
+            db, chunk_size=args.chunk_size, full_interval=args.full_interval
+        )
+        print(f"{converted} snapshot rows converted to deltas")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Denormalized case listing.
+
+GET /case-history used to load full CaseRecord rows (large JSON payloads) and
+dig program codes and the CRS total out of them in Python. case_summaries holds
+exactly what the listing shows: status, tenant, program codes with their
+eligibility flags (also in case_summary_programs, for the indexed program
+filter) and the CRS total. Rows are written together with the record:
+
+- CaseRepository.create_case inserts the summary,
+- CaseLifecycleService transitions update its status,
+- the re-evaluation job refreshes programs and CRS in bulk.
+
+list_summaries() pages with an opaque keyset cursor over (created_at, case_id),
+newest first, so deep pages cost the same as the first one. Cases created before
+the table existed are added with backfill_summaries()
+(python -m src.app.cases.summaries).
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from src.app.cases.models_db import CaseRecord, CaseSummary, CaseSummaryProgram
+from src.app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def program_results(program_eligibility: Any) -> list[tuple[str, bool]]:
+    """(program_code, eligible) per result, in result order, first occurrence wins."""
+    if not isinstance(program_eligibility, dict):
+        return []
+    results = program_eligibility.get("results", [])
+    if not isinstance(results, list):
+        return []
+    seen: dict[str, bool] = {}
+    for res in results:
+        if isinstance(res, dict) and res.get("program_code"):
+            seen.setdefault(str(res["program_code"]), bool(res.get("eligible")))
+    return list(seen.items())
+
+
+def crs_total(crs_breakdown: Any) -> int | None:
+    if not isinstance(crs_breakdown, dict):
+        return None
+    if isinstance(crs_breakdown.get("total"), int | float):
+        return int(crs_breakdown["total"])
+    if isinstance(crs_breakdown.get("total_points"), int | float):
+        return int(crs_breakdown["total_points"])
+    breakdown = crs_breakdown.get("breakdown")
+    if isinstance(breakdown, dict):
+        total = sum(v for v in breakdown.values() if isinstance(v, int | float))
+        return int(total)
+    return None
+
+
+def result_columns(program_eligibility: Any, crs_breakdown: Any) -> dict[str, Any]:
+    """programs / eligible_programs / crs_total, as stored on summaries (and snapshots)."""
+    programs = program_results(program_eligibility)
+    return {
+        "programs": [code for code, _ in programs],
+        "eligible_programs": [code for code, eligible in programs if eligible],
+        "crs_total": crs_total(crs_breakdown),
+    }
+
+
+def encode_cursor(summary: CaseSummary) -> str:
+    raw = json.dumps([summary.created_at.isoformat(), summary.case_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, case_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(case_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+@dataclass
+class SummaryPage:
+    items: list[CaseSummary]
+    next_cursor: Optional[str] = None
+
+
+class CaseSummaryStore:
+    """Writes and pages case_summaries."""
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def upsert(self, records: Iterable[CaseRecord]) -> None:
+        """(Re)write the summaries of fully loaded records."""
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "case_id": record.id,
+                "tenant_id": record.tenant_id,
+                "created_at": record.created_at or now,
+                "updated_at": now,
+                "source": record.source,
+                "status": record.status or "draft",
+                **self._results(record.program_eligibility, record.crs_breakdown),
+            }
+            for record in records
+        ]
+        if not rows:
+            return
+        ids = [row["case_id"] for row in rows]
+        self.db.execute(delete(CaseSummaryProgram).where(CaseSummaryProgram.case_id.in_(ids)))
+        self.db.execute(delete(CaseSummary).where(CaseSummary.case_id.in_(ids)))
+        self.db.execute(insert(CaseSummary), rows)
+        self._write_programs(rows)
+
+    def update_status(self, case_id: str, status: str) -> None:
+        self.update_statuses([case_id], status)
+
+    def update_statuses(self, case_ids: list[str], status: str) -> None:
+        if not case_ids:
+            return
+        self.db.execute(
+            update(CaseSummary)
+            .where(CaseSummary.case_id.in_(case_ids))
+            .values(status=status, updated_at=datetime.now(timezone.utc))
+        )
+
+    def update_results(self, results: dict[str, tuple[Any, Any]]) -> None:
+        """Refresh programs/CRS from {case_id: (program_eligibility, crs_breakdown)}."""
+        if not results:
+            return
+        now = datetime.now(timezone.utc)
+        existing = set(
+            self.db.execute(
+                select(CaseSummary.case_id).where(CaseSummary.case_id.in_(list(results)))
+            ).scalars()
+        )
+        rows = [
+            {"case_id": case_id, "updated_at": now, **self._results(*results[case_id])}
+            for case_id in results
+            if case_id in existing
+        ]
+        if not rows:
+            return
+        self.db.execute(
+            delete(CaseSummaryProgram).where(CaseSummaryProgram.case_id.in_(list(existing)))
+        )
+        self.db.execute(update(CaseSummary), rows)
+        self._write_programs(rows)
+
+    def list_summaries(
+        self,
+        *,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        status: Optional[str] = None,
+        program: Optional[str] = None,
+        eligible: Optional[bool] = None,
+        crs_min: Optional[int] = None,
+        crs_max: Optional[int] = None,
+    ) -> SummaryPage:
+        """Newest-first page of summaries; raises ValueError for a malformed cursor."""
+        stmt = select(CaseSummary)
+        if cursor:
+            created_at, case_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                tuple_(CaseSummary.created_at, CaseSummary.case_id) < tuple_(created_at, case_id)
+            )
+        if tenant_id is not None:
+            stmt = stmt.where(CaseSummary.tenant_id == tenant_id)
+        if status is not None:
+            stmt = stmt.where(CaseSummary.status == status)
+        if program is not None:
+            match = select(CaseSummaryProgram.case_id).where(
+                CaseSummaryProgram.program_code == program
+            )
+            if eligible is not None:
+                match = match.where(CaseSummaryProgram.eligible.is_(eligible))
+            stmt = stmt.where(CaseSummary.case_id.in_(match))
+        if crs_min is not None:
+            stmt = stmt.where(CaseSummary.crs_total >= crs_min)
+        if crs_max is not None:
+            stmt = stmt.where(CaseSummary.crs_total <= crs_max)
+        stmt = stmt.order_by(CaseSummary.created_at.desc(), CaseSummary.case_id.desc())
+
+        items = list(self.db.execute(stmt.limit(limit + 1)).scalars())
+        next_cursor = encode_cursor(items[limit - 1]) if len(items) > limit else None
+        return SummaryPage(items=items[:limit], next_cursor=next_cursor)
+
+    @staticmethod
+    def _results(program_eligibility: Any, crs_breakdown: Any) -> dict[str, Any]:
+        return result_columns(program_eligibility, crs_breakdown)
+
+    def _write_programs(self, rows: list[dict[str, Any]]) -> None:
+        programs = [
+            {
+                "case_id": row["case_id"],
+                "program_code": code,
+                "eligible": code in row["eligible_programs"],
+            }
+            for row in rows
+            for code in row["programs"]
+        ]
+        if programs:
+            self.db.execute(insert(CaseSummaryProgram), programs)
+
+
+def backfill_summaries(db: Session, chunk_size: int = 500) -> int:
+    """
+    Write summaries for cases that have none, one committed chunk at a time
+    (safe to re-run). Returns the number of summaries written.
+    """
+    store = CaseSummaryStore(db)
+    written = 0
+    cursor: Optional[str] = None
+    while True:
+        query = db.query(CaseRecord).filter(~CaseRecord.id.in_(select(CaseSummary.case_id)))
+        if cursor is not None:
+            query = query.filter(CaseRecord.id > cursor)
+        records = query.order_by(CaseRecord.id).limit(chunk_size).all()
+        if not records:
+            return written
+        store.upsert(records)
+        db.commit()
+        written += len(records)
+        cursor = records[-1].id
+        logger.info("Wrote %d case summaries", written)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """CLI: python -m src.app.cases.summaries [--chunk-size N]"""
+    from src.app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Backfill case_summaries for existing cases.")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    logging.basicConfig(level=settings.log_level)
+    db = SessionLocal()
+    try:
+        print(f"{backfill_summaries(db, chunk_size=args.chunk_size)} case summaries written")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Point-in-time ("as of") case queries.
+
+A case's state at time T is its snapshot with the highest version whose
+snapshot_at is at or before T (versions increase with time). Both lookups are
+index seeks instead of loading and scanning every snapshot:
+
+- snapshot_as_of(): one descending probe of (case_id, snapshot_at, version),
+  then SnapshotStore.materialize() rebuilds that version (at most
+  `snapshot_full_interval` rows).
+- eligibility_as_of(): per-case max(version) over (tenant_id, case_id,
+  snapshot_at) joined back to the snapshot row, answered from the denormalized
+  eligible_programs / crs_total snapshot columns in one query, a page of cases
+  at a time.
+
+Snapshots written before those columns existed are rebuilt on the fly and can
+be filled in with backfill_snapshot_results() (python -m src.app.cases.time_travel).
+
+Versions moved out by compaction (src/app/cases/archive.py) are answered from
+the archive: its uncompressed timeline for eligibility, the decoded document
+for a single case.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.orm import Session
+
+from src.app.cases.archive import load_archive
+from src.app.cases.models_db import CaseHistoryArchive, CaseSnapshot
+from src.app.cases.snapshot_store import SnapshotStore
+from src.app.cases.summaries import result_columns
+from src.app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _utc(moment: datetime) -> datetime:
+    # Snapshot times are stored in UTC; naive inputs are taken to be UTC already.
+    return moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class SnapshotAsOf:
+    id: str
+    case_id: str
+    version: int
+    snapshot_at: datetime
+    source: str
+    document: dict[str, Any]
+
+
+@dataclass
+class EligibilityAsOf:
+    case_id: str
+    version: int
+    snapshot_at: datetime
+    eligible_programs: list[str]
+    crs_total: Optional[int]
+
+
+def snapshot_as_of(db: Session, case_id: str, moment: datetime) -> Optional[SnapshotAsOf]:
+    """The case as of `moment`, or None if it had no snapshot yet."""
+    row = db.execute(
+        select(CaseSnapshot.id, CaseSnapshot.version, CaseSnapshot.snapshot_at, CaseSnapshot.source)
+        .where(CaseSnapshot.case_id == case_id, CaseSnapshot.snapshot_at <= _utc(moment))
+        .order_by(CaseSnapshot.snapshot_at.desc(), CaseSnapshot.version.desc())
+        .limit(1)
+    ).first()
+    if row is None:
+        return _archived_as_of(db, case_id, moment)
+    document = SnapshotStore(db).materialize(case_id, row.version)
+    if document is None:
+        return None
+    return SnapshotAsOf(
+        id=row.id,
+        case_id=case_id,
+        version=row.version,
+        snapshot_at=row.snapshot_at,
+        source=row.source,
+        document=document,
+    )
+
+
+def _archived_as_of(db: Session, case_id: str, moment: datetime) -> Optional[SnapshotAsOf]:
+    archive = load_archive(db, case_id)
+    found = archive.as_of(_utc(moment)) if archive is not None else None
+    if found is None:
+        return None
+    entry, document = found
+    return SnapshotAsOf(
+        id=entry["id"],
+        case_id=case_id,
+        version=entry["version"],
+        snapshot_at=datetime.fromisoformat(entry["snapshot_at"]),
+        source=entry["source"],
+        document=document,
+    )
+
+
+def eligibility_as_of(
+    db: Session,
+    tenant_id: str,
+    moment: datetime,
+    *,
+    limit: int = 500,
+    after_case_id: Optional[str] = None,
+) -> tuple[list[EligibilityAsOf], Optional[str]]:
+    """
+    Eligibility of the tenant's cases as of `moment`, ordered by case id. Returns
+    one page and the case id to pass as `after_case_id` for the next (None at the end).
+    """
+    moment = _utc(moment)
+    latest = select(CaseSnapshot.case_id, func.max(CaseSnapshot.version).label("version")).where(
+        CaseSnapshot.tenant_id == tenant_id, CaseSnapshot.snapshot_at <= moment
+    )
+    archived = select(CaseHistoryArchive.case_id, CaseHistoryArchive.timeline).where(
+        CaseHistoryArchive.tenant_id == tenant_id, CaseHistoryArchive.first_snapshot_at <= moment
+    )
+    if after_case_id is not None:
+        latest = latest.where(CaseSnapshot.case_id > after_case_id)
+        archived = archived.where(CaseHistoryArchive.case_id > after_case_id)
+    latest = (
+        latest.group_by(CaseSnapshot.case_id)
+        .order_by(CaseSnapshot.case_id)
+        .limit(limit + 1)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            CaseSnapshot.case_id,
+            CaseSnapshot.version,
+            CaseSnapshot.snapshot_at,
+            CaseSnapshot.eligible_programs,
+            CaseSnapshot.crs_total,
+        )
+        .join(
+            latest,
+            and_(
+                CaseSnapshot.case_id == latest.c.case_id,
+                CaseSnapshot.version == latest.c.version,
+            ),
+        )
+        .order_by(CaseSnapshot.case_id)
+    ).all()
+
+    # Compacted cases whose hot snapshot is newer than `moment` are answered from
+    # their archive timeline. Both lists are in case id order, so the first
+    # limit + 1 of each cover the page.
+    hot = {row.case_id: row for row in rows}
+    timelines = dict(
+        db.execute(archived.order_by(CaseHistoryArchive.case_id).limit(limit + 1)).all()
+    )
+    page = sorted(hot.keys() | timelines.keys())
+
+    store = SnapshotStore(db)
+    items = []
+    for case_id in page[:limit]:
+        row = hot.get(case_id)
+        if row is None:
+            items.append(_timeline_as_of(case_id, timelines[case_id], moment))
+            continue
+        eligible, crs = row.eligible_programs, row.crs_total
+        if eligible is None:  # written before the results columns existed
+            document = store.materialize(row.case_id, row.version) or {}
+            outcome = result_columns(
+                document.get("program_eligibility"), document.get("crs_breakdown")
+            )
+            eligible, crs = outcome["eligible_programs"], outcome["crs_total"]
+        items.append(
+            EligibilityAsOf(
+                case_id=row.case_id,
+                version=row.version,
+                snapshot_at=row.snapshot_at,
+                eligible_programs=eligible,
+                crs_total=crs,
+            )
+        )
+    next_case_id = items[-1].case_id if len(page) > limit else None
+    return items, next_case_id
+
+
+def _timeline_as_of(case_id: str, timeline: list[list[Any]], moment: datetime) -> EligibilityAsOf:
+    version, snapshot_at, eligible, crs = max(
+        (entry for entry in timeline if datetime.fromisoformat(entry[1]) <= moment),
+        key=lambda entry: entry[0],
+    )
+    return EligibilityAsOf(
+        case_id=case_id,
+        version=version,
+        snapshot_at=datetime.fromisoformat(snapshot_at),
+        eligible_programs=eligible,
+        crs_total=crs,
+    )
+
+
+def backfill_snapshot_results(db: Session, chunk_size: int = 500) -> int:
+    """
+    Fill eligible_programs / crs_total of older snapshots, one committed chunk of
+    cases at a time (safe to re-run). Returns the number of snapshots updated.
+    """
+    store = SnapshotStore(db)
+    updated = 0
+    cursor: Optional[str] = None
+    while True:
+        stmt = (
+            select(CaseSnapshot.case_id)
+            .where(CaseSnapshot.eligible_programs.is_(None))
+            .distinct()
+            .order_by(CaseSnapshot.case_id)
+        )
+        if cursor is not None:
+            stmt = stmt.where(CaseSnapshot.case_id > cursor)
+        case_ids = list(db.execute(stmt.limit(chunk_size)).scalars())
+        if not case_ids:
+            return updated
+        for case_id in case_ids:
+            snapshots = (
+                db.query(CaseSnapshot)
+                .filter(CaseSnapshot.case_id == case_id)
+                .order_by(CaseSnapshot.version.asc())
+                .populate_existing()
+                .all()
+            )
+            params = []
+            for snapshot in store.hydrate(snapshots):
+                if snapshot.eligible_programs is None:
+                    outcome = result_columns(snapshot.program_eligibility, snapshot.crs_breakdown)
+                    params.append(
+                        {
+                            "id": snapshot.id,
+                            "eligible_programs": outcome["eligible_programs"],
+                            "crs_total": outcome["crs_total"],
+                        }
+                    )
+            if params:
+                db.execute(update(CaseSnapshot), params)
+            updated += len(params)
+        db.commit()
+        cursor = case_ids[-1]
+        logger.info("Filled snapshot results up to case %s (%d rows)", cursor, updated)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """CLI: python -m src.app.cases.time_travel [--chunk-size N]"""
+    from src.app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Fill as-of result columns of old snapshots.")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    logging.basicConfig(level=settings.log_level)
+    db = SessionLocal()
+    try:
+        updated = backfill_snapshot_results(db, chunk_size=args.chunk_size)
+        print(f"{updated} snapshots updated")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
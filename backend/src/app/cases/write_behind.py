@@ -0,0 +1,234 @@
+"""
+Write-behind persistence for case evaluations.
+
+Evaluation requests hand the record + snapshot + event write to background
+writer threads instead of committing on the event loop. Each write runs in its
+own session and transaction (CaseHistoryService.persist_evaluation). Every
+write has a write_id whose status (pending -> committed | failed) can be
+polled, so callers may return an evaluation before its history row is durable.
+The snapshot version is only known once the write lands; it is reported on the
+write status, not guessed up front.
+
+Pending and failed statuses live in the process that accepted the write. The
+write_id starts with the pre-assigned case id, and every write creates that
+case, so write_status() reports a write committed by any process (or before a
+restart) from its case_records row.
+
+Writes are sharded by case id over `settings.history_writers` writer threads,
+each draining its own FIFO. Writes to different cases commit in parallel, and
+writes to one case still apply in submission order. SQLite admits one writer
+at a time, so writes bound to SQLite all go to a single writer.
+
+The queue is bounded: when `maxsize` writes are waiting, submit() raises
+queue.Full and the caller should shed load rather than block.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from src.app.cases.history_service import CaseHistoryResult, CaseHistoryService
+from src.app.cases.models_db import CaseRecord
+from src.app.config import settings
+
+logger = logging.getLogger(__name__)
+
+WRITE_PENDING = "pending"
+WRITE_COMMITTED = "committed"
+WRITE_FAILED = "failed"
+
+# Completed write statuses kept for polling; oldest are dropped first.
+STATUS_RETENTION = 10_000
+# write_id is "<case_id>.<hex>"; case ids are uuids and never contain the separator.
+WRITE_ID_SEPARATOR = "."
+
+
+@dataclass
+class HistoryWrite:
+    write_id: str
+    case_id: str
+    enqueued_at: datetime
+    status: str = WRITE_PENDING
+    version: Optional[int] = None
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class _Job:
+    write: HistoryWrite
+    bind: Engine | Connection
+    kwargs: dict[str, Any]
+    future: Future = field(default_factory=Future)
+
+
+class HistoryWriteQueue:
+    """Bounded FIFOs of case history writes, one writer thread per shard of case ids."""
+
+    def __init__(
+        self, maxsize: int = 1000, writers: int = 1, retain: int = STATUS_RETENTION
+    ) -> None:
+        writers = max(writers, 1)
+        # One bound across all shards: `maxsize` writes may wait, however they are spread.
+        self._maxsize = maxsize
+        self._pending = 0
+        self._queues: list[queue.Queue[Optional[_Job]]] = [queue.Queue() for _ in range(writers)]
+        self._threads: list[Optional[threading.Thread]] = [None] * writers
+        self._writes: OrderedDict[str, HistoryWrite] = OrderedDict()
+        self._retain = retain
+        self._lock = threading.Lock()
+
+    def submit(
+        self, bind: Engine | Connection, **persist_kwargs: Any
+    ) -> tuple[HistoryWrite, Future]:
+        """
+        Queue a CaseHistoryService.persist_evaluation call. The case id is assigned
+        up front so it can be returned before the write commits. The future resolves
+        to the CaseHistoryResult (or the persistence error).
+        """
+        case_id = persist_kwargs.pop("case_id", None) or str(uuid.uuid4())
+        write = HistoryWrite(
+            write_id=f"{case_id}{WRITE_ID_SEPARATOR}{uuid.uuid4().hex}",
+            case_id=case_id,
+            enqueued_at=datetime.now(timezone.utc),
+        )
+        job = _Job(write=write, bind=bind, kwargs={**persist_kwargs, "case_id": case_id})
+        shard = self._shard(bind, case_id)
+        self._ensure_worker(shard)
+        with self._lock:
+            if self._pending >= self._maxsize:
+                raise queue.Full
+            self._pending += 1
+            self._queues[shard].put_nowait(job)
+            self._writes[write.write_id] = write
+            while len(self._writes) > self._retain:
+                self._writes.popitem(last=False)
+        return write, job.future
+
+    def status(self, write_id: str) -> Optional[HistoryWrite]:
+        with self._lock:
+            return self._writes.get(write_id)
+
+    def flush(self) -> None:
+        """Block until every write submitted so far has been applied."""
+        for shard in self._queues:
+            shard.join()
+
+    def close(self) -> None:
+        """Apply the remaining writes and stop the writer threads."""
+        for index, thread in enumerate(self._threads):
+            if thread is None:
+                continue
+            self._queues[index].put(None)
+            thread.join()
+            self._threads[index] = None
+
+    def _shard(self, bind: Engine | Connection, case_id: str) -> int:
+        if len(self._queues) == 1 or bind.dialect.name == "sqlite":
+            return 0
+        return zlib.crc32(case_id.encode("utf-8")) % len(self._queues)
+
+    def _ensure_worker(self, shard: int) -> None:
+        thread = self._threads[shard]
+        if thread is not None and thread.is_alive():
+            return
+        with self._lock:
+            thread = self._threads[shard]
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(
+                    target=self._run,
+                    args=(self._queues[shard],),
+                    name=f"case-history-writer-{shard}",
+                    daemon=True,
+                )
+                self._threads[shard] = thread
+                thread.start()
+
+    def _run(self, jobs: queue.Queue[Optional[_Job]]) -> None:
+        while True:
+            job = jobs.get()
+            try:
+                if job is None:
+                    return
+                with self._lock:
+                    self._pending -= 1
+                self._apply(job)
+            finally:
+                jobs.task_done()
+
+    def _apply(self, job: _Job) -> None:
+        write = job.write
+        db = Session(bind=job.bind)
+        try:
+            result: CaseHistoryResult = CaseHistoryService(db).persist_evaluation(**job.kwargs)
+        except Exception as exc:
+            db.rollback()
+            logger.exception("Case history write %s failed", write.write_id)
+            write.status, write.error = WRITE_FAILED, str(exc)
+            write.completed_at = datetime.now(timezone.utc)
+            job.future.set_exception(exc)
+        else:
+            write.status, write.version = WRITE_COMMITTED, result.version
+            write.completed_at = datetime.now(timezone.utc)
+            job.future.set_result(result)
+        finally:
+            db.close()
+
+
+def write_status(
+    db: Session, write_id: str, writes: Optional[HistoryWriteQueue] = None
+) -> Optional[HistoryWrite]:
+    """
+    Status of a write: from the queue of this process when it accepted the write,
+    else committed if its case exists (accepted elsewhere, or before a restart).
+    None when neither knows it; it may still be pending in another process.
+    """
+    write = (writes or get_history_write_queue()).status(write_id)
+    if write is not None:
+        return write
+    case_id, separator, _ = write_id.partition(WRITE_ID_SEPARATOR)
+    if not separator:
+        return None
+    created_at = db.execute(
+        select(CaseRecord.created_at).where(CaseRecord.id == case_id)
+    ).scalar_one_or_none()
+    if created_at is None:
+        return None
+    # The write created the case together with its first snapshot.
+    return HistoryWrite(
+        write_id=write_id,
+        case_id=case_id,
+        enqueued_at=created_at,
+        status=WRITE_COMMITTED,
+        version=1,
+        completed_at=created_at,
+    )
+
+
+_queue: Optional[HistoryWriteQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_history_write_queue() -> HistoryWriteQueue:
+    """Process-wide write-behind queue (settings.history_write_queue_size, history_writers)."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = HistoryWriteQueue(
+                    maxsize=settings.history_write_queue_size, writers=settings.history_writers
+                )
+    return _queue
@@ -47,10 +47,40 @@ class Settings(BaseSettings):
     # File Storage
     document_storage_path: str = os.getenv("DOCUMENT_STORAGE_PATH", "./uploads")
     max_upload_size_mb: int = int(os.getenv("MAX_UPLOAD_SIZE_MB", "50"))
+    document_storage_provider: str = os.getenv("DOCUMENT_STORAGE_PROVIDER", "cas")  # cas, local
+    storage_gc_grace_seconds: int = int(os.getenv("STORAGE_GC_GRACE_SECONDS", "86400"))
 
     # OCR
     ocr_enabled: bool = os.getenv("OCR_ENABLED", "true").lower() == "true"
     tesseract_path: Optional[str] = os.getenv("TESSERACT_PATH")
+    ocr_workers: int = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 2)))
+    ocr_max_attempts: int = int(os.getenv("OCR_MAX_ATTEMPTS", "3"))
+    ocr_retry_backoff_seconds: int = int(os.getenv("OCR_RETRY_BACKOFF_SECONDS", "30"))
+    ocr_job_lease_seconds: int = int(os.getenv("OCR_JOB_LEASE_SECONDS", "900"))
+    ocr_poll_interval_seconds: float = float(os.getenv("OCR_POLL_INTERVAL_SECONDS", "2"))
+    ocr_pdf_window: int = int(os.getenv("OCR_PDF_WINDOW", str(os.cpu_count() or 2)))
+    ocr_pdf_dpi: int = int(os.getenv("OCR_PDF_DPI", "200"))
+    ocr_text_layer_min_chars: int = int(os.getenv("OCR_TEXT_LAYER_MIN_CHARS", "25"))
+    ocr_language: str = os.getenv("OCR_LANGUAGE", "eng")
+    ocr_cache_enabled: bool = os.getenv("OCR_CACHE_ENABLED", "true").lower() == "true"
+    ocr_cache_max_mb: int = int(os.getenv("OCR_CACHE_MAX_MB", "256"))
+
+    # Case evaluation
+    evaluation_workers: int = int(os.getenv("EVALUATION_WORKERS", "4"))
+    history_write_queue_size: int = int(os.getenv("HISTORY_WRITE_QUEUE_SIZE", "1000"))
+    history_writers: int = int(os.getenv("HISTORY_WRITERS", "4"))
+    evaluation_cache_backend: str = os.getenv("EVALUATION_CACHE_BACKEND", "memory")
+    evaluation_cache_path: str = os.getenv("EVALUATION_CACHE_PATH", "./evaluation_cache.db")
+    evaluation_cache_ttl_seconds: int = int(os.getenv("EVALUATION_CACHE_TTL_SECONDS", "3600"))
+    evaluation_cache_max_entries: int = int(os.getenv("EVALUATION_CACHE_MAX_ENTRIES", "10000"))
+    reevaluation_processes: int = int(os.getenv("REEVALUATION_PROCESSES", str(os.cpu_count() or 2)))
+    reevaluation_chunk_size: int = int(os.getenv("REEVALUATION_CHUNK_SIZE", "500"))
+    snapshot_full_interval: int = int(os.getenv("SNAPSHOT_FULL_INTERVAL", "10"))
+    snapshot_cache_size: int = int(os.getenv("SNAPSHOT_CACHE_SIZE", "1024"))
+    blob_cache_size: int = int(os.getenv("BLOB_CACHE_SIZE", "4096"))
+    blob_gc_grace_seconds: int = int(os.getenv("BLOB_GC_GRACE_SECONDS", "3600"))
+    case_event_batch_size: int = int(os.getenv("CASE_EVENT_BATCH_SIZE", "500"))
+    case_archive_after_days: int = int(os.getenv("CASE_ARCHIVE_AFTER_DAYS", "30"))
 
     # Logging
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
@@ -43,17 +43,37 @@ class DocumentConfigBundle:
     forms: FormsConfig
 
 
+def build_document_bundle(
+    docs_raw: dict[str, Any], forms_raw: dict[str, Any]
+) -> DocumentConfigBundle:
+    """Validate parsed documents.yaml / forms.yaml payloads into a DocumentConfigBundle."""
+    docs_cfg = DocumentsConfig(
+        documents={
+            code: ProgramDocuments(**program_docs)
+            for code, program_docs in (docs_raw or {}).get("documents", {}).items()
+        }
+    )
+    forms_cfg = FormsConfig(forms=(forms_raw or {}).get("forms", {}))
+    return DocumentConfigBundle(documents=docs_cfg, forms=forms_cfg)
+
+
 class DocumentMatrixService:
     """
     Config-driven document + forms resolver.
     Uses ConfigService for domain rules (e.g., PoF exemptions) and local YAML for documents/forms.
     """
 
-    def __init__(self, config_service: ConfigService, base_path: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        config_service: ConfigService,
+        base_path: Optional[Path] = None,
+        bundle: Optional[DocumentConfigBundle] = None,
+    ) -> None:
         self.config_service = config_service
         # repo root = parents[4]; align with DomainRulesConfigService
         self.base_path = base_path or Path(__file__).resolve().parents[4] / "config" / "domain"
-        self._bundle: Optional[DocumentConfigBundle] = None
+        # A preloaded bundle (e.g. from the process-wide config registry) skips disk reads.
+        self._bundle: Optional[DocumentConfigBundle] = bundle
 
     def _load_yaml(self, name: str) -> Dict[str, Any]:
         path = self.base_path / f"{name}.yaml"
@@ -65,16 +85,7 @@ class DocumentMatrixService:
     def _load_bundle(self) -> DocumentConfigBundle:
         if self._bundle:
             return self._bundle
-        docs_raw = self._load_yaml("documents")
-        forms_raw = self._load_yaml("forms")
-        docs_cfg = DocumentsConfig(
-            documents={
-                code: ProgramDocuments(**program_docs)
-                for code, program_docs in docs_raw.get("documents", {}).items()
-            }
-        )
-        forms_cfg = FormsConfig(forms=forms_raw.get("forms", {}))
-        self._bundle = DocumentConfigBundle(documents=docs_cfg, forms=forms_cfg)
+        self._bundle = build_document_bundle(self._load_yaml("documents"), self._load_yaml("forms"))
         return self._bundle
 
     def get_bundle(self) -> DocumentConfigBundle:
@@ -0,0 +1,225 @@
+"""
+Process-wide registry of the loaded domain configuration.
+
+The registry reads config/domain/*.yaml once, keeps the validated
+DomainRulesConfig and documents/forms bundle together with their content
+fingerprint, and hands the same snapshot to every caller. Files are re-checked
+with a cheap stat() at most every `check_interval` seconds; only when a file's
+mtime/size changes is it re-hashed, and only when a hash changes is the whole
+set re-parsed and swapped in atomically. If a reload fails validation the last
+good snapshot keeps being served.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Optional
+
+import yaml
+
+from src.app.documents.service import DocumentConfigBundle, build_document_bundle
+from src.app.domain_config.service import ConfigService, DomainConfigBundle
+from src.app.rules.compiled import CompiledRulePlan, compile_rule_plan
+from src.app.rules.config_loader import (
+    CONFIG_DIR,
+    OPTIONAL_SOURCES,
+    REQUIRED_SOURCES,
+    build_domain_rules_config,
+)
+from src.app.rules.config_models import DomainRulesConfig
+
+logger = logging.getLogger(__name__)
+
+# Order matches the historical config_version payload of /cases/evaluate.
+FINGERPRINT_SOURCES = (
+    "crs",
+    "programs",
+    "language",
+    "work_experience",
+    "proof_of_funds",
+    "arranged_employment",
+    "biometrics_medicals",
+    "forms",
+    "documents",
+)
+DOCUMENT_SOURCES = ("documents", "forms")
+
+
+def _fingerprint_key(name: str) -> str:
+    return f"config/domain/{name}.yaml"
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    Immutable view of one loaded config generation. Treat the contained models as
+    read-only: the same instances are shared by every request in the process.
+    """
+
+    domain_rules: DomainRulesConfig
+    bundle: DomainConfigBundle
+    documents: DocumentConfigBundle
+    fingerprint: Mapping[str, str]
+    digest: str
+    loaded_at: datetime
+    config_service: ConfigService = field(repr=False, compare=False)
+
+
+@dataclass
+class _SourceFile:
+    stat_key: Optional[tuple[int, int]]
+    sha256: str
+    data: Any
+
+
+class DomainConfigRegistry:
+    def __init__(self, base_path: Optional[Path] = None, check_interval: float = 1.0) -> None:
+        self.base_path = base_path or CONFIG_DIR
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._sources: dict[str, _SourceFile] = {}
+        self._last_check = 0.0
+
+    def snapshot(self) -> ConfigSnapshot:
+        """Return the current snapshot, reloading first if any source file changed."""
+        current = self._snapshot
+        if current is not None and time.monotonic() - self._last_check < self.check_interval:
+            return current
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self._load(self._read_all())
+            elif time.monotonic() - self._last_check >= self.check_interval:
+                self._refresh_if_changed()
+            self._last_check = time.monotonic()
+            return self._snapshot
+
+    def current(self) -> Optional[ConfigSnapshot]:
+        """The snapshot already loaded, if any, without loading or re-checking files."""
+        return self._snapshot
+
+    def reload(self) -> ConfigSnapshot:
+        """Force a full re-read of every source file."""
+        with self._lock:
+            self._snapshot = self._load(self._read_all())
+            self._last_check = time.monotonic()
+            return self._snapshot
+
+    # --- Internals (callers hold self._lock) ---
+    def _path(self, name: str) -> Path:
+        return self.base_path / f"{name}.yaml"
+
+    def _stat_key(self, name: str) -> Optional[tuple[int, int]]:
+        try:
+            stat = self._path(name).stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read(self, name: str) -> _SourceFile:
+        path = self._path(name)
+        stat_key = self._stat_key(name)
+        if stat_key is None:
+            if name in REQUIRED_SOURCES or name in DOCUMENT_SOURCES:
+                raise FileNotFoundError(f"Missing required config file: {path}")
+            return _SourceFile(stat_key=None, sha256="missing", data=None)
+        raw = path.read_bytes()
+        return _SourceFile(
+            stat_key=stat_key,
+            sha256=hashlib.sha256(raw).hexdigest(),
+            data=yaml.safe_load(raw),
+        )
+
+    def _read_all(self) -> dict[str, _SourceFile]:
+        return {name: self._read(name) for name in FINGERPRINT_SOURCES}
+
+    def _refresh_if_changed(self) -> None:
+        changed = [
+            name
+            for name in FINGERPRINT_SOURCES
+            if self._stat_key(name) != self._sources[name].stat_key
+        ]
+        if not changed:
+            return
+        try:
+            sources = dict(self._sources)
+            for name in changed:
+                sources[name] = self._read(name)
+            if all(sources[n].sha256 == self._sources[n].sha256 for n in changed):
+                # Touched but identical content: remember the new stat, keep the snapshot.
+                self._sources = sources
+                return
+            self._snapshot = self._load(sources)
+            logger.info("Domain config reloaded (%s changed)", ", ".join(changed))
+        except (OSError, ValueError, yaml.YAMLError) as exc:
+            logger.error("Domain config reload failed; keeping previous snapshot: %s", exc)
+
+    def _load(self, sources: dict[str, _SourceFile]) -> ConfigSnapshot:
+        parsed = {
+            name: source.data
+            for name, source in sources.items()
+            if name in REQUIRED_SOURCES or (name in OPTIONAL_SOURCES and source.data is not None)
+        }
+        domain_rules = build_domain_rules_config(parsed)
+        bundle = DomainConfigBundle(**domain_rules.model_dump())
+        documents = build_document_bundle(sources["documents"].data, sources["forms"].data)
+        fingerprint = {_fingerprint_key(name): sources[name].sha256 for name in FINGERPRINT_SOURCES}
+        digest = hashlib.sha256(
+            "\n".join(f"{k}={v}" for k, v in sorted(fingerprint.items())).encode("utf-8")
+        ).hexdigest()
+
+        self._sources = sources
+        return ConfigSnapshot(
+            domain_rules=domain_rules,
+            bundle=bundle,
+            documents=documents,
+            fingerprint=MappingProxyType(fingerprint),
+            digest=digest,
+            loaded_at=datetime.utcnow(),
+            config_service=ConfigService(
+                base_path=self.base_path,
+                bundle=bundle,
+                domain_rules=domain_rules,
+                fingerprint=digest,
+            ),
+        )
+
+
+_registry: Optional[DomainConfigRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_config_registry() -> DomainConfigRegistry:
+    """Process-wide registry for config/domain (created lazily)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = DomainConfigRegistry()
+    return _registry
+
+
+def get_config_snapshot() -> ConfigSnapshot:
+    return get_config_registry().snapshot()
+
+
+def get_rule_plan(config: Optional[DomainRulesConfig] = None) -> CompiledRulePlan:
+    """
+    Compiled plan for `config` (default: the current snapshot's rules). A caller's
+    own config never loads the registry: it is compiled by content hash, unless it
+    is the rules of the snapshot already in memory, which are looked up by digest.
+    """
+    if config is None:
+        return get_config_snapshot().config_service.get_rule_plan()
+    current = _registry.current() if _registry is not None else None
+    if current is not None and config is current.domain_rules:
+        return current.config_service.get_rule_plan()
+    return compile_rule_plan(config)
@@ -5,12 +5,15 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from src.app.rules.compiled import CompiledRulePlan, compile_rule_plan
 from src.app.rules.config_loader import DomainRulesConfigService
 from src.app.rules.config_models import (
     ArrangedEmploymentConfig,
     BiometricsMedicalsConfig,
     ClbTablesConfig,
+    CrsAdditionalConfig,
     CrsCoreConfig,
+    CrsSpouseConfig,
     CrsTransferabilityConfig,
     DomainRulesConfig,
     LanguageConfig,
@@ -25,6 +28,8 @@ class DomainConfigBundle(BaseModel):
 
     crs_core: CrsCoreConfig
     crs_transferability: CrsTransferabilityConfig
+    crs_spouse: CrsSpouseConfig
+    crs_additional: CrsAdditionalConfig
     language: LanguageConfig
     clb_tables: ClbTablesConfig
     work_experience: WorkExperienceConfig
@@ -47,9 +52,18 @@ class ConfigService:
     Intended as the single backend entrypoint for domain configuration access.
     """
 
-    def __init__(self, base_path: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        bundle: Optional[DomainConfigBundle] = None,
+        domain_rules: Optional[DomainRulesConfig] = None,
+        fingerprint: Optional[str] = None,
+    ) -> None:
         self.base_path = base_path
-        self._bundle: Optional[DomainConfigBundle] = None
+        self._bundle: Optional[DomainConfigBundle] = bundle
+        self._domain_rules: Optional[DomainRulesConfig] = domain_rules
+        self._fingerprint = fingerprint
+        self._rule_plan: Optional[CompiledRulePlan] = None
 
     def load_bundle(self) -> DomainConfigBundle:
         """Load all domain configs into a typed bundle (cached per instance)."""
@@ -60,8 +74,18 @@ class ConfigService:
         return self._bundle
 
     def get_domain_rules(self) -> DomainRulesConfig:
-        """Return the canonical DomainRulesConfig."""
-        return self.load_bundle().to_domain_rules()
+        """Return the canonical DomainRulesConfig (cached per instance)."""
+        if self._domain_rules is None:
+            self._domain_rules = self.load_bundle().to_domain_rules()
+        return self._domain_rules
+
+    def get_rule_plan(self) -> CompiledRulePlan:
+        """Return the compiled rule plan for the domain rules (cached per instance)."""
+        if self._rule_plan is None:
+            self._rule_plan = compile_rule_plan(
+                self.get_domain_rules(), fingerprint=self._fingerprint
+            )
+        return self._rule_plan
 
     # Convenience getters for callers that want a specific slice.
     def get_crs_core(self) -> CrsCoreConfig:
@@ -84,4 +108,3 @@ class ConfigService:
 
     def get_biometrics_medicals(self) -> BiometricsMedicalsConfig:
         return self.load_bundle().biometrics_medicals
-
@@ -14,7 +14,18 @@ from src.app.config import settings
 from src.app.cases import models_db as case_history_models
 from src.app.db.database import engine, get_db
 from src.app.middleware.security import security_middleware
-from src.app.models import case, config, document, organization, person, task, user
+from src.app.models import (
+    case,
+    config,
+    document,
+    ocr_job,
+    ocr_result,
+    organization,
+    person,
+    storage_blob,
+    task,
+    user,
+)
 
 logger = logging.getLogger(__name__)
 load_dotenv()
@@ -25,6 +36,9 @@ organization.Base.metadata.create_all(bind=engine)
 person.Base.metadata.create_all(bind=engine)
 case.Base.metadata.create_all(bind=engine)
 document.Base.metadata.create_all(bind=engine)
+ocr_job.Base.metadata.create_all(bind=engine)
+ocr_result.Base.metadata.create_all(bind=engine)
+storage_blob.Base.metadata.create_all(bind=engine)
 config.Base.metadata.create_all(bind=engine)
 task.Base.metadata.create_all(bind=engine)
 case_history_models.Base.metadata.create_all(bind=engine)
@@ -74,6 +88,16 @@ async def startup_event():
             )
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """Apply queued case history writes and stop the evaluation workers."""
+    from src.app.cases.evaluation_executor import shutdown_evaluation_executor
+    from src.app.cases.write_behind import get_history_write_queue
+
+    get_history_write_queue().close()
+    shutdown_evaluation_executor()
+
+
 # Security
 security = HTTPBearer()
 
@@ -9,8 +9,11 @@ from .config import (
 )
 from src.app.cases.models_db import CaseEvent, CaseRecord, CaseSnapshot
 from .document import Document
+from .ocr_job import OCRJob
+from .ocr_result import OCRResult
 from .organization import Organization, OrganizationMembership
 from .person import Person
+from .storage_blob import StorageBlob
 from .task import CaseTask, CaseTaskActivity, CaseTaskAssignment, CaseTaskDependency
 from .user import User
 from .tenant import Tenant
@@ -22,6 +25,9 @@ __all__ = [
     "Person",
     "Case",
     "Document",
+    "OCRJob",
+    "OCRResult",
+    "StorageBlob",
     "ConfigCaseType",
     "ConfigForm",
     "ConfigField",
@@ -38,6 +38,7 @@ class Document(Base):
     mime_type = Column(String(100), nullable=False)
     storage_key = Column(String(500), nullable=False)  # S3 key or local path
     storage_provider = Column(String(50), default="local")  # local, s3, etc.
+    content_sha256 = Column(String(64), nullable=True, index=True)  # sha256 of the file bytes
 
     # Processing information
     processing_status = Column(
@@ -0,0 +1,43 @@
+"""
+OCR job model: the durable queue behind background document OCR
+"""
+import uuid
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from ..db.database import Base
+
+
+class OCRJob(Base):
+    __tablename__ = "ocr_jobs"
+    __table_args__ = (
+        # Workers claim with: status = 'queued' AND available_at <= now ORDER BY available_at
+        Index("idx_ocr_jobs_status_available", "status", "available_at"),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    document_id = Column(
+        String(36), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    org_id = Column(String(36), nullable=False, index=True)
+
+    status = Column(
+        String(20), nullable=False, default="queued"
+    )  # queued, running, completed, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(DateTime(timezone=True), nullable=False)  # not claimed before this
+    locked_by = Column(String(100))  # worker id holding the job while running
+    locked_until = Column(DateTime(timezone=True))  # lease; expired leases are re-claimed
+    last_error = Column(Text)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+    document = relationship("Document")
+
+    def __repr__(self):
+        return f"<OCRJob(id={self.id}, document_id={self.document_id}, status={self.status})>"
@@ -0,0 +1,26 @@
+"""
+OCR result cache model: extracted text keyed by file content, language and engine
+"""
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSON
+
+from ..db.database import Base
+
+
+class OCRResult(Base):
+    __tablename__ = "ocr_results"
+
+    content_sha256 = Column(String(64), primary_key=True)  # sha256 of the file bytes
+    language = Column(String(50), primary_key=True)
+    engine = Column(String(100), primary_key=True)  # OCRService.engine_version()
+
+    text = Column(Text, nullable=False)
+    ocr_metadata = Column(JSON, default={})
+    size = Column(Integer, nullable=False)  # bytes of text + metadata, for the size bound
+    hits = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), nullable=False, index=True)  # LRU eviction
+
+    def __repr__(self):
+        return f"<OCRResult(sha256={self.content_sha256[:12]}, language={self.language})>"
@@ -0,0 +1,21 @@
+"""
+Content-addressed storage blob: one row per unique file, with its reference count
+"""
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from ..db.database import Base
+
+
+class StorageBlob(Base):
+    __tablename__ = "storage_blobs"
+
+    sha256 = Column(String(64), primary_key=True)  # also the blob's storage key
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # documents rows using this blob
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    released_at = Column(DateTime(timezone=True), nullable=True, index=True)  # ref_count hit 0
+
+    def __repr__(self):
+        return f"<StorageBlob(sha256={self.sha256[:12]}, refs={self.ref_count})>"
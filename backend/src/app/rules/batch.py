@@ -0,0 +1,281 @@
+"""
+Batch path for RuleEngine.
+
+Each profile's facts are derived once, as one ProfileFacts per profile (raw
+test scores of the whole batch are converted to CLB in one grouped pass
+first). Program eligibility reads those facts directly; the FSW/CEC gates and
+the CRS scores (rules/crs.py) read them flattened into plain columns (best
+CLB, family size, latest funds, Canadian months, CRS inputs, ...) and are
+evaluated for the whole batch at once: with NumPy when it is installed,
+otherwise with an equivalent pure-Python pass. Fact derivation itself stays
+per profile. Either way the results match RuleEngine.evaluate_profile profile
+for profile.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Optional
+
+from .clb import convert_profiles
+from .compiled import CompiledRulePlan
+from .crs import CrsInputs, score_crs_batch
+from .facts import ProfileFacts
+from .models import (
+    CandidateProfile,
+    ProfileEvaluation,
+    ProgramEvaluationResult,
+    RuleFlag,
+    Severity,
+)
+from .program_eligibility import evaluate_program_facts
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.info("NumPy not available. Batch evaluation will use the pure-Python path.")
+
+
+@dataclass
+class ProfileColumns:
+    """Per-profile facts laid out column-wise; integer columns hold 0 where has_* is False."""
+
+    has_language: list[bool] = field(default_factory=list)
+    best_clb: list[int] = field(default_factory=list)
+    family_size: list[int] = field(default_factory=list)
+    has_funds: list[bool] = field(default_factory=list)
+    latest_funds: list[float] = field(default_factory=list)
+    has_work: list[bool] = field(default_factory=list)
+    fsw_work_ok: list[bool] = field(default_factory=list)
+    has_canadian_work: list[bool] = field(default_factory=list)
+    canadian_months: list[int] = field(default_factory=list)
+    has_teer: list[bool] = field(default_factory=list)
+    canadian_best_teer: list[int] = field(default_factory=list)
+    crs_inputs: list[CrsInputs] = field(default_factory=list)
+    language_expiry: list[Optional[date]] = field(default_factory=list)
+    medical_expiry: list[Optional[date]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.has_language)
+
+
+def profile_facts(
+    profiles: list[CandidateProfile], plan: CompiledRulePlan, today: date
+) -> list[ProfileFacts]:
+    # Raw test scores for the whole batch are converted to CLB in one grouped pass.
+    return [
+        ProfileFacts(profile, plan, today=today) for profile in convert_profiles(plan.clb, profiles)
+    ]
+
+
+def build_columns(facts_list: list[ProfileFacts]) -> ProfileColumns:
+    cols = ProfileColumns()
+    for facts in facts_list:
+        profile = facts.profile
+        best = facts.best_language_test
+        cols.has_language.append(facts.best_clb is not None)
+        cols.best_clb.append(facts.best_clb or 0)
+        cols.language_expiry.append(best.expiry_date if best else None)
+        cols.medical_expiry.append(
+            profile.medical_status.expiry_date if profile.medical_status else None
+        )
+        cols.family_size.append(profile.family_size or 1)
+
+        latest = facts.latest_funds
+        cols.has_funds.append(latest is not None)
+        cols.latest_funds.append(latest.amount if latest is not None else 0.0)
+
+        cols.has_work.append(bool(profile.work_experience))
+        cols.fsw_work_ok.append(facts.fsw_continuous_work_elapsed)
+
+        cols.has_canadian_work.append(bool(facts.canadian_work))
+        cols.canadian_months.append(facts.canadian_elapsed_months)
+        cols.has_teer.append(facts.canadian_best_teer is not None)
+        cols.canadian_best_teer.append(facts.canadian_best_teer or 0)
+
+        cols.crs_inputs.append(facts.crs_inputs)
+    return cols
+
+
+def _gates_python(cols: ProfileColumns, plan: CompiledRulePlan) -> dict[str, list[Any]]:
+    fsw_min_clb = plan.fsw_min_clb
+    cec_min_months = plan.cec_min_canadian_months
+    funds_checked = plan.funds_checked("FSW")
+
+    gates: dict[str, list[Any]] = {
+        "fsw_lang_ok": [],
+        "funds_ok": [],
+        "cec_months_ok": [],
+        "cec_lang_ok": [],
+    }
+    for i in range(len(cols)):
+        best = cols.best_clb[i]
+        has_lang = cols.has_language[i]
+        gates["fsw_lang_ok"].append(fsw_min_clb is None or (has_lang and best >= fsw_min_clb))
+        gates["funds_ok"].append(
+            not funds_checked
+            or (
+                cols.has_funds[i]
+                and cols.latest_funds[i] >= plan.required_funds(cols.family_size[i])
+            )
+        )
+        gates["cec_months_ok"].append(
+            not cec_min_months or cols.canadian_months[i] >= cec_min_months
+        )
+        threshold = plan.cec_clb_threshold(cols.canadian_best_teer[i] if cols.has_teer[i] else None)
+        gates["cec_lang_ok"].append(has_lang and best >= threshold)
+    return gates
+
+
+def _gates_numpy(cols: ProfileColumns, plan: CompiledRulePlan) -> dict[str, list[Any]]:
+    cec_min_months = plan.cec_min_canadian_months
+
+    best = np.asarray(cols.best_clb, dtype=np.int64)
+    has_lang = np.asarray(cols.has_language, dtype=bool)
+
+    if plan.fsw_min_clb is None:
+        fsw_lang_ok = np.ones(len(cols), dtype=bool)
+    else:
+        fsw_lang_ok = has_lang & (best >= plan.fsw_min_clb)
+
+    if not plan.funds_checked("FSW"):
+        funds_ok = np.ones(len(cols), dtype=bool)
+    else:
+        # Sizes outside the plan's dense table use the fallback row.
+        fallback = plan.funds_fallback
+        dense = np.asarray(plan.funds_by_family_size, dtype=np.float64)
+        sizes = np.asarray(cols.family_size, dtype=np.int64)
+        in_range = (sizes >= 0) & (sizes < dense.size)
+        required = np.where(in_range, dense[np.clip(sizes, 0, dense.size - 1)], fallback)
+        funds_ok = np.asarray(cols.has_funds, dtype=bool) & (
+            np.asarray(cols.latest_funds, dtype=np.float64) >= required
+        )
+
+    months = np.asarray(cols.canadian_months, dtype=np.int64)
+    if cec_min_months:
+        cec_months_ok = months >= cec_min_months
+    else:
+        cec_months_ok = np.ones(len(cols), dtype=bool)
+
+    teer = np.asarray(cols.canadian_best_teer, dtype=np.int64)
+    threshold = np.where(
+        np.asarray(cols.has_teer, dtype=bool) & ((teer == 0) | (teer == 1)),
+        plan.cec_clb_thresholds[0],
+        plan.cec_clb_thresholds[1],
+    )
+    cec_lang_ok = has_lang & (best >= threshold)
+
+    return {
+        "fsw_lang_ok": fsw_lang_ok.tolist(),
+        "funds_ok": funds_ok.tolist(),
+        "cec_months_ok": cec_months_ok.tolist(),
+        "cec_lang_ok": cec_lang_ok.tolist(),
+    }
+
+
+def _expiry_flags(cols: ProfileColumns, index: int, soon: date) -> list[RuleFlag]:
+    flags: list[RuleFlag] = []
+    lang_expiry = cols.language_expiry[index]
+    if lang_expiry and lang_expiry <= soon:
+        flags.append(
+            RuleFlag(
+                rule_id="LANG_EXPIRING",
+                severity=Severity.WARNING,
+                message="Language test expiring soon",
+                metadata={"expiry_date": str(lang_expiry)},
+            )
+        )
+    medical_expiry = cols.medical_expiry[index]
+    if medical_expiry and medical_expiry <= soon:
+        flags.append(
+            RuleFlag(
+                rule_id="MEDICAL_EXPIRING",
+                severity=Severity.WARNING,
+                message="Medical exam expiring soon",
+                metadata={"expiry_date": str(medical_expiry)},
+            )
+        )
+    return flags
+
+
+def evaluate_batch(
+    plan: CompiledRulePlan, profiles: list[CandidateProfile], today: date
+) -> list[dict[str, ProgramEvaluationResult]]:
+    if not profiles:
+        return []
+    return _evaluate_facts(plan, profile_facts(profiles, plan, today), today)
+
+
+def evaluate_profiles(
+    plan: CompiledRulePlan, profiles: list[CandidateProfile], today: date
+) -> list[ProfileEvaluation]:
+    """Program eligibility and per-program CRS for every profile, from one fact derivation each."""
+    if not profiles:
+        return []
+    facts_list = profile_facts(profiles, plan, today)
+    return [
+        ProfileEvaluation(programs=evaluate_program_facts(facts), crs=crs)
+        for facts, crs in zip(facts_list, _evaluate_facts(plan, facts_list, today), strict=True)
+    ]
+
+
+def _evaluate_facts(
+    plan: CompiledRulePlan, facts_list: list[ProfileFacts], today: date
+) -> list[dict[str, ProgramEvaluationResult]]:
+    cols = build_columns(facts_list)
+    gates = _gates_numpy(cols, plan) if NUMPY_AVAILABLE else _gates_python(cols, plan)
+    funds_exempt = not plan.funds_checked("FSW")
+    soon = today + timedelta(days=plan.expiry_warning_days)
+    crs = score_crs_batch(plan.crs, cols.crs_inputs)
+
+    results: list[dict[str, ProgramEvaluationResult]] = []
+    for i in range(len(cols)):
+        fsw_reasons: list[str] = []
+        if not gates["fsw_lang_ok"][i]:
+            fsw_reasons.append("FSW_LANG_MIN_CLB")
+        if not cols.has_work[i]:
+            fsw_reasons.append("FSW_NO_WORK")
+        elif not cols.fsw_work_ok[i]:
+            fsw_reasons.append("FSW_WORK_MIN_MONTHS")
+        if not funds_exempt and not gates["funds_ok"][i]:
+            fsw_reasons.append(
+                "FSW_FUNDS_INSUFFICIENT" if cols.has_funds[i] else "FSW_FUNDS_MISSING"
+            )
+
+        cec_reasons: list[str] = []
+        if not cols.has_canadian_work[i]:
+            cec_reasons.append("CEC_NO_CANADIAN_WORK")
+        else:
+            if not gates["cec_months_ok"][i]:
+                cec_reasons.append("CEC_MIN_CANADIAN_MONTHS")
+            if not cols.has_teer[i]:
+                cec_reasons.append("CEC_UNKNOWN_TEER")
+            elif not gates["cec_lang_ok"][i]:
+                cec_reasons.append("CEC_LANG_MIN_CLB")
+
+        results.append(
+            {
+                "FSW": ProgramEvaluationResult(
+                    program_code="FSW",
+                    eligible=not fsw_reasons,
+                    reasons=fsw_reasons,
+                    flags=_expiry_flags(cols, i, soon),
+                    crs=crs[i],
+                ),
+                "CEC": ProgramEvaluationResult(
+                    program_code="CEC",
+                    eligible=not cec_reasons,
+                    reasons=cec_reasons,
+                    flags=_expiry_flags(cols, i, soon),
+                    crs=crs[i],
+                ),
+            }
+        )
+    return results
@@ -0,0 +1,230 @@
+"""
+Language test score -> CLB conversion.
+
+The equivalency tables in config/domain/language.yaml (clb_tables) are compiled
+once per config into one ClbScale per test edition: for each ability, the
+minimum scores of every level sorted ascending. Converting a score is then a
+binary search for the highest level whose minimum it reaches (bisect); scores
+below the lowest row convert to CLB 0. convert_batch() converts a whole intake
+at once, vectorized with NumPy searchsorted when it is installed.
+
+TEF/TCF tables hold NCLC levels, which the rule engine treats as CLB.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from bisect import bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Optional
+
+from .config_models import ClbTableEntry, ClbTablesConfig
+from .models import CandidateProfile, LanguageTestResult
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.info("NumPy not available. CLB batch conversion will use the pure-Python path.")
+
+SKILLS = ("listening", "reading", "writing", "speaking")
+
+
+def normalize_test_type(test_type: str) -> str:
+    """'PTE Core' / 'pte-core' -> 'PTE_CORE'."""
+    return re.sub(r"[\s\-]+", "_", test_type.strip().upper())
+
+
+@dataclass(frozen=True)
+class ClbScale:
+    """One test edition: per-ability ascending minimum scores and their CLB levels."""
+
+    test: str
+    valid_from: Optional[date]
+    valid_until: Optional[date]
+    thresholds: Mapping[str, tuple[float, ...]]
+    levels: Mapping[str, tuple[int, ...]]
+
+    def covers(self, test_date: date) -> bool:
+        if self.valid_from and test_date < self.valid_from:
+            return False
+        return not (self.valid_until and test_date > self.valid_until)
+
+    def to_clb(self, skill: str, score: float) -> Optional[int]:
+        """CLB for a score; None when the edition has no table for the ability."""
+        mins = self.thresholds.get(skill)
+        if not mins:
+            return None
+        index = bisect_right(mins, score)
+        return self.levels[skill][index - 1] if index else 0
+
+
+class ClbConverter:
+    """Test scores -> CLB per ability for every configured test type and edition."""
+
+    def __init__(self, scales: Mapping[str, tuple[ClbScale, ...]]) -> None:
+        # Editions per test type, newest first.
+        self.scales = scales
+
+    def __bool__(self) -> bool:
+        return bool(self.scales)
+
+    def scale_for(self, test_type: str, test_date: Optional[date] = None) -> Optional[ClbScale]:
+        """Edition for a test type and date; the newest edition when the date is unknown."""
+        editions = self.scales.get(normalize_test_type(test_type))
+        if not editions:
+            return None
+        if test_date is None:
+            return editions[0]
+        return next((e for e in editions if e.covers(test_date)), None)
+
+    def to_clb(
+        self, test_type: str, skill: str, score: float, test_date: Optional[date] = None
+    ) -> Optional[int]:
+        scale = self.scale_for(test_type, test_date)
+        return scale.to_clb(skill, score) if scale else None
+
+    def resolve(self, test: LanguageTestResult) -> LanguageTestResult:
+        """
+        Fill unset *_clb fields from the raw *_score fields. CLB levels supplied by
+        the caller win; tests without raw scores or a known table are returned as-is.
+        """
+        if not test.has_raw_scores():
+            return test
+        scale = self.scale_for(test.test_type, test.test_date)
+        if scale is None:
+            return test
+        update: dict[str, Any] = {}
+        for skill in SKILLS:
+            score = getattr(test, f"{skill}_score")
+            if score is None or getattr(test, f"{skill}_clb") is not None:
+                continue
+            clb = scale.to_clb(skill, score)
+            if clb is not None:
+                update[f"{skill}_clb"] = clb
+        return test.model_copy(update=update) if update else test
+
+    def convert_batch(self, tests: list[LanguageTestResult]) -> list[LanguageTestResult]:
+        """Same as [resolve(t) for t in tests], grouping scores per edition and ability."""
+        # (scale, skill) -> (test indexes, scores)
+        pending: dict[tuple[int, str], tuple[list[int], list[float]]] = {}
+        scales: dict[int, ClbScale] = {}
+        for index, test in enumerate(tests):
+            if not test.has_raw_scores():
+                continue
+            scale = self.scale_for(test.test_type, test.test_date)
+            if scale is None:
+                continue
+            scales[id(scale)] = scale
+            for skill in SKILLS:
+                score = getattr(test, f"{skill}_score")
+                if score is None or getattr(test, f"{skill}_clb") is not None:
+                    continue
+                indexes, scores = pending.setdefault((id(scale), skill), ([], []))
+                indexes.append(index)
+                scores.append(score)
+
+        updates: dict[int, dict[str, Any]] = {}
+        for (scale_id, skill), (indexes, scores) in pending.items():
+            scale = scales[scale_id]
+            if not scale.thresholds.get(skill):
+                continue
+            for index, clb in zip(indexes, _lookup(scale, skill, scores), strict=True):
+                updates.setdefault(index, {})[f"{skill}_clb"] = clb
+
+        return [
+            test.model_copy(update=updates[i]) if i in updates else test
+            for i, test in enumerate(tests)
+        ]
+
+
+def _lookup(scale: ClbScale, skill: str, scores: list[float]) -> list[int]:
+    mins = scale.thresholds[skill]
+    levels = scale.levels[skill]
+    if not NUMPY_AVAILABLE:
+        return [scale.to_clb(skill, score) or 0 for score in scores]
+    index = np.searchsorted(np.asarray(mins), np.asarray(scores, dtype=float), side="right")
+    clbs = np.where(index > 0, np.asarray(levels)[np.maximum(index - 1, 0)], 0)
+    return [int(c) for c in clbs]
+
+
+def convert_profiles(
+    converter: ClbConverter, profiles: list[CandidateProfile]
+) -> list[CandidateProfile]:
+    """
+    Batch-convert the applicant and spouse language tests of a whole intake in one
+    pass; profiles without raw scores are returned unchanged.
+    """
+    owners: list[tuple[int, bool]] = []  # (profile index, is spouse) per collected test
+    tests: list[LanguageTestResult] = []
+    for index, profile in enumerate(profiles):
+        for test in profile.language_tests:
+            owners.append((index, False))
+            tests.append(test)
+        if profile.spouse:
+            for test in profile.spouse.language_tests:
+                owners.append((index, True))
+                tests.append(test)
+    if not converter or not any(t.has_raw_scores() for t in tests):
+        return profiles
+
+    converted: dict[tuple[int, bool], list[LanguageTestResult]] = {}
+    for owner, test in zip(owners, converter.convert_batch(tests), strict=True):
+        converted.setdefault(owner, []).append(test)
+
+    result = []
+    for index, profile in enumerate(profiles):
+        own = converted.get((index, False), [])
+        spouse_tests = converted.get((index, True), [])
+        changed = any(a is not b for a, b in zip(own, profile.language_tests, strict=True))
+        spouse_changed = profile.spouse is not None and any(
+            a is not b for a, b in zip(spouse_tests, profile.spouse.language_tests, strict=True)
+        )
+        if not (changed or spouse_changed):
+            result.append(profile)
+            continue
+        update: dict[str, Any] = {"language_tests": own}
+        if spouse_changed:
+            update["spouse"] = profile.spouse.model_copy(update={"language_tests": spouse_tests})
+        result.append(profile.model_copy(update=update))
+    return result
+
+
+def _build_scale(
+    key: tuple[str, Optional[date], Optional[date]], rows: list[ClbTableEntry]
+) -> ClbScale:
+    by_skill: dict[str, list[tuple[float, int]]] = {}
+    for row in rows:
+        by_skill.setdefault(row.skill.strip().lower(), []).append((row.min_score, row.clb))
+    thresholds: dict[str, tuple[float, ...]] = {}
+    levels: dict[str, tuple[int, ...]] = {}
+    for skill, pairs in by_skill.items():
+        pairs.sort()
+        thresholds[skill] = tuple(score for score, _ in pairs)
+        levels[skill] = tuple(clb for _, clb in pairs)
+    test, valid_from, valid_until = key
+    return ClbScale(test, valid_from, valid_until, thresholds, levels)
+
+
+def compile_clb_converter(config: ClbTablesConfig) -> ClbConverter:
+    grouped: dict[tuple[str, Optional[date], Optional[date]], list[ClbTableEntry]] = {}
+    for row in config.tables:
+        key = (normalize_test_type(row.test), row.valid_from, row.valid_until)
+        grouped.setdefault(key, []).append(row)
+
+    editions: dict[str, list[ClbScale]] = {}
+    for key, rows in grouped.items():
+        editions.setdefault(key[0], []).append(_build_scale(key, rows))
+    return ClbConverter(
+        {
+            test: tuple(sorted(scales, key=lambda s: s.valid_from or date.min, reverse=True))
+            for test, scales in editions.items()
+        }
+    )
@@ -0,0 +1,156 @@
+"""
+Compiled rule plan.
+
+A DomainRulesConfig is turned once into flat, precomputed lookups so that the
+per-profile work in RuleEngine and evaluate_programs is constant-time:
+a dense family-size -> proof-of-funds array, per-program CLB threshold tuples,
+a TEER bitmask, the ordered program dispatch table, the CRS tables and the
+test score -> CLB converter. Plans
+are cached per config fingerprint (the registry digest, or a content hash of
+the config).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Optional
+
+from .clb import ClbConverter, compile_clb_converter
+from .config_models import DomainRulesConfig, ProgramRule
+from .crs import CrsTables, compile_crs_tables
+
+# Programs with eligibility evaluators, in evaluation order.
+DISPATCH_ORDER = ("FSW", "CEC", "FST")
+
+_PLAN_CACHE_SIZE = 16
+
+
+@dataclass(frozen=True)
+class CompiledRulePlan:
+    fingerprint: str
+
+    # Proof of funds: index = family size; sizes outside the table use funds_fallback
+    # (the largest family size entry), mirroring the original lookup semantics.
+    funds_by_family_size: tuple[float, ...]
+    funds_fallback: Optional[float]
+    funds_exemptions: frozenset[str]
+
+    # Language thresholds.
+    fsw_min_clb: Optional[int]
+    cec_clb_thresholds: tuple[int, int]  # (TEER 0/1, TEER 2/3)
+    fst_clb_thresholds: tuple[int, int]  # (speak/listen, read/write)
+    fst_min_clb: int
+
+    # Work experience.
+    teer_mask: int  # bit n set => TEER n eligible; 0 => no TEER filter
+    fsw_min_continuous_months: Optional[int]
+    cec_min_canadian_months: Optional[int]
+    cec_recency_years: Optional[int]
+
+    # Programs: (code, rule) pairs for the programs that have evaluators.
+    program_dispatch: tuple[tuple[str, ProgramRule], ...]
+    program_rules: Mapping[str, ProgramRule]
+
+    expiry_warning_days: int
+
+    # CRS lookup tables (see rules/crs.py).
+    crs: CrsTables
+
+    # Raw test scores -> CLB (see rules/clb.py).
+    clb: ClbConverter
+
+    def required_funds(self, family_size: int) -> Optional[float]:
+        """Funds required for a family size; None when no table is configured."""
+        if 0 <= family_size < len(self.funds_by_family_size):
+            return self.funds_by_family_size[family_size]
+        return self.funds_fallback
+
+    def funds_checked(self, program_code: str) -> bool:
+        return program_code not in self.funds_exemptions and self.funds_fallback is not None
+
+    def teer_eligible(self, teer_level: Optional[int]) -> bool:
+        if not self.teer_mask:
+            return True
+        if teer_level is None or teer_level < 0:
+            return False
+        return bool(self.teer_mask >> teer_level & 1)
+
+    def cec_clb_threshold(self, best_teer: Optional[int]) -> int:
+        t01, t23 = self.cec_clb_thresholds
+        return t01 if best_teer in (0, 1) else t23
+
+
+def config_fingerprint(config: DomainRulesConfig) -> str:
+    return hashlib.sha256(config.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def _build_plan(config: DomainRulesConfig, fingerprint: str) -> CompiledRulePlan:
+    table = sorted(config.proof_of_funds.table, key=lambda e: e.family_size)
+    if table:
+        fallback: Optional[float] = table[-1].amount_cad
+        by_size: dict[int, float] = {}
+        for entry in table:
+            by_size.setdefault(entry.family_size, entry.amount_cad)
+        size_limit = max(max(by_size), 0) + 1
+        funds = tuple(by_size.get(size, fallback) for size in range(size_limit))
+    else:
+        fallback = None
+        funds = ()
+
+    teer_mask = 0
+    for teer in config.work_experience.eligible_teers:
+        if teer >= 0:
+            teer_mask |= 1 << teer
+
+    lang = config.language
+    fst = (lang.fst_min_clb_speak_listen or 0, lang.fst_min_clb_read_write or 0)
+    rules = {p.code: p for p in config.program_rules.programs}
+
+    return CompiledRulePlan(
+        fingerprint=fingerprint,
+        funds_by_family_size=funds,
+        funds_fallback=fallback,
+        funds_exemptions=frozenset(config.proof_of_funds.exemptions),
+        fsw_min_clb=lang.fsw_min_clb,
+        cec_clb_thresholds=(lang.cec_min_clb_teer_0_1 or 0, lang.cec_min_clb_teer_2_3 or 0),
+        fst_clb_thresholds=fst,
+        fst_min_clb=min(fst),
+        teer_mask=teer_mask,
+        fsw_min_continuous_months=config.work_experience.fsw.min_continuous_months,
+        cec_min_canadian_months=config.work_experience.cec.min_canadian_months,
+        cec_recency_years=config.work_experience.cec.recency_years,
+        program_dispatch=tuple((code, rules[code]) for code in DISPATCH_ORDER if code in rules),
+        program_rules=rules,
+        expiry_warning_days=config.biometrics_medicals.expiry_warning_days,
+        crs=compile_crs_tables(config),
+        clb=compile_clb_converter(config.clb_tables),
+    )
+
+
+_cache: OrderedDict[str, CompiledRulePlan] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def compile_rule_plan(
+    config: DomainRulesConfig, fingerprint: Optional[str] = None
+) -> CompiledRulePlan:
+    """
+    Return the compiled plan for `config`, building it at most once per fingerprint.
+    Pass the registry digest when available; otherwise the config content is hashed.
+    """
+    key = fingerprint or config_fingerprint(config)
+    with _cache_lock:
+        plan = _cache.get(key)
+        if plan is not None:
+            _cache.move_to_end(key)
+            return plan
+    plan = _build_plan(config, key)
+    with _cache_lock:
+        _cache[key] = plan
+        while len(_cache) > _PLAN_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return plan
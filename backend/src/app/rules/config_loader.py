@@ -10,7 +10,9 @@ from .config_models import (
     ArrangedEmploymentConfig,
     BiometricsMedicalsConfig,
     ClbTablesConfig,
+    CrsAdditionalConfig,
     CrsCoreConfig,
+    CrsSpouseConfig,
     CrsTransferabilityConfig,
     DomainRulesConfig,
     LanguageConfig,
@@ -24,6 +26,9 @@ from .config_models import (
 REPO_ROOT = Path(__file__).resolve().parents[4]
 CONFIG_DIR = REPO_ROOT / "config" / "domain"
 
+REQUIRED_SOURCES = ("crs", "language", "work_experience", "proof_of_funds", "programs")
+OPTIONAL_SOURCES = ("arranged_employment", "biometrics_medicals")
+
 
 class DomainRulesConfigService:
     def __init__(self, base_path: Path | None = None) -> None:
@@ -43,58 +48,61 @@ class DomainRulesConfigService:
             return yaml.safe_load(f)
 
     def _load_from_disk(self) -> DomainRulesConfig:
-        crs_data = self._load_yaml("crs")
-        language_data = self._load_yaml("language")
-        work_data = self._load_yaml("work_experience")
-        pof_data = self._load_yaml("proof_of_funds")
-        programs_data = self._load_yaml("programs")
-        arranged_data = (
-            self._load_yaml("arranged_employment")
-            if (self.base_path / "arranged_employment.yaml").exists()
-            else {}
+        sources = {name: self._load_yaml(name) for name in REQUIRED_SOURCES}
+        for name in OPTIONAL_SOURCES:
+            if (self.base_path / f"{name}.yaml").exists():
+                sources[name] = self._load_yaml(name)
+        return build_domain_rules_config(sources)
+
+
+def build_domain_rules_config(sources: dict[str, Any]) -> DomainRulesConfig:
+    """Validate parsed YAML documents (keyed by file stem) into a DomainRulesConfig."""
+    crs_data = sources["crs"]
+    language_data = sources["language"]
+    work_data = sources["work_experience"]
+    pof_data = sources["proof_of_funds"]
+    programs_data = sources["programs"]
+    arranged_data = sources.get("arranged_employment") or {}
+    biometrics_data = sources.get("biometrics_medicals") or {}
+
+    try:
+        proof_table = [ProofOfFundsEntry(**entry) for entry in pof_data.get("table", [])]
+        work_cfg = WorkExperienceConfig(
+            eligible_teers=work_data["eligible_teers"],
+            fsw=WorkExperienceProgramRule(**work_data["fsw"]),
+            cec=WorkExperienceProgramRule(**work_data["cec"]),
         )
-        biometrics_data = (
-            self._load_yaml("biometrics_medicals")
-            if (self.base_path / "biometrics_medicals.yaml").exists()
-            else {}
+        domain_cfg = DomainRulesConfig(
+            crs_core=CrsCoreConfig(**crs_data["crs_core"]),
+            crs_transferability=CrsTransferabilityConfig(
+                **(crs_data.get("crs_transferability") or {})
+            ),
+            crs_spouse=CrsSpouseConfig(**(crs_data.get("crs_spouse") or {})),
+            crs_additional=CrsAdditionalConfig(**(crs_data.get("crs_additional") or {})),
+            language=LanguageConfig(
+                **language_data["program_minima"],
+                clb_tables_ref=language_data.get("clb_tables_ref"),
+            ),
+            clb_tables=ClbTablesConfig(
+                tables=language_data.get("clb_tables", []),
+            ),
+            work_experience=work_cfg,
+            proof_of_funds=ProofOfFundsConfig(
+                table=proof_table,
+                exemptions=pof_data.get("exemptions", []),
+            ),
+            program_rules=ProgramRulesConfig(programs=programs_data.get("program_rules", [])),
+            arranged_employment=ArrangedEmploymentConfig(
+                **arranged_data.get("arranged_employment", arranged_data or {})
+            ),
+            biometrics_medicals=BiometricsMedicalsConfig(
+                **biometrics_data.get("biometrics_medicals", biometrics_data or {})
+            ),
         )
+    except (TypeError, KeyError, ValidationError) as exc:
+        raise ValueError(f"Invalid domain rules config: {exc}") from exc
 
-        try:
-            proof_table = [ProofOfFundsEntry(**entry) for entry in pof_data.get("table", [])]
-            work_cfg = WorkExperienceConfig(
-                eligible_teers=work_data["eligible_teers"],
-                fsw=WorkExperienceProgramRule(**work_data["fsw"]),
-                cec=WorkExperienceProgramRule(**work_data["cec"]),
-            )
-            domain_cfg = DomainRulesConfig(
-                crs_core=CrsCoreConfig(**crs_data["crs_core"]),
-                crs_transferability=CrsTransferabilityConfig(
-                    notes=crs_data.get("crs_transferability", {}).get("notes")
-                ),
-                language=LanguageConfig(
-                    **language_data["program_minima"],
-                    clb_tables_ref=language_data.get("clb_tables_ref"),
-                ),
-                clb_tables=ClbTablesConfig(
-                    tables=language_data.get("clb_tables", []),
-                ),
-                work_experience=work_cfg,
-                proof_of_funds=ProofOfFundsConfig(
-                    table=proof_table,
-                    exemptions=pof_data.get("exemptions", []),
-                ),
-                program_rules=ProgramRulesConfig(programs=programs_data.get("program_rules", [])),
-                arranged_employment=ArrangedEmploymentConfig(
-                    **arranged_data.get("arranged_employment", arranged_data or {})
-                ),
-                biometrics_medicals=BiometricsMedicalsConfig(
-                    **biometrics_data.get("biometrics_medicals", biometrics_data or {})
-                ),
-            )
-        except (TypeError, KeyError, ValidationError) as exc:
-            raise ValueError(f"Invalid domain rules config: {exc}") from exc
-
-        return domain_cfg
+    return domain_cfg
 
 
 def load_domain_rules_config(base_path: Path | None = None) -> DomainRulesConfig:
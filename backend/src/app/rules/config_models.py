@@ -6,14 +6,83 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 
+class CrsBand(BaseModel):
+    """Row of a banded CRS table: applies from `min` (age, CLB or years) up to the next row."""
+
+    min: int
+    single: int = 0
+    with_spouse: int = 0
+
+
+class CrsPointsBand(BaseModel):
+    min: int
+    points: int = 0
+
+
+class CrsPairBand(BaseModel):
+    min: int
+    points: tuple[int, int] = (0, 0)
+
+
+class CrsSplitPoints(BaseModel):
+    single: int = 0
+    with_spouse: int = 0
+
+
+class CrsEducationLevel(BaseModel):
+    code: str
+    aliases: list[str] = Field(default_factory=list)
+    transfer_group: Optional[str] = None
+
+
 class CrsCoreConfig(BaseModel):
-    base_age_points: int = 0  # Placeholder; SME validation required.
-    language_bonus_per_clb: int = 0  # Placeholder; SME validation required.
+    # Skeleton parameters kept for backwards-compatible config files; unused by the table-driven CRS.
+    base_age_points: int = 0
+    language_bonus_per_clb: int = 0
+
+    max_points: CrsSplitPoints = Field(default_factory=CrsSplitPoints)
+    education_levels: list[CrsEducationLevel] = Field(default_factory=list)
+    age: list[CrsBand] = Field(default_factory=list)
+    education: dict[str, CrsSplitPoints] = Field(default_factory=dict)
+    first_language: list[CrsBand] = Field(default_factory=list)  # per ability
+    second_language: list[CrsBand] = Field(default_factory=list)  # per ability
+    second_language_max: CrsSplitPoints = Field(default_factory=CrsSplitPoints)
+    canadian_work: list[CrsBand] = Field(default_factory=list)  # by full years
+    work_recency_years: Optional[int] = None
+
+
+class CrsSpouseConfig(BaseModel):
+    max_points: int = 0
+    education: dict[str, int] = Field(default_factory=dict)
+    language: list[CrsPointsBand] = Field(default_factory=list)  # per ability
+    language_max: int = 0
+    canadian_work: list[CrsPointsBand] = Field(default_factory=list)
 
 
 class CrsTransferabilityConfig(BaseModel):
-    # Placeholder container for future wiring of transferability tables.
     notes: Optional[str] = None
+    max_points: int = 0
+    bundle_max_points: int = 0
+    clb_bands: list[int] = Field(default_factory=list)
+    certificate_clb_bands: list[int] = Field(default_factory=list)
+    canadian_work_bands: list[int] = Field(default_factory=list)
+    education_language: dict[str, tuple[int, int]] = Field(default_factory=dict)
+    education_canadian_work: dict[str, tuple[int, int]] = Field(default_factory=dict)
+    foreign_work_language: list[CrsPairBand] = Field(default_factory=list)
+    foreign_work_canadian_work: list[CrsPairBand] = Field(default_factory=list)
+    certificate_language: tuple[int, int] = (0, 0)
+
+
+class CrsAdditionalConfig(BaseModel):
+    max_points: int = 0
+    sibling_in_canada: int = 0
+    french_test_types: list[str] = Field(default_factory=list)
+    french_min_nclc: Optional[int] = None
+    french_points_weak_english: int = 0
+    french_points_strong_english: int = 0
+    french_strong_english_min_clb: Optional[int] = None
+    canadian_study: list[CrsPointsBand] = Field(default_factory=list)
+    provincial_nomination: int = 0
 
 
 class LanguageProgramMinima(BaseModel):
@@ -39,6 +108,8 @@ class ClbTableEntry(BaseModel):
     max_score: Optional[float] = None
     skill: str
     test: str
+    valid_from: Optional[date] = None  # test-date window for dated table editions (e.g. TEF)
+    valid_until: Optional[date] = None
 
 
 class ClbTablesConfig(BaseModel):
@@ -106,6 +177,8 @@ class BiometricsMedicalsConfig(BaseModel):
 class DomainRulesConfig(BaseModel):
     crs_core: CrsCoreConfig
     crs_transferability: CrsTransferabilityConfig
+    crs_spouse: CrsSpouseConfig = Field(default_factory=CrsSpouseConfig)
+    crs_additional: CrsAdditionalConfig = Field(default_factory=CrsAdditionalConfig)
     language: LanguageConfig
     clb_tables: ClbTablesConfig
     work_experience: WorkExperienceConfig
@@ -0,0 +1,528 @@
+"""
+Table-driven Comprehensive Ranking System (CRS) scoring.
+
+The CRS sections of DomainRulesConfig (config/domain/crs.yaml) are compiled
+into dense lookup tuples indexed by age, CLB, full years or education rank,
+with the single / with-spouse split as the first index. Scoring a profile is
+then a handful of index lookups and caps, which vectorizes directly: the
+score_crs_batch() NumPy path scores a whole candidate pool in one call and
+returns the same CRSBreakdown objects as score_crs().
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, fields
+from typing import Any, Optional
+
+from .config_models import CrsBand, CrsPairBand, CrsPointsBand, DomainRulesConfig
+from .models import CRSBreakdown
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.info("NumPy not available. CRS batch scoring will use the pure-Python path.")
+
+MAX_AGE = 100
+MAX_CLB = 12
+
+SINGLE = 0
+WITH_SPOUSE = 1
+
+# Factor keys reported in CRSBreakdown.factors, grouped by section.
+CORE_FACTORS = ("age", "education", "first_language", "second_language", "canadian_work")
+SPOUSE_FACTORS = ("spouse_education", "spouse_language", "spouse_canadian_work")
+TRANSFERABILITY_FACTORS = ("transfer_education", "transfer_foreign_work", "transfer_certificate")
+ADDITIONAL_FACTORS = ("sibling", "french", "canadian_study", "provincial_nomination")
+CRS_FACTOR_SECTIONS = (
+    ("core", CORE_FACTORS),
+    ("spouse", SPOUSE_FACTORS),
+    ("transferability", TRANSFERABILITY_FACTORS),
+    ("additional", ADDITIONAL_FACTORS),
+)
+
+
+@dataclass(frozen=True)
+class CrsTables:
+    """Dense CRS lookups; out-of-range indexes clamp to the last entry."""
+
+    education_rank: Mapping[str, int]
+    age: tuple[tuple[int, ...], tuple[int, ...]]
+    education: tuple[tuple[int, ...], tuple[int, ...]]
+    first_language: tuple[tuple[int, ...], tuple[int, ...]]
+    second_language: tuple[tuple[int, ...], tuple[int, ...]]
+    second_language_max: tuple[int, int]
+    canadian_work: tuple[tuple[int, ...], tuple[int, ...]]
+    core_max: tuple[int, int]
+    work_recency_years: Optional[int]
+
+    spouse_education: tuple[int, ...]
+    spouse_language: tuple[int, ...]
+    spouse_language_max: int
+    spouse_canadian_work: tuple[int, ...]
+    spouse_max: int
+
+    clb_band: tuple[int, ...]  # first-language min CLB -> transferability band
+    certificate_band: tuple[int, ...]  # min CLB -> certificate band
+    canadian_work_band: tuple[int, ...]  # Canadian years -> transferability band
+    transfer_education_language: tuple[tuple[int, ...], ...]  # [rank][clb band]
+    transfer_education_canadian: tuple[tuple[int, ...], ...]  # [rank][work band]
+    transfer_foreign_language: tuple[tuple[int, ...], ...]  # [foreign years][clb band]
+    transfer_foreign_canadian: tuple[tuple[int, ...], ...]  # [foreign years][work band]
+    transfer_certificate: tuple[int, ...]  # [certificate band]
+    transfer_bundle_max: int
+    transfer_max: int
+
+    french_test_types: frozenset[str]
+    french_min_nclc: Optional[int]
+    french_points_weak_english: int
+    french_points_strong_english: int
+    french_strong_english_min_clb: int
+    sibling_in_canada: int
+    canadian_study: tuple[int, ...]  # [years]
+    provincial_nomination: int
+    additional_max: int
+
+
+@dataclass
+class CrsInputs:
+    """Everything CRS scoring needs from a profile, reduced to table indexes."""
+
+    with_spouse: bool = False
+    age: int = 0  # 0 when unknown (scores no age points)
+    education_rank: int = 0
+    first_language: tuple[int, int, int, int] = (0, 0, 0, 0)
+    second_language: tuple[int, int, int, int] = (0, 0, 0, 0)
+    canadian_years: int = 0
+    foreign_years: int = 0
+    spouse_education_rank: int = 0
+    spouse_language: tuple[int, int, int, int] = (0, 0, 0, 0)
+    spouse_canadian_years: int = 0
+    has_certificate: bool = False
+    has_sibling: bool = False
+    french_nclc: int = 0
+    has_english: bool = False
+    english_clb: int = 0
+    canadian_study_years: int = 0
+    has_nomination: bool = False
+
+
+# --- Compilation ---
+def _band_points(bands: Sequence[Any], size: int, attr: str) -> tuple[int, ...]:
+    ordered = sorted(bands, key=lambda b: b.min)
+    points = []
+    for index in range(size):
+        value = 0
+        for band in ordered:
+            if band.min > index:
+                break
+            value = getattr(band, attr)
+        points.append(value)
+    return tuple(points)
+
+
+def _split_bands(bands: list[CrsBand], size: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    return (_band_points(bands, size, "single"), _band_points(bands, size, "with_spouse"))
+
+
+def _years_size(*tables: Sequence[Any]) -> int:
+    return max([band.min for table in tables for band in table] + [0]) + 1
+
+
+def _pair_bands(bands: list[CrsPairBand], size: int) -> tuple[tuple[int, ...], ...]:
+    firsts = _band_points(
+        [CrsPointsBand(min=b.min, points=b.points[0]) for b in bands], size, "points"
+    )
+    seconds = _band_points(
+        [CrsPointsBand(min=b.min, points=b.points[1]) for b in bands], size, "points"
+    )
+    return tuple((0, first, second) for first, second in zip(firsts, seconds, strict=True))
+
+
+def _thresholds(thresholds: list[int], size: int) -> tuple[int, ...]:
+    return tuple(sum(1 for t in thresholds if value >= t) for value in range(size))
+
+
+def compile_crs_tables(config: DomainRulesConfig) -> CrsTables:
+    core = config.crs_core
+    spouse = config.crs_spouse
+    transfer = config.crs_transferability
+    additional = config.crs_additional
+
+    levels = core.education_levels
+    education_rank: dict[str, int] = {}
+    for rank, level in enumerate(levels):
+        for name in (level.code, *level.aliases):
+            education_rank.setdefault(name.strip().lower(), rank)
+
+    def by_rank(points: Mapping[str, Any], default: Any) -> tuple[Any, ...]:
+        return tuple(points.get(level.code, default) for level in levels) or (default,)
+
+    def by_group(points: Mapping[str, tuple[int, int]]) -> tuple[tuple[int, ...], ...]:
+        rows = tuple((0, *points.get(level.transfer_group or "", (0, 0))) for level in levels)
+        return rows or ((0, 0, 0),)
+
+    education_split = by_rank(core.education, None)
+    work_size = _years_size(core.canadian_work, spouse.canadian_work)
+    foreign_size = _years_size(transfer.foreign_work_language, transfer.foreign_work_canadian_work)
+
+    return CrsTables(
+        education_rank=education_rank,
+        age=_split_bands(core.age, MAX_AGE + 1),
+        education=(
+            tuple(p.single if p else 0 for p in education_split),
+            tuple(p.with_spouse if p else 0 for p in education_split),
+        ),
+        first_language=_split_bands(core.first_language, MAX_CLB + 1),
+        second_language=_split_bands(core.second_language, MAX_CLB + 1),
+        second_language_max=(core.second_language_max.single, core.second_language_max.with_spouse),
+        canadian_work=_split_bands(core.canadian_work, work_size),
+        core_max=(core.max_points.single, core.max_points.with_spouse),
+        work_recency_years=core.work_recency_years,
+        spouse_education=by_rank(spouse.education, 0),
+        spouse_language=_band_points(spouse.language, MAX_CLB + 1, "points"),
+        spouse_language_max=spouse.language_max,
+        spouse_canadian_work=_band_points(spouse.canadian_work, work_size, "points"),
+        spouse_max=spouse.max_points,
+        clb_band=_thresholds(transfer.clb_bands, MAX_CLB + 1),
+        certificate_band=_thresholds(transfer.certificate_clb_bands, MAX_CLB + 1),
+        canadian_work_band=_thresholds(transfer.canadian_work_bands, work_size),
+        transfer_education_language=by_group(transfer.education_language),
+        transfer_education_canadian=by_group(transfer.education_canadian_work),
+        transfer_foreign_language=_pair_bands(transfer.foreign_work_language, foreign_size),
+        transfer_foreign_canadian=_pair_bands(transfer.foreign_work_canadian_work, foreign_size),
+        transfer_certificate=(0, *transfer.certificate_language),
+        transfer_bundle_max=transfer.bundle_max_points,
+        transfer_max=transfer.max_points,
+        french_test_types=frozenset(t.upper() for t in additional.french_test_types),
+        french_min_nclc=additional.french_min_nclc,
+        french_points_weak_english=additional.french_points_weak_english,
+        french_points_strong_english=additional.french_points_strong_english,
+        french_strong_english_min_clb=additional.french_strong_english_min_clb or 0,
+        sibling_in_canada=additional.sibling_in_canada,
+        canadian_study=_band_points(
+            additional.canadian_study, _years_size(additional.canadian_study), "points"
+        ),
+        provincial_nomination=additional.provincial_nomination,
+        additional_max=additional.max_points,
+    )
+
+
+# --- Scalar scoring ---
+def _at(table: Sequence[Any], index: int) -> Any:
+    return table[min(max(index, 0), len(table) - 1)]
+
+
+def _cap(value: int, cap: int) -> int:
+    """Caps of 0 mean "not configured" and leave the value unchanged."""
+    return min(value, cap) if cap else value
+
+
+def _split(inputs: CrsInputs) -> int:
+    return WITH_SPOUSE if inputs.with_spouse else SINGLE
+
+
+def _age(t: CrsTables, x: CrsInputs) -> int:
+    return _at(t.age[_split(x)], x.age)
+
+
+def _education(t: CrsTables, x: CrsInputs) -> int:
+    return _at(t.education[_split(x)], x.education_rank)
+
+
+def _first_language(t: CrsTables, x: CrsInputs) -> int:
+    table = t.first_language[_split(x)]
+    return sum(_at(table, clb) for clb in x.first_language)
+
+
+def _second_language(t: CrsTables, x: CrsInputs) -> int:
+    s = _split(x)
+    points = sum(_at(t.second_language[s], clb) for clb in x.second_language)
+    return _cap(points, t.second_language_max[s])
+
+
+def _canadian_work(t: CrsTables, x: CrsInputs) -> int:
+    return _at(t.canadian_work[_split(x)], x.canadian_years)
+
+
+def _spouse_education(t: CrsTables, x: CrsInputs) -> int:
+    return _at(t.spouse_education, x.spouse_education_rank) if x.with_spouse else 0
+
+
+def _spouse_language(t: CrsTables, x: CrsInputs) -> int:
+    if not x.with_spouse:
+        return 0
+    points = sum(_at(t.spouse_language, clb) for clb in x.spouse_language)
+    return _cap(points, t.spouse_language_max)
+
+
+def _spouse_canadian_work(t: CrsTables, x: CrsInputs) -> int:
+    return _at(t.spouse_canadian_work, x.spouse_canadian_years) if x.with_spouse else 0
+
+
+def _transfer_education(t: CrsTables, x: CrsInputs) -> int:
+    clb_band = _at(t.clb_band, min(x.first_language))
+    work_band = _at(t.canadian_work_band, x.canadian_years)
+    return _cap(
+        _at(t.transfer_education_language, x.education_rank)[clb_band]
+        + _at(t.transfer_education_canadian, x.education_rank)[work_band],
+        t.transfer_bundle_max,
+    )
+
+
+def _transfer_foreign_work(t: CrsTables, x: CrsInputs) -> int:
+    clb_band = _at(t.clb_band, min(x.first_language))
+    work_band = _at(t.canadian_work_band, x.canadian_years)
+    return _cap(
+        _at(t.transfer_foreign_language, x.foreign_years)[clb_band]
+        + _at(t.transfer_foreign_canadian, x.foreign_years)[work_band],
+        t.transfer_bundle_max,
+    )
+
+
+def _transfer_certificate(t: CrsTables, x: CrsInputs) -> int:
+    if not x.has_certificate:
+        return 0
+    band = _at(t.certificate_band, min(x.first_language))
+    return _cap(_at(t.transfer_certificate, band), t.transfer_bundle_max)
+
+
+def _sibling(t: CrsTables, x: CrsInputs) -> int:
+    return t.sibling_in_canada if x.has_sibling else 0
+
+
+def _french(t: CrsTables, x: CrsInputs) -> int:
+    if t.french_min_nclc is None or x.french_nclc < t.french_min_nclc:
+        return 0
+    if x.has_english and x.english_clb >= t.french_strong_english_min_clb:
+        return t.french_points_strong_english
+    return t.french_points_weak_english
+
+
+def _canadian_study(t: CrsTables, x: CrsInputs) -> int:
+    return _at(t.canadian_study, x.canadian_study_years)
+
+
+def _provincial_nomination(t: CrsTables, x: CrsInputs) -> int:
+    return t.provincial_nomination if x.has_nomination else 0
+
+
+# Factor key -> (scorer, CrsInputs fields it reads). Every factor also reads
+# with_spouse; the field sets let callers rescore only what an input change touches.
+FACTOR_SCORERS: dict[str, tuple[Callable[[CrsTables, CrsInputs], int], frozenset[str]]] = {
+    "age": (_age, frozenset({"age"})),
+    "education": (_education, frozenset({"education_rank"})),
+    "first_language": (_first_language, frozenset({"first_language"})),
+    "second_language": (_second_language, frozenset({"second_language"})),
+    "canadian_work": (_canadian_work, frozenset({"canadian_years"})),
+    "spouse_education": (_spouse_education, frozenset({"spouse_education_rank"})),
+    "spouse_language": (_spouse_language, frozenset({"spouse_language"})),
+    "spouse_canadian_work": (_spouse_canadian_work, frozenset({"spouse_canadian_years"})),
+    "transfer_education": (
+        _transfer_education,
+        frozenset({"education_rank", "first_language", "canadian_years"}),
+    ),
+    "transfer_foreign_work": (
+        _transfer_foreign_work,
+        frozenset({"foreign_years", "first_language", "canadian_years"}),
+    ),
+    "transfer_certificate": (
+        _transfer_certificate,
+        frozenset({"has_certificate", "first_language"}),
+    ),
+    "sibling": (_sibling, frozenset({"has_sibling"})),
+    "french": (_french, frozenset({"french_nclc", "has_english", "english_clb"})),
+    "canadian_study": (_canadian_study, frozenset({"canadian_study_years"})),
+    "provincial_nomination": (_provincial_nomination, frozenset({"has_nomination"})),
+}
+
+
+def changed_inputs(before: CrsInputs, after: CrsInputs) -> set[str]:
+    """Names of the CrsInputs fields that differ between two input sets."""
+    return {f.name for f in fields(CrsInputs) if getattr(before, f.name) != getattr(after, f.name)}
+
+
+def affected_factors(changed: Iterable[str]) -> list[str]:
+    """Factor keys whose score depends on any of the given CrsInputs fields."""
+    changed = set(changed)
+    if "with_spouse" in changed:
+        return list(FACTOR_SCORERS)
+    return [name for name, (_, reads) in FACTOR_SCORERS.items() if reads & changed]
+
+
+def score_factors(
+    tables: CrsTables, inputs: CrsInputs, names: Optional[Iterable[str]] = None
+) -> dict[str, int]:
+    """Per-factor points (uncapped by section) for all factors, or only `names`."""
+    keys = FACTOR_SCORERS if names is None else names
+    return {name: FACTOR_SCORERS[name][0](tables, inputs) for name in keys}
+
+
+def assemble_crs(tables: CrsTables, with_spouse: bool, factors: dict[str, int]) -> CRSBreakdown:
+    """Apply the section caps to a full factor map."""
+    s = WITH_SPOUSE if with_spouse else SINGLE
+    return CRSBreakdown(
+        core_points=_cap(sum(factors[k] for k in CORE_FACTORS), tables.core_max[s]),
+        spouse_points=_cap(sum(factors[k] for k in SPOUSE_FACTORS), tables.spouse_max),
+        transferability_points=_cap(
+            sum(factors[k] for k in TRANSFERABILITY_FACTORS), tables.transfer_max
+        ),
+        additional_points=_cap(sum(factors[k] for k in ADDITIONAL_FACTORS), tables.additional_max),
+        factors=factors,
+    )
+
+
+def score_crs(tables: CrsTables, inputs: CrsInputs) -> CRSBreakdown:
+    return assemble_crs(tables, inputs.with_spouse, score_factors(tables, inputs))
+
+
+# --- Vectorized scoring ---
+def _columns(inputs: list[CrsInputs]) -> dict[str, Any]:
+    def col(name: str) -> Any:
+        return np.asarray([getattr(x, name) for x in inputs], dtype=np.int64)
+
+    cols = {
+        name: col(name)
+        for name in (
+            "with_spouse",
+            "age",
+            "education_rank",
+            "canadian_years",
+            "foreign_years",
+            "spouse_education_rank",
+            "spouse_canadian_years",
+            "has_certificate",
+            "has_sibling",
+            "french_nclc",
+            "has_english",
+            "english_clb",
+            "canadian_study_years",
+            "has_nomination",
+        )
+    }
+    for name in ("first_language", "second_language", "spouse_language"):
+        cols[name] = np.asarray([getattr(x, name) for x in inputs], dtype=np.int64).reshape(-1, 4)
+    return cols
+
+
+def _lookup(table: Sequence[Any], index: Any) -> Any:
+    arr = np.asarray(table, dtype=np.int64)
+    return arr[np.clip(index, 0, arr.shape[0] - 1)]
+
+
+def _vcap(values: Any, cap: int) -> Any:
+    return np.minimum(values, cap) if cap else values
+
+
+def score_crs_batch(tables: CrsTables, inputs: list[CrsInputs]) -> list[CRSBreakdown]:
+    """Score many profiles at once; identical to [score_crs(tables, x) for x in inputs]."""
+    if not inputs:
+        return []
+    if not NUMPY_AVAILABLE:
+        return [score_crs(tables, x) for x in inputs]
+
+    c = _columns(inputs)
+    s = c["with_spouse"]
+    spouse_mask = s.astype(bool)
+    f: dict[str, Any] = {}
+
+    def split(table: tuple[tuple[int, ...], tuple[int, ...]], index: Any) -> Any:
+        arr = np.asarray(table, dtype=np.int64)
+        return arr[s, np.clip(index, 0, arr.shape[1] - 1)]
+
+    f["age"] = split(tables.age, c["age"])
+    f["education"] = split(tables.education, c["education_rank"])
+    f["first_language"] = split(tables.first_language, c["first_language"].T).sum(axis=0)
+    second_max = np.asarray(tables.second_language_max, dtype=np.int64)[s]
+    second = split(tables.second_language, c["second_language"].T).sum(axis=0)
+    f["second_language"] = np.where(second_max > 0, np.minimum(second, second_max), second)
+    f["canadian_work"] = split(tables.canadian_work, c["canadian_years"])
+    core = sum(f[k] for k in CORE_FACTORS)
+    core_max = np.asarray(tables.core_max, dtype=np.int64)[s]
+    core = np.where(core_max > 0, np.minimum(core, core_max), core)
+
+    f["spouse_education"] = np.where(
+        spouse_mask, _lookup(tables.spouse_education, c["spouse_education_rank"]), 0
+    )
+    f["spouse_language"] = np.where(
+        spouse_mask,
+        _vcap(
+            _lookup(tables.spouse_language, c["spouse_language"]).sum(axis=1),
+            tables.spouse_language_max,
+        ),
+        0,
+    )
+    f["spouse_canadian_work"] = np.where(
+        spouse_mask, _lookup(tables.spouse_canadian_work, c["spouse_canadian_years"]), 0
+    )
+    spouse = _vcap(sum(f[k] for k in SPOUSE_FACTORS), tables.spouse_max)
+
+    min_clb = c["first_language"].min(axis=1)
+    clb_band = _lookup(tables.clb_band, min_clb)
+    work_band = _lookup(tables.canadian_work_band, c["canadian_years"])
+    bundle_max = tables.transfer_bundle_max
+    f["transfer_education"] = _vcap(
+        _lookup(tables.transfer_education_language, c["education_rank"])[
+            np.arange(len(inputs)), clb_band
+        ]
+        + _lookup(tables.transfer_education_canadian, c["education_rank"])[
+            np.arange(len(inputs)), work_band
+        ],
+        bundle_max,
+    )
+    f["transfer_foreign_work"] = _vcap(
+        _lookup(tables.transfer_foreign_language, c["foreign_years"])[
+            np.arange(len(inputs)), clb_band
+        ]
+        + _lookup(tables.transfer_foreign_canadian, c["foreign_years"])[
+            np.arange(len(inputs)), work_band
+        ],
+        bundle_max,
+    )
+    f["transfer_certificate"] = np.where(
+        c["has_certificate"].astype(bool),
+        _vcap(
+            _lookup(tables.transfer_certificate, _lookup(tables.certificate_band, min_clb)),
+            bundle_max,
+        ),
+        0,
+    )
+    transferability = _vcap(sum(f[k] for k in TRANSFERABILITY_FACTORS), tables.transfer_max)
+
+    if tables.french_min_nclc is None:
+        f["french"] = np.zeros(len(inputs), dtype=np.int64)
+    else:
+        strong = c["has_english"].astype(bool) & (
+            c["english_clb"] >= tables.french_strong_english_min_clb
+        )
+        f["french"] = np.where(
+            c["french_nclc"] >= tables.french_min_nclc,
+            np.where(
+                strong, tables.french_points_strong_english, tables.french_points_weak_english
+            ),
+            0,
+        )
+    f["sibling"] = c["has_sibling"] * tables.sibling_in_canada
+    f["canadian_study"] = _lookup(tables.canadian_study, c["canadian_study_years"])
+    f["provincial_nomination"] = c["has_nomination"] * tables.provincial_nomination
+    additional = _vcap(sum(f[k] for k in ADDITIONAL_FACTORS), tables.additional_max)
+
+    factor_names = (*CORE_FACTORS, *SPOUSE_FACTORS, *TRANSFERABILITY_FACTORS, *ADDITIONAL_FACTORS)
+    factor_rows = np.stack([f[name] for name in factor_names], axis=1).tolist()
+    sections = np.stack([core, spouse, transferability, additional], axis=1).tolist()
+    return [
+        CRSBreakdown(
+            core_points=row[0],
+            spouse_points=row[1],
+            transferability_points=row[2],
+            additional_points=row[3],
+            factors=dict(zip(factor_names, factor_values, strict=True)),
+        )
+        for row, factor_values in zip(sections, factor_rows, strict=True)
+    ]
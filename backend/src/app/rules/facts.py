@@ -0,0 +1,334 @@
+"""
+Memoized per-profile facts.
+
+ProfileFacts derives each fact about a profile (best language test, latest
+funds, Canadian work, month sums, age, ...) at most once per evaluation so the
+RuleEngine (reason codes + CRS) and program eligibility (human-readable
+reasons) evaluators can share one pass over the profile.
+
+The two evaluators historically count work months differently and both
+behaviours are kept:
+- "elapsed" months: (end - start).days // 30, open-ended records run to today,
+  Canadian months are clipped to the CEC recency window (RuleEngine);
+- "calendar" months: year/month difference, records without both dates are
+  skipped, recency only drops records ending before the cutoff
+  (program_eligibility).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import date, timedelta
+from typing import Any, Generic, Optional, TypeVar
+
+from .compiled import CompiledRulePlan
+from .crs import CrsInputs, CrsTables, score_crs
+from .models import (
+    CandidateProfile,
+    CRSBreakdown,
+    EducationRecord,
+    LanguageTestResult,
+    ProofOfFundsSnapshot,
+    RuleFlag,
+    Severity,
+    WorkExperienceRecord,
+)
+
+FUNDS_MISSING = "missing"
+FUNDS_INSUFFICIENT = "insufficient"
+
+
+def elapsed_months(start: Optional[date], end: Optional[date]) -> int:
+    if not start or not end:
+        return 0
+    return max(0, (end - start).days // 30)
+
+
+def calendar_months(start: date, end: date) -> int:
+    return (end.year - start.year) * 12 + (end.month - start.month)
+
+
+def sum_elapsed_months(
+    records: Iterable[WorkExperienceRecord], recency_years: Optional[int], today: date
+) -> int:
+    cutoff = today.replace(year=today.year - recency_years) if recency_years else None
+    total = 0
+    for record in records:
+        start = record.start_date
+        end = record.end_date or today
+        if cutoff:
+            if end < cutoff:
+                continue
+            start = max(start or cutoff, cutoff)
+        total += elapsed_months(start, end)
+    return total
+
+
+def sum_calendar_months(
+    records: Iterable[WorkExperienceRecord], recency_years: Optional[int], today: date
+) -> int:
+    total = 0
+    for record in records:
+        if not record.start_date or not record.end_date:
+            continue
+        if recency_years:
+            cutoff = date(today.year - recency_years, today.month, today.day)
+            if record.end_date < cutoff:
+                continue
+        total += calendar_months(record.start_date, record.end_date)
+    return total
+
+
+def _best_test(tests: Iterable[LanguageTestResult]) -> Optional[LanguageTestResult]:
+    """Highest minimum CLB, first wins on ties (as CandidateProfile.best_language_test)."""
+    best: Optional[LanguageTestResult] = None
+    best_min = -1
+    for test in tests:
+        min_clb = test.min_clb()
+        if min_clb is not None and min_clb > best_min:
+            best, best_min = test, min_clb
+    return best
+
+
+def _education_rank(records: Iterable[EducationRecord], tables: CrsTables) -> int:
+    return max((tables.education_rank.get(r.level.strip().lower(), 0) for r in records), default=0)
+
+
+def _is_canadian(country: Optional[str]) -> bool:
+    return (country or "").strip().lower() in ("canada", "ca", "can")
+
+
+_T = TypeVar("_T")
+
+
+class _memoized(Generic[_T]):
+    """
+    Lock-free cached_property: ProfileFacts instances are per-evaluation and never
+    shared across threads, so functools.cached_property's per-access lock is pure cost.
+    """
+
+    def __init__(self, func: Callable[[Any], _T]) -> None:
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance: Any, owner: Any = None) -> _T:
+        if instance is None:
+            return self  # type: ignore[return-value]
+        value = self.func(instance)
+        instance.__dict__[self.name] = value
+        return value
+
+
+class ProfileFacts:
+    """Lazily computed facts for one profile under one compiled plan and evaluation date."""
+
+    def __init__(
+        self, profile: CandidateProfile, plan: CompiledRulePlan, today: Optional[date] = None
+    ) -> None:
+        self.profile = profile
+        self.plan = plan
+        self.today = today or date.today()
+        self._funds_status: dict[str, Optional[str]] = {}
+
+    def fork(self, **overrides: Any) -> ProfileFacts:
+        """
+        Copy with some facts replaced (what-if scenarios). Facts already derived
+        are shared; the rest are still derived lazily from the unchanged profile.
+        """
+        forked = ProfileFacts.__new__(ProfileFacts)
+        forked.__dict__.update(self.__dict__)
+        forked._funds_status = dict(self._funds_status)
+        forked.__dict__.update(overrides)
+        return forked
+
+    # --- Language ---
+    @_memoized
+    def best_language_test(self) -> Optional[LanguageTestResult]:
+        converter = self.plan.clb
+        return self.profile.best_language_test(convert=converter.resolve if converter else None)
+
+    @_memoized
+    def language_tests(self) -> list[LanguageTestResult]:
+        """Applicant tests with CLB levels filled from raw scores."""
+        return self._converted(self.profile.language_tests)
+
+    def _converted(self, tests: list[LanguageTestResult]) -> list[LanguageTestResult]:
+        converter = self.plan.clb
+        return [converter.resolve(t) for t in tests] if converter else tests
+
+    @_memoized
+    def best_clb(self) -> Optional[int]:
+        best = self.best_language_test
+        return best.min_clb() if best else None
+
+    # --- Education and work experience ---
+    @_memoized
+    def has_education(self) -> bool:
+        return bool(self.profile.education)
+
+    @_memoized
+    def has_work_experience(self) -> bool:
+        return bool(self.profile.work_experience)
+
+    @_memoized
+    def canadian_work(self) -> list[WorkExperienceRecord]:
+        return [w for w in self.profile.work_experience if w.is_canadian]
+
+    @_memoized
+    def canadian_best_teer(self) -> Optional[int]:
+        """Most skilled (lowest) TEER among Canadian work, if any record has one."""
+        teers = [w.teer_level for w in self.canadian_work if w.teer_level is not None]
+        return min(teers) if teers else None
+
+    @_memoized
+    def canadian_elapsed_months(self) -> int:
+        return sum_elapsed_months(self.canadian_work, self.plan.cec_recency_years, self.today)
+
+    @_memoized
+    def canadian_calendar_months(self) -> int:
+        return sum_calendar_months(self.canadian_work, self.plan.cec_recency_years, self.today)
+
+    @_memoized
+    def fsw_continuous_work_elapsed(self) -> bool:
+        return self._has_continuous_skilled_work(calendar=False)
+
+    @_memoized
+    def fsw_continuous_work_calendar(self) -> bool:
+        return self._has_continuous_skilled_work(calendar=True)
+
+    def _has_continuous_skilled_work(self, calendar: bool) -> bool:
+        required = self.plan.fsw_min_continuous_months
+        for record in self.profile.work_experience:
+            if not self.plan.teer_eligible(record.teer_level):
+                continue
+            if not record.is_continuous:
+                continue
+            if calendar:
+                if not record.start_date or not record.end_date:
+                    continue
+                months = calendar_months(record.start_date, record.end_date)
+            else:
+                months = elapsed_months(record.start_date, record.end_date)
+            if required and months < required:
+                continue
+            return True
+        return False
+
+    # --- Proof of funds ---
+    @_memoized
+    def latest_funds(self) -> Optional[ProofOfFundsSnapshot]:
+        if not self.profile.proof_of_funds:
+            return None
+        return max(self.profile.proof_of_funds, key=lambda p: p.as_of_date)
+
+    def funds_status(self, program_code: str) -> Optional[str]:
+        """None when funds pass (or are not checked), else FUNDS_MISSING / FUNDS_INSUFFICIENT."""
+        if program_code not in self._funds_status:
+            self._funds_status[program_code] = self._compute_funds_status(program_code)
+        return self._funds_status[program_code]
+
+    def _compute_funds_status(self, program_code: str) -> Optional[str]:
+        if not self.plan.funds_checked(program_code):
+            return None
+        latest = self.latest_funds
+        if latest is None:
+            return FUNDS_MISSING
+        if latest.amount >= self.plan.required_funds(self.profile.family_size or 1):
+            return None
+        return FUNDS_INSUFFICIENT
+
+    # --- Age, CRS and expiry ---
+    @_memoized
+    def age(self) -> Optional[int]:
+        return self.profile.current_age(on_date=self.today)
+
+    @_memoized
+    def crs_inputs(self) -> CrsInputs:
+        tables = self.plan.crs
+        profile = self.profile
+        french_types = tables.french_test_types
+
+        first = self.best_language_test
+        first_is_french = first is not None and first.test_type.upper() in french_types
+        second = _best_test(
+            t
+            for t in self.language_tests
+            if (t.test_type.upper() in french_types) != first_is_french
+        )
+        french = first if first_is_french else second
+        english = second if first_is_french else first
+
+        spouse = profile.spouse if profile.spouse and profile.spouse.counts_for_crs() else None
+        spouse_test = _best_test(self._converted(spouse.language_tests)) if spouse else None
+        nominated = profile.has_provincial_nomination or profile.nomination_points > 0
+
+        return CrsInputs(
+            with_spouse=spouse is not None,
+            age=max(self.age or 0, 0),
+            education_rank=_education_rank(profile.education, tables),
+            first_language=first.ability_clbs() if first else (0, 0, 0, 0),
+            second_language=second.ability_clbs() if second else (0, 0, 0, 0),
+            canadian_years=self._work_years(profile.work_experience, canadian=True),
+            foreign_years=self._work_years(profile.work_experience, canadian=False),
+            spouse_education_rank=_education_rank(spouse.education, tables) if spouse else 0,
+            spouse_language=spouse_test.ability_clbs() if spouse_test else (0, 0, 0, 0),
+            spouse_canadian_years=(
+                self._work_years(spouse.work_experience, canadian=True) if spouse else 0
+            ),
+            has_certificate=profile.has_certificate_of_qualification,
+            has_sibling=profile.has_sibling_in_canada,
+            french_nclc=(french.min_clb() or 0) if french else 0,
+            has_english=english is not None,
+            english_clb=(english.min_clb() or 0) if english else 0,
+            canadian_study_years=max(
+                (e.program_length_years or 0 for e in profile.education if _is_canadian(e.country)),
+                default=0,
+            ),
+            has_nomination=nominated,
+        )
+
+    def _work_years(self, records: list[WorkExperienceRecord], canadian: bool) -> int:
+        skilled = [
+            r
+            for r in records
+            if r.is_canadian == canadian and self.plan.teer_eligible(r.teer_level)
+        ]
+        months = sum_elapsed_months(skilled, self.plan.crs.work_recency_years, self.today)
+        return months // 12
+
+    @_memoized
+    def _crs(self) -> CRSBreakdown:
+        return score_crs(self.plan.crs, self.crs_inputs)
+
+    def crs(self) -> CRSBreakdown:
+        return self._crs
+
+    @_memoized
+    def _expiry_flags(self) -> tuple[RuleFlag, ...]:
+        soon = self.today + timedelta(days=self.plan.expiry_warning_days)
+        flags: list[RuleFlag] = []
+        best = self.best_language_test
+        if best and best.expiry_date and best.expiry_date <= soon:
+            flags.append(
+                RuleFlag(
+                    rule_id="LANG_EXPIRING",
+                    severity=Severity.WARNING,
+                    message="Language test expiring soon",
+                    metadata={"expiry_date": str(best.expiry_date)},
+                )
+            )
+        medical = self.profile.medical_status
+        if medical and medical.expiry_date and medical.expiry_date <= soon:
+            flags.append(
+                RuleFlag(
+                    rule_id="MEDICAL_EXPIRING",
+                    severity=Severity.WARNING,
+                    message="Medical exam expiring soon",
+                    metadata={"expiry_date": str(medical.expiry_date)},
+                )
+            )
+        return tuple(flags)
+
+    def expiry_flags(self) -> list[RuleFlag]:
+        return list(self._expiry_flags)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import date
 from enum import Enum
 from typing import Any, Optional
@@ -28,6 +29,12 @@ class LanguageTestResult(BaseModel):
     reading_clb: Optional[int] = None
     writing_clb: Optional[int] = None
     speaking_clb: Optional[int] = None
+    # Raw test scores (IELTS bands, CELPIP levels, TEF/TCF points, ...); converted to
+    # CLB per ability via config/domain/language.yaml when the *_clb field is unset.
+    listening_score: Optional[float] = None
+    reading_score: Optional[float] = None
+    writing_score: Optional[float] = None
+    speaking_score: Optional[float] = None
 
     def min_clb(self) -> Optional[int]:
         scores = [
@@ -39,6 +46,26 @@ class LanguageTestResult(BaseModel):
         filtered = [s for s in scores if s is not None]
         return min(filtered) if filtered else None
 
+    def ability_clbs(self) -> tuple[int, int, int, int]:
+        """(listening, reading, writing, speaking) CLB, 0 where missing."""
+        return (
+            self.listening_clb or 0,
+            self.reading_clb or 0,
+            self.writing_clb or 0,
+            self.speaking_clb or 0,
+        )
+
+    def has_raw_scores(self) -> bool:
+        return any(
+            s is not None
+            for s in (
+                self.listening_score,
+                self.reading_score,
+                self.writing_score,
+                self.speaking_score,
+            )
+        )
+
 
 class EducationRecord(BaseModel):
     level: str
@@ -46,6 +73,7 @@ class EducationRecord(BaseModel):
     eca_received: bool = False
     eca_date: Optional[date] = None
     eca_expiry: Optional[date] = None
+    program_length_years: Optional[int] = None  # CRS Canadian study points
 
 
 class WorkExperienceRecord(BaseModel):
@@ -104,6 +132,7 @@ class CRSBreakdown(BaseModel):
     spouse_points: int = 0
     transferability_points: int = 0
     additional_points: int = 0
+    factors: dict[str, int] = Field(default_factory=dict)  # per-factor points before section caps
 
     @property
     def total_points(self) -> int:
@@ -147,6 +176,25 @@ class ProgramEligibilitySummary(BaseModel):
         return self.eligible_programs()[0] if self.eligible_programs() else None
 
 
+class ProfileEvaluation(BaseModel):
+    """Program eligibility and per-program CRS results from one pass over a profile."""
+
+    programs: ProgramEligibilitySummary
+    crs: dict[str, ProgramEvaluationResult] = Field(default_factory=dict)
+
+
+class SpouseProfile(BaseModel):
+    accompanying: bool = True
+    is_canadian_citizen_or_pr: bool = False
+    education: list[EducationRecord] = Field(default_factory=list)
+    work_experience: list[WorkExperienceRecord] = Field(default_factory=list)
+    language_tests: list[LanguageTestResult] = Field(default_factory=list)
+
+    def counts_for_crs(self) -> bool:
+        """IRCC scores "with spouse" only for an accompanying spouse who is not a citizen/PR."""
+        return self.accompanying and not self.is_canadian_citizen_or_pr
+
+
 class CandidateProfile(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
@@ -161,6 +209,10 @@ class CandidateProfile(BaseModel):
     medical_status: Optional[MedicalStatus] = None
     biometrics_status: Optional[BiometricsStatus] = None
     nomination_points: int = 0  # placeholder for PNP add-ons
+    has_provincial_nomination: bool = False
+    has_certificate_of_qualification: bool = False
+    has_sibling_in_canada: bool = False
+    spouse: Optional[SpouseProfile] = None
 
     def current_age(self, on_date: Optional[date] = None) -> Optional[int]:
         if not self.date_of_birth:
@@ -171,11 +223,16 @@ class CandidateProfile(BaseModel):
             years -= 1
         return years
 
-    def best_language_test(self) -> Optional[LanguageTestResult]:
+    def best_language_test(
+        self, convert: Optional[Callable[[LanguageTestResult], LanguageTestResult]] = None
+    ) -> Optional[LanguageTestResult]:
         # Choose the test with the highest minimum CLB across skills.
+        # `convert` (e.g. ClbConverter.resolve) fills CLB levels from raw test scores first.
         best: Optional[LanguageTestResult] = None
         best_min = -1
         for test in self.language_tests:
+            if convert is not None:
+                test = convert(test)
             min_clb = test.min_clb()
             if min_clb is None:
                 continue
@@ -0,0 +1,288 @@
+"""
+CRS what-if / sensitivity analysis.
+
+A scenario is a list of hypothetical changes (deltas) applied to a base
+profile's ProfileFacts rather than to the profile itself: each delta edits the
+CRS inputs and overrides the eligibility facts it touches. Only the CRS factors
+that read a changed input (crs.affected_factors) and the programs whose facts
+changed are re-evaluated; everything else is reused from the base evaluation.
+Nothing is persisted.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from itertools import combinations
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from .crs import CrsInputs, affected_factors, assemble_crs, changed_inputs, score_factors
+from .facts import ProfileFacts
+from .models import CRSBreakdown, ProgramEligibilityResult, WorkExperienceRecord
+from .program_eligibility import evaluate_program, evaluate_program_facts
+
+DeltaKind = Literal[
+    "first_language_clb",
+    "second_language_clb",
+    "canadian_work_years",
+    "foreign_work_years",
+    "education_level",
+    "canadian_study_years",
+    "certificate_of_qualification",
+    "sibling_in_canada",
+    "provincial_nomination",
+    "spouse_language_clb",
+    "spouse_education_level",
+    "spouse_canadian_work_years",
+]
+
+# Program evaluators to re-run when a delta of this kind is applied; other
+# kinds only move CRS points.
+_ELIGIBILITY_PROGRAMS: dict[str, tuple[str, ...]] = {
+    "first_language_clb": ("FSW", "CEC", "FST"),
+    "canadian_work_years": ("CEC",),
+    "foreign_work_years": ("FSW",),
+    "education_level": ("FSW",),
+}
+
+
+class WhatIfDelta(BaseModel):
+    """
+    One hypothetical change. `value` is a CLB/NCLC level or a number of years,
+    `level` an education level (as in EducationRecord.level); flag kinds need
+    neither. Language deltas raise every ability to at least `value`; work
+    deltas add `value` years as one continuous record at `teer_level`
+    (Canadian work defaults to the best Canadian TEER on file; without a TEER
+    the work is assumed skilled).
+    """
+
+    kind: DeltaKind
+    value: Optional[int] = Field(default=None, ge=0)
+    level: Optional[str] = None
+    teer_level: Optional[int] = None
+    cost: float = Field(default=1.0, ge=0)
+    label: Optional[str] = None
+
+
+class WhatIfResult(BaseModel):
+    deltas: list[WhatIfDelta] = Field(default_factory=list)
+    cost: float = 0.0
+    total_points: int
+    points_gained: int = 0
+    crs: CRSBreakdown
+    eligible_programs: list[str] = Field(default_factory=list)
+    recomputed_factors: list[str] = Field(default_factory=list)
+    meets_target: Optional[bool] = None
+
+
+class WhatIfAnalysis(BaseModel):
+    base: WhatIfResult
+    target_score: Optional[int] = None
+    scenarios: list[WhatIfResult] = Field(default_factory=list)  # one per delta, input order
+    cheapest: list[WhatIfResult] = Field(default_factory=list)  # combinations reaching target
+
+
+def _raise_all(clbs: tuple[int, ...], value: int) -> tuple[int, int, int, int]:
+    return tuple(max(clb, value) for clb in clbs)  # type: ignore[return-value]
+
+
+def _min_teer(*teers: Optional[int]) -> Optional[int]:
+    known = [t for t in teers if t is not None]
+    return min(known) if known else None
+
+
+class WhatIfEngine:
+    """Incremental re-scoring of deltas against one base profile's facts."""
+
+    def __init__(self, facts: ProfileFacts) -> None:
+        self.facts = facts
+        self.plan = facts.plan
+        self.tables = facts.plan.crs
+        self.base_inputs = facts.crs_inputs
+        self.base_crs = facts.crs()
+        self.base_programs: dict[str, ProgramEligibilityResult] = {
+            r.program_code: r for r in evaluate_program_facts(facts).results
+        }
+        best = facts.best_language_test
+        self.first_is_french = (
+            best is not None and best.test_type.upper() in self.tables.french_test_types
+        )
+
+    def evaluate(
+        self, deltas: list[WhatIfDelta], target_score: Optional[int] = None
+    ) -> WhatIfResult:
+        inputs = replace(self.base_inputs)
+        overrides: dict[str, Any] = {}
+        for delta in deltas:
+            self._apply(delta, inputs, overrides)
+
+        recomputed = affected_factors(changed_inputs(self.base_inputs, inputs))
+        if recomputed:
+            factors = dict(self.base_crs.factors)
+            factors.update(score_factors(self.tables, inputs, recomputed))
+            crs = assemble_crs(self.tables, inputs.with_spouse, factors)
+        else:
+            crs = self.base_crs
+
+        programs = dict(self.base_programs)
+        touched = {code for d in deltas for code in _ELIGIBILITY_PROGRAMS.get(d.kind, ())}
+        if touched:
+            scenario = self.facts.fork(**overrides)
+            for code in touched & programs.keys():
+                programs[code] = evaluate_program(scenario, code)
+
+        total = crs.total_points
+        return WhatIfResult(
+            deltas=list(deltas),
+            cost=sum(d.cost for d in deltas),
+            total_points=total,
+            points_gained=total - self.base_crs.total_points,
+            crs=crs,
+            eligible_programs=[code for code, r in programs.items() if r.eligible],
+            recomputed_factors=recomputed,
+            meets_target=None if target_score is None else total >= target_score,
+        )
+
+    def cheapest(
+        self,
+        deltas: list[WhatIfDelta],
+        target_score: int,
+        max_changes: int = 2,
+        limit: int = 10,
+    ) -> list[WhatIfResult]:
+        """
+        Combinations of up to `max_changes` deltas (at most one per kind) that reach
+        `target_score`, cheapest first, then fewest changes, then highest score.
+        Supersets of a combination that already reaches the target are skipped:
+        with non-negative costs they can never rank ahead of it.
+        """
+        hits: list[WhatIfResult] = []
+        reached: set[tuple[int, ...]] = set()
+        for size in range(1, max_changes + 1):
+            for combo in combinations(range(len(deltas)), size):
+                if len({deltas[i].kind for i in combo}) < size:
+                    continue
+                if any(sub in reached for n in range(1, size) for sub in combinations(combo, n)):
+                    continue
+                result = self.evaluate([deltas[i] for i in combo], target_score)
+                if result.meets_target:
+                    reached.add(combo)
+                    hits.append(result)
+        hits.sort(key=lambda r: (r.cost, len(r.deltas), -r.total_points))
+        return hits[:limit]
+
+    # --- Delta application ---
+    def _apply(self, delta: WhatIfDelta, x: CrsInputs, overrides: dict[str, Any]) -> None:
+        kind = delta.kind
+        facts = self.facts
+        if kind == "certificate_of_qualification":
+            x.has_certificate = True
+        elif kind == "sibling_in_canada":
+            x.has_sibling = True
+        elif kind == "provincial_nomination":
+            x.has_nomination = True
+        elif kind in ("education_level", "spouse_education_level"):
+            rank = self._education_rank(delta)
+            if kind == "education_level":
+                x.education_rank = max(x.education_rank, rank)
+                overrides["has_education"] = True
+            else:
+                self._require_spouse(x, kind)
+                x.spouse_education_rank = max(x.spouse_education_rank, rank)
+        else:
+            value = self._value(delta)
+            if kind == "first_language_clb":
+                x.first_language = _raise_all(x.first_language, value)
+                if self.first_is_french:
+                    x.french_nclc = min(x.first_language)
+                else:
+                    x.has_english, x.english_clb = True, min(x.first_language)
+                overrides["best_clb"] = max(facts.best_clb or 0, value)
+            elif kind == "second_language_clb":
+                x.second_language = _raise_all(x.second_language, value)
+                if self.first_is_french:
+                    x.has_english, x.english_clb = True, min(x.second_language)
+                else:
+                    x.french_nclc = min(x.second_language)
+            elif kind == "canadian_work_years":
+                self._add_canadian_work(delta, value, x, overrides)
+            elif kind == "foreign_work_years":
+                self._add_foreign_work(delta, value, x, overrides)
+            elif kind == "canadian_study_years":
+                x.canadian_study_years = max(x.canadian_study_years, value)
+            elif kind == "spouse_language_clb":
+                self._require_spouse(x, kind)
+                x.spouse_language = _raise_all(x.spouse_language, value)
+            elif kind == "spouse_canadian_work_years":
+                self._require_spouse(x, kind)
+                x.spouse_canadian_years += value
+
+    def _add_canadian_work(
+        self, delta: WhatIfDelta, years: int, x: CrsInputs, overrides: dict[str, Any]
+    ) -> None:
+        facts = self.facts
+        teer = delta.teer_level if delta.teer_level is not None else facts.canadian_best_teer
+        if self._skilled(teer):
+            x.canadian_years += years
+        months = years * 12
+        overrides["canadian_elapsed_months"] = facts.canadian_elapsed_months + months
+        overrides["canadian_calendar_months"] = facts.canadian_calendar_months + months
+        overrides["canadian_best_teer"] = _min_teer(facts.canadian_best_teer, teer)
+        if not facts.canadian_work:
+            overrides["canadian_work"] = [
+                WorkExperienceRecord(teer_level=teer, is_continuous=True, is_canadian=True)
+            ]
+
+    def _add_foreign_work(
+        self, delta: WhatIfDelta, years: int, x: CrsInputs, overrides: dict[str, Any]
+    ) -> None:
+        if not self._skilled(delta.teer_level):
+            return
+        x.foreign_years += years
+        required = self.plan.fsw_min_continuous_months
+        if years and (not required or years * 12 >= required):
+            overrides["has_work_experience"] = True
+            overrides["fsw_continuous_work_elapsed"] = True
+            overrides["fsw_continuous_work_calendar"] = True
+
+    def _skilled(self, teer: Optional[int]) -> bool:
+        return teer is None or self.plan.teer_eligible(teer)
+
+    def _education_rank(self, delta: WhatIfDelta) -> int:
+        rank = self.tables.education_rank.get((delta.level or "").strip().lower())
+        if rank is None:
+            raise ValueError(f"{delta.kind}: unknown education level {delta.level!r}")
+        return rank
+
+    @staticmethod
+    def _value(delta: WhatIfDelta) -> int:
+        if delta.value is None:
+            raise ValueError(f"{delta.kind}: value is required")
+        return delta.value
+
+    @staticmethod
+    def _require_spouse(x: CrsInputs, kind: str) -> None:
+        if not x.with_spouse:
+            raise ValueError(f"{kind}: profile has no accompanying spouse scored for CRS")
+
+
+def analyze_what_if(
+    facts: ProfileFacts,
+    deltas: list[WhatIfDelta],
+    target_score: Optional[int] = None,
+    max_changes: int = 2,
+    limit: int = 10,
+) -> WhatIfAnalysis:
+    """Base result, each delta on its own, and (with a target) the cheapest ways to reach it."""
+    engine = WhatIfEngine(facts)
+    base = engine.evaluate([], target_score)
+    cheapest: list[WhatIfResult] = []
+    if target_score is not None and not base.meets_target:
+        cheapest = engine.cheapest(deltas, target_score, max_changes=max_changes, limit=limit)
+    return WhatIfAnalysis(
+        base=base,
+        target_score=target_score,
+        scenarios=[engine.evaluate([d], target_score) for d in deltas],
+        cheapest=cheapest,
+    )
@@ -48,6 +48,7 @@ class Document(DocumentBase):
     mime_type: str
     storage_key: str
     storage_provider: str
+    content_sha256: Optional[str] = None
     processing_status: str
     ocr_status: str
     validation_status: str
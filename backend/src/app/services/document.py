@@ -2,6 +2,7 @@
 Document service for file upload, processing, and management
 """
 import os
+import shutil
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -10,8 +11,11 @@ from typing import Optional
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
 
+from ..config import settings
 from ..models.document import Document
 from ..schemas.document import DocumentCreate
+from .storage import DocumentStorage, LocalStorage, get_storage
+from .uploads import StoredUpload, UploadRejected, UploadWriter, save_upload, save_upload_async
 
 
 class DocumentService:
@@ -27,6 +31,7 @@ class DocumentService:
     }
 
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 MB
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # uploads are streamed to storage 1 MB at a time
 
     # Document type mappings
     DOCUMENT_TYPE_MAPPING = {
@@ -44,10 +49,7 @@ class DocumentService:
     @staticmethod
     def get_storage_path(org_id: str, case_id: Optional[str] = None) -> str:
         """Generate storage path for document"""
-        base_path = os.getenv("DOCUMENT_STORAGE_PATH", "./uploads")
-        if case_id:
-            return os.path.join(base_path, org_id, case_id)
-        return os.path.join(base_path, org_id)
+        return LocalStorage.directory(org_id, case_id)
 
     @staticmethod
     def validate_file(file: UploadFile) -> tuple:
@@ -80,13 +82,12 @@ class DocumentService:
 
     @staticmethod
     def save_file(file: UploadFile, storage_path: str, filename: str) -> str:
-        """Save uploaded file to storage"""
+        """Save uploaded file to storage, copied in chunks"""
         os.makedirs(storage_path, exist_ok=True)
         file_path = os.path.join(storage_path, filename)
 
         with open(file_path, "wb") as f:
-            content = file.file.read()
-            f.write(content)
+            shutil.copyfileobj(file.file, f, DocumentService.UPLOAD_CHUNK_SIZE)
 
         return file_path
 
@@ -106,6 +107,28 @@ class DocumentService:
         """Get category from document type"""
         return DocumentService.DOCUMENT_TYPE_MAPPING.get(document_type.lower(), "other")
 
+    @staticmethod
+    def open_upload(
+        file: UploadFile,
+        org_id: str,
+        case_id: Optional[str] = None,
+        storage: Optional[DocumentStorage] = None,
+    ) -> UploadWriter:
+        """Validate an upload and open a streaming writer for it in the storage backend"""
+        is_valid, error_msg = DocumentService.validate_file(file)
+        if not is_valid:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_msg)
+
+        file_ext = Path(file.filename).suffix.lower()
+        return (storage or get_storage()).open_writer(
+            org_id=org_id,
+            case_id=case_id,
+            filename=file.filename,
+            max_size=DocumentService.MAX_FILE_SIZE,
+            declared_type=DocumentService.ALLOWED_EXTENSIONS[file_ext],
+            allowed_types=set(DocumentService.ALLOWED_EXTENSIONS.values()),
+        )
+
     @staticmethod
     def create_document(
         db: Session,
@@ -115,35 +138,79 @@ class DocumentService:
         uploaded_by: str,
         case_id: Optional[str] = None,
         person_id: Optional[str] = None,
+        queue_ocr: bool = False,
     ) -> Document:
-        """Create a new document record and save file"""
-        # Validate file
-        is_valid, error_msg = DocumentService.validate_file(file)
-        if not is_valid:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_msg)
-
-        # Get file size
-        file.file.seek(0, 2)  # Seek to end
-        file_size = file.file.tell()
-        file.file.seek(0)  # Reset to beginning
-
-        if file_size > DocumentService.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File size exceeds maximum allowed size of {DocumentService.MAX_FILE_SIZE / (1024*1024)} MB",
-            )
-
-        # Generate storage key and path
-        storage_key = DocumentService.generate_storage_key(org_id, case_id, file.filename)
-        storage_path = DocumentService.get_storage_path(org_id, case_id)
-        filename = f"{uuid.uuid4()}_{file.filename}"
+        """Create a new document record and stream the file to storage"""
+        storage = get_storage()
+        writer = DocumentService.open_upload(file, org_id, case_id, storage)
+        try:
+            stored = save_upload(file, writer, DocumentService.UPLOAD_CHUNK_SIZE)
+        except UploadRejected as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+        return DocumentService.record_document(
+            db,
+            stored,
+            file,
+            document_data,
+            org_id,
+            uploaded_by,
+            case_id,
+            person_id,
+            storage,
+            queue_ocr=queue_ocr,
+        )
 
-        # Save file
-        DocumentService.save_file(file, storage_path, filename)
+    @staticmethod
+    async def create_document_async(
+        db: Session,
+        file: UploadFile,
+        document_data: DocumentCreate,
+        org_id: str,
+        uploaded_by: str,
+        case_id: Optional[str] = None,
+        person_id: Optional[str] = None,
+        queue_ocr: bool = False,
+    ) -> Document:
+        """create_document for async routes: chunks are read and written off the event loop"""
+        storage = get_storage()
+        writer = DocumentService.open_upload(file, org_id, case_id, storage)
+        try:
+            stored = await save_upload_async(file, writer, DocumentService.UPLOAD_CHUNK_SIZE)
+        except UploadRejected as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+        return DocumentService.record_document(
+            db,
+            stored,
+            file,
+            document_data,
+            org_id,
+            uploaded_by,
+            case_id,
+            person_id,
+            storage,
+            queue_ocr=queue_ocr,
+        )
 
-        # Get MIME type
-        file_ext = Path(file.filename).suffix.lower()
-        mime_type = DocumentService.ALLOWED_EXTENSIONS.get(file_ext, "application/octet-stream")
+    @staticmethod
+    def record_document(
+        db: Session,
+        stored: StoredUpload,
+        file: UploadFile,
+        document_data: DocumentCreate,
+        org_id: str,
+        uploaded_by: str,
+        case_id: Optional[str] = None,
+        person_id: Optional[str] = None,
+        storage: Optional[DocumentStorage] = None,
+        queue_ocr: bool = False,
+    ) -> Document:
+        """
+        Create the document record for a stored upload, holding a reference to
+        its blob (a file no row references is removed if this fails). With
+        queue_ocr the OCR job is committed together with the record, or the
+        document is marked skipped when OCR is disabled
+        """
+        storage = storage or get_storage()
 
         # Get category if not provided
         category = document_data.category or DocumentService.get_category_from_document_type(
@@ -160,12 +227,13 @@ class DocumentService:
             category=category,
             title=document_data.title,
             description=document_data.description,
-            filename=filename,
+            filename=os.path.basename(stored.path),
             original_filename=file.filename,
-            file_size=file_size,
-            mime_type=mime_type,
-            storage_key=storage_key,
-            storage_provider="local",
+            file_size=stored.size,
+            mime_type=stored.mime_type,
+            content_sha256=stored.sha256,
+            storage_key=storage.storage_key(stored, org_id, case_id),
+            storage_provider=storage.provider,
             processing_status="pending",
             ocr_status="pending",
             validation_status="pending",
@@ -176,8 +244,20 @@ class DocumentService:
             expires_at=document_data.expires_at,
         )
 
-        db.add(document)
-        db.commit()
+        try:
+            db.add(document)
+            storage.acquire(db, stored)
+            if queue_ocr and settings.ocr_enabled:
+                from .ocr_queue import OCRJobQueue
+
+                OCRJobQueue(db).add(document)
+            elif queue_ocr:
+                DocumentService.apply_ocr_result(document, {"skipped": True})
+            db.commit()
+        except Exception:
+            db.rollback()
+            storage.unlink(stored.path)
+            raise
         db.refresh(document)
 
         return document
@@ -258,6 +338,26 @@ class DocumentService:
         db.commit()
         return True
 
+    @staticmethod
+    def purge_document(db: Session, document_id: str, org_id: str) -> bool:
+        """
+        Hard delete a document row and release its file. Soft-deleted documents
+        keep their file; purging is what lets storage reclaim it.
+        """
+        document = (
+            db.query(Document).filter(Document.id == document_id, Document.org_id == org_id).first()
+        )
+        if not document:
+            return False
+
+        storage = get_storage(document.storage_provider or LocalStorage.provider)
+        path = storage.path(document)
+        storage.release(db, document)
+        db.delete(document)
+        db.commit()
+        storage.unlink(path)
+        return True
+
     @staticmethod
     def update_processing_status(
         db: Session, document_id: str, org_id: str, status: str
@@ -275,9 +375,47 @@ class DocumentService:
         db.refresh(document)
         return document
 
+    @staticmethod
+    def get_file_path(document: Document) -> str:
+        """Local path of a stored document's file"""
+        return get_storage(document.storage_provider or LocalStorage.provider).path(document)
+
+    @staticmethod
+    def apply_ocr_result(document: Document, result: dict) -> None:
+        """Record an OCRService.process_document result on the document (not committed)"""
+        if result.get("skipped"):
+            # OCR not available, mark as skipped
+            document.ocr_status = "skipped"
+            document.processing_status = "completed"
+            document.processed_at = datetime.utcnow()
+        elif result["success"]:
+            # Update document with extracted data
+            document.ocr_text = result["text"]
+            document.extracted_metadata = result["metadata"]
+            document.processing_status = "completed"
+            document.ocr_status = "completed"
+            document.processed_at = datetime.utcnow()
+        else:
+            DocumentService.mark_ocr_failed(
+                document, "ocr_error", result.get("error") or "Unknown OCR error"
+            )
+
+    @staticmethod
+    def mark_ocr_failed(document: Document, key: str, error: str) -> None:
+        """Set both statuses to failed and keep the error in validation_results[key]"""
+        document.processing_status = "failed"
+        document.ocr_status = "failed"
+        # Reassigned rather than mutated in place so the JSON column is flagged dirty
+        document.validation_results = {**(document.validation_results or {}), key: error}
+
     @staticmethod
     def process_document_with_ocr(db: Session, document_id: str, org_id: str) -> Optional[Document]:
-        """Process document with OCR to extract text and metadata"""
+        """
+        Process document with OCR to extract text and metadata, synchronously.
+
+        Uploads go through the background queue (services/ocr_queue.py); this is
+        the single-document path its workers share the result handling with.
+        """
         document = DocumentService.get_document_by_id(db, document_id, org_id)
         if not document:
             return None
@@ -288,9 +426,7 @@ class DocumentService:
             document.ocr_status = "processing"
             db.commit()
 
-            # Get full file path
-            storage_path = DocumentService.get_storage_path(org_id, document.case_id)
-            file_path = os.path.join(storage_path, document.filename)
+            file_path = DocumentService.get_file_path(document)
 
             # Check if file exists
             if not os.path.exists(file_path):
@@ -298,31 +434,20 @@ class DocumentService:
 
             # Import OCR service
             from ..services.ocr import OCRService
-
-            # Process document with OCR
-            if OCRService.is_available():
-                result = OCRService.process_document(file_path, document.mime_type)
-
-                if result["success"]:
-                    # Update document with extracted data
-                    document.ocr_text = result["text"]
-                    document.extracted_metadata = result["metadata"]
-                    document.processing_status = "completed"
-                    document.ocr_status = "completed"
-                    document.processed_at = datetime.utcnow()
-                else:
-                    document.ocr_status = "failed"
-                    document.processing_status = "failed"
-                    if document.validation_results is None:
-                        document.validation_results = {}
-                    document.validation_results["ocr_error"] = result.get(
-                        "error", "Unknown OCR error"
-                    )
+            from ..services.ocr_cache import OCRResultCache
+
+            # Process document with OCR, unless these bytes were OCRed before
+            if OCRService.is_available() and settings.ocr_cache_enabled:
+                result = OCRResultCache(db).process(
+                    file_path, document.mime_type, content_sha256=document.content_sha256
+                )
+            elif OCRService.is_available():
+                result = OCRService.process_document(
+                    file_path, document.mime_type, settings.ocr_language
+                )
             else:
-                # OCR not available, mark as skipped
-                document.ocr_status = "skipped"
-                document.processing_status = "completed"
-                document.processed_at = datetime.utcnow()
+                result = {"skipped": True}
+            DocumentService.apply_ocr_result(document, result)
 
             db.commit()
             db.refresh(document)
@@ -330,11 +455,7 @@ class DocumentService:
 
         except Exception as e:
             # Update status to failed
-            document.processing_status = "failed"
-            document.ocr_status = "failed"
-            if document.validation_results is None:
-                document.validation_results = {}
-            document.validation_results["processing_error"] = str(e)
+            DocumentService.mark_ocr_failed(document, "processing_error", str(e))
             db.commit()
             db.refresh(document)
             return document
@@ -1,9 +1,24 @@
 """
 OCR service for document text extraction and processing
+
+PDFs are read page by page (iter_pdf_pages): a page with an embedded text
+layer is extracted with poppler's pdftotext and never rasterized; only pages
+without one are rendered (that single page, at settings.ocr_pdf_dpi) and OCRed.
+With an executor, at most settings.ocr_pdf_window pages are in flight at once
+and results come back in page order as they finish, so memory holds a window
+of page images instead of the whole rasterized document.
 """
 import logging
+import subprocess
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
+
+from ..config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +40,68 @@ except ImportError:
     PDF2IMAGE_AVAILABLE = False
     logger.warning("pdf2image not available. PDF OCR will be limited.")
 
+TEXT_LAYER = "text_layer"
+OCR = "ocr"
+
+
+@dataclass
+class PdfPage:
+    number: int  # 1-based
+    text: str
+    source: str  # text_layer or ocr
+
+
+@lru_cache(maxsize=1)
+def _tesseract_version() -> str:
+    try:
+        return str(pytesseract.get_tesseract_version())
+    except Exception as e:
+        logger.warning(f"Could not read the tesseract version: {str(e)}")
+        return "unknown"
+
+
+def pdf_page_count(pdf_path: str) -> int:
+    """Number of pages, from poppler's pdfinfo (nothing is rendered)"""
+    return int(pdf2image.pdfinfo_from_path(pdf_path)["Pages"])
+
+
+def pdf_text_layer(pdf_path: str, page: int) -> str:
+    """Embedded text of one page via pdftotext; empty if the page has none"""
+    try:
+        completed = subprocess.run(
+            ["pdftotext", "-f", str(page), "-l", str(page), "-layout", pdf_path, "-"],
+            capture_output=True,
+            timeout=60,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"pdftotext failed on page {page} of {pdf_path}: {str(e)}")
+        return ""
+    if completed.returncode != 0:
+        return ""
+    return completed.stdout.decode("utf-8", errors="replace")
+
+
+def read_pdf_page(
+    pdf_path: str, page: int, language: str = "eng", dpi: int = 200, min_text_chars: int = 25
+) -> PdfPage:
+    """
+    Text of one PDF page: its text layer when it has at least `min_text_chars`
+    non-blank characters, otherwise OCR of that page rendered alone.
+    Module-level so pool processes can run it.
+    """
+    text = pdf_text_layer(pdf_path, page)
+    if len("".join(text.split())) >= min_text_chars:
+        return PdfPage(number=page, text=text.strip(), source=TEXT_LAYER)
+
+    images = pdf2image.convert_from_path(pdf_path, dpi=dpi, first_page=page, last_page=page)
+    try:
+        text = "".join(pytesseract.image_to_string(image, lang=language) for image in images)
+    finally:
+        for image in images:
+            image.close()
+    return PdfPage(number=page, text=text.strip(), source=OCR)
+
 
 class OCRService:
     """Service for Optical Character Recognition"""
@@ -34,6 +111,19 @@ class OCRService:
         """Check if OCR is available"""
         return TESSERACT_AVAILABLE
 
+    @staticmethod
+    def engine_version() -> str:
+        """
+        Identifies everything that shapes OCR output (tesseract version and the
+        PDF page settings); part of the OCR result cache key
+        """
+        if not TESSERACT_AVAILABLE:
+            return "none"
+        return (
+            f"tesseract-{_tesseract_version()}"
+            f"/dpi-{settings.ocr_pdf_dpi}/text-layer-{settings.ocr_text_layer_min_chars}"
+        )
+
     @staticmethod
     def extract_text_from_image(image_path: str, language: str = "eng") -> str:
         """
@@ -58,13 +148,56 @@ class OCRService:
             raise
 
     @staticmethod
-    def extract_text_from_pdf(pdf_path: str, language: str = "eng") -> str:
+    def iter_pdf_pages(
+        pdf_path: str,
+        language: str = "eng",
+        executor: Optional[Executor] = None,
+        window: Optional[int] = None,
+    ) -> Iterator[PdfPage]:
         """
-        Extract text from a PDF file using Tesseract OCR
+        Yield the pages of a PDF in order as they are read
 
         Args:
             pdf_path: Path to the PDF file
             language: Language code for OCR (default: 'eng')
+            executor: Pool to read pages on; None reads them one by one in-process
+            window: Most pages in flight at once (default: settings.ocr_pdf_window)
+
+        Returns:
+            Iterator of PdfPage, page 1 first
+        """
+        page_count = pdf_page_count(pdf_path)
+        options = (language, settings.ocr_pdf_dpi, settings.ocr_text_layer_min_chars)
+        if executor is None:
+            for number in range(1, page_count + 1):
+                yield read_pdf_page(pdf_path, number, *options)
+            return
+
+        window = max(window or settings.ocr_pdf_window, 1)
+        pending: deque[Future] = deque()
+        next_page = 1
+        try:
+            while next_page <= page_count or pending:
+                # Top the window up; a page is submitted only once an earlier one was yielded.
+                while next_page <= page_count and len(pending) < window:
+                    pending.append(executor.submit(read_pdf_page, pdf_path, next_page, *options))
+                    next_page += 1
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    def extract_text_from_pdf(
+        pdf_path: str, language: str = "eng", executor: Optional[Executor] = None
+    ) -> str:
+        """
+        Extract text from a PDF file, page by page (text layer or Tesseract OCR)
+
+        Args:
+            pdf_path: Path to the PDF file
+            language: Language code for OCR (default: 'eng')
+            executor: Optional pool to read pages on in parallel
 
         Returns:
             Extracted text string
@@ -77,23 +210,31 @@ class OCRService:
             return ""
 
         try:
-            # Convert PDF pages to images
-            images = pdf2image.convert_from_path(pdf_path)
-
-            # Extract text from each page
             all_text = []
-            for i, image in enumerate(images):
-                text = pytesseract.image_to_string(image, lang=language)
-                if text.strip():
-                    all_text.append(f"--- Page {i + 1} ---\n{text}")
-
+            sources = {TEXT_LAYER: 0, OCR: 0}
+            for page in OCRService.iter_pdf_pages(pdf_path, language, executor):
+                sources[page.source] += 1
+                if page.text:
+                    all_text.append(f"--- Page {page.number} ---\n{page.text}")
+            logger.info(
+                f"Read {pdf_path}: {sources[TEXT_LAYER]} pages from the text layer, "
+                f"{sources[OCR]} by OCR"
+            )
             return "\n\n".join(all_text).strip()
         except Exception as e:
             logger.error(f"Error extracting text from PDF {pdf_path}: {str(e)}")
             raise
 
     @staticmethod
-    def extract_text_from_file(file_path: str, mime_type: str, language: str = "eng") -> str:
+    def _extract_image(file_path: str, language: str, executor: Optional[Executor]) -> str:
+        if executor is None:
+            return OCRService.extract_text_from_image(file_path, language)
+        return executor.submit(OCRService.extract_text_from_image, file_path, language).result()
+
+    @staticmethod
+    def extract_text_from_file(
+        file_path: str, mime_type: str, language: str = "eng", executor: Optional[Executor] = None
+    ) -> str:
         """
         Extract text from a file based on its MIME type
 
@@ -101,6 +242,7 @@ class OCRService:
             file_path: Path to the file
             mime_type: MIME type of the file
             language: Language code for OCR (default: 'eng')
+            executor: Optional pool for the OCR work (PDF pages or the image)
 
         Returns:
             Extracted text string
@@ -121,15 +263,15 @@ class OCRService:
 
         # Handle images
         if mime_type.startswith("image/"):
-            return OCRService.extract_text_from_image(file_path, language)
+            return OCRService._extract_image(file_path, language, executor)
 
         # Handle PDFs
         if mime_type == "application/pdf" or file_ext == ".pdf":
-            return OCRService.extract_text_from_pdf(file_path, language)
+            return OCRService.extract_text_from_pdf(file_path, language, executor)
 
         # For other file types, try OCR if it's an image-like format
         if file_ext in [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"]:
-            return OCRService.extract_text_from_image(file_path, language)
+            return OCRService._extract_image(file_path, language, executor)
 
         logger.warning(f"OCR not supported for file type: {mime_type}")
         return ""
@@ -202,7 +344,9 @@ class OCRService:
         return metadata
 
     @staticmethod
-    def process_document(file_path: str, mime_type: str, language: str = "eng") -> dict[str, Any]:
+    def process_document(
+        file_path: str, mime_type: str, language: str = "eng", executor: Optional[Executor] = None
+    ) -> dict[str, Any]:
         """
         Process a document: extract text and metadata
 
@@ -210,6 +354,7 @@ class OCRService:
             file_path: Path to the document file
             mime_type: MIME type of the file
             language: Language code for OCR (default: 'eng')
+            executor: Optional pool for the OCR work (see extract_text_from_file)
 
         Returns:
             Dictionary with extracted text and metadata
@@ -218,7 +363,7 @@ class OCRService:
 
         try:
             # Extract text
-            text = OCRService.extract_text_from_file(file_path, mime_type, language)
+            text = OCRService.extract_text_from_file(file_path, mime_type, language, executor)
             result["text"] = text
 
             # Extract metadata
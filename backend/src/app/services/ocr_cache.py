@@ -0,0 +1,172 @@
+"""
+OCR result cache keyed by file content.
+
+Clients re-upload the same passport scan or transcript, and /process-ocr can be
+triggered again and again; neither should run tesseract twice on the same
+bytes. Results live in the ocr_results table, shared by the API and every OCR
+worker host, under (sha256 of the file bytes, OCR language, engine version).
+OCRService.engine_version() covers the tesseract version and the PDF page
+settings, so upgrading tesseract or changing the DPI never serves old text:
+those keys stop being requested and age out.
+
+The table is bounded by size (settings.ocr_cache_max_mb of text and metadata):
+once a store pushes it past the bound, least recently used rows are deleted.
+Results are marked in extracted_metadata["ocr_cache"] with hit true/false, the
+content hash and the engine.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.ocr_result import OCRResult
+from .ocr import OCRService
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path: str) -> str:
+    """sha256 of a file, read in chunks so large scans are never held in memory"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class OCRCacheKey:
+    content_sha256: str
+    language: str
+    engine: str
+
+    def marker(self, hit: bool) -> dict[str, Any]:
+        return {"hit": hit, "content_sha256": self.content_sha256, "engine": self.engine}
+
+
+def _mark(result: dict[str, Any], key: OCRCacheKey, hit: bool) -> dict[str, Any]:
+    metadata = dict(result.get("metadata") or {})
+    metadata["ocr_cache"] = key.marker(hit)
+    return {**result, "metadata": metadata}
+
+
+class OCRResultCache:
+    """Get/store OCR results in ocr_results; callers commit with their own writes."""
+
+    def __init__(self, db: Session, max_bytes: Optional[int] = None) -> None:
+        self.db = db
+        self.max_bytes = settings.ocr_cache_max_mb * 1024 * 1024 if max_bytes is None else max_bytes
+
+    @staticmethod
+    def key_for(
+        file_path: str, language: Optional[str] = None, content_sha256: Optional[str] = None
+    ) -> OCRCacheKey:
+        """Cache key of a file; `content_sha256` (hashed at upload) saves re-reading it"""
+        return OCRCacheKey(
+            content_sha256=content_sha256 or file_sha256(file_path),
+            language=language or settings.ocr_language,
+            engine=OCRService.engine_version(),
+        )
+
+    def get(self, key: OCRCacheKey) -> Optional[dict[str, Any]]:
+        """A process_document-shaped result marked as a hit, or None on a miss."""
+        row = self.db.get(OCRResult, (key.content_sha256, key.language, key.engine))
+        if row is None:
+            return None
+        row.hits += 1
+        row.last_used_at = datetime.now(timezone.utc)
+        result = {"text": row.text, "metadata": row.ocr_metadata or {}, "success": True}
+        return _mark(result, key, hit=True)
+
+    def lookup(
+        self,
+        file_path: str,
+        language: Optional[str] = None,
+        content_sha256: Optional[str] = None,
+    ) -> tuple[OCRCacheKey, Optional[dict[str, Any]]]:
+        key = self.key_for(file_path, language, content_sha256)
+        return key, self.get(key)
+
+    def store(self, key: OCRCacheKey, result: dict[str, Any]) -> dict[str, Any]:
+        """
+        Cache a successful result (failures and skips are not cached) and return
+        it marked as a miss.
+        """
+        if not result.get("success"):
+            return result
+        metadata = {k: v for k, v in (result.get("metadata") or {}).items() if k != "ocr_cache"}
+        text = result.get("text") or ""
+        size = len(text.encode("utf-8")) + len(json.dumps(metadata))
+        if size <= self.max_bytes:
+            now = datetime.now(timezone.utc)
+            try:
+                # Savepoint: another worker storing the same bytes first is not an error.
+                with self.db.begin_nested():
+                    self.db.merge(
+                        OCRResult(
+                            content_sha256=key.content_sha256,
+                            language=key.language,
+                            engine=key.engine,
+                            text=text,
+                            ocr_metadata=metadata,
+                            size=size,
+                            hits=0,
+                            created_at=now,
+                            last_used_at=now,
+                        )
+                    )
+            except IntegrityError:
+                pass
+            self.evict()
+        return _mark(result, key, hit=False)
+
+    def process(
+        self,
+        file_path: str,
+        mime_type: str,
+        language: Optional[str] = None,
+        content_sha256: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """OCRService.process_document through the cache"""
+        key, cached = self.lookup(file_path, language, content_sha256)
+        if cached is not None:
+            return cached
+        return self.store(key, OCRService.process_document(file_path, mime_type, key.language))
+
+    def evict(self) -> int:
+        """Delete least recently used rows until the table fits max_bytes; returns rows removed."""
+        total = self.db.scalar(select(func.coalesce(func.sum(OCRResult.size), 0))) or 0
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return 0
+        victims = []
+        freed = 0
+        rows = self.db.execute(
+            select(
+                OCRResult.content_sha256, OCRResult.language, OCRResult.engine, OCRResult.size
+            ).order_by(OCRResult.last_used_at.asc())
+        )
+        for row in rows:
+            victims.append((row.content_sha256, row.language, row.engine))
+            freed += row.size
+            if freed >= excess:
+                break
+        rows.close()
+        for content_sha256, language, engine in victims:
+            self.db.execute(
+                delete(OCRResult).where(
+                    OCRResult.content_sha256 == content_sha256,
+                    OCRResult.language == language,
+                    OCRResult.engine == engine,
+                )
+            )
+        return len(victims)
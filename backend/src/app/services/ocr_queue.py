@@ -0,0 +1,501 @@
+"""
+Background OCR: a durable job queue and a process pool of OCR workers.
+
+Uploads no longer run tesseract inside the HTTP request. DocumentService stores
+the file and commits the documents row together with its ocr_jobs row
+(OCRJobQueue.add()), so no document is left pending without a job; the upload
+returns at once with ocr_status/processing_status "pending". With OCR disabled
+no job is queued and the document is recorded as skipped.
+
+Workers (`python -m src.app.services.ocr_queue`) poll the table:
+
+- claim() flips up to N due jobs from queued to running with a conditional
+  UPDATE per job (FOR UPDATE SKIP LOCKED on PostgreSQL), so any number of
+  worker hosts can share the queue without running a job twice. The claim is a
+  lease (settings.ocr_job_lease_seconds) that a heartbeat thread renews while
+  the job runs; a job whose worker died is claimed again once the lease
+  expires, and a worker that lost its lease can no longer complete or fail the
+  job (both are conditional on still holding it);
+- OCR itself runs in one ProcessPoolExecutor per worker, one process per CPU
+  core by default (settings.ocr_workers), so throughput scales with the cores
+  of the host. Claimed jobs are driven from threads that fan their work out to
+  that pool: a PDF page by page in a bounded window (OCRService.iter_pdf_pages),
+  so one long PDF keeps every core busy without rasterizing the whole file;
+- files whose bytes were OCRed before are answered from the OCR result cache
+  (services/ocr_cache.py) without reaching the pool;
+- a failed attempt is retried with exponential backoff
+  (settings.ocr_retry_backoff_seconds * 2**(attempt-1)) until
+  settings.ocr_max_attempts, after which the job and the document are failed.
+
+The document's ocr_status and processing_status follow the job: pending while
+queued (or waiting for a retry), processing while claimed, then completed,
+skipped (no tesseract) or failed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import uuid
+from collections.abc import Callable, Iterable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.document import Document
+from ..models.ocr_job import OCRJob
+from .document import DocumentService
+from .ocr import OCRService
+from .ocr_cache import OCRCacheKey, OCRResultCache
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+OPEN_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+MAX_BACKOFF_SECONDS = 6 * 60 * 60
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def run_ocr(file_path: str, mime_type: str, executor: Optional[Executor] = None) -> dict[str, Any]:
+    """OCR one stored file, sending pages/images to `executor` (None: in this thread)."""
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Document file not found: {file_path}")
+    if not settings.ocr_enabled or not OCRService.is_available():
+        return {"skipped": True}
+    return OCRService.process_document(file_path, mime_type, settings.ocr_language, executor)
+
+
+def retry_delay(attempt: int) -> timedelta:
+    """Backoff before retry number `attempt` (1-based): base, 2*base, 4*base, ..."""
+    seconds = settings.ocr_retry_backoff_seconds * 2 ** max(attempt - 1, 0)
+    return timedelta(seconds=min(seconds, MAX_BACKOFF_SECONDS))
+
+
+class OCRJobQueue:
+    """The ocr_jobs table as a queue: enqueue, claim, complete and fail jobs."""
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def enqueue(self, document: Document, *, max_attempts: Optional[int] = None) -> OCRJob:
+        """Queue OCR for the document (committed); an open job is reused, not duplicated."""
+        job = self.add(document, max_attempts=max_attempts)
+        self.db.commit()
+        return job
+
+    def add(self, document: Document, *, max_attempts: Optional[int] = None) -> OCRJob:
+        """enqueue() without the commit, for callers that commit the job with other rows."""
+        job = (
+            self.db.query(OCRJob)
+            .filter(OCRJob.document_id == document.id, OCRJob.status.in_(OPEN_STATUSES))
+            .first()
+        )
+        if job is None:
+            job = OCRJob(
+                document_id=document.id,
+                org_id=document.org_id,
+                status=JOB_QUEUED,
+                attempts=0,
+                max_attempts=max(max_attempts or settings.ocr_max_attempts, 1),
+                available_at=_now(),
+            )
+            self.db.add(job)
+            document.processing_status = "pending"
+            document.ocr_status = "pending"
+        return job
+
+    def claim(self, worker_id: str, limit: int) -> list[OCRJob]:
+        """Lease up to `limit` due jobs to `worker_id` (committed), oldest first."""
+        if limit <= 0:
+            return []
+        now = _now()
+        self._fail_exhausted_leases(now)
+        due = or_(
+            and_(OCRJob.status == JOB_QUEUED, OCRJob.available_at <= now),
+            and_(OCRJob.status == JOB_RUNNING, OCRJob.locked_until < now),
+        )
+        stmt = select(OCRJob.id).where(due).order_by(OCRJob.available_at).limit(limit)
+        if self.db.get_bind().dialect.name == "postgresql":
+            stmt = stmt.with_for_update(skip_locked=True)
+        claimed = []
+        for job_id in self.db.execute(stmt).scalars().all():
+            # Conditional on the job still being due: a concurrent worker that got
+            # there first leaves rowcount 0 and the job is skipped.
+            result = self.db.execute(
+                update(OCRJob)
+                .where(OCRJob.id == job_id, due)
+                .values(
+                    status=JOB_RUNNING,
+                    attempts=OCRJob.attempts + 1,
+                    locked_by=worker_id,
+                    locked_until=now + timedelta(seconds=settings.ocr_job_lease_seconds),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                claimed.append(job_id)
+        if claimed:
+            document_ids = select(OCRJob.document_id).where(OCRJob.id.in_(claimed))
+            self.db.execute(
+                update(Document)
+                .where(Document.id.in_(document_ids))
+                .values(processing_status="processing", ocr_status="processing")
+                .execution_options(synchronize_session=False)
+            )
+        self.db.commit()
+        if not claimed:
+            return []
+        return (
+            self.db.query(OCRJob)
+            .populate_existing()
+            .filter(OCRJob.id.in_(claimed))
+            .order_by(OCRJob.available_at)
+            .all()
+        )
+
+    def renew(self, worker_id: str, job_ids: Iterable[str]) -> set[str]:
+        """Extend the lease of the jobs `worker_id` still holds (committed); returns their ids."""
+        ids = list(job_ids)
+        if not ids:
+            return set()
+        held = and_(OCRJob.id.in_(ids), *self._held_by(worker_id))
+        self.db.execute(
+            update(OCRJob)
+            .where(held)
+            .values(locked_until=_now() + timedelta(seconds=settings.ocr_job_lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        renewed = set(self.db.execute(select(OCRJob.id).where(held)).scalars())
+        self.db.commit()
+        return renewed
+
+    def complete(self, job: OCRJob, result: dict[str, Any], worker_id: str) -> bool:
+        """
+        Store a run_ocr() result on the document; a failed OCR result counts as an
+        attempt. Returns False (nothing written) when `worker_id` lost the lease.
+        """
+        if not result.get("skipped") and not result.get("success"):
+            return self.fail(job, result.get("error") or "Unknown OCR error", worker_id)
+        if not self._transition(job, self._held_by(worker_id), **self._finished(JOB_COMPLETED)):
+            return False
+        DocumentService.apply_ocr_result(self._document(job), result)
+        self.db.commit()
+        return True
+
+    def fail(self, job: OCRJob, error: Any, worker_id: str, *, retry: bool = True) -> bool:
+        """
+        Schedule the next attempt with backoff, or fail job and document for good.
+        Returns False (nothing written) when `worker_id` lost the lease.
+        """
+        return self._fail(job, error, self._held_by(worker_id), retry=retry)
+
+    def pending_count(self) -> int:
+        return self.db.query(OCRJob).filter(OCRJob.status.in_(OPEN_STATUSES)).count()
+
+    def _document(self, job: OCRJob) -> Document:
+        return self.db.get(Document, job.document_id)
+
+    @staticmethod
+    def _held_by(worker_id: str) -> list[Any]:
+        return [OCRJob.status == JOB_RUNNING, OCRJob.locked_by == worker_id]
+
+    @staticmethod
+    def _finished(status: str) -> dict[str, Any]:
+        return {"status": status, "finished_at": _now(), "locked_by": None, "locked_until": None}
+
+    def _transition(self, job: OCRJob, held: list[Any], **values: Any) -> bool:
+        """
+        Move the job to its next state only while the lease is still held. The
+        conditional UPDATE also locks the row, so a worker whose lease expired
+        (and whose job another worker re-claimed) can no longer overwrite it.
+        """
+        result = self.db.execute(
+            update(OCRJob)
+            .where(OCRJob.id == job.id, *held)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            return True
+        self.db.rollback()
+        logger.warning("OCR job %s lease was lost; discarding this attempt's outcome", job.id)
+        return False
+
+    def _fail(self, job: OCRJob, error: Any, held: list[Any], *, retry: bool) -> bool:
+        message = str(error) or type(error).__name__
+        attempts, max_attempts = job.attempts, job.max_attempts
+        if retry and attempts < max_attempts:
+            delay = retry_delay(attempts)
+            values = {
+                "status": JOB_QUEUED,
+                "available_at": _now() + delay,
+                "locked_by": None,
+                "locked_until": None,
+            }
+        else:
+            delay, values = None, self._finished(JOB_FAILED)
+        if not self._transition(job, held, last_error=message, **values):
+            return False
+        document = self._document(job)
+        if delay is not None:
+            document.processing_status = "pending"
+            document.ocr_status = "pending"
+            logger.warning(
+                "OCR job %s attempt %d/%d failed, retrying in %ds: %s",
+                job.id,
+                attempts,
+                max_attempts,
+                delay.total_seconds(),
+                message,
+            )
+        else:
+            DocumentService.mark_ocr_failed(document, "ocr_error", message)
+            logger.error("OCR job %s failed after %d attempts: %s", job.id, attempts, message)
+        self.db.commit()
+        return True
+
+    def _fail_exhausted_leases(self, now: datetime) -> None:
+        # A job whose worker kept dying mid-run must not be re-claimed forever.
+        stale = (
+            self.db.query(OCRJob)
+            .filter(
+                OCRJob.status == JOB_RUNNING,
+                OCRJob.locked_until < now,
+                OCRJob.attempts >= OCRJob.max_attempts,
+            )
+            .all()
+        )
+        for job in stale:
+            holder = job.locked_by
+            # Still expired and still that worker's: a late heartbeat wins over this.
+            held = [*self._held_by(holder), OCRJob.locked_until < now]
+            self._fail(job, f"Lease expired while held by {holder}", held, retry=False)
+
+
+def _inline_future(func: Callable[..., Any], *args: Any) -> Future:
+    future: Future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as exc:  # noqa: BLE001 - delivered through the future like the pool does
+        future.set_exception(exc)
+    return future
+
+
+class OCRWorkerPool:
+    """Claims queued OCR jobs and runs them on a process pool until stopped."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        *,
+        processes: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+        worker_id: Optional[str] = None,
+    ) -> None:
+        if session_factory is None:
+            from ..db.database import SessionLocal
+
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        # processes <= 0 runs OCR in this process, one job at a time (tests, debugging).
+        self.processes = settings.ocr_workers if processes is None else processes
+        self.poll_interval = (
+            settings.ocr_poll_interval_seconds if poll_interval is None else poll_interval
+        )
+        # Leases are renewed well before they run out, even while a long PDF is in flight.
+        self.heartbeat_interval = (
+            max(settings.ocr_job_lease_seconds / 3, 1)
+            if heartbeat_interval is None
+            else heartbeat_interval
+        )
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.stop_event = threading.Event()
+        self._held: set[str] = set()
+        self._held_lock = threading.Lock()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+    def renew_leases(self) -> set[str]:
+        """Renew the lease of every job this worker is running; returns the ones it lost."""
+        with self._held_lock:
+            held = set(self._held)
+        if not held:
+            return set()
+        db = self.session_factory()
+        try:
+            lost = held - OCRJobQueue(db).renew(self.worker_id, held)
+        finally:
+            db.close()
+        for job_id in lost:
+            logger.warning("OCR worker %s lost the lease on job %s", self.worker_id, job_id)
+        return lost
+
+    def _heartbeat(self, stopped: threading.Event) -> None:
+        # Own thread and session: the loop below may be blocked (an inline OCR run, a
+        # large file being hashed) for longer than a lease.
+        while not stopped.wait(self.heartbeat_interval):
+            try:
+                self.renew_leases()
+            except Exception:  # noqa: BLE001 - a failed heartbeat is retried next interval
+                logger.exception("OCR worker %s could not renew its leases", self.worker_id)
+
+    def _track(self, job_id: str, held: bool) -> None:
+        with self._held_lock:
+            if held:
+                self._held.add(job_id)
+            else:
+                self._held.discard(job_id)
+
+    def run(self, *, drain: bool = False) -> int:
+        """
+        Process jobs until stop() (or, with drain=True, until no job is due and
+        none is running). Returns the number of jobs that finished an attempt.
+        """
+        slots = max(self.processes, 1)
+        jobs = ThreadPoolExecutor(max_workers=slots, thread_name_prefix="ocr-job")
+        pages = self._executor()
+        in_flight: dict[Future, tuple[str, Optional[Executor], Optional[OCRCacheKey]]] = {}
+        handled = 0
+        db = self.session_factory()
+        queue = OCRJobQueue(db)
+        cache = OCRResultCache(db) if self._cache_enabled() else None
+        heartbeat_stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat,
+            args=(heartbeat_stopped,),
+            name="ocr-heartbeat",
+            daemon=True,
+        )
+        heartbeat.start()
+        try:
+            while not self.stop_event.is_set():
+                for job in queue.claim(self.worker_id, slots - len(in_flight)):
+                    self._track(job.id, True)
+                    key = None
+                    if cache is not None:
+                        try:
+                            document = job.document
+                            key, cached = cache.lookup(
+                                DocumentService.get_file_path(document),
+                                content_sha256=document.content_sha256,
+                            )
+                        except FileNotFoundError as exc:
+                            queue.fail(job, exc, self.worker_id, retry=False)
+                            self._track(job.id, False)
+                            handled += 1
+                            continue
+                        if cached is not None:
+                            queue.complete(job, cached, self.worker_id)
+                            self._track(job.id, False)
+                            handled += 1
+                            continue
+                    in_flight[self._submit(jobs, pages, job)] = (job.id, pages, key)
+                if not in_flight:
+                    if drain:
+                        break
+                    self.stop_event.wait(self.poll_interval)
+                    continue
+
+                done, _ = wait(in_flight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    job_id, used, key = in_flight.pop(future)
+                    job = db.get(OCRJob, job_id)
+                    try:
+                        result = future.result()
+                        if key is not None:
+                            result = cache.store(key, result)
+                        queue.complete(job, result, self.worker_id)
+                    except BrokenProcessPool as exc:
+                        broken = broken or used is pages
+                        queue.fail(job, f"OCR worker process died: {exc}", self.worker_id)
+                    except Exception as exc:  # noqa: BLE001 - any OCR error is a failed attempt
+                        queue.fail(
+                            job, exc, self.worker_id, retry=not isinstance(exc, FileNotFoundError)
+                        )
+                    self._track(job_id, False)
+                    handled += 1
+                if broken and pages is not None:
+                    # Every job still using the broken pool fails with it; start a fresh pool.
+                    pages.shutdown(wait=False, cancel_futures=True)
+                    pages = self._executor()
+        finally:
+            heartbeat_stopped.set()
+            if pages is not None:
+                pages.shutdown(wait=True, cancel_futures=True)
+            jobs.shutdown(wait=True)
+            heartbeat.join()
+            with self._held_lock:
+                self._held.clear()
+            db.close()
+        return handled
+
+    @staticmethod
+    def _cache_enabled() -> bool:
+        return settings.ocr_cache_enabled and settings.ocr_enabled and OCRService.is_available()
+
+    def _executor(self) -> Optional[Executor]:
+        if self.processes <= 0:
+            return None
+        # spawn: forking a process that holds threads and DB connections is unsafe.
+        return ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    @staticmethod
+    def _submit(jobs: Executor, pages: Optional[Executor], job: OCRJob) -> Future:
+        document = job.document
+        args = (DocumentService.get_file_path(document), document.mime_type)
+        if pages is None:
+            return _inline_future(run_ocr, *args)
+        return jobs.submit(run_ocr, *args, executor=pages)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """CLI: python -m src.app.services.ocr_queue [--processes N] [--drain]"""
+    parser = argparse.ArgumentParser(description="Run the background OCR workers.")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--poll-interval", type=float, default=None)
+    parser.add_argument(
+        "--drain", action="store_true", help="Exit once no job is due instead of polling forever"
+    )
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    logging.basicConfig(level=settings.log_level)
+    pool = OCRWorkerPool(processes=args.processes, poll_interval=args.poll_interval)
+    logger.info("OCR worker %s starting with %d processes", pool.worker_id, pool.processes)
+    try:
+        handled = pool.run(drain=args.drain)
+    except KeyboardInterrupt:
+        pool.stop()
+        return
+    print(f"{handled} OCR jobs processed")
+
+
+if __name__ == "__main__":
+    main()
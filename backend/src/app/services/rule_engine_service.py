@@ -5,10 +5,12 @@ from src.app.rules.config_port import RuleConfigPort
 from src.app.rules.engine import RuleEngine
 from src.app.rules.models import (
     CandidateProfile,
+    ProfileEvaluation,
     ProgramEvaluationResult,
     ProgramEligibilitySummary,
 )
 from src.app.rules.program_eligibility import evaluate_programs
+from src.app.rules.what_if import WhatIfAnalysis, WhatIfDelta, analyze_what_if
 
 
 class RuleEngineService:
@@ -21,22 +23,49 @@ class RuleEngineService:
         self, config_port: RuleConfigPort | None = None, config_service: ConfigService | None = None
     ) -> None:
         if config_port:
-            config = config_port.get_config()
+            self.engine = RuleEngine(config=config_port.get_config())
         else:
             service = config_service or ConfigService()
-            config = service.get_domain_rules()
-        self.engine = RuleEngine(config=config)
+            self.engine = RuleEngine(
+                config=service.get_domain_rules(), plan=service.get_rule_plan()
+            )
 
     def evaluate(self, profile: CandidateProfile) -> dict[str, ProgramEvaluationResult]:
         return self.engine.evaluate_candidate(profile)
 
+    def evaluate_batch(
+        self, profiles: list[CandidateProfile]
+    ) -> list[dict[str, ProgramEvaluationResult]]:
+        return self.engine.evaluate_batch(profiles)
+
     def evaluate_programs(self, profile: CandidateProfile) -> ProgramEligibilitySummary:
-        return evaluate_programs(profile, self.engine.config)
+        return evaluate_programs(profile, self.engine.config, plan=self.engine.plan)
+
+    def evaluate_profile(self, profile: CandidateProfile) -> ProfileEvaluation:
+        return self.engine.evaluate_profile(profile)
+
+    def evaluate_profiles(self, profiles: list[CandidateProfile]) -> list[ProfileEvaluation]:
+        return self.engine.evaluate_profiles(profiles)
+
+    def what_if(
+        self,
+        profile: CandidateProfile,
+        deltas: list[WhatIfDelta],
+        target_score: int | None = None,
+        max_changes: int = 2,
+        limit: int = 10,
+    ) -> WhatIfAnalysis:
+        return analyze_what_if(
+            self.engine.facts(profile),
+            deltas,
+            target_score=target_score,
+            max_changes=max_changes,
+            limit=limit,
+        )
 
     def evaluate_full_profile(self, profile: CandidateProfile) -> dict[str, object]:
         """
         Combined view: program eligibility + CRS breakdown (DRAFT).
         """
-        program_summary = self.evaluate_programs(profile)
-        crs_results = self.evaluate(profile)
-        return {"programs": program_summary, "crs": crs_results}
+        evaluation = self.evaluate_profile(profile)
+        return {"programs": evaluation.programs, "crs": evaluation.crs}
@@ -0,0 +1,371 @@
+"""
+Document storage backends
+
+documents.storage_provider records which backend holds a document's bytes:
+
+- "local": one file per upload at DOCUMENT_STORAGE_PATH/<org>/<case>/<uuid>_<name>,
+  the original layout. Byte-identical uploads are stored once per upload.
+- "cas": content-addressed. A file is stored once per unique content at
+  DOCUMENT_STORAGE_PATH/blobs/sha256/<ab>/<cd>/<sha256>, sharded on the first
+  two bytes of the hash so no directory holds more than a few thousand blobs.
+  Every documents row using a blob holds a reference (storage_blobs.ref_count);
+  blobs no row references are deleted by collect_garbage().
+
+New uploads go to settings.document_storage_provider; existing rows keep
+resolving through the provider they were stored with.
+"""
+
+import argparse
+import logging
+import os
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.document import Document
+from ..models.storage_blob import StorageBlob
+from .uploads import StoredUpload, UploadWriter
+
+logger = logging.getLogger(__name__)
+
+
+def storage_root() -> str:
+    return os.getenv("DOCUMENT_STORAGE_PATH", settings.document_storage_path)
+
+
+class DocumentStorage(ABC):
+    """Where a document's bytes live, and what a documents row owns of them"""
+
+    provider: str
+
+    @abstractmethod
+    def open_writer(
+        self,
+        org_id: str,
+        case_id: Optional[str],
+        filename: str,
+        max_size: int,
+        declared_type: str,
+        allowed_types: set[str],
+    ) -> UploadWriter:
+        """A streaming writer that stores an upload in this backend"""
+
+    @abstractmethod
+    def storage_key(self, stored: StoredUpload, org_id: str, case_id: Optional[str]) -> str:
+        pass
+
+    @abstractmethod
+    def path(self, document: Document) -> str:
+        """Local path of a document's file"""
+
+    @abstractmethod
+    def acquire(self, db: Session, stored: StoredUpload) -> None:
+        """Take a reference for a new documents row (in the caller's transaction)"""
+
+    @abstractmethod
+    def release(self, db: Session, document: Document) -> None:
+        """Drop the reference of a documents row being deleted (in the caller's transaction)"""
+
+    @abstractmethod
+    def unlink(self, path: str) -> None:
+        """Remove a file no documents row uses any more, once the row change is committed"""
+
+
+class LocalStorage(DocumentStorage):
+    """One file per upload, in a directory per org and case"""
+
+    provider = "local"
+
+    @staticmethod
+    def directory(org_id: str, case_id: Optional[str] = None) -> str:
+        if case_id:
+            return os.path.join(storage_root(), org_id, case_id)
+        return os.path.join(storage_root(), org_id)
+
+    def open_writer(self, org_id, case_id, filename, max_size, declared_type, allowed_types):
+        directory = self.directory(org_id, case_id)
+        path = os.path.join(directory, f"{uuid.uuid4()}_{filename}")
+        return UploadWriter(
+            directory=directory,
+            destination=lambda sha256: path,
+            max_size=max_size,
+            declared_type=declared_type,
+            allowed_types=allowed_types,
+        )
+
+    def storage_key(self, stored, org_id, case_id):
+        return os.path.relpath(stored.path, storage_root()).replace(os.sep, "/")
+
+    def path(self, document):
+        return os.path.join(self.directory(document.org_id, document.case_id), document.filename)
+
+    def acquire(self, db, stored):
+        # Every upload owns its file: there is no shared reference to take.
+        return None
+
+    def release(self, db, document):
+        return None
+
+    def unlink(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@dataclass
+class GarbageCollection:
+    blobs: int = 0  # storage_blobs rows (and their files) with no references left
+    orphan_files: int = 0  # blob files without a storage_blobs row
+    temp_files: int = 0  # abandoned .part files of interrupted uploads
+    bytes_freed: int = 0
+
+
+class ContentAddressedStorage(DocumentStorage):
+    """One file per unique content, shared by every documents row with those bytes"""
+
+    provider = "cas"
+
+    @staticmethod
+    def root() -> str:
+        return os.path.join(storage_root(), "blobs")
+
+    @staticmethod
+    def key_for(sha256: str) -> str:
+        return f"sha256/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.root(), *self.key_for(sha256).split("/"))
+
+    def temp_dir(self) -> str:
+        # Under the blob root, so the final rename never crosses filesystems
+        return os.path.join(self.root(), "tmp")
+
+    def open_writer(self, org_id, case_id, filename, max_size, declared_type, allowed_types):
+        return UploadWriter(
+            directory=self.temp_dir(),
+            destination=self.blob_path,
+            max_size=max_size,
+            declared_type=declared_type,
+            allowed_types=allowed_types,
+        )
+
+    def storage_key(self, stored, org_id, case_id):
+        return self.key_for(stored.sha256)
+
+    def path(self, document):
+        return os.path.join(self.root(), *document.storage_key.split("/"))
+
+    def acquire(self, db, stored):
+        increment = (
+            update(StorageBlob)
+            .where(StorageBlob.sha256 == stored.sha256)
+            .values(ref_count=StorageBlob.ref_count + 1, released_at=None)
+        )
+        if db.execute(increment).rowcount:
+            return
+        try:
+            # Savepoint: a concurrent upload of the same bytes may insert the row first.
+            with db.begin_nested():
+                db.add(StorageBlob(sha256=stored.sha256, size=stored.size, ref_count=1))
+        except IntegrityError:
+            db.execute(increment)
+
+    def release(self, db, document):
+        db.execute(
+            update(StorageBlob)
+            .where(StorageBlob.sha256 == document.content_sha256)
+            .values(
+                ref_count=case((StorageBlob.ref_count > 1, StorageBlob.ref_count - 1), else_=0),
+                released_at=case(
+                    (StorageBlob.ref_count <= 1, datetime.now(timezone.utc)),
+                    else_=StorageBlob.released_at,
+                ),
+            )
+        )
+
+    def unlink(self, path):
+        # Shared blobs are only removed by collect_garbage(), after their last reference.
+        pass
+
+    def reconcile(self, db: Session) -> None:
+        """
+        Recount references from the documents table. Rows removed without
+        release() (an org deleted with ON DELETE CASCADE) otherwise keep their
+        blobs alive forever.
+        """
+        references = (
+            select(func.count(Document.id))
+            .where(
+                Document.storage_provider == self.provider,
+                Document.content_sha256 == StorageBlob.sha256,
+            )
+            .scalar_subquery()
+        )
+        db.execute(update(StorageBlob).values(ref_count=references))
+        db.execute(
+            update(StorageBlob)
+            .where(StorageBlob.ref_count == 0, StorageBlob.released_at.is_(None))
+            .values(released_at=datetime.now(timezone.utc))
+        )
+        db.execute(
+            update(StorageBlob)
+            .where(StorageBlob.ref_count > 0, StorageBlob.released_at.isnot(None))
+            .values(released_at=None)
+        )
+
+    def collect_garbage(
+        self, db: Session, grace_seconds: Optional[int] = None
+    ) -> GarbageCollection:
+        """
+        Delete blobs no documents row references. Anything touched within the
+        grace period is kept: an upload may have stored (or deduplicated onto) a
+        blob whose documents row is not committed yet.
+        """
+        grace = settings.storage_gc_grace_seconds if grace_seconds is None else grace_seconds
+        stats = GarbageCollection()
+
+        self.reconcile(db)
+        db.commit()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace)
+
+        released = db.execute(
+            select(StorageBlob.sha256, StorageBlob.size).where(
+                StorageBlob.ref_count == 0, StorageBlob.released_at <= cutoff
+            )
+        ).all()
+        # Files are moved aside (tombstoned) before their row is deleted: an upload
+        # deduplicating onto a blob touches its mtime, which the tombstone re-checks,
+        # and an upload arriving after the move writes a fresh copy.
+        doomed: list[tuple[str, Optional[str], int]] = []
+        try:
+            for sha256, size in released:
+                path = self.blob_path(sha256)
+                tombstone = None
+                if os.path.exists(path):
+                    tombstone = self._tombstone(path, cutoff)
+                    if tombstone is None:
+                        continue
+                removed = db.execute(
+                    delete(StorageBlob).where(
+                        StorageBlob.sha256 == sha256, StorageBlob.ref_count == 0
+                    )
+                ).rowcount
+                if removed:
+                    doomed.append((path, tombstone, size))
+                elif tombstone is not None:
+                    self._restore(tombstone, path)
+            db.commit()
+        except Exception:
+            db.rollback()
+            for path, tombstone, _ in doomed:
+                if tombstone is not None:
+                    self._restore(tombstone, path)
+            raise
+        for _, tombstone, size in doomed:
+            if tombstone is not None:
+                os.remove(tombstone)
+            stats.blobs += 1
+            stats.bytes_freed += size
+
+        # Files of uploads whose documents row was never committed
+        shards = os.path.join(self.root(), "sha256")
+        for directory, _, names in os.walk(shards):
+            old = [n for n in names if _mtime(os.path.join(directory, n)) <= cutoff]
+            if not old:
+                continue
+            known = set(db.scalars(select(StorageBlob.sha256).where(StorageBlob.sha256.in_(old))))
+            for name in old:
+                if name in known:
+                    continue
+                path = os.path.join(directory, name)
+                tombstone = self._tombstone(path, cutoff)
+                if tombstone is None:
+                    continue
+                # An upload that took a reference before the move keeps its file.
+                if db.scalar(select(StorageBlob.sha256).where(StorageBlob.sha256 == name)):
+                    self._restore(tombstone, path)
+                    continue
+                stats.bytes_freed += os.path.getsize(tombstone)
+                os.remove(tombstone)
+                stats.orphan_files += 1
+
+        if os.path.isdir(self.temp_dir()):
+            for name in os.listdir(self.temp_dir()):
+                path = os.path.join(self.temp_dir(), name)
+                if _mtime(path) <= cutoff:
+                    os.remove(path)
+                    stats.temp_files += 1
+
+        logger.info("Storage garbage collection: %s", stats)
+        return stats
+
+    def _tombstone(self, path: str, cutoff: datetime) -> Optional[str]:
+        """
+        Move a blob file into tmp/ for deletion, or leave it in place (None) when
+        an upload refreshed its mtime after the cutoff
+        """
+        os.makedirs(self.temp_dir(), exist_ok=True)
+        tombstone = os.path.join(self.temp_dir(), f"{os.path.basename(path)}.{uuid.uuid4().hex}.gc")
+        try:
+            os.replace(path, tombstone)
+        except FileNotFoundError:
+            return None
+        if _mtime(tombstone) > cutoff:
+            self._restore(tombstone, path)
+            return None
+        return tombstone
+
+    @staticmethod
+    def _restore(tombstone: str, path: str) -> None:
+        # A new upload may have written the same bytes back meanwhile; either copy will do.
+        os.replace(tombstone, path)
+
+
+def _mtime(path: str) -> datetime:
+    return datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+
+
+_BACKENDS: dict[str, DocumentStorage] = {
+    backend.provider: backend for backend in (LocalStorage(), ContentAddressedStorage())
+}
+
+
+def get_storage(provider: Optional[str] = None) -> DocumentStorage:
+    """The backend for a storage_provider value (default: where new uploads go)"""
+    provider = provider or settings.document_storage_provider
+    try:
+        return _BACKENDS[provider]
+    except KeyError:
+        raise ValueError(f"Unknown document storage provider: {provider}") from None
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """CLI: python -m src.app.services.storage gc [--grace-seconds N]"""
+    from ..db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain content-addressed document storage.")
+    parser.add_argument("command", choices=["gc"])
+    parser.add_argument("--grace-seconds", type=int, default=None)
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    logging.basicConfig(level=settings.log_level)
+    db = SessionLocal()
+    try:
+        stats = ContentAddressedStorage().collect_garbage(db, args.grace_seconds)
+    finally:
+        db.close()
+    print(
+        f"{stats.blobs} blobs, {stats.orphan_files} orphan files and {stats.temp_files} "
+        f"temp files removed ({stats.bytes_freed} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Streaming upload writer: one pass over the bytes, constant memory
+
+Uploads are copied to storage in fixed-size chunks. Each chunk updates the
+SHA-256, counts toward the size limit (checked as bytes arrive, so an oversized
+upload is cut off instead of read to the end) and, for the first bytes, feeds
+the MIME sniffer. Chunks go to a temp file next to the destination, which is
+fsynced and atomically renamed into place only once the whole upload passed;
+a rejected or interrupted upload leaves nothing behind. The destination may
+depend on the content hash (content-addressed storage): when a file already
+exists there, the new copy is dropped and the existing one is kept.
+"""
+import hashlib
+import os
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MB
+SNIFF_BYTES = 16
+
+# Leading bytes of the formats we accept (plus the ones we refuse outright)
+SIGNATURES = [
+    (b"%PDF-", "application/pdf"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/msword"),  # OLE2 (.doc)
+    (b"PK\x03\x04", "application/zip"),  # .docx is a zip container
+    (b"MZ", "application/x-msdownload"),
+    (b"\x7fELF", "application/x-executable"),
+]
+ZIP_BASED = {"application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+
+
+class UploadRejected(Exception):
+    """The upload was refused; nothing was written"""
+
+
+class UploadTooLarge(UploadRejected):
+    pass
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    size: int
+    sha256: str
+    mime_type: str
+    deduplicated: bool = False  # the same bytes were already stored at `path`
+
+
+def sniff_mime_type(head: bytes) -> Optional[str]:
+    """MIME type from the file signature, or None when the bytes are not recognized"""
+    for signature, mime_type in SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    return None
+
+
+def resolve_mime_type(declared: str, sniffed: Optional[str], allowed: set[str]) -> str:
+    """
+    The MIME type to record: the sniffed type when it is recognized (a PNG
+    named .jpg is a PNG), the declared (extension) type when the signature is
+    unknown. Recognized content that is not an allowed type is rejected.
+    """
+    if sniffed is None:
+        return declared
+    if sniffed == "application/zip" and declared in ZIP_BASED:
+        return declared
+    if sniffed in allowed:
+        return sniffed
+    raise UploadRejected(f"File content ({sniffed}) does not match the {declared} file type")
+
+
+class UploadWriter:
+    """
+    Incremental writer: feed chunks with write(), then commit() or abort().
+
+    The temp file is created in `directory`; `destination` maps the finished
+    upload's sha256 to its final path (same filesystem, so the rename is atomic).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        destination: Callable[[str], str],
+        max_size: int,
+        declared_type: str,
+        allowed_types: set[str],
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.destination = destination
+        self.max_size = max_size
+        self.declared_type = declared_type
+        self.allowed_types = allowed_types
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._head = b""
+        fd, self._temp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+        self._file: Optional[BinaryIO] = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise UploadTooLarge(
+                f"File size exceeds maximum allowed size of {self.max_size / (1024 * 1024)} MB"
+            )
+        if len(self._head) < SNIFF_BYTES:
+            self._head += chunk[: SNIFF_BYTES - len(self._head)]
+        self._digest.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self) -> StoredUpload:
+        """Check the content type, then fsync and rename the temp file into place"""
+        mime_type = resolve_mime_type(
+            self.declared_type, sniff_mime_type(self._head), self.allowed_types
+        )
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        sha256 = self._digest.hexdigest()
+        path = self.destination(sha256)
+        deduplicated = os.path.exists(path)
+        if deduplicated:
+            # Same bytes already stored: keep that copy, refreshing its mtime so
+            # garbage collection treats it as just written. Garbage collection
+            # may have moved it aside since the check; then store this copy.
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                deduplicated = False
+            else:
+                os.remove(self._temp_path)
+        if not deduplicated:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(self._temp_path, path)
+        return StoredUpload(
+            path=path,
+            size=self.size,
+            sha256=sha256,
+            mime_type=mime_type,
+            deduplicated=deduplicated,
+        )
+
+    def abort(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+
+def save_upload(
+    file: UploadFile, writer: UploadWriter, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> StoredUpload:
+    """Stream an upload through `writer` with blocking reads"""
+    try:
+        for chunk in iter(lambda: file.file.read(chunk_size), b""):
+            writer.write(chunk)
+        return writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+async def save_upload_async(
+    file: UploadFile, writer: UploadWriter, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> StoredUpload:
+    """Stream an upload through `writer` without blocking the event loop"""
+    try:
+        while chunk := await file.read(chunk_size):
+            await run_in_threadpool(writer.write, chunk)
+        return await run_in_threadpool(writer.commit)
+    except BaseException:
+        writer.abort()
+        raise
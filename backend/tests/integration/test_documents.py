@@ -523,3 +523,595 @@ class TestDocumentAPI:
         assert response.status_code == 200
         documents = response.json()
         assert isinstance(documents, list)
+
+
+class TestOCRJobQueue:
+    """Test the background OCR queue and workers"""
+
+    @staticmethod
+    def _document(db: Session, org: Organization, user: User) -> Document:
+        from fastapi import UploadFile
+
+        from src.app.schemas.document import DocumentCreate
+
+        file = BytesIO(b"Passport number AB1234567, issued 01/02/2020")
+        upload_file = UploadFile(file=file, filename="passport.txt")
+        return DocumentService.create_document(
+            db=db,
+            file=upload_file,
+            document_data=DocumentCreate(
+                document_type="passport", category=DEFAULT_DOC_CATEGORY, title="Passport"
+            ),
+            org_id=str(org.id),
+            uploaded_by=str(user.id),
+        )
+
+    def test_upload_queues_ocr_and_workers_complete_it(
+        self, client, db: Session, test_org, test_user, auth_token, temp_storage_dir, monkeypatch
+    ):
+        """Upload returns before OCR runs; a worker pass fills in the text"""
+        from src.app.models.ocr_job import OCRJob
+        from src.app.services import ocr_queue
+        from tests.conftest import TestingSessionLocal
+
+        calls = []
+        monkeypatch.setattr(
+            ocr_queue,
+            "run_ocr",
+            lambda path, mime, executor=None: calls.append(path)
+            or {"success": True, "text": "AB1234567", "metadata": {"word_count": 1}},
+        )
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        files = {"file": ("passport.pdf", BytesIO(b"%PDF-1.4 scan"), "application/pdf")}
+        data = {"document_type": "passport", "category": DEFAULT_DOC_CATEGORY, "title": "Scan"}
+
+        response = client.post("/api/v1/documents/upload", files=files, data=data, headers=headers)
+
+        assert response.status_code == 200
+        document = response.json()["document"]
+        assert (document["ocr_status"], document["processing_status"]) == ("pending", "pending")
+        assert calls == []
+        job = db.query(OCRJob).filter_by(document_id=document["id"]).one()
+        assert (job.status, job.attempts) == ("queued", 0)
+
+        pool = ocr_queue.OCRWorkerPool(TestingSessionLocal, processes=0, poll_interval=0)
+        assert pool.run(drain=True) == 1
+
+        db.expire_all()
+        stored = db.get(Document, document["id"])
+        assert (stored.ocr_status, stored.processing_status) == ("completed", "completed")
+        assert stored.ocr_text == "AB1234567"
+        assert db.get(OCRJob, job.id).status == "completed"
+        assert len(calls) == 1
+
+        # Re-queueing through the API hands the document back to the workers.
+        response = client.post(f"/api/v1/documents/{document['id']}/process-ocr", headers=headers)
+        assert response.status_code == 202
+        assert response.json()["ocr_status"] == "pending"
+
+    def test_upload_with_ocr_disabled_is_recorded_as_skipped(
+        self, client, db: Session, auth_token, temp_storage_dir, monkeypatch
+    ):
+        """No job is queued when OCR is off, and the document does not stay pending"""
+        from src.app.config import settings
+        from src.app.models.ocr_job import OCRJob
+
+        monkeypatch.setattr(settings, "ocr_enabled", False)
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        files = {"file": ("passport.pdf", BytesIO(b"%PDF-1.4 scan"), "application/pdf")}
+        data = {"document_type": "passport", "category": DEFAULT_DOC_CATEGORY, "title": "Scan"}
+
+        response = client.post("/api/v1/documents/upload", files=files, data=data, headers=headers)
+
+        assert response.status_code == 200
+        document = response.json()["document"]
+        assert (document["ocr_status"], document["processing_status"]) == ("skipped", "completed")
+        assert db.query(OCRJob).filter_by(document_id=document["id"]).count() == 0
+
+    def test_upload_is_not_recorded_without_its_job(
+        self, client, db: Session, auth_token, temp_storage_dir, monkeypatch
+    ):
+        """The documents row and its OCR job commit together"""
+        from src.app.services import ocr_queue
+
+        def broken(self, document, *, max_attempts=None):
+            raise RuntimeError("ocr_jobs unavailable")
+
+        monkeypatch.setattr(ocr_queue.OCRJobQueue, "add", broken)
+        before = db.query(Document).count()
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        files = {"file": ("passport.pdf", BytesIO(b"%PDF-1.4 scan"), "application/pdf")}
+        data = {"document_type": "passport", "category": DEFAULT_DOC_CATEGORY, "title": "Scan"}
+
+        response = client.post("/api/v1/documents/upload", files=files, data=data, headers=headers)
+
+        assert response.status_code == 500
+        db.expire_all()
+        assert db.query(Document).count() == before
+
+    def test_failed_attempts_back_off_then_fail_the_document(
+        self, db: Session, test_org, test_user, temp_storage_dir, monkeypatch
+    ):
+        """Errors are retried after a growing delay up to max_attempts"""
+        from datetime import datetime, timezone
+
+        from src.app.models.ocr_job import OCRJob
+        from src.app.services import ocr_queue
+        from tests.conftest import TestingSessionLocal
+
+        def broken(path, mime, executor=None):
+            raise RuntimeError("tesseract crashed")
+
+        monkeypatch.setattr(ocr_queue, "run_ocr", broken)
+        document = self._document(db, test_org, test_user)
+        job = ocr_queue.OCRJobQueue(db).enqueue(document, max_attempts=2)
+        assert ocr_queue.OCRJobQueue(db).enqueue(document).id == job.id
+
+        pool = ocr_queue.OCRWorkerPool(TestingSessionLocal, processes=0, poll_interval=0)
+        assert pool.run(drain=True) == 1
+        db.expire_all()
+        job = db.get(OCRJob, job.id)
+        assert (job.status, job.attempts, job.last_error) == ("queued", 1, "tesseract crashed")
+        assert db.get(Document, document.id).ocr_status == "pending"
+        # Not due yet: the retry waits out its backoff.
+        assert pool.run(drain=True) == 0
+        assert ocr_queue.retry_delay(2) == 2 * ocr_queue.retry_delay(1)
+
+        job.available_at = datetime.now(timezone.utc)
+        db.commit()
+        assert pool.run(drain=True) == 1
+        db.expire_all()
+        assert (db.get(OCRJob, job.id).status, db.get(OCRJob, job.id).attempts) == ("failed", 2)
+        stored = db.get(Document, document.id)
+        assert (stored.ocr_status, stored.processing_status) == ("failed", "failed")
+        assert stored.validation_results["ocr_error"] == "tesseract crashed"
+
+    def test_expired_leases_are_claimed_again(
+        self, db: Session, test_org, test_user, temp_storage_dir
+    ):
+        """A job whose worker died is picked up by another worker after its lease"""
+        from datetime import datetime, timedelta, timezone
+
+        from src.app.services.ocr_queue import OCRJobQueue
+
+        document = self._document(db, test_org, test_user)
+        queue = OCRJobQueue(db)
+        queue.enqueue(document)
+
+        [job] = queue.claim("worker-a", 5)
+        assert (job.status, job.locked_by, job.attempts) == ("running", "worker-a", 1)
+        assert db.get(Document, document.id).ocr_status == "processing"
+        assert queue.claim("worker-b", 5) == []
+
+        job.locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.commit()
+        [job] = queue.claim("worker-b", 5)
+        assert (job.locked_by, job.attempts) == ("worker-b", 2)
+
+    def test_worker_that_lost_its_lease_cannot_finish_the_job(
+        self, db: Session, test_org, test_user, temp_storage_dir
+    ):
+        """Only the current lease holder completes or fails a job"""
+        from datetime import datetime, timedelta, timezone
+
+        from src.app.models.ocr_job import OCRJob
+        from src.app.services.ocr_queue import OCRJobQueue
+
+        document = self._document(db, test_org, test_user)
+        queue = OCRJobQueue(db)
+        queue.enqueue(document)
+        [stale] = queue.claim("worker-a", 5)
+        stale.locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.commit()
+        [job] = queue.claim("worker-b", 5)
+
+        result = {"success": True, "text": "late", "metadata": {}}
+        assert queue.complete(stale, result, "worker-a") is False
+        assert queue.fail(stale, "late failure", "worker-a") is False
+        db.expire_all()
+        assert (db.get(OCRJob, job.id).status, db.get(OCRJob, job.id).locked_by) == (
+            "running",
+            "worker-b",
+        )
+        assert db.get(Document, document.id).ocr_text is None
+
+        result = {"success": True, "text": "AB1234567", "metadata": {}}
+        assert queue.complete(job, result, "worker-b") is True
+        db.expire_all()
+        assert db.get(OCRJob, job.id).status == "completed"
+        assert db.get(Document, document.id).ocr_text == "AB1234567"
+
+    def test_heartbeat_renews_the_leases_a_worker_holds(
+        self, db: Session, test_org, test_user, temp_storage_dir
+    ):
+        """renew() pushes locked_until forward and reports the leases already lost"""
+        from datetime import datetime, timedelta, timezone
+
+        from src.app.models.ocr_job import OCRJob
+        from src.app.services.ocr_queue import OCRJobQueue, OCRWorkerPool
+        from tests.conftest import TestingSessionLocal
+
+        queue = OCRJobQueue(db)
+        first = queue.enqueue(self._document(db, test_org, test_user))
+        second = queue.enqueue(self._document(db, test_org, test_user))
+        pool = OCRWorkerPool(TestingSessionLocal, processes=0, worker_id="worker-a")
+        queue.claim("worker-a", 5)
+        soon = datetime.now(timezone.utc) + timedelta(seconds=5)
+        db.query(OCRJob).update({"locked_until": soon})
+        # The second job's lease ran out and worker-b took it over.
+        db.query(OCRJob).filter_by(id=second.id).update({"locked_by": "worker-b"})
+        db.commit()
+
+        pool._track(first.id, True)
+        pool._track(second.id, True)
+        assert pool.renew_leases() == {second.id}
+
+        db.expire_all()
+        renewed = db.get(OCRJob, first.id).locked_until.replace(tzinfo=timezone.utc)
+        assert renewed > soon + timedelta(seconds=1)
+        assert db.get(OCRJob, second.id).locked_by == "worker-b"
+        assert queue.renew("worker-b", [first.id, second.id]) == {second.id}
+
+
+class TestOCRResultCache:
+    """Test the OCR result cache keyed by file content"""
+
+    @pytest.fixture(autouse=True)
+    def fake_tesseract(self, monkeypatch):
+        from src.app.services import ocr
+
+        calls = []
+
+        def process_document(file_path, mime_type, language="eng", executor=None):
+            calls.append(file_path)
+            return {"text": "AB1234567", "metadata": {"word_count": 1}, "success": True}
+
+        monkeypatch.setattr(ocr, "TESSERACT_AVAILABLE", True)
+        monkeypatch.setattr(ocr.OCRService, "engine_version", staticmethod(lambda: "tesseract-5"))
+        monkeypatch.setattr(ocr.OCRService, "process_document", staticmethod(process_document))
+        return calls
+
+    def test_identical_bytes_are_ocred_once(
+        self, db: Session, test_org, test_user, temp_storage_dir, fake_tesseract, monkeypatch
+    ):
+        """A re-upload of the same scan is served from the cache and marked as a hit"""
+        from src.app.services import ocr
+
+        first = TestOCRJobQueue._document(db, test_org, test_user)
+        second = TestOCRJobQueue._document(db, test_org, test_user)
+
+        first = DocumentService.process_document_with_ocr(db, first.id, str(test_org.id))
+        second = DocumentService.process_document_with_ocr(db, second.id, str(test_org.id))
+        again = DocumentService.process_document_with_ocr(db, second.id, str(test_org.id))
+
+        assert len(fake_tesseract) == 1
+        assert first.extracted_metadata["ocr_cache"]["hit"] is False
+        assert second.extracted_metadata["ocr_cache"]["hit"] is True
+        assert again.extracted_metadata["ocr_cache"]["hit"] is True
+        assert second.ocr_text == first.ocr_text == "AB1234567"
+        assert second.extracted_metadata["word_count"] == 1
+        digest = second.extracted_metadata["ocr_cache"]["content_sha256"]
+        assert digest == first.extracted_metadata["ocr_cache"]["content_sha256"]
+
+        # A different engine (tesseract upgrade, new DPI) never reuses old text.
+        monkeypatch.setattr(ocr.OCRService, "engine_version", staticmethod(lambda: "tesseract-6"))
+        DocumentService.process_document_with_ocr(db, second.id, str(test_org.id))
+        assert len(fake_tesseract) == 2
+
+    def test_workers_answer_cached_files_without_the_pool(
+        self, db: Session, test_org, test_user, temp_storage_dir, fake_tesseract, monkeypatch
+    ):
+        """Only the first of two identical uploads reaches the OCR processes"""
+        from src.app.services import ocr_queue
+        from tests.conftest import TestingSessionLocal
+
+        runs = []
+        monkeypatch.setattr(
+            ocr_queue,
+            "run_ocr",
+            lambda path, mime, executor=None: runs.append(path)
+            or {"text": "AB1234567", "metadata": {}, "success": True},
+        )
+        documents = [TestOCRJobQueue._document(db, test_org, test_user) for _ in range(2)]
+        for document in documents:
+            ocr_queue.OCRJobQueue(db).enqueue(document)
+
+        pool = ocr_queue.OCRWorkerPool(TestingSessionLocal, processes=0, poll_interval=0)
+        assert pool.run(drain=True) == 2
+
+        db.expire_all()
+        hits = [db.get(Document, d.id).extracted_metadata["ocr_cache"]["hit"] for d in documents]
+        assert sorted(hits) == [False, True]
+        assert len(runs) == 1
+        assert all(db.get(Document, d.id).ocr_status == "completed" for d in documents)
+
+    def test_least_recently_used_results_are_evicted_past_the_size_bound(self, db: Session):
+        """The table is trimmed to max_bytes, oldest use first"""
+        from src.app.models.ocr_result import OCRResult
+        from src.app.services.ocr_cache import OCRCacheKey, OCRResultCache
+
+        cache = OCRResultCache(db, max_bytes=250)
+        keys = [
+            OCRCacheKey(content_sha256=f"{n:064x}", language="eng", engine="e") for n in range(3)
+        ]
+        result = {"text": "x" * 100, "metadata": {}, "success": True}
+        cache.store(keys[0], result)
+        cache.store(keys[1], result)
+        assert cache.get(keys[0]) is not None  # key 1 is now the least recently used
+        cache.store(keys[2], result)
+        db.commit()
+
+        assert {row.content_sha256 for row in db.query(OCRResult)} == {
+            keys[0].content_sha256,
+            keys[2].content_sha256,
+        }
+        assert cache.get(keys[1]) is None
+        # Failures are never cached.
+        cache.store(keys[1], {"text": "", "metadata": {}, "success": False, "error": "boom"})
+        assert cache.get(keys[1]) is None
+
+
+class TestStreamingUpload:
+    """Test chunked uploads: hashing, size limit and MIME sniffing in one pass"""
+
+    @staticmethod
+    def _upload(db, org, user, content: bytes, filename: str) -> Document:
+        from fastapi import UploadFile
+
+        from src.app.schemas.document import DocumentCreate
+
+        return DocumentService.create_document(
+            db=db,
+            file=UploadFile(file=BytesIO(content), filename=filename),
+            document_data=DocumentCreate(
+                document_type="passport", category=DEFAULT_DOC_CATEGORY, title="Scan"
+            ),
+            org_id=str(org.id),
+            uploaded_by=str(user.id),
+        )
+
+    def test_upload_is_hashed_and_renamed_into_place(
+        self, db: Session, test_org, test_user, temp_storage_dir, monkeypatch
+    ):
+        """Chunks are hashed as they are written; only the final file remains"""
+        import hashlib
+
+        monkeypatch.setattr(DocumentService, "UPLOAD_CHUNK_SIZE", 4)
+        content = b"%PDF-1.4 a scanned bank statement"
+
+        document = self._upload(db, test_org, test_user, content, "statement.pdf")
+
+        assert document.content_sha256 == hashlib.sha256(content).hexdigest()
+        assert (document.file_size, document.mime_type) == (len(content), "application/pdf")
+        with open(DocumentService.get_file_path(document), "rb") as f:
+            assert f.read() == content
+        assert os.listdir(os.path.join(temp_storage_dir, "blobs", "tmp")) == []
+
+    def test_oversized_upload_is_cut_off_without_leftovers(
+        self, db: Session, test_org, test_user, temp_storage_dir, monkeypatch
+    ):
+        """The limit is enforced while streaming, not after reading everything"""
+
+        class CountingReader(BytesIO):
+            reads = 0
+
+            def read(self, size=-1):
+                CountingReader.reads += 1
+                return super().read(size)
+
+        from fastapi import UploadFile
+
+        from src.app.schemas.document import DocumentCreate
+
+        monkeypatch.setattr(DocumentService, "UPLOAD_CHUNK_SIZE", 8)
+        monkeypatch.setattr(DocumentService, "MAX_FILE_SIZE", 16)
+        with pytest.raises(HTTPException) as exc_info:
+            DocumentService.create_document(
+                db=db,
+                file=UploadFile(file=CountingReader(b"x" * 1000), filename="big.txt"),
+                document_data=DocumentCreate(
+                    document_type="passport", category=DEFAULT_DOC_CATEGORY, title="Big"
+                ),
+                org_id=str(test_org.id),
+                uploaded_by=str(test_user.id),
+            )
+
+        assert exc_info.value.status_code == 400
+        assert "exceeds maximum allowed size" in exc_info.value.detail
+        assert CountingReader.reads == 3
+        assert os.listdir(os.path.join(temp_storage_dir, "blobs", "tmp")) == []
+        assert not os.path.exists(os.path.join(temp_storage_dir, "blobs", "sha256"))
+        assert db.query(Document).count() == 0
+
+    def test_content_type_is_sniffed(self, db: Session, test_org, test_user, temp_storage_dir):
+        """The recorded MIME type follows the bytes; disallowed content is refused"""
+        png = self._upload(db, test_org, test_user, b"\x89PNG\r\n\x1a\n" + b"0" * 64, "scan.jpg")
+        assert png.mime_type == "image/png"
+
+        with pytest.raises(HTTPException) as exc_info:
+            self._upload(db, test_org, test_user, b"MZ\x90\x00" + b"0" * 64, "passport.pdf")
+        assert exc_info.value.status_code == 400
+        assert "does not match" in exc_info.value.detail
+        assert db.query(Document).count() == 1
+
+    def test_upload_endpoint_streams_asynchronously(
+        self, client, test_org, test_user, auth_token, temp_storage_dir
+    ):
+        """POST /upload returns the content hash computed while streaming"""
+        import hashlib
+
+        content = b"%PDF-1.7 " + os.urandom(3 * 1024 * 1024)
+        response = client.post(
+            "/api/v1/documents/upload",
+            files={"file": ("large.pdf", BytesIO(content), "application/pdf")},
+            data={"document_type": "passport", "category": DEFAULT_DOC_CATEGORY, "title": "Big"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert response.status_code == 200
+        document = response.json()["document"]
+        assert document["content_sha256"] == hashlib.sha256(content).hexdigest()
+        assert document["file_size"] == len(content)
+
+
+class TestContentAddressedStorage:
+    """Test deduplicated blob storage, reference counting and garbage collection"""
+
+    _upload = staticmethod(TestStreamingUpload._upload)
+
+    @staticmethod
+    def _blob(db, document):
+        from src.app.models.storage_blob import StorageBlob
+
+        db.expire_all()
+        return db.get(StorageBlob, document.content_sha256)
+
+    def test_identical_uploads_share_one_sharded_blob(
+        self, db: Session, test_org, test_user, temp_storage_dir
+    ):
+        """The same letter uploaded twice is stored once, referenced twice"""
+        content = b"%PDF-1.4 employer letter for the principal applicant and spouse"
+        first = self._upload(db, test_org, test_user, content, "letter.pdf")
+        second = self._upload(db, test_org, test_user, content, "letter-spouse.pdf")
+
+        sha = first.content_sha256
+        assert first.storage_provider == second.storage_provider == "cas"
+        assert first.storage_key == second.storage_key == f"sha256/{sha[:2]}/{sha[2:4]}/{sha}"
+        path = DocumentService.get_file_path(first)
+        assert path == DocumentService.get_file_path(second)
+        assert path == os.path.join(temp_storage_dir, "blobs", "sha256", sha[:2], sha[2:4], sha)
+        blobs = [f for _, _, files in os.walk(os.path.join(temp_storage_dir, "blobs")) for f in files]
+        assert blobs == [sha]
+        assert self._blob(db, first).ref_count == 2
+        assert os.listdir(os.path.join(temp_storage_dir, "blobs", "tmp")) == []
+
+    def test_blob_is_collected_after_last_reference_is_purged(
+        self, db: Session, test_org, test_user, temp_storage_dir
+    ):
+        """Soft delete keeps the blob; purging every row lets GC reclaim it"""
+        from src.app.services.storage import ContentAddressedStorage
+
+        store = ContentAddressedStorage()
+        content = b"%PDF-1.4 pay stub"
+        first = self._upload(db, test_org, test_user, content, "stub.pdf")
+        second = self._upload(db, test_org, test_user, content, "stub-copy.pdf")
+        path = DocumentService.get_file_path(first)
+
+        DocumentService.delete_document(db, first.id, str(test_org.id))
+        assert self._blob(db, first).ref_count == 2
+
+        assert DocumentService.purge_document(db, first.id, str(test_org.id))
+        assert self._blob(db, second).ref_count == 1
+        assert store.collect_garbage(db, grace_seconds=0).blobs == 0
+        assert os.path.exists(path)
+
+        assert DocumentService.purge_document(db, second.id, str(test_org.id))
+        blob = self._blob(db, second)
+        assert blob.ref_count == 0 and blob.released_at is not None
+        # Within the grace period the blob is kept (an upload may be about to reuse it)
+        assert store.collect_garbage(db, grace_seconds=3600).blobs == 0
+        stats = store.collect_garbage(db, grace_seconds=0)
+        assert (stats.blobs, stats.bytes_freed) == (1, len(content))
+        assert not os.path.exists(path)
+        assert self._blob(db, second) is None
+
+    def test_gc_reconciles_references_and_sweeps_orphan_files(
+        self, db: Session, test_org, test_user, temp_storage_dir
+    ):
+        """Rows deleted without purge_document, and files of failed uploads, are reclaimed"""
+        from src.app.services.storage import ContentAddressedStorage
+
+        store = ContentAddressedStorage()
+        kept = self._upload(db, test_org, test_user, b"%PDF-1.4 diploma", "diploma.pdf")
+        dropped = self._upload(db, test_org, test_user, b"%PDF-1.4 transcript", "t.pdf")
+        dropped_path = DocumentService.get_file_path(dropped)
+        db.delete(dropped)  # e.g. the org cascade; ref_count is not released
+        db.commit()
+
+        orphan = store.blob_path("ab" * 32)
+        os.makedirs(os.path.dirname(orphan))
+        with open(orphan, "wb") as f:
+            f.write(b"uncommitted upload")
+        with open(os.path.join(store.temp_dir(), ".upload-crashed.part"), "wb") as f:
+            f.write(b"partial")
+
+        stats = store.collect_garbage(db, grace_seconds=0)
+
+        assert (stats.blobs, stats.orphan_files, stats.temp_files) == (1, 1, 1)
+        assert not os.path.exists(dropped_path) and not os.path.exists(orphan)
+        assert os.path.exists(DocumentService.get_file_path(kept))
+        assert self._blob(db, kept).ref_count == 1
+
+    def test_gc_keeps_a_blob_an_upload_deduplicates_onto_mid_run(
+        self, db: Session, test_org, test_user, temp_storage_dir, monkeypatch
+    ):
+        """A blob touched after the released rows were selected is not deleted"""
+        from datetime import datetime, timedelta, timezone
+
+        from src.app.models.storage_blob import StorageBlob
+        from src.app.services.storage import ContentAddressedStorage
+
+        store = ContentAddressedStorage()
+        content = b"%PDF-1.4 police certificate"
+        document = self._upload(db, test_org, test_user, content, "police.pdf")
+        path = DocumentService.get_file_path(document)
+        assert DocumentService.purge_document(db, document.id, str(test_org.id))
+        released = datetime.now(timezone.utc) - timedelta(hours=2)
+        db.query(StorageBlob).update({"released_at": released})
+        db.commit()
+        os.utime(path, (0, 0))
+
+        tombstone = ContentAddressedStorage._tombstone
+
+        def deduplicated_first(self, blob_path, cutoff):
+            os.utime(blob_path)  # UploadWriter.commit of the same bytes
+            return tombstone(self, blob_path, cutoff)
+
+        monkeypatch.setattr(ContentAddressedStorage, "_tombstone", deduplicated_first)
+        stats = store.collect_garbage(db, grace_seconds=3600)
+
+        assert stats.blobs == 0
+        assert os.path.exists(path)
+        assert self._blob(db, document) is not None
+        assert os.listdir(store.temp_dir()) == []
+
+    def test_upload_stores_its_copy_when_gc_moved_the_blob_away(
+        self, db: Session, test_org, test_user, temp_storage_dir, monkeypatch
+    ):
+        """Deduplication falls back to a fresh copy if the existing file is gone"""
+        content = b"%PDF-1.4 language test results"
+        first = self._upload(db, test_org, test_user, content, "ielts.pdf")
+        path = DocumentService.get_file_path(first)
+        utime = os.utime
+
+        def collected(target, *args, **kwargs):
+            os.remove(target)  # garbage collection tombstoned the blob meanwhile
+            return utime(target, *args, **kwargs)
+
+        monkeypatch.setattr(os, "utime", collected)
+        second = self._upload(db, test_org, test_user, content, "ielts-copy.pdf")
+
+        assert DocumentService.get_file_path(second) == path
+        with open(path, "rb") as f:
+            assert f.read() == content
+        assert self._blob(db, second).ref_count == 2
+
+    def test_local_provider_stores_one_file_per_upload(
+        self, db: Session, test_org, test_user, temp_storage_dir, monkeypatch
+    ):
+        """DOCUMENT_STORAGE_PROVIDER=local keeps the per-org layout; purge removes the file"""
+        from src.app.config import settings
+
+        monkeypatch.setattr(settings, "document_storage_provider", "local")
+        first = self._upload(db, test_org, test_user, b"%PDF-1.4 same", "a.pdf")
+        second = self._upload(db, test_org, test_user, b"%PDF-1.4 same", "b.pdf")
+
+        org_dir = os.path.join(temp_storage_dir, str(test_org.id))
+        assert first.storage_provider == "local"
+        assert sorted(os.listdir(org_dir)) == sorted([first.filename, second.filename])
+        assert first.storage_key == f"{test_org.id}/{first.filename}"
+        assert self._blob(db, first) is None
+
+        assert DocumentService.purge_document(db, first.id, str(test_org.id))
+        assert os.listdir(org_dir) == [second.filename]
+        assert not DocumentService.purge_document(db, first.id, str(test_org.id))
@@ -1,3 +1,4 @@
+import json
 from datetime import date, timedelta
 
 from fastapi.testclient import TestClient
@@ -78,3 +79,63 @@ def test_case_evaluation_warns_expiring_language():
     assert "warnings" in body
     assert body["audit"]["source"] == "express_entry_intake"
 
+
+
+def test_case_evaluation_batch_streams_ndjson():
+    eligible = _eligible_payload()["profile"]
+    ineligible = _eligible_payload()["profile"]
+    ineligible["language_tests"] = []
+
+    response = client.post(
+        "/api/v1/cases/evaluate/batch", json={"profiles": [eligible, ineligible]}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    items = [json.loads(line) for line in response.text.splitlines() if line]
+    assert [item["index"] for item in items] == [0, 1]
+    assert any(p["eligible"] for p in items[0]["program_eligibility"])
+    assert not any(p["eligible"] for p in items[1]["program_eligibility"])
+    assert items[0]["crs"]["total"] >= items[1]["crs"]["total"]
+
+
+def test_case_what_if_ranks_changes_without_persisting():
+    payload = {
+        "profile": _eligible_payload()["profile"],
+        "deltas": [
+            {"kind": "sibling_in_canada", "cost": 1},
+            {"kind": "provincial_nomination", "cost": 10},
+        ],
+        "target_score": 0,
+    }
+    response = client.post("/api/v1/cases/what-if", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["base"]["meets_target"] is True
+    assert [s["points_gained"] for s in body["scenarios"]][0] == 15
+
+    payload["deltas"] = [{"kind": "education_level", "level": "unknown"}]
+    assert client.post("/api/v1/cases/what-if", json=payload).status_code == 422
+
+
+def test_case_evaluation_can_return_before_history_is_durable():
+    from src.app.cases.write_behind import get_history_write_queue
+
+    response = client.post(
+        "/api/v1/cases/evaluate", params={"wait_for_write": "false"}, json=_eligible_payload()
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["write_status"] in ("pending", "committed")
+    # The version is only reported once the write has landed.
+    assert body["version"] == (None if body["write_status"] == "pending" else 1)
+
+    get_history_write_queue().flush()
+    status_response = client.get(f"/api/v1/cases/evaluate/writes/{body['write_id']}")
+    assert status_response.status_code == 200
+    status = status_response.json()
+    assert status["status"] == "committed"
+    assert status["case_id"] == body["case_id"]
+    assert status["version"] == 1
+    assert client.get(f"/api/v1/case-history/{body['case_id']}").status_code == 200
+
+    assert client.get("/api/v1/cases/evaluate/writes/unknown").status_code == 404
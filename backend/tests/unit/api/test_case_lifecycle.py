@@ -68,3 +68,27 @@ def test_case_lifecycle_submit_endpoint():
     assert body["last_snapshot_version"] >= 1
     assert body["events"]
 
+
+def test_case_lifecycle_bulk_transition_endpoint():
+    case_id, user_id, tenant_id = _bootstrap_case()
+    payload = {"user_id": user_id, "tenant_id": tenant_id, "target_status": "archived"}
+
+    response = client.post(
+        "/api/v1/case-lifecycle/bulk-transition",
+        json={**payload, "case_ids": [case_id, "missing"]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (1, 1)
+    assert body["results"][0]["status"] == "archived"
+    assert body["results"][1]["error"] == "Case not found for tenant"
+
+    response = client.post(
+        "/api/v1/case-lifecycle/bulk-transition",
+        json={**payload, "case_ids": [case_id], "target_status": "draft"},
+    )
+    assert response.status_code == 400
+    response = client.post(
+        "/api/v1/case-lifecycle/bulk-transition", json={**payload, "case_ids": []}
+    )
+    assert response.status_code == 422
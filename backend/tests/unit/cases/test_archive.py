@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from src.app.cases.archive import compact_history, load_archive
+from src.app.cases.blob_store import BlobStore
+from src.app.cases.lifecycle_service import CaseLifecycleService
+from src.app.cases.models_db import CaseEvent, CaseHistoryArchive, CaseRecord, CaseSnapshot
+from src.app.cases.repository import CaseEventRepository, CaseSnapshotRepository
+from src.app.cases.time_travel import eligibility_as_of, snapshot_as_of
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _results(crs: int) -> dict:
+    return {
+        "program_eligibility": {"results": [{"program_code": "FSW", "eligible": crs > 450}]},
+        "crs_breakdown": {"total": crs},
+    }
+
+
+def _settled_case(db, tenant_id: str = "tenant-archive") -> str:
+    """v1-v2 change the payload, v3-v5 are lifecycle transitions (status only)."""
+    service = CaseLifecycleService(db)
+    case_id = service.create_case(
+        profile={"age": 30},
+        **_results(440),
+        tenant_id=tenant_id,
+        user_id="reviewer",
+        source="archive_test",
+    ).id
+    record = db.get(CaseRecord, case_id)
+    CaseSnapshotRepository(db).append_snapshot(
+        case_id=case_id,
+        profile={"age": 31},
+        **_results(460),
+        required_artifacts={},
+        config_fingerprint={},
+        source="archive_test",
+        snapshot_at=START + timedelta(days=1),
+        tenant_id=tenant_id,
+    )
+    BlobStore(db).assign(
+        record,
+        {
+            "profile": {"age": 31},
+            **_results(460),
+            "required_artifacts": {},
+            "config_fingerprint": {},
+        },
+    )
+    db.commit()
+    for step in (service.submit_case, service.mark_in_review, service.mark_complete):
+        step(case_id, "reviewer", tenant_id)
+    for version in range(1, 6):
+        db.execute(
+            update(CaseSnapshot)
+            .where(CaseSnapshot.case_id == case_id, CaseSnapshot.version == version)
+            .values(snapshot_at=START + timedelta(days=version - 1))
+        )
+    db.execute(
+        update(CaseRecord)
+        .where(CaseRecord.id == case_id)
+        .values(updated_at=datetime.now(timezone.utc) - timedelta(days=60))
+    )
+    db.commit()
+    return case_id
+
+
+def _history(client, case_id: str, **params) -> dict:
+    body = client.get(f"/api/v1/case-history/{case_id}", params=params).json()
+    return {
+        "snapshots": [(s["version"], s["profile"], s["crs_breakdown"]) for s in body["snapshots"]],
+        "events": [(e["id"], e["event_type"], e["metadata"]) for e in body["events"]],
+    }
+
+
+def test_compaction_moves_settled_history_out_of_the_hot_tables(client, db_session) -> None:
+    case_id = _settled_case(db_session)
+    draft_id = _settled_case(db_session, tenant_id="tenant-draft")
+    db_session.execute(update(CaseRecord).where(CaseRecord.id == draft_id).values(status="draft"))
+    db_session.commit()
+    before = _history(client, case_id)
+    ranged = _history(client, case_id, from_version=2, to_version=4)
+    snapshots = CaseSnapshotRepository(db_session)
+    documents = {version: snapshots.get_snapshot(case_id, version) for version in range(1, 6)}
+
+    assert compact_history(db_session, older_than_days=30) == 1
+    assert compact_history(db_session, older_than_days=30) == 0
+
+    hot = db_session.query(CaseSnapshot).filter_by(case_id=case_id).all()
+    assert [(s.version, s.encoding) for s in hot] == [(5, "full")]
+    assert db_session.query(CaseEvent).filter_by(case_id=case_id).count() == 0
+    assert db_session.query(CaseSnapshot).filter_by(case_id=draft_id).count() == 5
+
+    # Status-only versions are stored as references to the version they repeat.
+    archive = load_archive(db_session, case_id)
+    assert [entry.get("same_as") for entry in archive.snapshots] == [None, None, 2, 2]
+    row = db_session.get(CaseHistoryArchive, case_id)
+    assert (row.snapshot_count, row.last_version, row.size > len(row.data)) == (4, 4, True)
+
+    assert _history(client, case_id) == before
+    assert _history(client, case_id, from_version=2, to_version=4) == ranged
+    assert {v: snapshots.get_snapshot(case_id, v) for v in range(1, 6)} == documents
+    events = CaseEventRepository(db_session).list_events(case_id)
+    assert [e.event_type for e in events][-3:] == [
+        "CASE_SUBMITTED",
+        "CASE_IN_REVIEW",
+        "CASE_COMPLETE",
+    ]
+
+
+def test_as_of_queries_and_later_history_read_through_the_archive(db_session) -> None:
+    case_id = _settled_case(db_session)
+    compact_history(db_session, older_than_days=30)
+
+    snapshot = snapshot_as_of(db_session, case_id, START + timedelta(days=1, hours=1))
+    assert (snapshot.version, snapshot.document["profile"]) == (2, {"age": 31})
+    items, _ = eligibility_as_of(db_session, "tenant-archive", START + timedelta(hours=1))
+    assert [(i.version, i.eligible_programs, i.crs_total) for i in items] == [(1, [], 440)]
+    items, _ = eligibility_as_of(db_session, "tenant-archive", START + timedelta(days=10))
+    assert [(i.version, i.eligible_programs) for i in items] == [(5, ["FSW"])]
+
+    # New history after compaction is merged into the same archive on the next run.
+    CaseLifecycleService(db_session).archive_case(case_id, "reviewer", "tenant-archive")
+    db_session.execute(
+        update(CaseRecord)
+        .where(CaseRecord.id == case_id)
+        .values(updated_at=datetime.now(timezone.utc) - timedelta(days=60))
+    )
+    db_session.commit()
+    assert compact_history(db_session, older_than_days=30) == 1
+
+    archive = load_archive(db_session, case_id)
+    assert [entry["version"] for entry in archive.snapshots] == [1, 2, 3, 4, 5]
+    assert len(archive.events) == 5
+    assert CaseSnapshotRepository(db_session).get_snapshot(case_id, 1)["profile"] == {"age": 30}
+    assert CaseSnapshotRepository(db_session).latest_version(case_id) == 6
@@ -0,0 +1,134 @@
+from sqlalchemy import text
+
+from src.app.cases import blob_store
+from src.app.cases.blob_store import (
+    CODEC_RAW,
+    CODEC_ZLIB,
+    BlobCache,
+    BlobStore,
+    migrate_inline_payloads,
+)
+from src.app.cases.history_service import CaseHistoryService
+from src.app.cases.models_db import CaseBlob, CaseRecord, CaseSnapshot
+
+ARTIFACTS = {"forms": ["IMM0008", "IMM5669"], "documents": [{"id": "passport"}] * 20}
+FINGERPRINT = {"crs": "a" * 64, "programs": "b" * 64}
+
+
+def _persist(db, family_size: int):
+    return CaseHistoryService(db).persist_evaluation(
+        profile={"family_size": family_size},
+        program_eligibility={"results": [{"program_code": "FSW", "eligible": True}]},
+        crs_breakdown={"total": 450},
+        required_artifacts=ARTIFACTS,
+        config_fingerprint=FINGERPRINT,
+        source="blob_test",
+    )
+
+
+def test_repeated_payloads_are_stored_once_with_reference_counts(db_session) -> None:
+    case_ids = [_persist(db_session, n).case_id for n in (1, 2, 3)]
+
+    blobs = {b.hash: b for b in db_session.query(CaseBlob)}
+    record = db_session.get(CaseRecord, case_ids[0])
+    artifacts = blobs[record.required_artifacts_hash]
+    assert artifacts.refcount == 6  # three records + three snapshots
+    assert artifacts.codec == CODEC_ZLIB and len(artifacts.data) < artifacts.size
+    assert blobs[record.crs_breakdown_hash].codec == CODEC_RAW
+    assert len(blobs) == 3 + 4  # distinct profiles + shared eligibility/crs/artifacts/fingerprint
+    inline = db_session.execute(
+        text("SELECT COUNT(*) FROM case_records WHERE required_artifacts IS NOT NULL")
+    ).scalar()
+    assert inline == 0
+
+
+def test_reads_are_transparent_and_served_from_the_cache(client, db_session, monkeypatch) -> None:
+    case_id = _persist(db_session, 4).case_id
+    cache = BlobCache()
+    monkeypatch.setattr(blob_store, "_cache", cache)
+    db_session.expire_all()
+
+    detail = client.get(f"/api/v1/case-history/{case_id}").json()
+    assert detail["record"]["required_artifacts"] == ARTIFACTS
+    assert detail["record"]["profile"] == {"family_size": 4}
+    assert detail["snapshots"][0]["config_fingerprint"] == FINGERPRINT
+    misses = cache.misses
+
+    db_session.expire_all()
+    assert db_session.get(CaseRecord, case_id).required_artifacts == ARTIFACTS
+    assert cache.misses == misses and cache.hits > 0
+    assert not db_session.dirty
+
+
+def test_release_and_garbage_collection(db_session) -> None:
+    store = BlobStore(db_session, cache=BlobCache())
+    keep, drop = store.put_many([{"keep": True}, {"drop": True}])
+    store.retain([keep])
+    store.release([keep, drop])
+    assert store.collect_garbage() == 0  # released within the grace period
+    assert store.collect_garbage(grace_seconds=0) == 1
+    assert [b.hash for b in db_session.query(CaseBlob)] == [keep]
+    assert store.get(keep) == {"keep": True}
+
+
+def test_garbage_collection_keeps_blobs_retained_again(db_session) -> None:
+    store = BlobStore(db_session, cache=BlobCache())
+    key = store.put({"shared": True})
+    store.release([key])
+    store.put({"shared": True})  # another row deduplicates onto the released blob
+
+    assert store.collect_garbage(grace_seconds=0) == 0
+    assert store.get(key) == {"shared": True}
+    assert db_session.get(CaseBlob, key).released_at is None
+
+
+def test_recount_rebuilds_reference_counts_from_the_rows(db_session) -> None:
+    case_ids = [_persist(db_session, n).case_id for n in (1, 2)]
+    record = db_session.get(CaseRecord, case_ids[0])
+    db_session.query(CaseBlob).update({"refcount": 1})
+    store = BlobStore(db_session, cache=BlobCache())
+    stray = store.put({"unreferenced": True})
+
+    store.recount()
+    db_session.expire_all()
+
+    counts = {b.hash: b.refcount for b in db_session.query(CaseBlob)}
+    assert counts[record.required_artifacts_hash] == 4  # two records + two snapshots
+    assert counts[record.profile_hash] == 2
+    assert counts[stray] == 0
+    assert store.collect_garbage(grace_seconds=0) == 1
+
+
+def test_inline_rows_stay_readable_and_migrate(db_session) -> None:
+    legacy = CaseRecord(
+        profile={"family_size": 2},
+        program_eligibility={"results": []},
+        required_artifacts=ARTIFACTS,
+        source="legacy",
+    )
+    db_session.add(legacy)
+    db_session.flush()
+    db_session.add(
+        CaseSnapshot(
+            case_id=legacy.id,
+            version=1,
+            source="legacy",
+            profile={"family_size": 2},
+            program_eligibility={"results": []},
+            required_artifacts=ARTIFACTS,
+        )
+    )
+    db_session.commit()
+    shared = _persist(db_session, 5).case_id
+
+    assert migrate_inline_payloads(db_session, chunk_size=1) == 2
+    assert migrate_inline_payloads(db_session) == 0
+
+    db_session.expire_all()
+    record = db_session.get(CaseRecord, legacy.id)
+    assert record.profile_hash and record.required_artifacts == ARTIFACTS
+    assert (
+        record.required_artifacts_hash == db_session.get(CaseRecord, shared).required_artifacts_hash
+    )
+    assert db_session.get(CaseBlob, record.required_artifacts_hash).refcount == 4
+    assert record.crs_breakdown is None and record.crs_breakdown_hash is None
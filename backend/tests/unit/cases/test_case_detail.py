@@ -0,0 +1,91 @@
+from sqlalchemy import event
+
+from src.app.cases import snapshot_store
+from src.app.cases.history_service import CaseHistoryService
+from src.app.cases.repository import CaseEventRepository, CaseSnapshotRepository
+from src.app.cases.snapshot_store import SnapshotCache
+
+VERSIONS = 25
+
+
+def _document(step: int) -> dict:
+    return {
+        "profile": {"family_size": 1 + step % 4, "education": [{"level": "bachelor"}]},
+        "program_eligibility": {"results": [{"program_code": "FSW", "eligible": step % 2 == 0}]},
+        "crs_breakdown": {"total": 400 + step},
+        "required_artifacts": {"forms": ["IMM0008"]},
+        "config_fingerprint": {"crs": "sha"},
+    }
+
+
+def _case_with_history(db) -> str:
+    case_id = (
+        CaseHistoryService(db).persist_evaluation(source="detail_test", **_document(1)).case_id
+    )
+    repo = CaseSnapshotRepository(db)
+    for step in range(2, VERSIONS + 1):
+        repo.append_snapshot(case_id=case_id, source="detail_test", **_document(step))
+        CaseEventRepository(db).log_event(event_type="NOTE", case_id=case_id, actor="tester")
+    db.commit()
+    return case_id
+
+
+def test_detail_loads_in_a_bounded_number_of_queries(client, db_session, monkeypatch) -> None:
+    case_id = _case_with_history(db_session)
+    monkeypatch.setattr(snapshot_store, "_cache", SnapshotCache())  # force delta rebuilds
+    statements: list[str] = []
+    engine = db_session.get_bind()
+
+    def count(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        response = client.get(f"/api/v1/case-history/{case_id}")
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    detail = response.json()
+    assert [s["version"] for s in detail["snapshots"]] == list(range(1, VERSIONS + 1))
+    assert [s["crs_breakdown"] for s in detail["snapshots"]] == [
+        _document(v)["crs_breakdown"] for v in range(1, VERSIONS + 1)
+    ]
+    assert detail["record"]["profile"] == _document(1)["profile"]
+    assert len(detail["events"]) == VERSIONS
+    # record + snapshots + events + one batched blob lookup
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) <= 4
+
+
+def test_detail_sections_version_range_and_projection(client, db_session) -> None:
+    case_id = _case_with_history(db_session)
+
+    detail = client.get(
+        f"/api/v1/case-history/{case_id}",
+        params={
+            "include": "snapshots",
+            "from_version": 13,
+            "to_version": 16,
+            "fields": "crs_breakdown",
+        },
+    ).json()
+
+    assert "events" not in detail
+    assert [s["version"] for s in detail["snapshots"]] == [13, 14, 15, 16]
+    assert detail["snapshots"][0]["crs_breakdown"] == {"total": 413}
+    assert "profile" not in detail["snapshots"][0]
+    assert set(detail["record"]) >= {"id", "status", "crs_breakdown"}
+    assert "profile" not in detail["record"]
+
+    bare = client.get(f"/api/v1/case-history/{case_id}", params={"include": ""}).json()
+    assert set(bare) == {"record"}
+
+
+def test_detail_rejects_unknown_parameters(client, db_session) -> None:
+    case_id = _case_with_history(db_session)
+    url = f"/api/v1/case-history/{case_id}"
+    assert client.get(url, params={"include": "documents"}).status_code == 422
+    assert client.get(url, params={"fields": "passport"}).status_code == 422
+    assert client.get(url, params={"from_version": 5, "to_version": 2}).status_code == 422
+    assert client.get("/api/v1/case-history/missing").status_code == 404
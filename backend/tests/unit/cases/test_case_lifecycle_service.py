@@ -1,6 +1,10 @@
 import uuid
 
+from sqlalchemy import event
+
 from src.app.cases.lifecycle_service import CaseLifecycleError, CaseLifecycleService
+from src.app.cases.models_db import CaseRecord, CaseSnapshot
+from src.app.cases.repository import CaseEventRepository, CaseSnapshotRepository
 from src.app.db.database import SessionLocal
 from src.app.models.tenant import Tenant
 from src.app.models.user import User
@@ -75,3 +79,69 @@ def test_invalid_transition():
     finally:
         db.close()
 
+
+def test_bulk_transition_validates_as_a_set_and_writes_in_batches():
+    db = SessionLocal()
+    try:
+        tenant, user = _setup(db)
+        service = CaseLifecycleService(db)
+        drafts = [
+            service.create_case(
+                profile={"n": n},
+                program_eligibility={"results": [{"program_code": "FSW", "eligible": True}]},
+                crs_breakdown={"total": 450 + n},
+                tenant_id=tenant.id,
+                user_id=user.id,
+                source="test",
+            ).id
+            for n in range(4)
+        ]
+        service.archive_case(drafts[3], user.id, tenant.id)
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany) -> None:
+            statements.append(statement.split(None, 3)[2].upper())
+
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            results = service.bulk_transition(
+                case_ids=drafts + ["missing", drafts[0]],
+                tenant_id=tenant.id,
+                user_id=user.id,
+                new_status="submitted",
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert [(r.case_id, r.ok, r.status) for r in results] == [
+            (drafts[0], True, "submitted"),
+            (drafts[1], True, "submitted"),
+            (drafts[2], True, "submitted"),
+            (drafts[3], False, "archived"),
+            ("missing", False, None),
+        ]
+        assert {r.version for r in results if r.ok} == {2}
+        # One statement per table, whatever the batch size.
+        assert statements.count("CASE_SNAPSHOTS") == 1
+        assert statements.count("CASE_EVENTS") == 1
+
+        snapshots = CaseSnapshotRepository(db)
+        assert snapshots.get_snapshot(drafts[1], 2)["profile"] == {"n": 1}
+        assert db.query(CaseSnapshot).filter_by(case_id=drafts[1], version=2).one().crs_total == 451
+        events = CaseEventRepository(db).list_events(drafts[1])
+        assert events[-1].event_type == "CASE_SUBMITTED"
+        assert events[-1].event_metadata == {"from": "draft", "to": "submitted"}
+        assert db.get(CaseRecord, drafts[1]).status == "submitted"
+
+        try:
+            service.bulk_transition(
+                case_ids=drafts, tenant_id=tenant.id, user_id=user.id, new_status="draft"
+            )
+            raised = False
+        except CaseLifecycleError:
+            raised = True
+        assert raised is True
+    finally:
+        db.close()
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from src.app.cases.history_service import CaseHistoryService
+from src.app.cases.lifecycle_service import CaseLifecycleService
+from src.app.cases.models_db import CaseRecord, CaseSummary, CaseSummaryProgram
+from src.app.cases.summaries import CaseSummaryStore, backfill_summaries
+from src.app.models.tenant import Tenant
+from src.app.models.user import User
+
+
+def _results(eligible: dict[str, bool]) -> dict:
+    return {"results": [{"program_code": code, "eligible": ok} for code, ok in eligible.items()]}
+
+
+def _persist(db, *, crs: int, programs: dict[str, bool], tenant_id=None, status="evaluated"):
+    return (
+        CaseHistoryService(db)
+        .persist_evaluation(
+            profile={"crs": crs},
+            program_eligibility=_results(programs),
+            crs_breakdown={"total": crs},
+            required_artifacts=None,
+            config_fingerprint=None,
+            source="summary_test",
+            status=status,
+            tenant_id=tenant_id,
+        )
+        .case_id
+    )
+
+
+def _tenant(db, name: str) -> str:
+    tenant = Tenant(name=name)
+    db.add(tenant)
+    db.commit()
+    return tenant.id
+
+
+def test_keyset_pages_cover_every_case_once_newest_first(client, db_session) -> None:
+    case_ids = [_persist(db_session, crs=400 + n, programs={"FSW": True}) for n in range(7)]
+    # Identical timestamps must still page deterministically (case_id breaks ties).
+    db_session.execute(update(CaseSummary).values(created_at=datetime(2026, 1, 1)))
+    db_session.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/case-history", params=params)
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    assert seen == sorted(case_ids, reverse=True)
+    assert client.get("/api/v1/case-history", params={"cursor": "nope"}).status_code == 422
+
+
+def test_filters_by_tenant_status_program_and_crs(client, db_session) -> None:
+    tenant_a, tenant_b = _tenant(db_session, "Tenant A"), _tenant(db_session, "Tenant B")
+    fsw = _persist(db_session, crs=480, programs={"FSW": True, "CEC": False}, tenant_id=tenant_a)
+    cec = _persist(db_session, crs=430, programs={"CEC": True}, tenant_id=tenant_a)
+    _persist(db_session, crs=510, programs={"FSW": False}, tenant_id=tenant_b, status="draft")
+
+    def ids(**params) -> set[str]:
+        return {item["id"] for item in client.get("/api/v1/case-history", params=params).json()}
+
+    assert ids(tenant_id=tenant_a) == {fsw, cec}
+    assert ids(program="CEC") == {fsw, cec}
+    assert ids(program="CEC", eligible=True) == {cec}
+    assert ids(program="FSW", eligible=True, crs_min=450, crs_max=500) == {fsw}
+    assert len(ids(status="draft")) == 1
+
+    item = client.get("/api/v1/case-history", params={"tenant_id": tenant_b}).json()[0]
+    assert item["programs"] == ["FSW"] and item["eligible_programs"] == []
+    assert item["crs_total"] == 510 and item["tenant_id"] == tenant_b
+
+
+def test_summary_follows_lifecycle_and_result_updates(db_session) -> None:
+    tenant_id = _tenant(db_session, "Tenant Lifecycle")
+    user = User(email="sum@example.com", hashed_password="x", tenant_id=tenant_id, role="admin")
+    db_session.add(user)
+    db_session.commit()
+    service = CaseLifecycleService(db_session)
+    record = service.create_case(
+        program_eligibility=_results({"FSW": True}), tenant_id=tenant_id, user_id=user.id
+    )
+    service.submit_case(record.id, user.id, tenant_id)
+    assert db_session.get(CaseSummary, record.id).status == "submitted"
+
+    store = CaseSummaryStore(db_session)
+    store.update_results({record.id: (_results({"CEC": True}), {"total": 470})})
+    db_session.commit()
+    db_session.expire_all()
+    summary = db_session.get(CaseSummary, record.id)
+    assert (summary.eligible_programs, summary.crs_total) == (["CEC"], 470)
+    codes = db_session.query(CaseSummaryProgram.program_code).filter_by(case_id=record.id).all()
+    assert codes == [("CEC",)]
+
+
+def test_backfill_adds_missing_summaries(db_session) -> None:
+    legacy = CaseRecord(
+        source="legacy",
+        status="evaluated",
+        profile={},
+        program_eligibility=_results({"FSW": True}),
+        crs_breakdown={"breakdown": {"core": 300, "transfer": 50}},
+        created_at=datetime(2025, 1, 1) + timedelta(hours=1),
+    )
+    db_session.add(legacy)
+    db_session.commit()
+    _persist(db_session, crs=400, programs={})
+
+    assert backfill_summaries(db_session, chunk_size=1) == 1
+    assert backfill_summaries(db_session) == 0
+    summary = db_session.get(CaseSummary, legacy.id)
+    assert summary.crs_total == 350 and summary.programs == ["FSW"]
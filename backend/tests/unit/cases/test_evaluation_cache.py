@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.app.cases import evaluation_cache
+from src.app.cases.evaluation_cache import (
+    EvaluationCache,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    canonical_profile_hash,
+)
+from src.app.cases.model import CaseService
+from src.app.documents.service import DocumentMatrixResult, DocumentMatrixService
+from src.app.domain_config.service import ConfigService
+from src.app.rules.models import CandidateProfile
+from src.app.services.rule_engine_service import RuleEngineService
+
+
+def _profile(**overrides) -> CandidateProfile:
+    today = date.today()
+    payload = {
+        "family_size": 1,
+        "education": [{"level": "bachelor"}],
+        "language_tests": [
+            {
+                "test_type": "IELTS",
+                "listening_clb": 9,
+                "reading_clb": 9,
+                "writing_clb": 9,
+                "speaking_clb": 9,
+            }
+        ],
+        "work_experience": [
+            {
+                "teer_level": 1,
+                "start_date": (today - timedelta(days=400)).isoformat(),
+                "end_date": today.isoformat(),
+                "is_continuous": True,
+                "is_canadian": True,
+            }
+        ],
+        "proof_of_funds": [{"amount": 20000, "as_of_date": today.isoformat()}],
+    }
+    payload.update(overrides)
+    return CandidateProfile(**payload)
+
+
+def test_canonical_hash_ignores_key_order_only() -> None:
+    profile = _profile()
+    reordered = CandidateProfile(**dict(reversed(list(profile.model_dump().items()))))
+    assert canonical_profile_hash(profile) == canonical_profile_hash(reordered)
+    assert canonical_profile_hash(profile) != canonical_profile_hash(_profile(family_size=2))
+
+
+def test_memory_backend_lru_and_ttl(monkeypatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(evaluation_cache.time, "time", lambda: clock[0])
+    cache = EvaluationCache(MemoryCacheBackend(max_entries=2), ttl_seconds=60)
+
+    def compute(value: str):
+        return lambda: DocumentMatrixResult(required_forms=[value])
+
+    cache.get_or_compute("a", DocumentMatrixResult, compute("a"))
+    cache.get_or_compute("b", DocumentMatrixResult, compute("b"))
+    assert cache.get_or_compute("a", DocumentMatrixResult, compute("x")).required_forms == ["a"]
+    cache.get_or_compute("c", DocumentMatrixResult, compute("c"))  # evicts "b" (least recent)
+    assert cache.get_or_compute("b", DocumentMatrixResult, compute("b2")).required_forms == ["b2"]
+
+    clock[0] += 61  # "a" was evicted by "b"; now "b" expires
+    assert cache.get_or_compute("b", DocumentMatrixResult, compute("b3")).required_forms == ["b3"]
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.expirations) == (1, 5, 2, 1)
+    assert stats.size == 2
+
+
+def test_sqlite_backend_round_trips_and_evicts(tmp_path) -> None:
+    path = str(tmp_path / "cache.db")
+    cache = EvaluationCache(SQLiteCacheBackend(path, max_entries=2), ttl_seconds=None)
+    first = DocumentMatrixResult(required_forms=["IMM0008"])
+    cache.get_or_compute("k1", DocumentMatrixResult, lambda: first)
+
+    # A second process (new backend on the same file) sees the entry.
+    shared = EvaluationCache(SQLiteCacheBackend(path, max_entries=2), ttl_seconds=None)
+    hit = shared.get_or_compute("k1", DocumentMatrixResult, lambda: pytest.fail("recomputed"))
+    assert hit == first
+
+    shared.get_or_compute("k2", DocumentMatrixResult, DocumentMatrixResult)
+    shared.get_or_compute("k3", DocumentMatrixResult, DocumentMatrixResult)
+    assert shared.stats().size == 2
+    assert shared.stats().evictions == 1
+
+
+def test_case_service_reuses_results_until_config_changes(monkeypatch) -> None:
+    calls = {"rules": 0, "documents": 0}
+    rule_engine = RuleEngineService()
+    document_service = DocumentMatrixService(config_service=ConfigService())
+    evaluate_profile = rule_engine.evaluate_profile
+    get_required_documents = document_service.get_required_documents
+
+    def counting_rules(profile):
+        calls["rules"] += 1
+        return evaluate_profile(profile)
+
+    def counting_documents(profile, program):
+        calls["documents"] += 1
+        return get_required_documents(profile, program)
+
+    monkeypatch.setattr(rule_engine, "evaluate_profile", counting_rules)
+    monkeypatch.setattr(document_service, "get_required_documents", counting_documents)
+    cache = EvaluationCache(MemoryCacheBackend(), ttl_seconds=60)
+
+    def build(fingerprint: str):
+        service = CaseService(rule_engine, document_service, cache, config_fingerprint=fingerprint)
+        return service.build_case(_profile())
+
+    first = build("digest-1")
+    second = build("digest-1")
+    assert calls == {"rules": 1, "documents": 1}
+    assert second.model_dump() == first.model_dump()
+
+    build("digest-2")
+    assert calls == {"rules": 2, "documents": 2}
+    assert cache.stats().hits == 2
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from src.app.cases.event_log import EVENT_BUFFER_KEY, CaseEventLog
+from src.app.cases.models_db import CaseEvent, CaseRecord
+from src.app.cases.repository import CaseEventRepository, CaseRepository
+
+
+def _case(db, tenant_id=None) -> str:
+    record = CaseRepository(db).create_case(
+        profile={},
+        program_eligibility={},
+        crs_breakdown=None,
+        required_artifacts=None,
+        config_fingerprint=None,
+        source="event_log_test",
+        tenant_id=tenant_id,
+    )
+    db.commit()
+    return record.id
+
+
+def test_events_are_buffered_and_written_in_one_batch_on_commit(db_session) -> None:
+    first, second = _case(db_session), _case(db_session)
+    repo = CaseEventRepository(db_session)
+    inserts: list[int] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("INSERT INTO CASE_EVENTS"):
+            inserts.append(len(parameters) if executemany else 1)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for n in range(5):
+            repo.log_event(event_type="NOTE", case_id=first if n % 2 else second, actor="a")
+        assert inserts == [] and db_session.query(CaseEvent).count() == 0
+        db_session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert inserts == [5]
+    assert [e.sequence for e in repo.list_events(second)] == [1, 2, 3]
+    assert [e.sequence for e in repo.list_events(first)] == [1, 2]
+    assert db_session.get(CaseRecord, second).event_sequence == 3
+
+
+def test_sequences_continue_across_batches_and_rollbacks_discard_the_buffer(db_session) -> None:
+    case_id = _case(db_session)
+    log = CaseEventLog(db_session, batch_size=2)
+    for _ in range(3):  # the third append stays buffered
+        log.append(event_type="NOTE", case_id=case_id, actor="a")
+    assert len(db_session.info[EVENT_BUFFER_KEY]) == 1
+    db_session.commit()
+
+    log.append(event_type="LOST", case_id=case_id, actor="a")
+    db_session.rollback()
+    assert EVENT_BUFFER_KEY not in db_session.info
+
+    log.write([{"event_type": "BULK", "case_id": case_id}] * 2)
+    db_session.commit()
+    events = log.scan(case_id)
+    assert [(e.sequence, e.event_type) for e in events] == [
+        (1, "NOTE"),
+        (2, "NOTE"),
+        (3, "NOTE"),
+        (4, "BULK"),
+        (5, "BULK"),
+    ]
+    assert log.scan(case_id, after_sequence=3, limit=1)[0].sequence == 4
+
+
+def test_range_scans_by_case_tenant_and_time(db_session) -> None:
+    case_id = _case(db_session)
+    log = CaseEventLog(db_session)
+    base = datetime(2026, 3, 31, 23, 0)
+    for hours in range(4):  # one event in March, three in April
+        log.append(
+            event_type="NOTE",
+            case_id=case_id,
+            actor="a",
+            tenant_id="tenant-1",
+            created_at=base + timedelta(hours=hours),
+        )
+    db_session.commit()
+
+    april = log.scan(tenant_id="tenant-1", since=datetime(2026, 4, 1))
+    assert [e.month for e in april] == ["2026-04"] * 3
+    window = log.scan(case_id, since=base + timedelta(hours=1), until=base + timedelta(hours=3))
+    assert [e.sequence for e in window] == [2, 3]
+    assert log.scan(tenant_id="tenant-2") == []
+
+
+def test_hooks_are_scoped_to_the_buffering_session_and_fill_in_the_sequence(db_session) -> None:
+    from sqlalchemy.orm import Session
+
+    from src.app.cases import event_log
+    from tests.conftest import TestingSessionLocal
+
+    case_id = _case(db_session)
+    other = TestingSessionLocal()
+    try:
+        entry = CaseEventRepository(db_session).log_event(
+            event_type="NOTE", case_id=case_id, actor="a"
+        )
+        assert entry.sequence is None and entry.id is not None
+
+        assert event.contains(db_session, "before_commit", event_log._write_buffered_events)
+        assert not event.contains(other, "before_commit", event_log._write_buffered_events)
+        assert not event.contains(Session, "before_commit", event_log._write_buffered_events)
+
+        db_session.commit()
+        assert entry.sequence == 1
+    finally:
+        other.close()
@@ -0,0 +1,222 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from src.app.cases.archive import compact_history
+from src.app.cases.blob_store import PAYLOAD_FIELDS, BlobStore
+from src.app.cases.lifecycle_service import CaseLifecycleService
+from src.app.cases.models_db import (
+    CaseBlob,
+    CaseEvent,
+    CaseRecord,
+    CaseReevaluationRun,
+    CaseSnapshot,
+)
+from src.app.cases.reevaluation import (
+    REEVALUATION_EVENT,
+    RUN_COMPLETED,
+    RUN_FAILED,
+    ReevaluationJob,
+    build_report,
+)
+from src.app.cases.repository import CaseRepository, CaseSnapshotRepository
+from src.app.domain_config.registry import get_config_snapshot
+
+STALE_FINGERPRINT = {"crs": "stale"}
+
+
+def _profile(**overrides):
+    today = date.today()
+    payload = {
+        "family_size": 1,
+        "education": [{"level": "bachelor"}],
+        "language_tests": [
+            {
+                "test_type": "IELTS",
+                "listening_clb": 9,
+                "reading_clb": 9,
+                "writing_clb": 9,
+                "speaking_clb": 9,
+            }
+        ],
+        "work_experience": [
+            {
+                "teer_level": 1,
+                "start_date": (today - timedelta(days=400)).isoformat(),
+                "end_date": today.isoformat(),
+                "is_continuous": True,
+                "is_canadian": True,
+            }
+        ],
+        "proof_of_funds": [{"amount": 20000, "as_of_date": today.isoformat()}],
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _seed(db, profile, fingerprint=STALE_FINGERPRINT):
+    record = CaseRepository(db).create_case(
+        profile=profile,
+        program_eligibility={"results": [{"program_code": "FSW", "eligible": True}]},
+        crs_breakdown={"total": 1},
+        required_artifacts=None,
+        config_fingerprint=fingerprint,
+        source="seed",
+        status="evaluated",
+    )
+    CaseSnapshotRepository(db).create_snapshot(
+        case_id=record.id,
+        version=1,
+        profile=profile,
+        program_eligibility=record.program_eligibility,
+        crs_breakdown=record.crs_breakdown,
+        required_artifacts=None,
+        config_fingerprint=fingerprint,
+        source="seed",
+    )
+    db.commit()
+    return record.id
+
+
+@pytest.fixture
+def seeded(db_session):
+    current = dict(get_config_snapshot().fingerprint)
+    ids = {
+        "stale": [_seed(db_session, _profile(family_size=n)) for n in range(1, 5)],
+        "invalid": _seed(db_session, {"family_size": "many"}),
+        "current": _seed(db_session, _profile(), fingerprint=current),
+    }
+    return db_session, ids
+
+
+def test_job_writes_new_versions_and_diff_report(seeded):
+    db, ids = seeded
+    seen = []
+    progress = ReevaluationJob(db, chunk_size=2, processes=0, on_progress=seen.append).run()
+
+    assert progress.status == RUN_COMPLETED
+    assert (progress.processed, progress.updated, progress.skipped, progress.failed) == (6, 4, 1, 1)
+    assert [p.processed for p in seen] == [2, 4, 6, 6]
+
+    db.expire_all()
+    current = dict(get_config_snapshot().fingerprint)
+    for case_id in ids["stale"]:
+        record = db.get(CaseRecord, case_id)
+        assert record.config_fingerprint == current
+        assert record.crs_breakdown["total"] > 1
+        versions = [s.version for s in CaseSnapshotRepository(db).list_snapshots(case_id)]
+        assert versions == [1, 2]
+    assert db.get(CaseRecord, ids["invalid"]).config_fingerprint == STALE_FINGERPRINT
+    assert db.query(CaseSnapshot).filter_by(case_id=ids["current"]).count() == 1
+    assert db.query(CaseEvent).filter_by(event_type=REEVALUATION_EVENT).count() == 4
+
+    report = build_report(db, progress.run_id)
+    assert report.progress.changed == progress.changed == len(report.changes) == 4
+    assert report.crs_increased == 4
+    assert {c.case_id for c in report.changes} == set(ids["stale"])
+    assert all(c.crs_before == 1 and c.version == 2 for c in report.changes)
+
+
+def _blob_references(db):
+    references = {}
+    for model in (CaseRecord, CaseSnapshot):
+        for row in db.query(model):
+            for name in PAYLOAD_FIELDS:
+                key = getattr(row, f"{name}_hash")
+                if key:
+                    references[key] = references.get(key, 0) + 1
+    return references
+
+
+def test_result_blobs_survive_compaction_and_garbage_collection(db_session):
+    db = db_session
+    case_id = _seed(db, _profile())
+    ReevaluationJob(db, processes=0).run()
+
+    # The result blobs are referenced by the record and by the new snapshot.
+    db.expire_all()
+    record = db.get(CaseRecord, case_id)
+    counts = {blob.hash: blob.refcount for blob in db.query(CaseBlob)}
+    for name in ("program_eligibility", "crs_breakdown", "config_fingerprint"):
+        assert counts[getattr(record, f"{name}_hash")] == 2
+
+    # A transition adds v3; compaction then moves v1 and v2 (releasing their blobs).
+    db.execute(
+        update(CaseRecord)
+        .where(CaseRecord.id == case_id)
+        .values(status="complete", tenant_id="tenant-reeval")
+    )
+    db.commit()
+    CaseLifecycleService(db).archive_case(case_id, "reviewer", "tenant-reeval")
+    expected = db.get(CaseRecord, case_id).crs_breakdown
+    assert compact_history(db, older_than_days=0) == 1
+    BlobStore(db).collect_garbage(grace_seconds=0)
+    db.commit()
+
+    db.expire_all()
+    references = _blob_references(db)
+    assert {blob.hash: blob.refcount for blob in db.query(CaseBlob)} == references
+    record = db.get(CaseRecord, case_id)
+    assert record.crs_breakdown == expected
+    assert record.config_fingerprint == dict(get_config_snapshot().fingerprint)
+    snapshots = CaseSnapshotRepository(db).list_snapshots(case_id)
+    assert [s.version for s in snapshots] == [3]
+    assert snapshots[0].crs_breakdown == expected
+
+
+def test_interrupted_run_resumes_from_checkpoint(seeded, monkeypatch):
+    db, _ = seeded
+    job = ReevaluationJob(db, chunk_size=2, processes=0)
+    apply_chunk = job._apply_chunk
+    calls = []
+
+    def crash_on_second_chunk(run, rows, executor):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError("worker lost")
+        apply_chunk(run, rows, executor)
+
+    monkeypatch.setattr(job, "_apply_chunk", crash_on_second_chunk)
+    with pytest.raises(RuntimeError):
+        job.run()
+
+    run = db.query(CaseReevaluationRun).one()
+    failed = build_report(db, run.id).progress
+    assert failed.status == RUN_FAILED and failed.processed == 2
+
+    # A new job for the same config picks up the failed run after its cursor.
+    progress = ReevaluationJob(db, chunk_size=2, processes=0).run()
+    assert progress.run_id == failed.run_id
+    assert progress.status == RUN_COMPLETED
+    assert progress.processed == 6 and progress.updated == 4
+    assert db.query(CaseSnapshot).filter(CaseSnapshot.version == 2).count() == 4
+
+
+def test_process_pool_matches_inline_evaluation(db_session):
+    case_id = _seed(db_session, _profile())
+    progress = ReevaluationJob(db_session, processes=2).run()
+    assert progress.updated == 1 and progress.failed == 0
+
+    db_session.expire_all()
+    pooled = db_session.get(CaseRecord, case_id)
+    inline_id = _seed(db_session, _profile())
+    ReevaluationJob(db_session, processes=0).run()
+    inline = db_session.get(CaseRecord, inline_id)
+    assert pooled.program_eligibility == inline.program_eligibility
+    assert pooled.crs_breakdown == inline.crs_breakdown
+
+
+def test_reevaluation_endpoints(client, db_session):
+    case_id = _seed(db_session, _profile())
+    response = client.post("/api/v1/case-history/reevaluations", json={"processes": 0})
+    assert response.status_code == 202
+    run_id = response.json()["run_id"]
+
+    # TestClient runs the background task before returning.
+    report = client.get(f"/api/v1/case-history/reevaluations/{run_id}").json()
+    assert report["progress"]["status"] == RUN_COMPLETED
+    assert report["progress"]["updated"] == 1
+    assert [c["case_id"] for c in report["changes"]] == [case_id]
+
+    assert client.get("/api/v1/case-history/reevaluations/missing").status_code == 404
@@ -0,0 +1,135 @@
+import random
+
+from src.app.cases.json_patch import apply_patch, make_patch
+from src.app.cases.lifecycle_service import CaseLifecycleService
+from src.app.cases.models_db import CaseSnapshot
+from src.app.cases.repository import CaseRepository, CaseSnapshotRepository
+from src.app.cases.snapshot_store import (
+    SNAPSHOT_DELTA,
+    SNAPSHOT_FULL,
+    SnapshotCache,
+    SnapshotStore,
+    reencode_snapshots,
+)
+from src.app.models.tenant import Tenant
+from src.app.models.user import User
+
+
+def _document(step: int) -> dict:
+    return {
+        "profile": {"family_size": 1 + step % 3, "education": [{"level": "bachelor"}]},
+        "program_eligibility": {"results": [{"program_code": "FSW", "eligible": step % 2 == 0}]},
+        "crs_breakdown": {"total": 400 + step, "breakdown": {"core_points": 300}},
+        "required_artifacts": {"forms": ["IMM0008"] + (["IMM5669"] if step > 2 else [])},
+        "config_fingerprint": {"crs": f"sha-{step // 2}", "a/b~c": "escaped"},
+    }
+
+
+def _case(db) -> str:
+    record = CaseRepository(db).create_case(
+        profile={},
+        program_eligibility={},
+        crs_breakdown=None,
+        required_artifacts=None,
+        config_fingerprint=None,
+        source="test",
+    )
+    db.commit()
+    return record.id
+
+
+def test_json_patch_round_trips_random_documents() -> None:
+    rng = random.Random(11)
+
+    def value(depth: int):
+        kind = rng.choice(["int", "str", "list", "dict", "none"] if depth < 3 else ["int", "str"])
+        if kind == "list":
+            return [value(depth + 1) for _ in range(rng.randint(0, 3))]
+        if kind == "dict":
+            return {rng.choice(["a", "b", "c/d", "e~f"]): value(depth + 1) for _ in range(3)}
+        return {"int": rng.randint(0, 3), "str": rng.choice("xyz"), "none": None}[kind]
+
+    for _ in range(300):
+        source, target = value(0), value(0)
+        patch = make_patch(source, target)
+        assert apply_patch(source, patch) == target
+        assert make_patch(target, target) == []
+    assert make_patch({"n": 1}, {"n": True}) == [{"op": "replace", "path": "/n", "value": True}]
+
+
+def test_bases_are_written_every_interval_and_any_version_rebuilds(db_session) -> None:
+    case_id = _case(db_session)
+    store = SnapshotStore(db_session, full_interval=3, cache=SnapshotCache())
+    for version in range(1, 8):
+        store.write(case_id=case_id, version=version, document=_document(version), source="test")
+    db_session.commit()
+
+    rows = db_session.query(CaseSnapshot).order_by(CaseSnapshot.version).all()
+    assert [r.encoding for r in rows] == [
+        "full",
+        "delta",
+        "delta",
+        "full",
+        "delta",
+        "delta",
+        "full",
+    ]
+    assert rows[1].profile is None and rows[1].delta
+
+    db_session.expire_all()
+    cold = SnapshotStore(db_session, cache=SnapshotCache())
+    for version in (6, 2, 7, 5):
+        assert cold.materialize(case_id, version) == _document(version)
+    assert cold.materialize(case_id, 8) is None
+
+    listed = CaseSnapshotRepository(db_session).list_snapshots(case_id)
+    assert [s.profile for s in listed] == [_document(v)["profile"] for v in range(1, 8)]
+    assert not db_session.dirty
+
+
+def test_lifecycle_transition_stores_an_empty_delta(db_session) -> None:
+    tenant = Tenant(name="Tenant Snapshots")
+    db_session.add(tenant)
+    db_session.commit()
+    user = User(email="s@example.com", hashed_password="x", tenant_id=tenant.id, role="admin")
+    db_session.add(user)
+    db_session.commit()
+
+    service = CaseLifecycleService(db_session)
+    record = service.create_case(profile={"foo": "bar"}, tenant_id=tenant.id, user_id=user.id)
+    service.submit_case(record.id, user.id, tenant.id)
+    service.mark_in_review(record.id, user.id, tenant.id)
+
+    rows = db_session.query(CaseSnapshot).order_by(CaseSnapshot.version).all()
+    assert [(r.encoding, r.delta) for r in rows[1:]] == [(SNAPSHOT_DELTA, [])] * 2
+    repo = CaseSnapshotRepository(db_session)
+    assert repo.get_snapshot(record.id, 3)["profile"] == {"foo": "bar"}
+    assert repo.latest_version(record.id) == 3
+
+
+def test_reencode_converts_existing_full_rows(db_session) -> None:
+    case_id = _case(db_session)
+    for version in range(1, 6):
+        db_session.add(
+            CaseSnapshot(case_id=case_id, version=version, source="legacy", **_document(version))
+        )
+    db_session.commit()
+
+    assert reencode_snapshots(db_session, chunk_size=1, full_interval=4) == 3
+    assert reencode_snapshots(db_session, chunk_size=1, full_interval=4) == 0
+    db_session.expire_all()
+    encodings = [
+        r.encoding for r in db_session.query(CaseSnapshot).order_by(CaseSnapshot.version).all()
+    ]
+    assert encodings == [
+        SNAPSHOT_FULL,
+        SNAPSHOT_DELTA,
+        SNAPSHOT_DELTA,
+        SNAPSHOT_DELTA,
+        SNAPSHOT_FULL,
+    ]
+
+    cold = SnapshotStore(db_session, cache=SnapshotCache())
+    assert [cold.materialize(case_id, v) for v in range(1, 6)] == [
+        _document(v) for v in range(1, 6)
+    ]
@@ -0,0 +1,131 @@
+import threading
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from src.app.cases.history_service import CaseHistoryService
+from src.app.cases.models_db import CaseRecord, CaseSnapshot
+from src.app.cases.repository import CaseSnapshotRepository
+from src.app.db.database import Base
+
+THREADS = 8
+WRITES_PER_THREAD = 15
+
+
+def _append(db, case_id: str, step: int) -> CaseSnapshot:
+    return CaseSnapshotRepository(db).append_snapshot(
+        case_id=case_id,
+        profile={"step": step},
+        program_eligibility={"results": []},
+        crs_breakdown={"total": step},
+        required_artifacts=None,
+        config_fingerprint=None,
+        source="stress",
+    )
+
+
+def _persist(db) -> str:
+    return (
+        CaseHistoryService(db)
+        .persist_evaluation(
+            profile={"step": 0},
+            program_eligibility={"results": []},
+            crs_breakdown={"total": 0},
+            required_artifacts=None,
+            config_fingerprint=None,
+            source="stress",
+        )
+        .case_id
+    )
+
+
+def test_concurrent_writers_never_lose_or_duplicate_versions(tmp_path) -> None:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'versions.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        case_id = _persist(db)
+
+    start = threading.Barrier(THREADS)
+    written: dict[int, int] = {}  # version -> step
+    errors: list[BaseException] = []
+    lock = threading.Lock()
+
+    def writer(worker: int) -> None:
+        with Session() as db:
+            start.wait()
+            for n in range(WRITES_PER_THREAD):
+                step = worker * 100 + n
+                try:
+                    version = _append(db, case_id, step).version
+                    db.commit()
+                except BaseException as exc:  # noqa: BLE001 - reported below
+                    db.rollback()
+                    with lock:
+                        errors.append(exc)
+                    return
+                with lock:
+                    assert version not in written
+                    written[version] = step
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    total = THREADS * WRITES_PER_THREAD
+    assert sorted(written) == list(range(2, total + 2))
+    with Session() as db:
+        stored = [
+            v
+            for (v,) in db.query(CaseSnapshot.version)
+            .filter(CaseSnapshot.case_id == case_id)
+            .order_by(CaseSnapshot.version)
+        ]
+        assert stored == list(range(1, total + 2))
+        assert db.get(CaseRecord, case_id).snapshot_version == total + 1
+        repo = CaseSnapshotRepository(db)
+        assert repo.latest_version(case_id) == total + 1
+        for version in (2, total // 2, total + 1):
+            assert repo.get_snapshot(case_id, version)["profile"] == {"step": written[version]}
+    engine.dispose()
+
+
+def test_lagging_counter_catches_up_with_stored_versions(db_session) -> None:
+    case_id = _persist(db_session)
+    _append(db_session, case_id, 1)
+    db_session.commit()
+    # Simulate rows written without the counter (e.g. before the migration backfill).
+    db_session.execute(
+        update(CaseRecord).where(CaseRecord.id == case_id).values(snapshot_version=0)
+    )
+    db_session.commit()
+
+    assert _append(db_session, case_id, 2).version == 3
+    db_session.commit()
+    assert db_session.get(CaseRecord, case_id).snapshot_version == 3
+    versions = CaseSnapshotRepository(db_session).allocate_versions([case_id, "missing"])
+    assert versions == {case_id: 4}
+
+
+def test_colliding_insert_is_rolled_back_to_a_savepoint_and_retried(
+    db_session, monkeypatch
+) -> None:
+    case_id = _persist(db_session)
+    allocate = CaseSnapshotRepository.allocate_version
+    taken = iter([1])  # first allocation returns an existing version
+
+    def allocate_version(self, case_id: str) -> int:
+        return next(taken, None) or allocate(self, case_id)
+
+    monkeypatch.setattr(CaseSnapshotRepository, "allocate_version", allocate_version)
+    snapshot = _append(db_session, case_id, 2)
+    db_session.commit()
+
+    assert snapshot.version == 2
+    assert db_session.query(CaseSnapshot).filter(CaseSnapshot.case_id == case_id).count() == 2
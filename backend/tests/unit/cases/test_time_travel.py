@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import null, update
+
+from src.app.cases.history_service import CaseHistoryService
+from src.app.cases.models_db import CaseSnapshot
+from src.app.cases.repository import CaseSnapshotRepository
+from src.app.cases.time_travel import backfill_snapshot_results, eligibility_as_of
+
+START = datetime(2026, 1, 1, 12, 0)
+
+
+def _results(*eligible: str) -> dict:
+    return {"results": [{"program_code": code, "eligible": True} for code in eligible]}
+
+
+def _case_with_timeline(db, tenant_id: str, days: int = 12) -> str:
+    """Version n (1-based) is written on START + n-1 days with crs_total 400 + n."""
+    case_id = (
+        CaseHistoryService(db)
+        .persist_evaluation(
+            profile={"day": 0},
+            program_eligibility=_results("FSW"),
+            crs_breakdown={"total": 401},
+            required_artifacts=None,
+            config_fingerprint=None,
+            source="as_of_test",
+            tenant_id=tenant_id,
+        )
+        .case_id
+    )
+    db.execute(
+        update(CaseSnapshot).where(CaseSnapshot.case_id == case_id).values(snapshot_at=START)
+    )
+    repo = CaseSnapshotRepository(db)
+    for day in range(1, days):
+        repo.append_snapshot(
+            case_id=case_id,
+            profile={"day": day},
+            program_eligibility=_results("FSW", "CEC") if day >= 5 else _results("FSW"),
+            crs_breakdown={"total": 401 + day},
+            required_artifacts=None,
+            config_fingerprint=None,
+            source="as_of_test",
+            snapshot_at=START + timedelta(days=day),
+            tenant_id=tenant_id,
+        )
+    db.commit()
+    return case_id
+
+
+def test_case_as_of_returns_the_version_in_effect(client, db_session) -> None:
+    case_id = _case_with_timeline(db_session, "tenant-a")
+    url = f"/api/v1/case-history/{case_id}/as-of"
+
+    body = client.get(url, params={"ts": (START + timedelta(days=6, hours=3)).isoformat()}).json()
+    assert (body["version"], body["profile"], body["crs_breakdown"]) == (
+        7,
+        {"day": 6},
+        {"total": 407},
+    )
+
+    # Offsets are normalized to UTC: 14:00+02:00 on day 3 is exactly version 4's time.
+    aware = (START + timedelta(days=3, hours=2)).replace(tzinfo=timezone(timedelta(hours=2)))
+    assert client.get(url, params={"ts": aware.isoformat()}).json()["version"] == 4
+
+    assert (
+        client.get(url, params={"ts": (START - timedelta(days=1)).isoformat()}).status_code == 404
+    )
+
+
+def test_tenant_eligibility_as_of_pages_through_cases(client, db_session) -> None:
+    case_ids = sorted(_case_with_timeline(db_session, "tenant-b", days=8) for _ in range(3))
+    _case_with_timeline(db_session, "tenant-c", days=2)
+    moment = (START + timedelta(days=5, hours=1)).isoformat()
+
+    seen, cursor = [], None
+    while True:
+        params = {"tenant_id": "tenant-b", "ts": moment, "limit": 2}
+        response = client.get(
+            "/api/v1/case-history/as-of",
+            params={**params, **({"cursor": cursor} if cursor else {})},
+        )
+        seen.extend(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    assert [item["case_id"] for item in seen] == case_ids
+    assert {(item["version"], item["crs_total"]) for item in seen} == {(6, 406)}
+    assert all(item["eligible_programs"] == ["FSW", "CEC"] for item in seen)
+
+
+def test_snapshots_without_result_columns_are_rebuilt_and_backfilled(db_session) -> None:
+    case_id = _case_with_timeline(db_session, "tenant-d", days=4)
+    db_session.execute(update(CaseSnapshot).values(eligible_programs=null(), crs_total=None))
+    db_session.commit()
+
+    items, _ = eligibility_as_of(db_session, "tenant-d", START + timedelta(days=10))
+    assert [(i.case_id, i.version, i.crs_total) for i in items] == [(case_id, 4, 404)]
+
+    assert backfill_snapshot_results(db_session, chunk_size=1) == 4
+    assert backfill_snapshot_results(db_session) == 0
+    crs = [s.crs_total for s in db_session.query(CaseSnapshot).order_by(CaseSnapshot.version)]
+    assert crs == [401, 402, 403, 404]
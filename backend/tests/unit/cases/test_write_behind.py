@@ -0,0 +1,111 @@
+import queue
+import uuid
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.app.cases.history_service import CaseHistoryResult
+from src.app.cases.repository import CaseRepository, CaseSnapshotRepository
+from src.app.cases.write_behind import (
+    WRITE_COMMITTED,
+    WRITE_FAILED,
+    HistoryWriteQueue,
+    write_status,
+)
+from src.app.db.database import SessionLocal, engine
+
+
+def _payload(**overrides):
+    payload = {
+        "profile": {"family_size": 1},
+        "program_eligibility": {"results": []},
+        "crs_breakdown": {"total": 0},
+        "required_artifacts": {"forms": [], "documents": []},
+        "config_fingerprint": {"crs": "abc"},
+        "source": "write_behind_test",
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_write_is_applied_in_background_with_preassigned_case_id():
+    writes = HistoryWriteQueue(maxsize=10)
+    write, future = writes.submit(engine, **_payload())
+
+    result = future.result(timeout=10)
+    writes.close()
+
+    assert isinstance(result, CaseHistoryResult)
+    assert result.case_id == write.case_id
+    status = writes.status(write.write_id)
+    assert status.status == WRITE_COMMITTED
+    assert status.version == 1
+    assert status.completed_at is not None
+
+    db = SessionLocal()
+    try:
+        assert CaseRepository(db).get_case(write.case_id) is not None
+        assert [s.version for s in CaseSnapshotRepository(db).list_snapshots(write.case_id)] == [1]
+    finally:
+        db.close()
+
+
+def test_failed_write_reports_error_and_keeps_worker_alive():
+    writes = HistoryWriteQueue(maxsize=10)
+    bad, bad_future = writes.submit(engine, **_payload(source=None))
+    good, good_future = writes.submit(engine, **_payload())
+
+    with pytest.raises(IntegrityError):  # source is NOT NULL
+        bad_future.result(timeout=10)
+    good_future.result(timeout=10)
+    writes.flush()
+
+    assert writes.status(bad.write_id).status == WRITE_FAILED
+    assert writes.status(bad.write_id).error
+    assert writes.status(good.write_id).status == WRITE_COMMITTED
+    writes.close()
+
+
+def test_full_queue_rejects_instead_of_blocking():
+    writes = HistoryWriteQueue(maxsize=1)
+    writes._ensure_worker = lambda shard: None  # no consumer: the first write stays queued
+    writes.submit(engine, **_payload())
+    with pytest.raises(queue.Full):
+        writes.submit(engine, **_payload())
+
+
+def test_writes_are_sharded_by_case_over_several_writers(monkeypatch):
+    writes = HistoryWriteQueue(maxsize=8, writers=4)
+    monkeypatch.setattr(engine.dialect, "name", "postgresql")
+    shards = {writes._shard(engine, f"case-{n}") for n in range(32)}
+    assert len(shards) > 1
+    assert writes._shard(engine, "case-1") == writes._shard(engine, "case-1")
+    monkeypatch.undo()
+
+    # SQLite takes one writer at a time: every write goes to the first shard.
+    assert {writes._shard(engine, f"case-{n}") for n in range(32)} == {0}
+    futures = [writes.submit(engine, **_payload())[1] for _ in range(3)]
+    assert [f.result(timeout=10).version for f in futures] == [1, 1, 1]
+    writes.close()
+
+
+def test_committed_write_is_resolved_from_the_database_in_another_process():
+    writes = HistoryWriteQueue(maxsize=10)
+    write, future = writes.submit(engine, **_payload())
+    future.result(timeout=10)
+    writes.close()
+    elsewhere = HistoryWriteQueue(maxsize=10)  # another worker, or this one after a restart
+
+    db = SessionLocal()
+    try:
+        assert elsewhere.status(write.write_id) is None
+        status = write_status(db, write.write_id, elsewhere)
+        assert (status.case_id, status.status, status.version) == (
+            write.case_id,
+            WRITE_COMMITTED,
+            1,
+        )
+        assert write_status(db, f"{uuid.uuid4()}.{uuid.uuid4().hex}", elsewhere) is None
+        assert write_status(db, "unknown", elsewhere) is None
+    finally:
+        db.close()
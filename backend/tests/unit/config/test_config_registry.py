@@ -0,0 +1,94 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.app.domain_config.registry import DomainConfigRegistry, get_config_snapshot
+from src.app.rules.config_loader import CONFIG_DIR
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    for path in CONFIG_DIR.glob("*.yaml"):
+        shutil.copy(path, tmp_path / path.name)
+    return tmp_path
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_snapshot_is_shared_until_files_change(config_dir: Path) -> None:
+    registry = DomainConfigRegistry(base_path=config_dir, check_interval=0)
+    first = registry.snapshot()
+
+    assert registry.snapshot() is first
+    assert first.fingerprint["config/domain/crs.yaml"] != "missing"
+    assert first.config_service.get_domain_rules() is first.domain_rules
+    assert first.documents.forms.forms
+
+
+def test_touch_without_content_change_keeps_snapshot(config_dir: Path) -> None:
+    registry = DomainConfigRegistry(base_path=config_dir, check_interval=0)
+    first = registry.snapshot()
+
+    _bump_mtime(config_dir / "language.yaml")
+
+    assert registry.snapshot() is first
+
+
+def test_content_change_reloads_with_new_fingerprint(config_dir: Path) -> None:
+    registry = DomainConfigRegistry(base_path=config_dir, check_interval=0)
+    first = registry.snapshot()
+
+    path = config_dir / "language.yaml"
+    path.write_text(path.read_text().replace("fsw_min_clb: 7", "fsw_min_clb: 8"))
+    _bump_mtime(path)
+    second = registry.snapshot()
+
+    assert second is not first
+    assert second.domain_rules.language.fsw_min_clb == 8
+    assert first.domain_rules.language.fsw_min_clb == 7
+    assert second.digest != first.digest
+    assert (
+        second.fingerprint["config/domain/language.yaml"]
+        != first.fingerprint["config/domain/language.yaml"]
+    )
+    assert second.fingerprint["config/domain/crs.yaml"] == first.fingerprint["config/domain/crs.yaml"]
+
+
+def test_invalid_reload_keeps_last_good_snapshot(config_dir: Path) -> None:
+    registry = DomainConfigRegistry(base_path=config_dir, check_interval=0)
+    first = registry.snapshot()
+
+    path = config_dir / "crs.yaml"
+    path.write_text("crs_core:\n  base_age_points: oops\n")
+    _bump_mtime(path)
+
+    assert registry.snapshot() is first
+
+
+def test_missing_optional_source_is_fingerprinted_as_missing(config_dir: Path) -> None:
+    (config_dir / "arranged_employment.yaml").unlink()
+    registry = DomainConfigRegistry(base_path=config_dir, check_interval=0)
+
+    snapshot = registry.snapshot()
+
+    assert snapshot.fingerprint["config/domain/arranged_employment.yaml"] == "missing"
+
+
+def test_missing_required_source_raises(config_dir: Path) -> None:
+    (config_dir / "programs.yaml").unlink()
+    registry = DomainConfigRegistry(base_path=config_dir, check_interval=0)
+
+    with pytest.raises(FileNotFoundError):
+        registry.snapshot()
+
+
+def test_process_snapshot_matches_repo_configs() -> None:
+    snapshot = get_config_snapshot()
+
+    assert snapshot is get_config_snapshot()
+    assert len(snapshot.fingerprint) == 9
@@ -0,0 +1,93 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.app.services import ocr
+from src.app.services.ocr import OCRService, PdfPage
+
+
+class _Image:
+    def __init__(self, page: int, closed: list[int]) -> None:
+        self.page = page
+        self.closed = closed
+
+    def close(self) -> None:
+        self.closed.append(self.page)
+
+
+@pytest.fixture
+def scanned_pdf(monkeypatch):
+    """A 5-page PDF whose even pages carry a text layer; odd pages are scans."""
+    rendered, closed = [], []
+
+    class FakePdf2Image:
+        @staticmethod
+        def convert_from_path(path, dpi, first_page, last_page):
+            rendered.append((first_page, last_page))
+            return [_Image(first_page, closed)]
+
+    class FakeTesseract:
+        @staticmethod
+        def image_to_string(image, lang):
+            return f"scanned text of page {image.page}\n"
+
+    monkeypatch.setattr(ocr, "TESSERACT_AVAILABLE", True)
+    monkeypatch.setattr(ocr, "PDF2IMAGE_AVAILABLE", True)
+    monkeypatch.setattr(ocr, "pdf2image", FakePdf2Image, raising=False)
+    monkeypatch.setattr(ocr, "pytesseract", FakeTesseract, raising=False)
+    monkeypatch.setattr(ocr, "pdf_page_count", lambda path: 5)
+    monkeypatch.setattr(
+        ocr,
+        "pdf_text_layer",
+        lambda path, page: f"Statement page {page}, balance 1,234.56 CAD" if page % 2 == 0 else "",
+    )
+    return rendered, closed
+
+
+def test_text_layer_pages_are_not_rasterized(scanned_pdf) -> None:
+    rendered, closed = scanned_pdf
+
+    pages = list(OCRService.iter_pdf_pages("statement.pdf"))
+
+    assert [(p.number, p.source) for p in pages] == [
+        (1, "ocr"),
+        (2, "text_layer"),
+        (3, "ocr"),
+        (4, "text_layer"),
+        (5, "ocr"),
+    ]
+    # Only scanned pages are rendered, one page per call, and every image is released.
+    assert rendered == [(1, 1), (3, 3), (5, 5)]
+    assert closed == [1, 3, 5]
+    text = OCRService.extract_text_from_pdf("statement.pdf")
+    assert text.startswith("--- Page 1 ---\nscanned text of page 1\n\n--- Page 2 ---\nStatement")
+
+
+def test_pages_run_in_a_bounded_window_and_arrive_in_order(scanned_pdf, monkeypatch) -> None:
+    started, active, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    def read_page(path, page, *options):
+        with lock:
+            started.append(page)
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01 * (page % 3 == 1))  # some later pages finish first
+        with lock:
+            active[0] -= 1
+        return PdfPage(number=page, text=f"page {page}", source="ocr")
+
+    monkeypatch.setattr(ocr, "read_pdf_page", read_page)
+    monkeypatch.setattr(ocr, "pdf_page_count", lambda path: 12)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        pages = OCRService.iter_pdf_pages("statement.pdf", executor=executor, window=3)
+        first = next(pages)
+        # The first page is emitted before the rest of the document was submitted.
+        assert first.number == 1 and len(started) <= 3
+        rest = list(pages)
+
+    assert [p.number for p in [first, *rest]] == list(range(1, 13))
+    assert peak[0] <= 3
@@ -0,0 +1,122 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.app.domain_config.service import ConfigService
+from src.app.rules import batch, crs
+from src.app.rules.engine import RuleEngine
+from src.app.rules.facts import ProfileFacts
+from src.app.rules.models import (
+    CandidateProfile,
+    LanguageTestResult,
+    MedicalStatus,
+    ProofOfFundsSnapshot,
+    WorkExperienceRecord,
+)
+
+
+def _language(clb: int, expires_in_days: int = 365) -> LanguageTestResult:
+    return LanguageTestResult(
+        test_type="IELTS",
+        expiry_date=date.today() + timedelta(days=expires_in_days),
+        listening_clb=clb,
+        reading_clb=clb,
+        writing_clb=clb,
+        speaking_clb=clb,
+    )
+
+
+def _work(teer: int | None, months: int, canadian: bool, continuous: bool = True):
+    end = date.today()
+    return WorkExperienceRecord(
+        teer_level=teer,
+        start_date=end - timedelta(days=30 * months),
+        end_date=end,
+        is_continuous=continuous,
+        is_canadian=canadian,
+    )
+
+
+def _profiles() -> list[CandidateProfile]:
+    today = date.today()
+    return [
+        CandidateProfile(),
+        CandidateProfile(
+            date_of_birth=today.replace(year=today.year - 29),
+            language_tests=[_language(9)],
+            work_experience=[_work(1, 14, canadian=False)],
+            proof_of_funds=[ProofOfFundsSnapshot(amount=20000, as_of_date=today)],
+        ),
+        CandidateProfile(
+            family_size=3,
+            language_tests=[_language(6, expires_in_days=10), _language(8)],
+            work_experience=[_work(0, 13, canadian=True), _work(2, 30, canadian=True)],
+            proof_of_funds=[
+                ProofOfFundsSnapshot(amount=50000, as_of_date=today - timedelta(days=90)),
+                ProofOfFundsSnapshot(amount=1000, as_of_date=today),
+            ],
+            medical_status=MedicalStatus(expiry_date=today + timedelta(days=20)),
+        ),
+        CandidateProfile(
+            family_size=12,
+            language_tests=[_language(5)],
+            work_experience=[_work(None, 24, canadian=True), _work(4, 24, canadian=False)],
+            proof_of_funds=[ProofOfFundsSnapshot(amount=40000, as_of_date=today)],
+        ),
+        CandidateProfile(
+            family_size=None,
+            date_of_birth=today.replace(year=today.year - 45),
+            language_tests=[LanguageTestResult(test_type="CELPIP")],
+            work_experience=[_work(3, 6, canadian=True, continuous=False)],
+        ),
+    ]
+
+
+@pytest.fixture
+def engine() -> RuleEngine:
+    return RuleEngine(config=ConfigService().get_domain_rules())
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_batch_matches_per_profile(engine, monkeypatch, use_numpy) -> None:
+    if use_numpy and not batch.NUMPY_AVAILABLE:
+        pytest.skip("NumPy not installed")
+    monkeypatch.setattr(batch, "NUMPY_AVAILABLE", use_numpy)
+    monkeypatch.setattr(crs, "NUMPY_AVAILABLE", use_numpy)
+    profiles = _profiles()
+
+    batched = engine.evaluate_batch(profiles)
+
+    assert len(batched) == len(profiles)
+    for profile, results in zip(profiles, batched, strict=True):
+        expected = engine.evaluate_candidate(profile)
+        assert results.keys() == expected.keys()
+        for code in expected:
+            assert results[code].model_dump() == expected[code].model_dump()
+
+
+def test_batch_empty(engine) -> None:
+    assert engine.evaluate_batch([]) == []
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_batch_profiles_match_single_pass(engine, monkeypatch, use_numpy) -> None:
+    if use_numpy and not batch.NUMPY_AVAILABLE:
+        pytest.skip("NumPy not installed")
+    monkeypatch.setattr(batch, "NUMPY_AVAILABLE", use_numpy)
+    monkeypatch.setattr(crs, "NUMPY_AVAILABLE", use_numpy)
+    profiles = _profiles()
+    derived = []
+    monkeypatch.setattr(
+        batch,
+        "ProfileFacts",
+        lambda *args, **kwargs: derived.append(1) or ProfileFacts(*args, **kwargs),
+    )
+
+    evaluations = engine.evaluate_profiles(profiles)
+
+    # Eligibility and CRS come from one fact derivation per profile.
+    assert len(derived) == len(profiles)
+    assert len(evaluations) == len(profiles)
+    for profile, evaluation in zip(profiles, evaluations, strict=True):
+        assert evaluation.model_dump() == engine.evaluate_profile(profile).model_dump()
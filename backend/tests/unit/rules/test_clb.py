@@ -0,0 +1,106 @@
+import random
+from datetime import date
+
+import pytest
+
+from src.app.domain_config.service import ConfigService
+from src.app.rules import clb
+from src.app.rules.clb import compile_clb_converter, convert_profiles
+from src.app.rules.engine import RuleEngine
+from src.app.rules.models import CandidateProfile, EducationRecord, LanguageTestResult
+
+
+@pytest.fixture(scope="module")
+def converter():
+    return compile_clb_converter(ConfigService().get_domain_rules().clb_tables)
+
+
+def _raw(test_type: str, score: float, test_date: date | None = None) -> LanguageTestResult:
+    return LanguageTestResult(
+        test_type=test_type,
+        test_date=test_date,
+        listening_score=score,
+        reading_score=score,
+        writing_score=score,
+        speaking_score=score,
+    )
+
+
+def test_ielts_bands_convert_per_ability(converter) -> None:
+    assert converter.to_clb("IELTS", "reading", 6.5) == 8
+    assert converter.to_clb("IELTS", "reading", 7.5) == 9  # between CLB 9 (7.0) and 10 (8.0)
+    assert converter.to_clb("IELTS", "listening", 8.0) == 9
+    assert converter.to_clb("IELTS", "listening", 9.0) == 10
+    assert converter.to_clb("ielts", "speaking", 5.0) == 5
+    assert converter.to_clb("IELTS", "reading", 3.0) == 0  # below the lowest row
+    assert converter.to_clb("PTE Core", "writing", 90) == 10
+    assert converter.to_clb("TOEFL", "reading", 30) is None
+
+
+def test_tef_edition_selected_by_test_date(converter) -> None:
+    assert converter.to_clb("TEF", "reading", 510, test_date=date(2022, 5, 1)) == 8
+    assert converter.to_clb("TEF", "reading", 510, test_date=date(2024, 5, 1)) == 9
+    assert converter.to_clb("TEF", "reading", 510) == 9  # newest edition when undated
+    assert converter.to_clb("TEF", "reading", 510, test_date=date(2018, 1, 1)) is None
+
+
+def test_resolve_keeps_supplied_clb_levels(converter) -> None:
+    test = _raw("CELPIP", 8).model_copy(update={"speaking_clb": 5})
+    resolved = converter.resolve(test)
+    assert resolved.ability_clbs() == (8, 8, 8, 5)
+    plain = LanguageTestResult(test_type="IELTS", listening_clb=7)
+    assert converter.resolve(plain) is plain
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_batch_conversion_matches_scalar(monkeypatch, converter, use_numpy) -> None:
+    if use_numpy and not clb.NUMPY_AVAILABLE:
+        pytest.skip("NumPy not installed")
+    monkeypatch.setattr(clb, "NUMPY_AVAILABLE", use_numpy)
+    rng = random.Random(3)
+    tests = []
+    for _ in range(300):
+        test_type, top = rng.choice([("IELTS", 9), ("CELPIP", 12), ("TEF", 699), ("TCF", 699)])
+        tests.append(
+            LanguageTestResult(
+                test_type=test_type,
+                test_date=rng.choice([None, date(2021, 1, 1), date(2025, 1, 1)]),
+                listening_score=rng.uniform(0, top),
+                reading_score=rng.uniform(0, top),
+                writing_score=rng.choice([None, rng.uniform(0, top)]),
+                speaking_score=rng.uniform(0, top),
+            )
+        )
+
+    assert [t.model_dump() for t in converter.convert_batch(tests)] == [
+        converter.resolve(t).model_dump() for t in tests
+    ]
+
+
+def test_engine_converts_raw_scores_before_evaluation() -> None:
+    engine = RuleEngine(config=ConfigService().get_domain_rules())
+    today = date(2026, 6, 1)
+    raw = CandidateProfile(
+        date_of_birth=date(1995, 1, 1),
+        education=[EducationRecord(level="bachelor")],
+        language_tests=[_raw("IELTS", 7.0)],
+    )
+    manual = raw.model_copy(
+        update={
+            "language_tests": [
+                LanguageTestResult(
+                    test_type="IELTS", listening_clb=7, reading_clb=9, writing_clb=9, speaking_clb=9
+                )
+            ]
+        }
+    )
+
+    facts = engine.facts(raw, today)
+    assert facts.best_clb == 7
+    assert facts.crs().model_dump() == engine.facts(manual, today).crs().model_dump()
+
+    [converted] = convert_profiles(engine.plan.clb, [raw])
+    assert converted.language_tests[0].ability_clbs() == (7, 9, 9, 9)
+    assert engine.evaluate_batch([raw], today=today)[0]["FSW"].crs.total_points == (
+        facts.crs().total_points
+    )
@@ -0,0 +1,101 @@
+from src.app.domain_config.service import ConfigService
+from src.app.rules.compiled import compile_rule_plan
+from src.app.rules.config_models import ProofOfFundsEntry
+
+
+def _config():
+    return ConfigService().get_domain_rules().model_copy(deep=True)
+
+
+def test_funds_lookup_matches_table_with_gaps_and_fallback() -> None:
+    cfg = _config()
+    cfg.proof_of_funds.table = [
+        ProofOfFundsEntry(family_size=4, amount_cad=400),
+        ProofOfFundsEntry(family_size=1, amount_cad=100),
+        ProofOfFundsEntry(family_size=2, amount_cad=200),
+    ]
+    plan = compile_rule_plan(cfg)
+
+    assert plan.required_funds(1) == 100
+    assert plan.required_funds(2) == 200
+    # Sizes missing from the table, or beyond it, use the largest family size entry.
+    assert plan.required_funds(3) == 400
+    assert plan.required_funds(9) == 400
+    assert plan.funds_checked("FSW")
+
+
+def test_empty_funds_table_disables_check() -> None:
+    cfg = _config()
+    cfg.proof_of_funds.table = []
+    plan = compile_rule_plan(cfg)
+
+    assert plan.required_funds(1) is None
+    assert not plan.funds_checked("FSW")
+
+
+def test_teer_mask() -> None:
+    cfg = _config()
+    cfg.work_experience.eligible_teers = [0, 1, 3]
+    plan = compile_rule_plan(cfg)
+
+    assert [plan.teer_eligible(t) for t in range(5)] == [True, True, False, True, False]
+    assert not plan.teer_eligible(None)
+
+    cfg.work_experience.eligible_teers = []
+    assert compile_rule_plan(cfg).teer_eligible(None)
+
+
+def test_plan_cached_by_fingerprint() -> None:
+    cfg = _config()
+    assert compile_rule_plan(cfg) is compile_rule_plan(cfg.model_copy(deep=True))
+    assert compile_rule_plan(cfg, fingerprint="abc") is compile_rule_plan(cfg, fingerprint="abc")
+
+
+def test_mutated_config_recompiles() -> None:
+    cfg = _config()
+    before = compile_rule_plan(cfg)
+    cfg.language.fsw_min_clb = (cfg.language.fsw_min_clb or 0) + 1
+    after = compile_rule_plan(cfg)
+
+    assert after is not before
+    assert after.fsw_min_clb == before.fsw_min_clb + 1
+
+
+def test_config_service_plan_shared() -> None:
+    service = ConfigService()
+    assert service.get_rule_plan() is service.get_rule_plan()
+
+
+def test_engine_takes_the_registry_plan_without_hashing_its_config(monkeypatch) -> None:
+    from src.app.domain_config.registry import get_config_snapshot
+    from src.app.rules import compiled
+    from src.app.rules.engine import RuleEngine
+    from src.app.services.rule_engine_service import RuleEngineService
+
+    snapshot = get_config_snapshot()
+    expected = snapshot.config_service.get_rule_plan()
+
+    def hashed(config):
+        raise AssertionError("the snapshot config must be looked up by its digest")
+
+    monkeypatch.setattr(compiled, "config_fingerprint", hashed)
+
+    class SnapshotPort:
+        def get_config(self):
+            return snapshot.domain_rules
+
+    assert RuleEngine(config=snapshot.domain_rules).plan is expected
+    assert RuleEngineService(config_port=SnapshotPort()).engine.plan is expected
+    assert expected.fingerprint == snapshot.digest
+
+
+def test_engine_for_its_own_config_does_not_load_the_registry(monkeypatch, tmp_path) -> None:
+    from src.app.domain_config import registry
+    from src.app.rules.engine import RuleEngine
+
+    # A registry whose config directory is missing fails as soon as it is loaded.
+    monkeypatch.setattr(registry, "_registry", registry.DomainConfigRegistry(tmp_path / "none"))
+    cfg = _config()
+
+    assert RuleEngine(config=cfg).plan is compile_rule_plan(cfg)
+    assert registry.get_config_registry().current() is None
@@ -0,0 +1,169 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.app.domain_config.service import ConfigService
+from src.app.rules import crs
+from src.app.rules.crs import CrsInputs, compile_crs_tables, score_crs, score_crs_batch
+from src.app.rules.engine import RuleEngine
+from src.app.rules.models import (
+    CandidateProfile,
+    EducationRecord,
+    LanguageTestResult,
+    SpouseProfile,
+    WorkExperienceRecord,
+)
+
+TODAY = date(2026, 6, 1)
+
+
+@pytest.fixture(scope="module")
+def engine() -> RuleEngine:
+    return RuleEngine(config=ConfigService().get_domain_rules())
+
+
+def _test(test_type: str, clb: int) -> LanguageTestResult:
+    return LanguageTestResult(
+        test_type=test_type,
+        listening_clb=clb,
+        reading_clb=clb,
+        writing_clb=clb,
+        speaking_clb=clb,
+    )
+
+
+def _work(days: int, canadian: bool, teer: int = 1) -> WorkExperienceRecord:
+    return WorkExperienceRecord(
+        teer_level=teer,
+        start_date=TODAY - timedelta(days=days),
+        end_date=TODAY,
+        is_continuous=True,
+        is_canadian=canadian,
+    )
+
+
+def _profile(**overrides) -> CandidateProfile:
+    fields = {
+        "date_of_birth": TODAY.replace(year=TODAY.year - 29),
+        "education": [EducationRecord(level="bachelor")],
+        "language_tests": [_test("IELTS", 9)],
+        # 2 full years Canadian, 3 full years foreign (30-day months).
+        "work_experience": [_work(735, canadian=True), _work(1100, canadian=False)],
+    }
+    fields.update(overrides)
+    return CandidateProfile(**fields)
+
+
+def _crs(engine: RuleEngine, profile: CandidateProfile):
+    return engine.evaluate_candidate(profile, today=TODAY)["FSW"].crs
+
+
+def test_single_candidate_breakdown(engine) -> None:
+    result = _crs(engine, _profile())
+
+    # age 29 (110) + bachelor (120) + CLB 9 x4 (124) + 2 years Canadian (53)
+    assert result.core_points == 407
+    assert result.spouse_points == 0
+    # education bundle 25 + 25, foreign work bundle 50 + 50 capped at 50 each
+    assert result.transferability_points == 100
+    assert result.additional_points == 0
+    assert result.total_points == 507
+    assert result.factors["first_language"] == 124
+
+
+def test_accompanying_spouse_uses_with_spouse_columns(engine) -> None:
+    spouse = SpouseProfile(
+        education=[EducationRecord(level="masters")],
+        language_tests=[_test("CELPIP", 7)],
+    )
+    result = _crs(engine, _profile(spouse=spouse))
+
+    # age 100 + bachelor 112 + CLB 9 x4 (116) + 2 years Canadian (46)
+    assert result.core_points == 374
+    # masters (10) + CLB 7 x4 (12)
+    assert result.spouse_points == 22
+
+    citizen = spouse.model_copy(update={"is_canadian_citizen_or_pr": True})
+    assert _crs(engine, _profile(spouse=citizen)).core_points == 407
+
+
+def test_french_second_language_and_nomination(engine) -> None:
+    profile = _profile(
+        language_tests=[_test("IELTS", 9), _test("TEF", 7)],
+        has_provincial_nomination=True,
+        has_sibling_in_canada=True,
+    )
+    result = _crs(engine, profile)
+
+    assert result.factors["second_language"] == 12
+    assert result.factors["french"] == 50
+    assert result.factors["provincial_nomination"] == 600
+    # sibling 15 + French 50 + nomination 600, capped at 600
+    assert result.additional_points == 600
+
+
+def test_canadian_study_and_certificate(engine) -> None:
+    profile = _profile(
+        education=[EducationRecord(level="bachelor", country="Canada", program_length_years=3)],
+        language_tests=[_test("IELTS", 6)],
+        work_experience=[],
+        has_certificate_of_qualification=True,
+    )
+    result = _crs(engine, profile)
+
+    assert result.factors["canadian_study"] == 30
+    assert result.factors["transfer_certificate"] == 25
+
+
+def test_empty_tables_score_zero() -> None:
+    cfg = ConfigService().get_domain_rules().model_copy(deep=True)
+    cfg.crs_core.age = []
+    cfg.crs_core.education_levels = []
+    tables = compile_crs_tables(cfg)
+
+    result = score_crs(tables, CrsInputs(age=30, education_rank=3))
+    assert result.factors["age"] == 0
+    assert result.factors["education"] == 0
+
+
+def _random_inputs(rng: random.Random) -> CrsInputs:
+    def clbs():
+        return tuple(rng.randint(0, 12) for _ in range(4))
+
+    return CrsInputs(
+        with_spouse=rng.random() < 0.5,
+        age=rng.randint(0, 70),
+        education_rank=rng.randint(0, 9),
+        first_language=clbs(),
+        second_language=clbs(),
+        canadian_years=rng.randint(0, 8),
+        foreign_years=rng.randint(0, 8),
+        spouse_education_rank=rng.randint(0, 9),
+        spouse_language=clbs(),
+        spouse_canadian_years=rng.randint(0, 8),
+        has_certificate=rng.random() < 0.3,
+        has_sibling=rng.random() < 0.3,
+        french_nclc=rng.randint(0, 12),
+        has_english=rng.random() < 0.7,
+        english_clb=rng.randint(0, 12),
+        canadian_study_years=rng.randint(0, 5),
+        has_nomination=rng.random() < 0.1,
+    )
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_batch_scoring_matches_scalar(monkeypatch, use_numpy) -> None:
+    if use_numpy and not crs.NUMPY_AVAILABLE:
+        pytest.skip("NumPy not installed")
+    monkeypatch.setattr(crs, "NUMPY_AVAILABLE", use_numpy)
+    tables = compile_crs_tables(ConfigService().get_domain_rules())
+    rng = random.Random(7)
+    inputs = [_random_inputs(rng) for _ in range(500)]
+
+    batched = score_crs_batch(tables, inputs)
+
+    assert [b.model_dump() for b in batched] == [
+        score_crs(tables, x).model_dump() for x in inputs
+    ]
+    assert score_crs_batch(tables, []) == []
@@ -1,11 +1,10 @@
 from datetime import date, timedelta
 
+from src.app.domain_config.service import ConfigService
 from src.app.rules.config_models import (
     ArrangedEmploymentConfig,
     BiometricsMedicalsConfig,
     ClbTablesConfig,
-    CrsCoreConfig,
-    CrsTransferabilityConfig,
     DomainRulesConfig,
     LanguageConfig,
     ProgramRule,
@@ -59,9 +58,13 @@ def make_funds(amount: float) -> ProofOfFundsSnapshot:
 
 class TestRuleEngine:
     def setup_method(self):
+        # CRS tables come from config/domain/crs.yaml; thresholds below are test-specific.
+        crs_rules = ConfigService().get_domain_rules()
         self.config = DomainRulesConfig(
-            crs_core=CrsCoreConfig(base_age_points=50, language_bonus_per_clb=2),
-            crs_transferability=CrsTransferabilityConfig(notes="placeholder"),
+            crs_core=crs_rules.crs_core,
+            crs_transferability=crs_rules.crs_transferability,
+            crs_spouse=crs_rules.crs_spouse,
+            crs_additional=crs_rules.crs_additional,
             language=LanguageConfig(
                 fsw_min_clb=7,
                 cec_min_clb_teer_0_1=7,
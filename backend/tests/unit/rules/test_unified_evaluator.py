@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+
+from src.app.domain_config.service import ConfigService
+from src.app.rules.engine import RuleEngine
+from src.app.rules.models import (
+    CandidateProfile,
+    LanguageTestResult,
+    ProofOfFundsSnapshot,
+    WorkExperienceRecord,
+)
+from src.app.rules.program_eligibility import evaluate_programs
+from src.app.services.rule_engine_service import RuleEngineService
+
+
+def _profile() -> CandidateProfile:
+    today = date.today()
+    return CandidateProfile(
+        date_of_birth=today.replace(year=today.year - 31),
+        language_tests=[
+            LanguageTestResult(
+                test_type="IELTS",
+                listening_clb=9,
+                reading_clb=9,
+                writing_clb=9,
+                speaking_clb=9,
+                expiry_date=today + timedelta(days=30),
+            )
+        ],
+        work_experience=[
+            WorkExperienceRecord(
+                teer_level=1,
+                start_date=today - timedelta(days=400),
+                end_date=today,
+                is_continuous=True,
+                is_canadian=True,
+            )
+        ],
+        proof_of_funds=[ProofOfFundsSnapshot(amount=20000, as_of_date=today)],
+    )
+
+
+def test_unified_pass_matches_separate_evaluators() -> None:
+    cfg = ConfigService().get_domain_rules()
+    engine = RuleEngine(config=cfg)
+    profile = _profile()
+
+    evaluation = engine.evaluate_profile(profile)
+
+    assert evaluation.programs.model_dump() == evaluate_programs(profile, cfg).model_dump()
+    expected = engine.evaluate_candidate(profile)
+    assert {k: v.model_dump() for k, v in evaluation.crs.items()} == {
+        k: v.model_dump() for k, v in expected.items()
+    }
+    assert evaluation.crs["FSW"].flags[0].rule_id == "LANG_EXPIRING"
+
+
+def test_profile_facts_derived_once(monkeypatch) -> None:
+    engine = RuleEngine(config=ConfigService().get_domain_rules())
+    profile = _profile()
+    calls = {"best": 0, "age": 0}
+    best_language_test = CandidateProfile.best_language_test
+    current_age = CandidateProfile.current_age
+
+    def counting_best(self, convert=None):
+        calls["best"] += 1
+        return best_language_test(self, convert=convert)
+
+    def counting_age(self, on_date=None):
+        calls["age"] += 1
+        return current_age(self, on_date=on_date)
+
+    monkeypatch.setattr(CandidateProfile, "best_language_test", counting_best)
+    monkeypatch.setattr(CandidateProfile, "current_age", counting_age)
+
+    engine.evaluate_profile(profile)
+
+    assert calls == {"best": 1, "age": 1}
+
+
+def test_service_full_profile_shape() -> None:
+    result = RuleEngineService().evaluate_full_profile(_profile())
+    assert set(result) == {"programs", "crs"}
+    assert set(result["crs"]) == {"FSW", "CEC"}
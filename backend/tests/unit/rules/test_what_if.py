@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.app.domain_config.service import ConfigService
+from src.app.rules.engine import RuleEngine
+from src.app.rules.models import (
+    CandidateProfile,
+    EducationRecord,
+    LanguageTestResult,
+    ProofOfFundsSnapshot,
+    WorkExperienceRecord,
+)
+from src.app.rules.what_if import WhatIfDelta, WhatIfEngine, analyze_what_if
+
+TODAY = date(2026, 6, 1)
+
+
+@pytest.fixture(scope="module")
+def engine() -> RuleEngine:
+    return RuleEngine(config=ConfigService().get_domain_rules())
+
+
+def _test(clb: int) -> LanguageTestResult:
+    return LanguageTestResult(
+        test_type="IELTS", listening_clb=clb, reading_clb=clb, writing_clb=clb, speaking_clb=clb
+    )
+
+
+def _work(days: int, canadian: bool) -> WorkExperienceRecord:
+    return WorkExperienceRecord(
+        teer_level=1,
+        start_date=TODAY - timedelta(days=days),
+        end_date=TODAY,
+        is_continuous=True,
+        is_canadian=canadian,
+    )
+
+
+def _profile(**overrides) -> CandidateProfile:
+    fields = {
+        "date_of_birth": TODAY.replace(year=TODAY.year - 29),
+        "education": [EducationRecord(level="bachelor")],
+        "language_tests": [_test(9)],
+        "work_experience": [_work(735, canadian=True), _work(1100, canadian=False)],
+        "proof_of_funds": [ProofOfFundsSnapshot(amount=20000, as_of_date=TODAY)],
+    }
+    fields.update(overrides)
+    return CandidateProfile(**fields)
+
+
+def _total(engine: RuleEngine, profile: CandidateProfile) -> int:
+    return engine.facts(profile, TODAY).crs().total_points
+
+
+def test_incremental_rescore_matches_full_rescore(engine) -> None:
+    what_if = WhatIfEngine(engine.facts(_profile(), TODAY))
+
+    language = what_if.evaluate([WhatIfDelta(kind="first_language_clb", value=10)])
+    assert language.total_points == _total(engine, _profile(language_tests=[_test(10)]))
+    assert set(language.recomputed_factors) == {
+        "first_language",
+        "transfer_education",
+        "transfer_foreign_work",
+        "transfer_certificate",
+        "french",
+    }
+
+    work = what_if.evaluate([WhatIfDelta(kind="canadian_work_years", value=1)])
+    longer = _profile(work_experience=[_work(1100, canadian=True), _work(1100, canadian=False)])
+    assert work.total_points == _total(engine, longer)
+    assert work.points_gained == work.total_points - what_if.base_crs.total_points > 0
+
+
+def test_flag_delta_touches_one_factor(engine) -> None:
+    result = WhatIfEngine(engine.facts(_profile(), TODAY)).evaluate(
+        [WhatIfDelta(kind="sibling_in_canada")]
+    )
+    assert result.recomputed_factors == ["sibling"]
+    assert result.points_gained == 15
+
+
+def test_language_delta_reevaluates_eligibility(engine) -> None:
+    analysis = analyze_what_if(
+        engine.facts(_profile(language_tests=[_test(6)]), TODAY),
+        [WhatIfDelta(kind="first_language_clb", value=7)],
+    )
+    assert "FSW" not in analysis.base.eligible_programs
+    assert {"FSW", "CEC"} <= set(analysis.scenarios[0].eligible_programs)
+
+
+def test_cheapest_changes_to_target_ranked_by_cost(engine) -> None:
+    facts = engine.facts(_profile(), TODAY)
+    base = facts.crs().total_points
+    deltas = [
+        WhatIfDelta(kind="provincial_nomination", cost=10),
+        WhatIfDelta(kind="sibling_in_canada", cost=1),
+        WhatIfDelta(kind="second_language_clb", value=7, cost=2),
+        WhatIfDelta(kind="education_level", level="masters", cost=5),
+    ]
+
+    analysis = analyze_what_if(facts, deltas, target_score=base + 60)
+
+    assert analysis.base.meets_target is False
+    assert [s.meets_target for s in analysis.scenarios] == [True, False, True, False]
+    costs = [r.cost for r in analysis.cheapest]
+    assert costs == sorted(costs)
+    assert [d.kind for d in analysis.cheapest[0].deltas] == ["second_language_clb"]
+    # Supersets of a combination that already reaches the target are not reported.
+    assert all(
+        len(r.deltas) == 1 or "provincial_nomination" not in {d.kind for d in r.deltas}
+        for r in analysis.cheapest
+    )
+
+
+def test_invalid_deltas_raise(engine) -> None:
+    what_if = WhatIfEngine(engine.facts(_profile(), TODAY))
+    with pytest.raises(ValueError):
+        what_if.evaluate([WhatIfDelta(kind="education_level", level="unknown")])
+    with pytest.raises(ValueError):
+        what_if.evaluate([WhatIfDelta(kind="spouse_language_clb", value=7)])
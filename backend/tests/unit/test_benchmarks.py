@@ -0,0 +1,47 @@
+import json
+
+from benchmarks.case_history import SCENARIOS, compare, main, percentile, run_benchmark
+from benchmarks.seed import Scale
+
+TINY = Scale(tenants=2, cases=40, snapshots_per_case=4, events_per_case=2, full_interval=3)
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    samples = [float(n) for n in range(1, 101)]
+    assert (percentile(samples, 0.5), percentile(samples, 0.99), percentile([], 0.5)) == (
+        50.0,
+        99.0,
+        0.0,
+    )
+
+
+def test_benchmark_seeds_and_times_every_scenario(tmp_path) -> None:
+    result = run_benchmark(f"sqlite:///{tmp_path / 'bench.db'}", TINY, iterations=3, warmup=1)
+
+    assert result["seed"]["rows"] == {"cases": 40, "snapshots": 160, "events": 80}
+    assert result["database"]["dialect"] == "sqlite"
+    assert set(result["scenarios"]) == set(SCENARIOS)
+    for stats in result["scenarios"].values():
+        assert stats["count"] == 3
+        assert 0 < stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    # evaluate added three (+ one warm-up) cases on top of the seeded ones
+    assert result["table_rows"]["case_records"] == 44
+
+
+def test_regressions_against_a_baseline_fail_the_run(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'bench.db'}"
+    args = ["--database-url", url, "--cases", "20", "--tenants", "2", "--snapshots-per-case", "3"]
+    output = tmp_path / "current.json"
+    assert main([*args, "--iterations", "2", "--scenarios", "list", "--output", str(output)]) == 0
+    current = json.loads(output.read_text())
+
+    faster = {"scenarios": {"list": {"p50_ms": 1e-6, "p99_ms": 1e-6}}}
+    assert compare(current, faster, 0.25) == [
+        f"list p50_ms: 1e-06 -> {current['scenarios']['list']['p50_ms']}",
+        f"list p99_ms: 1e-06 -> {current['scenarios']['list']['p99_ms']}",
+    ]
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(faster))
+    run = [*args, "--skip-seed", "--scenarios", "list", "--output", str(output)]
+    assert main([*run, "--baseline", str(baseline)]) == 1
+    assert main([*run, "--baseline", str(output)] + ["--max-regression", "1000"]) == 0